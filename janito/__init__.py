@@ -6,22 +6,38 @@ with built-in function calling capabilities and MCP (Model Context Protocol) sup
 """
 
 from ._version import __version__, __version_tuple__
-from .mcp_client.base import MCPTransport
-from .mcp_client.factory import create_transport
-from .mcp_client.http import HttpTransport
-from .mcp_client.stdio import StdioTransport
-
-# MCP modules
-from .mcp_config import (
-    MCP_CONFIG_PATH,
-    add_service,
-    get_service,
-    list_services,
-    load_mcp_config,
-    remove_service,
-    save_mcp_config,
-)
-from .mcp_manager import MCPManager, get_mcp_manager, shutdown_mcp_manager
+
+# The MCP API is re-exported lazily (PEP 562): ``import janito`` runs before
+# every command, and the MCP client stack (``requests``, the HTTP and stdio
+# transports, the manager) is only needed once a session starts.
+_LAZY_EXPORTS = {
+    "MCPTransport": "mcp_client.base",
+    "create_transport": "mcp_client.factory",
+    "HttpTransport": "mcp_client.http",
+    "StdioTransport": "mcp_client.stdio",
+    "MCP_CONFIG_PATH": "mcp_config",
+    "add_service": "mcp_config",
+    "get_service": "mcp_config",
+    "list_services": "mcp_config",
+    "load_mcp_config": "mcp_config",
+    "remove_service": "mcp_config",
+    "save_mcp_config": "mcp_config",
+    "MCPManager": "mcp_manager",
+    "get_mcp_manager": "mcp_manager",
+    "shutdown_mcp_manager": "mcp_manager",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Version
@@ -23,35 +23,13 @@ Usage:
 import importlib.util
 import sys
 
+# Only what every command needs is imported here: argument parsing, the
+# config dir and the privilege flags.  Command handlers, the chat modes and
+# the API clients (with their SDKs) are imported by the code path that runs
+# them, so ``--version``, ``--get`` or ``--show-providers`` never load the
+# agent loop (see tests/test_import_time.py).
 from . import privileges as _privileges_mod
 from .cli import create_parser
-from .cli.chat import print_version_banner, run_interactive_chat, run_single_prompt
-from .cli.handlers import (
-    handle_config_interactive,
-    handle_delete_secret,
-    handle_get_config,
-    handle_get_secret,
-    handle_info,
-    handle_install_plugin,
-    handle_install_skill,
-    handle_list_keys,
-    handle_list_mcp,
-    handle_list_models,
-    handle_list_plugins,
-    handle_list_secrets,
-    handle_list_skills,
-    handle_list_tools,
-    handle_set_api_key,
-    handle_set_config,
-    handle_set_secret,
-    handle_show_config,
-    handle_show_providers,
-    handle_show_system_prompt,
-    handle_uninstall_plugin,
-    handle_uninstall_skill,
-    handle_unset_config,
-)
-from .cli.handlers.variants import handle_create_variant, handle_delete_variant
 from .cli.input import read_stdin_prompt
 from .cli.logging_config import setup_logging
 from .cli.setup import validate_runtime_config
@@ -143,6 +121,13 @@ def _handle_batch_config(args) -> int | None:
     if not _has_batch_config_ops(args):
         return None
 
+    from .cli.handlers.config import (
+        handle_get_config,
+        handle_set_config,
+        handle_unset_config,
+    )
+    from .cli.handlers.secrets import handle_delete_secret, handle_set_secret
+
     exit_code = 0
     # Provider used for provider-scoped config keys (e.g. model). It is
     # taken from --provider, falling back to the configured provider value.
@@ -170,36 +155,56 @@ def _handle_batch_config(args) -> int | None:
     return exit_code
 
 
-def _dispatch_flag_command(args) -> int | None:
-    """Run the single flag-driven command handler, if any was requested."""
+def _flag_command(args):
+    """The handler of the flag-driven command requested, or ``None``."""
+    from .cli import handlers as h
+
     handlers = [
-        (args.info, lambda: handle_info(args)),
-        (args.show_config, lambda: handle_show_config(args)),
-        (args.show_system_prompt, lambda: handle_show_system_prompt(args)),
-        (args.config, lambda: handle_config_interactive()),
-        (args.list_keys, lambda: handle_list_keys(args)),
-        (args.show_providers, lambda: handle_show_providers(args)),
-        (args.set_api_key, lambda: handle_set_api_key(args)),
-        (args.list_secrets, lambda: handle_list_secrets(args)),
-        (args.get_secret is not None, lambda: handle_get_secret(args)),
-        (args.install_skill, lambda: handle_install_skill(args.install_skill)),
-        (args.list_skills, lambda: handle_list_skills(args)),
-        (args.uninstall_skill, lambda: handle_uninstall_skill(args.uninstall_skill)),
-        (args.install_plugin, lambda: handle_install_plugin(args.install_plugin)),
-        (args.uninstall_plugin, lambda: handle_uninstall_plugin(args.uninstall_plugin)),
-        (args.list_tools, lambda: handle_list_tools(args)),
-        (args.list_mcp, lambda: handle_list_mcp(args)),
-        (args.list_models, lambda: handle_list_models(args)),
-        (args.list_plugins, lambda: handle_list_plugins(args)),
-        (args.create_variant, lambda: handle_create_variant(args.create_variant)),
-        (args.delete_variant, lambda: handle_delete_variant(args.delete_variant)),
+        (args.info, lambda: h.handle_info(args)),
+        (args.show_config, lambda: h.handle_show_config(args)),
+        (args.show_system_prompt, lambda: h.handle_show_system_prompt(args)),
+        (args.config, lambda: h.handle_config_interactive()),
+        (args.list_keys, lambda: h.handle_list_keys(args)),
+        (args.show_providers, lambda: h.handle_show_providers(args)),
+        (args.set_api_key, lambda: h.handle_set_api_key(args)),
+        (args.list_secrets, lambda: h.handle_list_secrets(args)),
+        (args.get_secret is not None, lambda: h.handle_get_secret(args)),
+        (args.install_skill, lambda: h.handle_install_skill(args.install_skill)),
+        (args.list_skills, lambda: h.handle_list_skills(args)),
+        (args.uninstall_skill, lambda: h.handle_uninstall_skill(args.uninstall_skill)),
+        (args.install_plugin, lambda: h.handle_install_plugin(args.install_plugin)),
+        (args.uninstall_plugin, lambda: h.handle_uninstall_plugin(args.uninstall_plugin)),
+        (args.list_tools, lambda: h.handle_list_tools(args)),
+        (args.list_mcp, lambda: h.handle_list_mcp(args)),
+        (args.list_models, lambda: h.handle_list_models(args)),
+        (args.list_plugins, lambda: h.handle_list_plugins(args)),
+        (args.create_variant, lambda: h.handle_create_variant(args.create_variant)),
+        (args.delete_variant, lambda: h.handle_delete_variant(args.delete_variant)),
     ]
     for enabled, handler in handlers:
         if enabled:
-            return handler()
+            return handler
     return None
 
 
+def _dispatch_flag_command(args) -> int | None:
+    """Run the single flag-driven command handler, if any was requested."""
+    handler = _flag_command(args)
+    return handler() if handler is not None else None
+
+
+def _forward_to_daemon(args) -> int | None:
+    """Run a single prompt in the running ``--daemon``, when there is one.
+
+    Returns the prompt's exit status, or ``None`` to run it in-process.
+    """
+    if args.no_daemon or args.web or _flag_command(args) is not None:
+        return None
+    from .cli.daemon import forward
+
+    return forward(args, sys.argv[1:])
+
+
 def _run_web(args) -> int:
     """Run the web UI server, failing with a hint when extras are missing."""
     # The [web] extra (fastapi / uvicorn) is optional, so check its
@@ -223,6 +228,27 @@ def _run_web(args) -> int:
     return 0
 
 
+def _load_session_plugins(args) -> None:
+    """Load the session's plugins, after the version banner.
+
+    - Plugins installed in ~/.janito/plugins are autoloaded unless
+      --no-plugins is passed (they are independent of --no-tools).
+    - Plugins explicitly requested with --plugin DIR are always loaded.
+    """
+    if getattr(args, "plugin", None) or not getattr(args, "no_plugins", False):
+        from .cli.chat import print_version_banner
+        from .plugin_manager import load_installed_plugins, load_plugins
+
+        # Show the version banner before any plugin loading messages so the
+        # session identity is visible first.
+        print_version_banner()
+
+        if not getattr(args, "no_plugins", False):
+            load_installed_plugins()
+        if getattr(args, "plugin", None):
+            load_plugins(args.plugin)
+
+
 def main():
     """Main entry point."""
     parser = create_parser()
@@ -239,24 +265,29 @@ def main():
     if exit_code is not None:
         return exit_code
 
+    # --batch FILE: the prompts run in worker processes that load the
+    # plugins themselves; stdout only carries the NDJSON results, so the
+    # version banner is not printed.
+    if getattr(args, "batch", None):
+        from .cli.batch import run_batch
+
+        return run_batch(args)
+
+    if args.daemon:
+        from .cli.daemon import serve
+
+        return serve(args)
+
+    # With a --daemon running, a single prompt runs there (warm plugins,
+    # tools, MCP services and SDK clients); this process only relays it.
+    exit_code = _forward_to_daemon(args)
+    if exit_code is not None:
+        return exit_code
+
     # Load plugins before any registry/shell access so plugin tools,
     # commands and system-prompt sections are registered for the session.
     # Runs after _setup_runtime so privileges are already applied.
-    #
-    # - Plugins installed in ~/.janito/plugins are autoloaded unless
-    #   --no-plugins is passed (they are independent of --no-tools).
-    # - Plugins explicitly requested with --plugin DIR are always loaded.
-    if getattr(args, "plugin", None) or not getattr(args, "no_plugins", False):
-        from .plugin_manager import load_installed_plugins, load_plugins
-
-        # Show the version banner before any plugin loading messages so the
-        # session identity is visible first.
-        print_version_banner()
-
-        if not getattr(args, "no_plugins", False):
-            load_installed_plugins()
-        if getattr(args, "plugin", None):
-            load_plugins(args.plugin)
+    _load_session_plugins(args)
 
     # Handle single flag-driven commands (--info, --config, --list-*, ...)
     exit_code = _dispatch_flag_command(args)
@@ -280,6 +311,8 @@ def main():
         args.prompt = stdin_prompt
 
     # Run chat or single prompt
+    from .cli.chat import run_interactive_chat, run_single_prompt
+
     if args.prompt is None:
         run_interactive_chat(args)
     else:
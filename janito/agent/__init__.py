@@ -1,7 +1,7 @@
 """Shared per-API adapter layer for the CLI and web agent loops.
 
 Both agent loops (the CLI's ``janito.openai_client.base_client.Client.send``
-and the web's ``janito.web.backend.agent.loop.stream_prompt``) drive the
+and the async ``janito.agent.pipeline.loop.stream_prompt``) drive the
 same turn pipeline — resolve config, stream a response, run tool calls and
 repeat — but they differ where it matters: the CLI is synchronous and prints
 Rich output, the web is asynchronous and yields structured events.  The
@@ -13,8 +13,19 @@ conversion, usage normalization) are the same in both, so they live here:
 - :mod:`~.anthropic`   — native Anthropic SDK kwargs, conversion and accumulator.
 - :mod:`~.dashscope`   — native DashScope SDK kwargs and accumulator.
 - :mod:`~.usage`       — token-usage normalization shared by both loops.
+- :mod:`~.tokens`      — local token estimation for pre-flight budgeting.
+- :mod:`~.context`     — automatic compaction of the re-sent history.
+- :mod:`~.history_cache` — incremental conversion of the history to the
+  native Anthropic / Gemini formats.
 - :mod:`~.events`      — the agent event dataclasses (web wire format; the
   CLI prints them instead of serializing).
+- :mod:`~.pipeline`    — ``PipelineConfig`` and ``run_prompt``, the entry
+  point of the async loop for both interfaces (``async-pipeline``).
+- :mod:`~.ratelimit`   — client-side rate limiting per provider and API key.
+- :mod:`~.routing`     — endpoint pools: balancing and failover across a
+  provider's variants.
+- :mod:`~.tracing`     — per-prompt phase spans (``-v``, ``/status`` and
+  OTLP/JSON trace files).
 
 The tool-execution core is shared too, and lives in its historical home
 ``janito.tooling.executor.run_tool`` (used by the CLI ``ToolExecutor`` and
@@ -1,14 +1,14 @@
 """Shared native Anthropic SDK adapter: kwargs, conversion, accumulation.
 
 The Anthropic Messages-API turn pipeline used to live in the web runner
-(``janito.web.backend.agent.anthropic``); the pure parts — call-kwargs
+(``janito.agent.pipeline.anthropic``); the pure parts — call-kwargs
 building, history conversion and stream accumulation — moved here so both
-agent loops share them.  The web shim keeps the async glue
+agent loops share them.  The pipeline runner keeps the async glue
 (:func:`create_client` and :func:`stream_turn_events`).
 
 The ``anthropic`` package is **optional** (see
 ``janito.providers.REQUIRES_BY_API_TYPE``); importing it happens lazily
-inside :func:`create_client` (kept in the web shim), so importing this
+inside :func:`create_client` (kept in the pipeline runner), so importing this
 module never requires it.
 
 **Conversation model.** The Messages API is stateless, so every round
@@ -18,6 +18,20 @@ system messages are folded into the top-level ``system`` parameter,
 ``assistant`` ``tool_calls`` become ``tool_use`` content blocks, and ``tool``
 messages become ``tool_result`` blocks in a ``user`` message (consecutive
 tool results are merged into one message so roles keep alternating).
+Each round only converts the messages added since the previous one (see
+:mod:`janito.agent.history_cache`).
+
+**Prompt caching.**  Because every round re-sends the same prefix (tools,
+system prompt, earlier turns), :func:`apply_cache_breakpoints` marks it with
+``cache_control`` breakpoints so the API serves it from the prompt cache
+instead of re-processing it.  The API allows four breakpoints per request;
+they go on the last tool definition, the system prompt, the last message (the
+rolling end of the prefix, read back by the next round) and the previous user
+message (so a round that appends more than the API's 20-block lookback still
+hits the cache).  The markers are added to copies; the caller's history is
+never mutated.  Both the CLI client and the web runner use it, gated by the
+per-model ``prompt-caching`` setting
+(:func:`janito.provider_accessors.get_prompt_caching_from_provider`).
 """
 
 import json
@@ -28,6 +42,9 @@ from .usage import usage_event_from_usage
 
 logger = logging.getLogger(__name__)
 
+#: The marker placed on each prompt-cache breakpoint (5-minute TTL).
+CACHE_CONTROL = {"type": "ephemeral"}
+
 
 def _convert_tools(tools_schemas: list[dict]) -> list[dict]:
     """Convert Chat Completions tool schemas to the Anthropic tools format."""
@@ -55,52 +72,184 @@ def _to_anthropic(messages: list[dict]) -> tuple[list[dict], str | None]:
     messages (one per tool call in a turn) are merged into a single ``user``
     message so the user/assistant roles keep alternating as the API requires.
     """
+    converted: list[dict] = []
+    for m in messages:
+        _append_anthropic(converted, m)
+    return converted, _system_of(messages)
+
+
+def _to_anthropic_cached(messages: list[dict]) -> tuple[list[dict], str | None]:
+    """:func:`_to_anthropic`, converting only the messages added since last round."""
+    from .history_cache import converted_history
+
+    return converted_history(messages, _append_anthropic, "anthropic"), _system_of(
+        messages
+    )
+
+
+def _system_of(messages: list[dict]) -> str | None:
+    """The ``\\n\\n``-joined content of the ``system``-role messages."""
     system_parts = [
         str(m["content"])
         for m in messages
         if m.get("role") == "system" and m.get("content")
     ]
-    system = "\n\n".join(system_parts) if system_parts else None
+    return "\n\n".join(system_parts) if system_parts else None
 
-    converted: list[dict] = []
-    for m in messages:
-        role = m.get("role")
-        if role == "system":
-            continue
-        if role == "assistant" and m.get("tool_calls"):
-            blocks: list[dict] = []
-            if m.get("content"):
-                blocks.append({"type": "text", "text": m["content"]})
-            for tc in m["tool_calls"]:
-                blocks.append(
-                    {
-                        "type": "tool_use",
-                        "id": tc.get("id", ""),
-                        "name": tc["function"]["name"],
-                        "input": _parse_tool_input(tc["function"]["arguments"]),
-                    }
-                )
-            converted.append({"role": "assistant", "content": blocks})
-        elif role == "tool":
-            result_block = {
-                "type": "tool_result",
-                "tool_use_id": m.get("tool_call_id", ""),
-                "content": m.get("content") or "",
+
+def _append_anthropic(converted: list[dict], m: dict) -> None:
+    """Append the Messages API form of one OpenAI-format message.
+
+    The step function of :func:`_to_anthropic` (see
+    :mod:`janito.agent.history_cache`): a ``tool`` message following tool
+    results replaces the last ``user`` message with a merged copy rather
+    than appending to it, so converted entries are never mutated.
+    """
+    role = m.get("role")
+    if role == "system":
+        return
+    if role == "assistant" and m.get("tool_calls"):
+        blocks: list[dict] = []
+        if m.get("content"):
+            blocks.append({"type": "text", "text": m["content"]})
+        for tc in m["tool_calls"]:
+            blocks.append(
+                {
+                    "type": "tool_use",
+                    "id": tc.get("id", ""),
+                    "name": tc["function"]["name"],
+                    "input": _parse_tool_input(tc["function"]["arguments"]),
+                }
+            )
+        converted.append({"role": "assistant", "content": blocks})
+    elif role == "tool":
+        result_block = {
+            "type": "tool_result",
+            "tool_use_id": m.get("tool_call_id", ""),
+            "content": m.get("content") or "",
+        }
+        last = converted[-1] if converted else None
+        if (
+            last
+            and last["role"] == "user"
+            and isinstance(last["content"], list)
+            and last["content"]
+            and all(b.get("type") == "tool_result" for b in last["content"])
+        ):
+            converted[-1] = {
+                "role": "user",
+                "content": [*last["content"], result_block],
             }
-            last = converted[-1] if converted else None
-            if (
-                last
-                and last["role"] == "user"
-                and isinstance(last["content"], list)
-                and last["content"]
-                and all(b.get("type") == "tool_result" for b in last["content"])
-            ):
-                last["content"].append(result_block)
-            else:
-                converted.append({"role": "user", "content": [result_block]})
         else:
-            converted.append({"role": role, "content": m.get("content") or ""})
-    return converted, system
+            converted.append({"role": "user", "content": [result_block]})
+    else:
+        converted.append({"role": role, "content": m.get("content") or ""})
+
+
+def cache_tools(tools: list[dict] | None) -> list[dict] | None:
+    """Return ``tools`` with a cache breakpoint on the last definition.
+
+    Tools are the first section of the cached prefix, so one breakpoint at
+    the end covers all of them.  The list and the marked entry are copies.
+    """
+    if not tools:
+        return tools
+    return [*tools[:-1], {**tools[-1], "cache_control": CACHE_CONTROL}]
+
+
+def _cache_system(system):
+    """Turn ``system`` into text blocks with a breakpoint on the last one."""
+    if isinstance(system, str):
+        return [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+    if isinstance(system, list) and system:
+        return [*system[:-1], {**system[-1], "cache_control": CACHE_CONTROL}]
+    return system
+
+
+def _cache_message(message: dict) -> dict:
+    """Copy ``message`` with a breakpoint on its last content block.
+
+    String content is promoted to a single text block.  Messages without a
+    block that can carry ``cache_control`` (empty text, thinking) are
+    returned unchanged.
+    """
+    content = message.get("content")
+    if isinstance(content, str):
+        if not content:
+            return message
+        blocks = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+        return {**message, "content": blocks}
+    if not isinstance(content, list) or not content:
+        return message
+    last = content[-1]
+    if not isinstance(last, dict) or last.get("type") in (
+        "thinking",
+        "redacted_thinking",
+    ):
+        return message
+    if last.get("type") == "text" and not last.get("text"):
+        return message
+    return {
+        **message,
+        "content": [*content[:-1], {**last, "cache_control": CACHE_CONTROL}],
+    }
+
+
+def apply_cache_breakpoints(call_kwargs: dict) -> dict:
+    """Place prompt-cache breakpoints on a ``messages.create`` kwargs dict.
+
+    Marks the last tool (when ``tools`` is in the kwargs), the ``system``
+    prompt, the last message and the user message before it -- at most the
+    four breakpoints the API accepts.  ``call_kwargs`` is updated in place
+    with copied ``tools``/``system``/``messages`` values and returned.
+    """
+    if call_kwargs.get("tools"):
+        call_kwargs["tools"] = cache_tools(call_kwargs["tools"])
+    if call_kwargs.get("system"):
+        call_kwargs["system"] = _cache_system(call_kwargs["system"])
+    messages = list(call_kwargs.get("messages") or [])
+    if messages:
+        last = len(messages) - 1
+        messages[last] = _cache_message(messages[last])
+        previous_user = next(
+            (i for i in range(last - 1, -1, -1) if messages[i].get("role") == "user"),
+            None,
+        )
+        if previous_user is not None:
+            messages[previous_user] = _cache_message(messages[previous_user])
+        call_kwargs["messages"] = messages
+    return call_kwargs
+
+
+def usage_namespace(
+    input_tokens: int | None,
+    output_tokens: int | None,
+    cache_read: int | None = None,
+    cache_write: int | None = None,
+):
+    """Build the usage object for one Messages API round.
+
+    The API's ``input_tokens`` excludes the prompt-cache reads and writes, so
+    they are added back to report the full prompt size as ``input_tokens``;
+    the cache counters go into ``input_tokens_details`` (``cached_tokens`` /
+    ``cache_write_tokens``) where :func:`~janito.agent.usage.normalize_usage`
+    picks them up.  Returns ``None`` when no usage was reported.
+    """
+    if input_tokens is None and output_tokens is None:
+        return None
+    usage = SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+    )
+    if cache_read is not None or cache_write is not None:
+        usage.input_tokens = (
+            (input_tokens or 0) + (cache_read or 0) + (cache_write or 0)
+        )
+        usage.input_tokens_details = SimpleNamespace(
+            cached_tokens=cache_read or 0, cache_write_tokens=cache_write or 0
+        )
+    usage.total_tokens = (usage.input_tokens or 0) + (output_tokens or 0)
+    return usage
 
 
 def build_call_kwargs(
@@ -119,9 +268,12 @@ def build_call_kwargs(
     the CLI client).  ``preserve_thinking`` / ``reasoning_level`` / thinking
     are accepted for signature parity with the other runners but the native
     extended-thinking mode is not wired yet (thinking text is still streamed
-    and displayed when the model emits it).
+    and displayed when the model emits it).  Prompt-cache breakpoints are
+    added unless the effective model disables ``prompt-caching``.
     """
-    anthropic_messages, system = _to_anthropic(messages)
+    from janito.provider_accessors import get_prompt_caching_from_provider
+
+    anthropic_messages, system = _to_anthropic_cached(messages)
     if max_output_tokens is None:
         max_output_tokens = 100000  # default to 100k tokens if not set in config
 
@@ -135,6 +287,10 @@ def build_call_kwargs(
         call_kwargs["system"] = system
     if tools_schemas:
         call_kwargs["tools"] = _convert_tools(tools_schemas)
+    if get_prompt_caching_from_provider(
+        getattr(config, "effective_provider", None), model
+    ):
+        apply_cache_breakpoints(call_kwargs)
     return call_kwargs
 
 
@@ -154,10 +310,13 @@ class AnthropicTurnAccumulator:
         self.content: list[str] = []
         self.reasoning: list[str] = []
         self.tool_use_blocks: list[dict] = []  # [{id, name, input}]
-        # index -> {type, id, name, json} while a tool_use block is in flight
+        # index -> {type, id, name, parts} while a block is in flight;
+        # ``parts`` collects the JSON fragments, joined on content_block_stop
         self.blocks: dict[int, dict] = {}
         self.input_tokens: int | None = None
         self.output_tokens: int | None = None
+        self.cache_read_tokens: int | None = None
+        self.cache_write_tokens: int | None = None
         self.done: bool = False
 
     # ------------------------------------------------------------------
@@ -168,12 +327,13 @@ class AnthropicTurnAccumulator:
         """Process one stream event; returns ``(reasoning_delta, content_delta)``."""
         event_type = getattr(event, "type", None)
 
-        if event_type == "message_start":
+        # Deltas are by far the most frequent events: test for them first.
+        if event_type == "content_block_delta":
+            return self.handle_content_block_delta(event)
+        elif event_type == "message_start":
             self.handle_message_start(event)
         elif event_type == "content_block_start":
             self.handle_content_block_start(event)
-        elif event_type == "content_block_delta":
-            return self.handle_content_block_delta(event)
         elif event_type == "content_block_stop":
             self.handle_content_block_stop(event)
         elif event_type == "message_delta":
@@ -185,11 +345,15 @@ class AnthropicTurnAccumulator:
         return None, None
 
     def handle_message_start(self, event) -> None:
-        """Record the input tokens reported by the message_start event."""
+        """Record the input and prompt-cache tokens reported by message_start."""
         message = getattr(event, "message", None)
         usage = getattr(message, "usage", None)
         if usage is not None:
             self.input_tokens = getattr(usage, "input_tokens", None)
+            self.cache_read_tokens = getattr(usage, "cache_read_input_tokens", None)
+            self.cache_write_tokens = getattr(
+                usage, "cache_creation_input_tokens", None
+            )
 
     def handle_content_block_start(self, event) -> None:
         """Open a new content block indexed by ``index``."""
@@ -199,10 +363,9 @@ class AnthropicTurnAccumulator:
         block = getattr(event, "content_block", None)
         self.blocks[index] = {
             "type": getattr(block, "type", None),
-            "text": "",
             "id": getattr(block, "id", None),
             "name": getattr(block, "name", None),
-            "json": "",
+            "parts": [],
         }
 
     def handle_content_block_delta(self, event) -> tuple[str | None, str | None]:
@@ -212,20 +375,20 @@ class AnthropicTurnAccumulator:
         if block is None or delta is None:
             return None, None
         delta_type = getattr(delta, "type", None)
+        # Text and thinking are collected in ``content`` / ``reasoning``
+        # directly; only tool_use JSON is kept on the block.
         if delta_type == "text_delta":
             text = getattr(delta, "text", "") or ""
-            block["text"] += text
             if text:
                 self.content.append(text)
                 return None, text
         elif delta_type == "thinking_delta":
             text = getattr(delta, "thinking", "") or ""
-            block["text"] += text
             if text:
                 self.reasoning.append(text)
                 return text, None
         elif delta_type == "input_json_delta":
-            block["json"] += getattr(delta, "partial_json", "") or ""
+            block["parts"].append(getattr(delta, "partial_json", "") or "")
         return None, None
 
     def handle_content_block_stop(self, event) -> None:
@@ -251,8 +414,9 @@ class AnthropicTurnAccumulator:
 
     def _parse_tool_use(self, block: dict) -> dict:
         """Parse a finished tool_use block into ``{"id", "name", "input"}``."""
+        arguments = "".join(block["parts"])
         try:
-            parsed = json.loads(block["json"]) if block["json"].strip() else {}
+            parsed = json.loads(arguments) if arguments.strip() else {}
         except json.JSONDecodeError:
             parsed = {}
         return {"id": block["id"], "name": block["name"], "input": parsed}
@@ -282,12 +446,11 @@ class AnthropicTurnAccumulator:
         ]
 
     def usage_event(self, max_tokens: int | None = None):
-        if self.input_tokens is None and self.output_tokens is None:
-            return None
-        usage = SimpleNamespace(
-            total_tokens=(self.input_tokens or 0) + (self.output_tokens or 0),
-            input_tokens=self.input_tokens,
-            output_tokens=self.output_tokens,
+        usage = usage_namespace(
+            self.input_tokens,
+            self.output_tokens,
+            self.cache_read_tokens,
+            self.cache_write_tokens,
         )
         return usage_event_from_usage(usage, max_tokens)
 
@@ -298,9 +461,13 @@ accumulator = AnthropicTurnAccumulator
 
 
 __all__ = [
+    "CACHE_CONTROL",
     "AnthropicTurnAccumulator",
     "accumulator",
+    "apply_cache_breakpoints",
     "build_call_kwargs",
+    "cache_tools",
+    "usage_namespace",
     "_convert_tools",
     "_parse_tool_input",
     "_to_anthropic",
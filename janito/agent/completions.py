@@ -2,9 +2,10 @@
 
 Used by both agent loops:
 
-- the web ``stream_prompt()`` loop imports ``CompletionsAccumulator`` and
-  ``build_call_kwargs`` through the ``janito.web.backend.agent.call`` shim
-  (where the accumulator is still aliased as ``StreamAccumulator``);
+- the async ``stream_prompt()`` loop (:mod:`janito.agent.pipeline.loop`)
+  imports ``CompletionsAccumulator`` and ``build_call_kwargs`` directly
+  (the ``janito.web.backend.agent.call`` shim still aliases the
+  accumulator as ``StreamAccumulator``);
 - the CLI loop subclasses ``CompletionsAccumulator`` in
   ``janito.openai_client.completions_stream`` (``CompletionsStreamConsumer``)
   to add its synchronous Enter-to-cancel stream driver.
@@ -15,12 +16,13 @@ loop under a progress spinner).
 """
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, ClassVar
 
 from janito.provider_accessors import (
     apply_builtin_tools_to_extra_body,
     apply_thinking_to_extra_body,
 )
+from janito.tooling.speculative import JsonObjectTracker
 
 from .usage import usage_event_from_usage
 
@@ -129,12 +131,54 @@ class CompletionsAccumulator:
 
     content: list[str] = field(default_factory=list)
     reasoning: list[str] = field(default_factory=list)
-    tool_calls: dict[int, dict[str, Any]] = field(default_factory=dict)
     usage: object | None = None
     #: Raw top-level response metadata (id, model, created, finish_reason, ...)
     #: captured from the stream chunks.  Populated by the CLI stream consumer
     #: for the verbose response dump; the web loop never reads it.
     raw_attrs: dict[str, Any] = field(default_factory=dict)
+    #: Number of chunks handled so far (the CLI consumer reads the repeated
+    #: response metadata from the first and the terminal chunks only).
+    chunks: int = 0
+    #: Per-index ``{id, name, arguments}`` of the streamed tool calls (see
+    #: :attr:`tool_calls`).
+    _calls: dict[int, dict[str, Any]] = field(default_factory=dict, repr=False)
+    #: Per-index ``arguments`` fragments.  Appending to a growing string would
+    #: copy it on every fragment (quadratic for a large ``create_file``
+    #: call), so the fragments are joined only when the calls are read.
+    _argument_parts: dict[int, list[str]] = field(default_factory=dict, repr=False)
+    _stale_arguments: set[int] = field(default_factory=set, repr=False)
+    #: Per-index completeness trackers of the streamed ``arguments`` JSON.
+    arguments_trackers: dict[int, JsonObjectTracker] = field(
+        default_factory=dict, repr=False
+    )
+
+    #: Whether :meth:`on_tool_call_ready` is called as soon as a tool call's
+    #: arguments are complete (the CLI consumer enables it to start read-only
+    #: tools early; see :mod:`janito.tooling.speculative`).
+    track_tool_call_arguments: ClassVar[bool] = False
+
+    def on_tool_call_ready(self, call: dict[str, Any]) -> None:
+        """Hook: ``call``'s streamed arguments form a complete JSON object."""
+
+    def _track_arguments(self, idx: int, fragment: str) -> None:
+        """Feed an arguments fragment; fire the hook once it completes.
+
+        Calls are reported in order: a call is not reported when an earlier
+        one's arguments never completed (the hook could not see it first).
+        """
+        tracker = self.arguments_trackers.get(idx)
+        if tracker is None:
+            tracker = self.arguments_trackers[idx] = JsonObjectTracker()
+        if tracker.complete:
+            tracker.feed(fragment)
+        elif tracker.feed(fragment) and self._earlier_calls_complete(idx):
+            self.on_tool_call_ready(self.tool_calls[idx])
+
+    def _earlier_calls_complete(self, idx: int) -> bool:
+        trackers = self.arguments_trackers
+        return all(
+            i in trackers and trackers[i].complete for i in self._calls if i < idx
+        )
 
     def _handle_reasoning_delta(self, delta) -> str | None:
         """Capture reasoning/thinking content; returns the delta or None."""
@@ -145,18 +189,49 @@ class CompletionsAccumulator:
                 return val
         return None
 
+    @property
+    def tool_calls(self) -> dict[int, dict[str, Any]]:
+        """Per-index ``{id, name, arguments}`` of the tool calls streamed so far."""
+        self.join_tool_call_arguments()
+        return self._calls
+
+    @tool_calls.setter
+    def tool_calls(self, calls: dict[int, dict[str, Any]]) -> None:
+        """Fold into an existing per-index map (the legacy bridges' own dict)."""
+        self._calls = calls
+        self._argument_parts = {
+            idx: [call.get("arguments") or ""] for idx, call in calls.items()
+        }
+        self._stale_arguments.clear()
+
+    def join_tool_call_arguments(self) -> None:
+        """Write the pending ``arguments`` fragments into the tool-call map."""
+        for idx in self._stale_arguments:
+            parts = self._argument_parts[idx]
+            joined = "".join(parts)
+            parts[:] = [joined]
+            self._calls[idx]["arguments"] = joined
+        self._stale_arguments.clear()
+
     def _fold_tool_call_delta(self, tc_delta) -> None:
         """Merge one tool-call delta into the per-index tool call map."""
         idx = tc_delta.index
-        if idx not in self.tool_calls:
-            self.tool_calls[idx] = {"id": "", "name": "", "arguments": ""}
+        call = self._calls.get(idx)
+        if call is None:
+            call = self._calls[idx] = {"id": "", "name": "", "arguments": ""}
+            self._argument_parts[idx] = []
         if tc_delta.id:
-            self.tool_calls[idx]["id"] = tc_delta.id
-        if tc_delta.function:
-            if tc_delta.function.name:
-                self.tool_calls[idx]["name"] = tc_delta.function.name
-            if tc_delta.function.arguments:
-                self.tool_calls[idx]["arguments"] += tc_delta.function.arguments
+            call["id"] = tc_delta.id
+        function = tc_delta.function
+        if function:
+            if function.name:
+                call["name"] = function.name
+            fragment = function.arguments
+            if fragment:
+                self._argument_parts[idx].append(fragment)
+                self._stale_arguments.add(idx)
+                if self.track_tool_call_arguments:
+                    self._track_arguments(idx, fragment)
         # Preserve provider-specific extras (e.g. Gemini's
         # ``extra_content.google.thought_signature``) so they can be echoed
         # back verbatim on the next turn.  The OpenAI SDK surfaces unknown
@@ -165,25 +240,32 @@ class CompletionsAccumulator:
         # "Function call is missing a thought_signature" error.
         extra_content = getattr(tc_delta, "extra_content", None)
         if extra_content:
-            self.tool_calls[idx]["extra_content"] = extra_content
+            call["extra_content"] = extra_content
 
     def _handle_tool_call_delta(self, delta) -> None:
         """Accumulate tool-call deltas (split across many chunks)."""
-        if not hasattr(delta, "tool_calls") or not delta.tool_calls:
-            return
-        for tc_delta in delta.tool_calls:
-            self._fold_tool_call_delta(tc_delta)
+        tool_calls = getattr(delta, "tool_calls", None)
+        if tool_calls:
+            for tc_delta in tool_calls:
+                self._fold_tool_call_delta(tc_delta)
 
     def handle(self, chunk) -> tuple[str | None, str | None]:
-        """Process one chunk; returns ``(reasoning_delta, content_delta)``."""
-        if hasattr(chunk, "usage") and chunk.usage:
-            self.usage = chunk.usage
+        """Process one chunk; returns ``(reasoning_delta, content_delta)``.
+
+        This runs for every streamed token, so each chunk is probed with as
+        few attribute lookups as possible and nothing is copied.
+        """
+        self.chunks += 1
+        usage = getattr(chunk, "usage", None)
+        if usage:
+            self.usage = usage
 
-        if not chunk.choices:
+        choices = chunk.choices
+        if not choices:
             _raise_chunk_error(chunk)
             return None, None
 
-        delta = chunk.choices[0].delta
+        delta = choices[0].delta
 
         # Reasoning / thinking content
         reasoning_delta = self._handle_reasoning_delta(delta)
@@ -215,8 +297,9 @@ class CompletionsAccumulator:
         in the assistant message of the next turn.
         """
         calls = []
-        for i in sorted(self.tool_calls):
-            tc = self.tool_calls[i]
+        tool_calls = self.tool_calls
+        for i in sorted(tool_calls):
+            tc = tool_calls[i]
             call = {
                 "id": tc["id"],
                 "type": "function",
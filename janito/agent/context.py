@@ -0,0 +1,537 @@
+"""Automatic conversation compaction near the model's context window.
+
+The stateless APIs re-send the whole conversation on every round, so a long
+session eventually outgrows ``max_input_tokens`` (and gets slower and more
+expensive well before that).  :class:`ContextCompactor` keeps the estimated
+prompt size under ``compact-threshold`` percent of the window by compacting
+the turns *before* the most recent ones, in increasing order of loss:
+
+1. drop stale reasoning (``reasoning_content`` / ``thought_parts``);
+2. elide large tool results (the call ids stay, so every tool call keeps its
+   result and the pairing the APIs require is intact);
+3. replace the older turns with a summary message pair.
+
+The recent turns (the current one included) are never modified, and turns
+are only cut at user-prompt boundaries, so a tool call is never separated
+from its result.  The compactor works in place on any of the history shapes
+the loops keep: OpenAI chat messages (CLI ``messages_history`` and web
+sessions), Anthropic content blocks (the native Anthropic CLI client) and
+Responses input items (stateless ``conversation_items``).
+
+Compacting shrinks the list, which moves every later index.  Callers that
+keep checkpoints into the history (``/rewind``, the web rollback) map them
+through :meth:`Compaction.shift` / :func:`shift_checkpoints`.  The CLI client
+records each :class:`Compaction` of a prompt here (:func:`record_compaction`
+/ :func:`pop_compactions`), the same way ``janito.tooling.used_files`` tracks
+the files of a prompt; the web loop emits a ``CompactionEvent`` instead.
+
+Right before sending, :func:`preflight_request` estimates the request as a
+whole (:func:`~janito.agent.tokens.estimate_request`, calibrated per provider
+family) and, when it would not fit the context window at all, trims it down
+to the current turn or refuses it with
+:class:`~janito.agent.tokens.PromptTooLargeError` instead of letting the API
+reject it after the upload.
+"""
+
+import logging
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .tokens import (
+    PromptEstimate,
+    PromptTooLargeError,
+    estimate_request,
+    estimate_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+#: Default compaction threshold, in percent of ``max_input_tokens``.
+DEFAULT_COMPACT_THRESHOLD = 80
+
+#: Number of most recent turns (the current one included) kept verbatim.
+DEFAULT_KEEP_TURNS = 2
+
+#: Tool results shorter than this (in characters) are not worth eliding.
+ELIDE_MIN_CHARS = 500
+
+#: First line of the summary message that replaces compacted turns.
+SUMMARY_PREFIX = "[Summary of the earlier conversation]"
+
+#: Assistant reply paired with the summary so user/assistant roles alternate.
+SUMMARY_ACK = "Understood. I will continue from this summary."
+
+_REASONING_KEYS = ("reasoning_content", "thought_parts")
+_THINKING_BLOCKS = ("thinking", "redacted_thinking")
+_TEXT_BLOCKS = ("text", "input_text", "output_text")
+
+
+@dataclass
+class Compaction:
+    """What one compaction pass changed.
+
+    ``items[start:end]`` of the original history was replaced by
+    ``inserted`` summary entries (``start == end`` when only reasoning and
+    tool results were trimmed in place).
+
+    Attributes:
+        start: First replaced index (after the leading system messages).
+        end: End (exclusive) of the replaced span in the original history.
+        inserted: Number of summary entries inserted at ``start``.
+        tokens_before: Estimated prompt tokens before compacting.
+        tokens_after: Estimated prompt tokens after compacting.
+        summarized_turns: Number of turns folded into the summary.
+        elided_results: Number of tool results elided.
+        dropped_reasoning: Number of reasoning fields/blocks dropped.
+    """
+
+    start: int
+    end: int
+    inserted: int
+    tokens_before: int
+    tokens_after: int
+    summarized_turns: int = 0
+    elided_results: int = 0
+    dropped_reasoning: int = 0
+
+    @property
+    def delta(self) -> int:
+        """Change in history length (negative when turns were summarized)."""
+        return self.inserted - (self.end - self.start)
+
+    def shift(self, index: int) -> int | None:
+        """Map an index of the original history onto the compacted one.
+
+        Returns ``None`` for indexes strictly inside the summarized span
+        (those positions no longer exist).
+        """
+        if index <= self.start:
+            return index
+        if index >= self.end:
+            return index + self.delta
+        return None
+
+    def describe(self) -> str:
+        """One-line human-readable description (CLI notice / logs)."""
+        parts = []
+        if self.summarized_turns:
+            parts.append(f"summarized {self.summarized_turns} turn(s)")
+        if self.elided_results:
+            parts.append(f"elided {self.elided_results} tool result(s)")
+        if self.dropped_reasoning:
+            parts.append(f"dropped {self.dropped_reasoning} reasoning block(s)")
+        return (
+            f"Context compacted: ~{self.tokens_before} -> ~{self.tokens_after} "
+            f"tokens ({', '.join(parts)})"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "inserted": self.inserted,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "summarized_turns": self.summarized_turns,
+            "elided_results": self.elided_results,
+            "dropped_reasoning": self.dropped_reasoning,
+        }
+
+
+def shift_checkpoints(checkpoints: list[int], compaction: Compaction) -> None:
+    """Remap history checkpoints in place after ``compaction``.
+
+    Checkpoints inside the summarized span are dropped: the turns they
+    marked were folded into the summary and can no longer be rewound to
+    individually.
+    """
+    shifted = [compaction.shift(cp) for cp in checkpoints]
+    checkpoints[:] = [cp for cp in shifted if cp is not None]
+
+
+# ---------------------------------------------------------------------------
+# Per-prompt record (CLI)
+# ---------------------------------------------------------------------------
+
+_compactions: list[Compaction] = []
+
+
+def record_compaction(compaction: Compaction) -> None:
+    """Record a compaction of the current prompt's history (CLI)."""
+    _compactions.append(compaction)
+
+
+def reset_compactions() -> None:
+    """Forget the compactions recorded for the previous prompt."""
+    _compactions.clear()
+
+
+def pop_compactions() -> list[Compaction]:
+    """Return and clear the compactions recorded since the last reset."""
+    recorded = list(_compactions)
+    _compactions.clear()
+    return recorded
+
+
+# ---------------------------------------------------------------------------
+# History shape helpers
+# ---------------------------------------------------------------------------
+
+
+def _is_system(item: dict) -> bool:
+    return item.get("role") in ("system", "developer")
+
+
+def _is_tool_result_block(block: Any) -> bool:
+    return isinstance(block, dict) and block.get("type") == "tool_result"
+
+
+def _is_turn_start(item: dict) -> bool:
+    """Whether ``item`` is a user prompt (not a tool-result carrier)."""
+    if item.get("role") != "user":
+        return False
+    if item.get("type") not in (None, "message"):
+        return False
+    content = item.get("content")
+    if isinstance(content, list) and any(_is_tool_result_block(b) for b in content):
+        return False
+    return True
+
+
+def _is_items_format(items: list[dict]) -> bool:
+    """Whether ``items`` are Responses input items (``type``-tagged)."""
+    return any("type" in item for item in items)
+
+
+def _text_of(item: dict) -> str:
+    """The plain text of a message (joined text blocks)."""
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            str(block.get("text") or "")
+            for block in content
+            if isinstance(block, dict) and block.get("type") in _TEXT_BLOCKS
+        )
+    return ""
+
+
+def _tool_names(item: dict) -> list[str]:
+    """Names of the tools called by an assistant message / item."""
+    if item.get("type") == "function_call":
+        return [item.get("name") or "?"]
+    names = [
+        (tc.get("function") or {}).get("name") or "?"
+        for tc in item.get("tool_calls") or []
+    ]
+    content = item.get("content")
+    if isinstance(content, list):
+        names.extend(
+            block.get("name") or "?"
+            for block in content
+            if isinstance(block, dict) and block.get("type") == "tool_use"
+        )
+    return names
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _elided(size: int) -> str:
+    return f"[tool output elided during context compaction: {size} characters]"
+
+
+def _elide_tool_results(item: dict) -> int:
+    """Elide large tool results in ``item`` in place; returns how many."""
+    if item.get("role") == "tool":
+        content = item.get("content")
+        if isinstance(content, str) and len(content) > ELIDE_MIN_CHARS:
+            item["content"] = _elided(len(content))
+            return 1
+        return 0
+    if item.get("type") == "function_call_output":
+        output = item.get("output")
+        if isinstance(output, str) and len(output) > ELIDE_MIN_CHARS:
+            item["output"] = _elided(len(output))
+            return 1
+        return 0
+    content = item.get("content")
+    if item.get("role") != "user" or not isinstance(content, list):
+        return 0
+    elided = 0
+    for index, block in enumerate(content):
+        if not _is_tool_result_block(block):
+            continue
+        size = len(str(block.get("content") or ""))
+        if size > ELIDE_MIN_CHARS:
+            content[index] = {**block, "content": _elided(size)}
+            elided += 1
+    return elided
+
+
+def _drop_reasoning(item: dict) -> int:
+    """Drop stale reasoning from an assistant message in place; returns how many."""
+    if item.get("role") != "assistant":
+        return 0
+    dropped = 0
+    for key in _REASONING_KEYS:
+        if item.pop(key, None) is not None:
+            dropped += 1
+    content = item.get("content")
+    if isinstance(content, list):
+        kept = [
+            b
+            for b in content
+            if not (isinstance(b, dict) and b.get("type") in _THINKING_BLOCKS)
+        ]
+        if kept and len(kept) != len(content):
+            dropped += len(content) - len(kept)
+            item["content"] = kept
+    return dropped
+
+
+def _split_turns(items: list[dict]) -> list[list[dict]]:
+    """Group history entries into turns (each starting at a user prompt)."""
+    turns: list[list[dict]] = []
+    for item in items:
+        if _is_turn_start(item) or not turns:
+            turns.append([item])
+        else:
+            turns[-1].append(item)
+    return turns
+
+
+def summarize_turns(items: list[dict]) -> str:
+    """Build an extractive summary of compacted turns.
+
+    Each turn is reduced to the user's prompt, the tools it used and the
+    assistant's final answer (clipped).  An earlier summary found in
+    ``items`` is carried over verbatim, so repeated compactions accumulate
+    instead of summarizing the summary.
+    """
+    lines = [SUMMARY_PREFIX]
+    for turn in _split_turns(items):
+        prompt = _text_of(turn[0]) if _is_turn_start(turn[0]) else ""
+        if prompt.startswith(SUMMARY_PREFIX):
+            lines.extend(prompt[len(SUMMARY_PREFIX) :].strip().splitlines())
+            continue
+        tools = Counter(name for item in turn for name in _tool_names(item))
+        answer = next(
+            (
+                _text_of(item)
+                for item in reversed(turn)
+                if item.get("role") == "assistant" and _text_of(item).strip()
+            ),
+            "",
+        )
+        if prompt:
+            lines.append(f"- User: {_clip(prompt, 300)}")
+        if tools:
+            used = ", ".join(
+                f"{name} x{count}" if count > 1 else name
+                for name, count in tools.items()
+            )
+            lines.append(f"  Tools used: {used}")
+        if answer:
+            lines.append(f"  Assistant: {_clip(answer, 500)}")
+    return "\n".join(lines)
+
+
+def _summary_entries(summary: str, items_format: bool) -> list[dict]:
+    """The user/assistant pair that replaces the compacted turns."""
+    if items_format:
+        return [
+            {
+                "type": "message",
+                "role": "user",
+                "content": [{"type": "input_text", "text": summary}],
+            },
+            {
+                "type": "message",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": SUMMARY_ACK}],
+            },
+        ]
+    return [
+        {"role": "user", "content": summary},
+        {"role": "assistant", "content": SUMMARY_ACK},
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Compactor
+# ---------------------------------------------------------------------------
+
+
+def load_compact_threshold() -> int:
+    """The ``compact-threshold`` config value (percent; ``0`` disables)."""
+    from janito.config_store import get_config_value
+
+    value = get_config_value("compact-threshold")
+    if value is None:
+        return DEFAULT_COMPACT_THRESHOLD
+    try:
+        return max(0, min(int(value), 100))
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid compact-threshold value: {value!r}")
+        return DEFAULT_COMPACT_THRESHOLD
+
+
+class ContextCompactor:
+    """Keep a conversation history under a share of the context window.
+
+    Args:
+        max_input_tokens: The model's context window; ``None`` (unknown)
+            disables compaction.
+        threshold: Percent of ``max_input_tokens`` above which the history
+            is compacted; ``None`` reads ``compact-threshold`` from the
+            config (``0`` disables compaction).
+        keep_turns: Number of most recent turns kept verbatim (at least 1,
+            the current turn).
+        summarizer: Builds the summary text from the compacted entries;
+            defaults to the extractive :func:`summarize_turns`.
+    """
+
+    def __init__(
+        self,
+        max_input_tokens: int | None,
+        threshold: int | None = None,
+        keep_turns: int = DEFAULT_KEEP_TURNS,
+        summarizer: Callable[[list[dict]], str] | None = None,
+    ):
+        self.max_input_tokens = max_input_tokens
+        self.threshold = load_compact_threshold() if threshold is None else threshold
+        self.keep_turns = max(1, keep_turns)
+        self.summarizer = summarizer or summarize_turns
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_input_tokens) and self.threshold > 0
+
+    @property
+    def budget(self) -> int:
+        """Prompt-size estimate above which the history is compacted."""
+        return int((self.max_input_tokens or 0) * self.threshold / 100)
+
+    def compact(
+        self, items: list[dict] | None, reserved_tokens: int = 0
+    ) -> Compaction | None:
+        """Compact ``items`` in place when the estimate exceeds the budget.
+
+        Args:
+            items: The conversation history (mutated in place).
+            reserved_tokens: Estimated tokens of the rest of the request
+                (tool schemas, a separate system prompt).
+
+        Returns:
+            The :class:`Compaction` applied, or ``None`` when nothing changed.
+        """
+        if not self.enabled or not items:
+            return None
+        before = reserved_tokens + estimate_tokens(items)
+        if before <= self.budget:
+            return None
+
+        head = 0
+        while head < len(items) and _is_system(items[head]):
+            head += 1
+        starts = [i for i in range(head, len(items)) if _is_turn_start(items[i])]
+        if len(starts) <= self.keep_turns:
+            return None
+        cut = starts[-self.keep_turns]
+
+        record = Compaction(
+            start=head, end=head, inserted=0, tokens_before=before, tokens_after=before
+        )
+        for item in items[head:cut]:
+            record.dropped_reasoning += _drop_reasoning(item)
+            record.elided_results += _elide_tool_results(item)
+        after = reserved_tokens + estimate_tokens(items)
+
+        if after > self.budget:
+            older = items[head:cut]
+            replacement = _summary_entries(
+                self.summarizer(older), _is_items_format(items)
+            )
+            items[head:cut] = replacement
+            record.end = cut
+            record.inserted = len(replacement)
+            record.summarized_turns = len(_split_turns(older))
+            after = reserved_tokens + estimate_tokens(items)
+
+        if not (
+            record.summarized_turns or record.elided_results or record.dropped_reasoning
+        ):
+            return None
+        record.tokens_after = after
+        if after > self.budget:
+            logger.warning(
+                f"History still ~{after} tokens after compaction "
+                f"(budget {self.budget}); the recent turns are kept intact"
+            )
+        logger.info(record.describe())
+        return record
+
+
+def preflight_request(
+    history: list[dict] | None,
+    tools: list[dict] | None,
+    system: Any,
+    max_input_tokens: int | None,
+    family: str | None = None,
+) -> tuple[PromptEstimate, Compaction | None]:
+    """Estimate a request before sending it; trim or refuse it if oversized.
+
+    When the calibrated estimate exceeds ``max_input_tokens`` every turn but
+    the current one is folded into the summary (regardless of
+    ``compact-threshold``).  If the request still does not fit -- e.g. the
+    current turn's tool results alone are too large -- it is refused.
+
+    Args:
+        history: The re-sent history (mutated in place when trimmed).
+        tools: The tool schemas offered to the model.
+        system: A system prompt sent outside the history, or ``None``.
+        max_input_tokens: The model's context window (``None``: no check).
+        family: The calibration family (see :func:`~.tokens.token_family`).
+
+    Returns:
+        ``(estimate, compaction)``: the estimate of the request as it will
+        be sent and the trimming applied (``None`` when nothing was trimmed).
+
+    Raises:
+        PromptTooLargeError: The request cannot fit the context window.
+    """
+    estimate = estimate_request(history, tools, system, family)
+    if not max_input_tokens or estimate.total <= max_input_tokens:
+        return estimate, None
+    reserved = estimate.raw_total - estimate_tokens(history)
+    trimmer = ContextCompactor(
+        int(max_input_tokens / estimate.ratio), threshold=100, keep_turns=1
+    )
+    compaction = trimmer.compact(history, reserved_tokens=max(reserved, 0))
+    if compaction is not None:
+        estimate = estimate_request(history, tools, system, family)
+    if estimate.total > max_input_tokens:
+        raise PromptTooLargeError(estimate, max_input_tokens)
+    return estimate, compaction
+
+
+__all__ = [
+    "DEFAULT_COMPACT_THRESHOLD",
+    "DEFAULT_KEEP_TURNS",
+    "SUMMARY_PREFIX",
+    "Compaction",
+    "ContextCompactor",
+    "load_compact_threshold",
+    "pop_compactions",
+    "preflight_request",
+    "record_compaction",
+    "reset_compactions",
+    "shift_checkpoints",
+    "summarize_turns",
+]
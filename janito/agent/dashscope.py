@@ -1,16 +1,16 @@
 """Shared native DashScope SDK adapter: kwargs + accumulation.
 
 The DashScope generation-API turn pipeline used to live in the web runner
-(``janito.web.backend.agent.dashscope``); the pure parts — call-kwargs
+(``janito.agent.pipeline.dashscope``); the pure parts — call-kwargs
 building and stream accumulation — moved here so both agent loops share
-them.  The web shim keeps the async glue (:func:`create_client`,
+them.  The pipeline runner keeps the async glue (:func:`create_client`,
 :func:`_dashscope_chunks` and :func:`stream_turn_events`), which consumes
 the **sync** DashScope SDK stream chunk-by-chunk through
 ``asyncio.to_thread``.
 
 The ``dashscope`` package is **optional** (see
 ``janito.providers.REQUIRES_BY_API_TYPE``); importing it happens lazily
-inside :func:`create_client` (kept in the web shim), so importing this
+inside :func:`create_client` (kept in the pipeline runner), so importing this
 module never requires it.
 
 **Conversation model.** The DashScope generation API is stateless and accepts
@@ -101,7 +101,7 @@ class DashScopeTurnAccumulator:
     def __init__(self) -> None:
         self.content: list[str] = []
         self.reasoning: list[str] = []
-        self.tool_calls: dict[int, dict[str, str]] = {}
+        self.tool_calls: dict[int, dict] = {}
         self.input_tokens: int | None = None
         self.output_tokens: int | None = None
         self.total_tokens: int | None = None
@@ -152,15 +152,21 @@ class DashScopeTurnAccumulator:
     def _handle_tool_call(self, tc) -> None:
         """Merge one DashScope tool-call chunk into the per-index map."""
         idx = _get(tc, "index", 0) or 0
-        entry = self.tool_calls.setdefault(idx, {"id": "", "name": "", "arguments": ""})
-        if _get(tc, "id"):
-            entry["id"] = _get(tc, "id")
+        entry = self.tool_calls.get(idx)
+        if entry is None:
+            # ``arguments`` collects the streamed fragments (joined once, in
+            # tool_calls_list) instead of re-copying a growing string.
+            entry = self.tool_calls[idx] = {"id": "", "name": "", "arguments": []}
+        call_id = _get(tc, "id")
+        if call_id:
+            entry["id"] = call_id
         function = _get(tc, "function") or {}
-        if _get(function, "name"):
-            entry["name"] = _get(function, "name")
+        name = _get(function, "name")
+        if name:
+            entry["name"] = name
         arguments = _get(function, "arguments")
         if arguments:
-            entry["arguments"] += arguments
+            entry["arguments"].append(arguments)
 
     def _consume_usage(self, chunk) -> None:
         """Keep the most recent usage reported by the API."""
@@ -205,7 +211,7 @@ class DashScopeTurnAccumulator:
                 "type": "function",
                 "function": {
                     "name": self.tool_calls[idx]["name"],
-                    "arguments": self.tool_calls[idx]["arguments"] or "{}",
+                    "arguments": "".join(self.tool_calls[idx]["arguments"]) or "{}",
                 },
             }
             for idx in sorted(self.tool_calls)
@@ -108,6 +108,7 @@ class ToolProgressEvent:
     tool_call_id: str
     level: str  # "start"|"progress"|"output"|"diff"|"result"|"error"|"warning"|"info"
     message: str  # "output" = raw subprocess stdout/stderr (monospace in UI)
+    end: str = "\n"  # the report's line ending (CLI rendering; not sent)
 
     type: ClassVar[str] = "tool_progress"
 
@@ -141,6 +142,8 @@ class UsageEvent:
     output: int = 0
     cached: int = 0
     max_tokens: int | None = None
+    cache_write: int = 0
+    queue_ms: int = 0  # Time spent waiting for the client-side rate limiter.
 
     type: ClassVar[str] = "usage"
 
@@ -154,9 +157,42 @@ class UsageEvent:
         }
         if self.max_tokens is not None:
             d["max_tokens"] = self.max_tokens
+        if self.cache_write:
+            d["cache_write"] = self.cache_write
+        if self.queue_ms:
+            d["queue_ms"] = self.queue_ms
         return d
 
 
+@dataclass
+class CompactionEvent:
+    """The history was compacted before the next API round.
+
+    Carries the :class:`~janito.agent.context.Compaction` span so the
+    session owner can remap its history checkpoints (see
+    :func:`~janito.agent.context.shift_checkpoints`).
+    """
+
+    start: int
+    end: int
+    inserted: int
+    tokens_before: int
+    tokens_after: int
+    summarized_turns: int = 0
+    elided_results: int = 0
+
+    type: ClassVar[str] = "compaction"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "type": self.type,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "summarized_turns": self.summarized_turns,
+            "elided_results": self.elided_results,
+        }
+
+
 @dataclass
 class ImageEvent:
     """A native Responses API image_generation_call result.
@@ -217,6 +253,7 @@ AgentEvent = (
     | WaitingEvent
     | ToolProgressEvent
     | ImageEvent
+    | CompactionEvent
     | UsageEvent
     | DoneEvent
     | ErrorEvent
@@ -2,14 +2,14 @@
 
 The native Gemini ``generateContent`` turn pipeline used to be CLI-only; the
 pure parts -- call-kwargs building, history conversion and stream
-accumulation -- live here so both agent loops share them.  The web shim
-(``janito.web.backend.agent.gemini``) keeps the async glue
+accumulation -- live here so both agent loops share them.  The pipeline runner
+(``janito.agent.pipeline.gemini``) keeps the async glue
 (:func:`create_client` and :func:`stream_turn_events`), which consumes the
 **sync** ``google-genai`` stream chunk-by-chunk through ``asyncio.to_thread``.
 
 The ``google-genai`` package is **optional** (see
 ``janito.providers.REQUIRES_BY_API_TYPE``); importing it happens lazily
-inside :func:`create_client` (kept in the web shim), so importing this
+inside :func:`create_client` (kept in the pipeline runner), so importing this
 module never requires it.
 
 **Conversation model.** The ``generateContent`` API is stateless, so every
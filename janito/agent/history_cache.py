@@ -0,0 +1,133 @@
+"""Incremental conversion of the portable chat history to a native format.
+
+The native Anthropic and Gemini APIs are stateless, so every round re-sends
+the full history, and the session stores it in the portable OpenAI chat
+format.  Converting all of it on every round (:func:`janito.agent.anthropic._to_anthropic`,
+:func:`janito.gemini_helpers._messages_to_contents`) re-does O(n) work and
+re-allocates every converted message per round -- O(n²) over a session with
+hundreds of messages and large tool results.
+
+A conversation's history only grows between rounds, except on ``/rewind``
+(truncated), ``/restart`` (cleared or replaced) and compaction (messages
+replaced or stubbed).  :class:`ConvertedHistory` therefore converts each
+message once, with an append-only *step* function, and keeps:
+
+- the messages it converted, each with the ``content`` it had; the cached
+  prefix is the longest run of messages that are still the same objects
+  (``is``) with the same content (the same object, or an equal one: the web
+  sessions swap large tool results for blob references between turns and
+  put an equal string back for the next), so an in-place edit of a
+  message's content, a replaced message or a truncated list all invalidate
+  exactly the messages from the first difference on;
+- the converted length after each message, plus that moment's last
+  converted entry, so the cache rolls back to any prefix even when a step
+  merged a message into the previous converted entry (the Anthropic step
+  folds consecutive tool results into one ``user`` message).
+
+Step functions never mutate an entry they already appended; they replace
+it.  Converted entries are shared across rounds, so the payload builders
+that mark entries (prompt-cache breakpoints) copy them, as they already do.
+
+:func:`converted_history` keeps one cache per conversation (per history
+list object and format) for the few most recent conversations, shared by
+the CLI clients and the web runners.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+#: Appends the native form of one message to the converted list (in place).
+Step = Callable[[list[Any], dict], None]
+
+#: Conversations whose converted history is kept (least recently used first
+#: out).  Each cache holds a reference to its history list.
+MAX_CONVERSATIONS = 16
+
+
+class ConvertedHistory:
+    """One conversation's history, converted message by message."""
+
+    def __init__(self, step: Step) -> None:
+        self._step = step
+        self._sources: list[tuple[dict, Any]] = []  # (message, its content)
+        self._converted: list[Any] = []
+        self._ends: list[int] = []  # len(_converted) after each message
+        self._lasts: list[Any] = []  # _converted[-1] after each message
+
+    def convert(self, messages: list[dict]) -> list[Any]:
+        """Convert ``messages``, reusing the still-valid cached prefix.
+
+        Returns:
+            A new list of the converted entries (the entries themselves are
+            shared with the cache and must not be mutated).
+        """
+        self._truncate(self._valid_prefix(messages))
+        for message in messages[len(self._sources) :]:
+            self._step(self._converted, message)
+            self._sources.append((message, message.get("content")))
+            self._ends.append(len(self._converted))
+            self._lasts.append(self._converted[-1] if self._converted else None)
+        return list(self._converted)
+
+    def _valid_prefix(self, messages: list[dict]) -> int:
+        """Number of leading messages whose cached conversion still holds."""
+        count = min(len(messages), len(self._sources))
+        for index in range(count):
+            source, content = self._sources[index]
+            message = messages[index]
+            current = message.get("content")
+            if message is not source or (current is not content and current != content):
+                return index
+            # Equal but rehydrated: compare by identity again next round.
+            self._sources[index] = (source, current)
+        return count
+
+    def _truncate(self, keep: int) -> None:
+        """Roll the cache back to its state after the first ``keep`` messages."""
+        if keep == len(self._sources):
+            return
+        del self._sources[keep:]
+        del self._ends[keep:]
+        del self._lasts[keep:]
+        if keep == 0:
+            self._converted = []
+            return
+        self._converted = self._converted[: self._ends[-1]]
+        if self._converted:
+            self._converted[-1] = self._lasts[-1]
+
+
+_caches: "OrderedDict[tuple[int, str], tuple[list, ConvertedHistory]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def converted_history(messages: list[dict], step: Step, kind: str) -> list[Any]:
+    """Convert a conversation's history with its cached :class:`ConvertedHistory`.
+
+    Args:
+        messages: The conversation's history (the caller-owned list; the
+            cache is keyed by its identity).
+        step: The format's step function (see :data:`Step`).
+        kind: The format's name, so one history can be cached in several.
+
+    Returns:
+        The converted history, as ``ConvertedHistory.convert`` returns it.
+    """
+    key = (id(messages), kind)
+    with _lock:
+        entry = _caches.get(key)
+        if entry is None or entry[0] is not messages:
+            entry = (messages, ConvertedHistory(step))
+        _caches[key] = entry
+        _caches.move_to_end(key)
+        while len(_caches) > MAX_CONVERSATIONS:
+            _caches.popitem(last=False)
+        return entry[1].convert(messages)
+
+
+def clear_converted_histories() -> None:
+    """Drop every cached conversion."""
+    with _lock:
+        _caches.clear()
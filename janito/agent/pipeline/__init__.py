@@ -0,0 +1,169 @@
+"""The native asyncio agent pipeline shared by the CLI and web interfaces.
+
+The CLI ``Client.send`` template method is synchronous: the stream is
+consumed in a worker thread under a spinner and tools run inline.  This
+package runs the same turn pipeline natively on an event loop — async SDK
+clients, tools dispatched off the loop (``asyncio.to_thread``) and
+cancellation by cancelling the task that drives it — and yields
+:mod:`~janito.agent.events` instead of printing:
+
+- :class:`PipelineConfig` — the settings the pipeline reads for a prompt
+  (provider, model, API type, thinking, tools).  The web's
+  ``WebServerConfig`` extends it with its server fields; the CLI builds
+  one from its flags.
+- :func:`run_prompt` — the pipeline entry point: an async generator of
+  agent events for one prompt, mutating the caller-owned history.
+
+Modules:
+  - :mod:`~.loop`       — ``stream_prompt()``, the orchestration skeleton
+                          dispatching to the API type of the provider.
+  - :mod:`~.turn`       — the tool-call leg of one agentic turn (as events).
+  - :mod:`~.tooling`    — tool discovery (built-in + MCP) and execution.
+  - :mod:`~.budget`     — history compaction and pre-flight size checks.
+  - :mod:`~.routing`    — endpoint-pool failover between SDK clients.
+  - :mod:`~.responses`, :mod:`~.anthropic`, :mod:`~.dashscope`,
+    :mod:`~.gemini`     — the async runners of the non-Completions API types.
+
+The web chat (``janito.web.backend.agent``) drives the loop for its
+sessions; the CLI renders the events in the terminal
+(``janito.cli.async_send``) when ``async-pipeline`` is enabled, and the
+synchronous ``Client.send`` stays its default.  Cancellation is task
+cancellation (the web cancel button, Ctrl+C or Enter in the CLI).  The
+submodules are imported lazily: importing this package only loads the
+config dataclass.
+"""
+
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+
+from ..events import AgentEvent
+
+
+@dataclass
+class PipelineConfig:
+    """The settings :func:`run_prompt` reads for one prompt.
+
+    Attributes:
+        provider: The ``--provider`` (``None`` = the persisted default).
+        model: The ``--model`` (``None`` = the provider's configured model,
+            else its built-in default).
+        api_type: The ``--api-type`` (``None`` = the provider's configured
+            api-type, else its built-in default).
+        session_provider: A session-only provider override (web chat-page
+            combo); wins over ``provider`` and is never persisted.
+        thinking: The ``--thinking`` flag.
+        thinking_override: A runtime thinking override (web status-bar
+            toggle); ``None`` = follow ``thinking`` / the provider default.
+        reasoning_level: The ``--reasoning-level`` (``None`` = the
+            model-scoped config value, else the model's built-in default).
+        verbose: Log the resolved backend of every prompt.
+        no_tools: Offer no tools to the model.
+    """
+
+    provider: str | None = None
+    model: str | None = None
+    api_type: str | None = None
+    session_provider: str | None = None
+    thinking: bool = False
+    thinking_override: bool | None = None
+    reasoning_level: str | None = None
+    verbose: bool = False
+    no_tools: bool = False
+
+    @property
+    def effective_provider(self) -> str | None:
+        """The provider in effect for the next prompt.
+
+        Resolution order mirrors :attr:`effective_thinking`: the session-only
+        combo override, then the CLI ``--provider``, then the persisted
+        default provider.
+        """
+        from janito.general_config import get_active_provider
+
+        return self.session_provider or self.provider or get_active_provider()
+
+    @property
+    def effective_thinking(self):
+        """The thinking mode in effect for the next prompt.
+
+        Resolution order: the runtime ``thinking_override`` (status-bar
+        toggle) first, then the explicit ``--thinking`` CLI flag, then the
+        effective provider's built-in ``thinking`` resolved for the
+        **effective model** (``self.model``: the CLI ``--model``, else the
+        provider's configured model, else its built-in default model).  The
+        value may be a plain ``True`` flag (DeepSeek / Alibaba-Qwen, which
+        reason by default) or a pass-through dict for providers with a
+        structured thinking parameter (MiniMax-M3: ``{'type':
+        'adaptive'}``); falsy means thinking is off.  The effective provider
+        is the session-only combo override, else the CLI ``--provider``,
+        else the persisted default.
+        """
+        if self.thinking_override is not None:
+            return self.thinking_override
+        if self.thinking:
+            return True
+        from janito.provider_accessors import get_default_thinking_from_provider
+
+        return get_default_thinking_from_provider(self.effective_provider, self.model)
+
+    def effective_tools_for(self, api_type: str):
+        """The effective model's built-in (native) tools for an API type.
+
+        Resolution order mirrors :attr:`effective_thinking`: the effective
+        provider (session-only combo override, else the CLI ``--provider``,
+        else the persisted default) resolved for the **effective model**
+        (``self.model``: the CLI ``--model``, else the provider's configured
+        model, else its built-in default model).  Returns the model's
+        built-in ``tools`` entry for ``api_type`` from the provider config
+        (e.g. alibaba's ``qwen3.8-max`` enables ``code_interpreter`` /
+        ``web_search`` / ``web_extractor`` on the Responses API only), or
+        ``None`` when the model declares no built-in tools for that API
+        type.  These are not function tools: each ``type`` is enabled
+        through request-body flags on the API call.
+        """
+        from janito.provider_accessors import get_default_tools_from_provider
+
+        return get_default_tools_from_provider(
+            self.effective_provider, self.model, api_type=api_type
+        )
+
+
+def run_prompt(
+    prompt: str,
+    messages: list[dict],
+    config: PipelineConfig,
+    tools: list[dict] | None = None,
+    use_mcp: bool = True,
+) -> AsyncGenerator[AgentEvent, None]:
+    """Run one prompt through the async pipeline, yielding agent events.
+
+    Args:
+        prompt: The user prompt to send.
+        messages: Caller-owned conversation history (mutated in place; a
+            leading system message is the system prompt).
+        config: The prompt's settings.
+        tools: Explicit tool schemas (``None`` = auto-discover unless
+            ``config.no_tools``).
+        use_mcp: Whether MCP tools are loaded and executed.
+
+    Returns:
+        An async generator ending with a ``DoneEvent`` (or an
+        ``ErrorEvent``).  Cancelling the task that iterates it cancels the
+        prompt; the caller restores ``messages`` to its pre-prompt length.
+    """
+    from .loop import stream_prompt
+
+    return stream_prompt(prompt, messages, config, tools=tools, use_mcp=use_mcp)
+
+
+def load_async_pipeline_enabled() -> bool:
+    """The ``async-pipeline`` config value (disabled by default)."""
+    from janito.config_store import get_config_value
+
+    value = get_config_value("async-pipeline")
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes", "on")
+    return bool(value)
+
+
+__all__ = ["PipelineConfig", "load_async_pipeline_enabled", "run_prompt"]
@@ -1,11 +1,11 @@
-"""Native Anthropic SDK runner for the web agentic loop.
+"""Native Anthropic SDK runner for the async agent pipeline.
 
 The per-API adapter (call-kwargs building, history conversion, stream
 accumulation) lives in :mod:`janito.agent.anthropic` — the shared adapter
-layer used by both agent loops.  This module keeps the web-only glue:
+layer used by both agent loops.  This module keeps the async glue:
 :func:`create_client` (async Anthropic SDK client, lazily importing the
 optional ``anthropic`` package) and :func:`stream_turn_events` (which
-drives the stream and yields reasoning/token events to the browser).
+drives the stream and yields reasoning/token events to the caller).
 """
 
 import importlib.util
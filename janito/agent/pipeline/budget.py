@@ -0,0 +1,130 @@
+"""Context-window budgeting for the agent pipeline (compaction + pre-flight).
+
+The async counterpart of the CLI ``Client`` hooks ``_compact_context`` /
+``_preflight``: before every round the session history is compacted when it
+nears ``compact-threshold`` percent of the context window
+(:class:`~janito.agent.context.ContextCompactor`), then the request is
+estimated as a whole and trimmed or refused when it cannot fit
+(:func:`~janito.agent.context.preflight_request`).  After the round the
+reported input tokens calibrate the estimator for the provider family.
+
+The budget also queues each round behind the provider's client-side rate
+limiter (:mod:`janito.agent.ratelimit`), reserving the estimated input and
+settling the reservation with the tokens the round actually used.
+"""
+
+import logging
+
+from janito.agent.context import Compaction, ContextCompactor, preflight_request
+from janito.agent.tokens import (
+    PromptTooLargeError,
+    estimate_tokens,
+    observe_usage,
+    token_family,
+)
+from janito.agent.usage import PROMPT_USAGE_COUNTERS, add_prompt_usage, add_queue_wait
+from janito.config_loaders import load_max_input_tokens
+from janito.provider_accessors import get_default_max_input_tokens_from_provider
+
+from ..events import AgentEvent, CompactionEvent, ErrorEvent
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_max_input_tokens(provider, model) -> int | None:
+    """The context window used to budget the history."""
+    max_input_tokens = load_max_input_tokens(provider, model)
+    if max_input_tokens is None:
+        max_input_tokens = get_default_max_input_tokens_from_provider(provider, model)
+    return max_input_tokens
+
+
+def compaction_event(compaction: Compaction) -> CompactionEvent:
+    """The wire event for a compaction (lets the caller remap checkpoints)."""
+    return CompactionEvent(
+        start=compaction.start,
+        end=compaction.end,
+        inserted=compaction.inserted,
+        tokens_before=compaction.tokens_before,
+        tokens_after=compaction.tokens_after,
+        summarized_turns=compaction.summarized_turns,
+        elided_results=compaction.elided_results,
+    )
+
+
+class ContextBudget:
+    """Per-prompt compaction, pre-flight estimate and calibration.
+
+    Args:
+        provider: The effective provider (also the calibration family).
+        model: The effective model (selects the context window).
+        tools_schemas: The tool schemas offered on every round.
+    """
+
+    def __init__(self, provider, model, tools_schemas):
+        self.max_input_tokens = resolve_max_input_tokens(provider, model)
+        self.family = token_family(provider)
+        self.tools_schemas = tools_schemas
+        self.compactor = ContextCompactor(self.max_input_tokens)
+        self.reserved_tokens = estimate_tokens(tools_schemas)
+        self.estimate = None
+        self.refused = False
+        self.limiter = None
+        self.reserved = 0
+        self.queue_ms = 0
+
+    def prepare(self, messages: list[dict]) -> list[AgentEvent]:
+        """Compact / trim ``messages`` in place before a round.
+
+        Returns the events to forward: one :class:`CompactionEvent` per
+        change, or an :class:`ErrorEvent` when the request cannot fit (then
+        :attr:`refused` is set and the round must not be sent).
+        """
+        events: list[AgentEvent] = []
+        compaction = self.compactor.compact(
+            messages, reserved_tokens=self.reserved_tokens
+        )
+        if compaction is not None:
+            events.append(compaction_event(compaction))
+        try:
+            self.estimate, trimmed = preflight_request(
+                messages, self.tools_schemas, None, self.max_input_tokens, self.family
+            )
+        except PromptTooLargeError as e:
+            self.refused = True
+            events.append(ErrorEvent(message=str(e)))
+            return events
+        if trimmed is not None:
+            events.append(compaction_event(trimmed))
+        logger.debug(f"Request estimate: {self.estimate.describe()}")
+        return events
+
+    async def wait_for_rate_limit(self, limiter) -> None:
+        """Wait (without blocking the loop) for the round's slot on ``limiter``."""
+        self.limiter = limiter
+        self.reserved = self.estimate.total if self.estimate is not None else 0
+        waited = await self.limiter.acquire_async(self.reserved)
+        if waited > 0:
+            self.queue_ms += round(waited * 1000)
+            add_queue_wait(waited)
+
+    def release_reservation(self) -> None:
+        """Give the token reservation of a failed attempt back to its limiter."""
+        if self.limiter is not None:
+            self.limiter.settle(self.reserved, 0)
+
+    def observe(self, acc) -> None:
+        """Calibrate the estimator from the round's reported usage.
+
+        The round's usage is also added to the prompt's summed usage (read by
+        the batch runner when the CLI drives this pipeline) and settles the
+        rate limiter's token reservation.
+        """
+        usage = acc.usage_event()
+        if usage is not None:
+            add_prompt_usage(
+                {key: getattr(usage, key) for key in PROMPT_USAGE_COUNTERS}
+            )
+            if self.limiter is not None:
+                self.limiter.settle(self.reserved, usage.input + usage.output)
+        observe_usage(self.estimate, usage.input if usage else None)
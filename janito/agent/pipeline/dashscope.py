@@ -1,8 +1,8 @@
-"""Native DashScope SDK runner for the web agentic loop.
+"""Native DashScope SDK runner for the async agent pipeline.
 
 The per-API adapter (call-kwargs building, stream accumulation) lives in
 :mod:`janito.agent.dashscope` — the shared adapter layer used by both agent
-loops.  This module keeps the web-only glue: :func:`create_client`
+loops.  This module keeps the async glue: :func:`create_client`
 (prepares the sync DashScope SDK), :func:`_dashscope_chunks` (consumes the
 sync stream chunk-by-chunk through ``asyncio.to_thread``, retrying once on
 a model/endpoint mismatch) and :func:`stream_turn_events`.
@@ -1,8 +1,8 @@
-"""Native Gemini SDK runner for the web agentic loop.
+"""Native Gemini SDK runner for the async agent pipeline.
 
 The per-API adapter (call-kwargs building, stream accumulation) lives in
 :mod:`janito.agent.gemini` -- the shared adapter layer used by both agent
-loops.  This module keeps the web-only glue: :func:`create_client`
+loops.  This module keeps the async glue: :func:`create_client`
 (prepares the sync ``google-genai`` client, guarding the optional package)
 and :func:`stream_turn_events` (consumes the sync stream chunk-by-chunk
 through ``asyncio.to_thread``).
@@ -0,0 +1,468 @@
+"""``stream_prompt()`` — the orchestration skeleton of the agentic loop.
+
+Everything heavy lives in sibling modules; this generator reads top to
+bottom: resolve config -> resolve API type -> resolve tools -> loop { compact
+the history if needed; stream a response; either run tool calls and continue,
+or finish }.
+
+The loop is API-type agnostic.  The API type for the turn is resolved for the
+*effective provider* (the one selected for the session/provider combo) via
+``resolve_api_type`` — ``--api-type`` first, then the provider's configured
+``api-type`` (written by the web Settings drawer), then the provider's
+built-in default.  Each API type contributes a small runner (client factory,
+call-kwargs builder, accumulator, stream driver) exposing the same interface:
+
+- Completions  -> ``janito.agent.completions`` (this module's built-in)
+- Responses    -> ``janito.agent.pipeline.responses``
+- Anthropic    -> ``janito.agent.pipeline.anthropic``
+- DashScope    -> ``janito.agent.pipeline.dashscope``
+- Gemini       -> ``janito.agent.pipeline.gemini``
+
+Both interfaces drive it: ``janito.agent.pipeline.run_prompt`` for the CLI
+(``async-pipeline``, events rendered in the terminal) and
+``janito.web.backend.agent.loop.stream_prompt`` for the web, which only
+adds the rehydration of the session's out-of-line tool payloads.
+"""
+
+import inspect
+import itertools
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+
+from janito.agent.routing import Route, resolve_route
+from janito.agent.superseded import superseded_history
+from janito.agent.tokens import flush_calibration
+from janito.agent.tracing import span, start_trace, trace_rows
+from janito.config_loaders import load_max_output_tokens, load_reasoning_level
+from janito.config_store import get_config_value
+from janito.general_config import get_active_provider, resolve_api_type
+from janito.openai_client.completions_api import resolve_runtime_config
+from janito.provider_accessors import (
+    get_default_max_output_tokens_from_provider,
+    get_default_reasoning_level_from_provider,
+)
+from janito.tooling.tool_selection import ToolSelection, select_tools
+
+from ..completions import CompletionsAccumulator, build_call_kwargs
+from ..events import (
+    AgentEvent,
+    DoneEvent,
+    ErrorEvent,
+    ReasoningEvent,
+    TokenEvent,
+    WaitingEvent,
+)
+from . import PipelineConfig
+from . import anthropic as anthropic_runner
+from . import dashscope as dashscope_runner
+from . import gemini as gemini_runner
+from . import responses as responses_runner
+from .budget import ContextBudget
+from .routing import RoutedClients
+from .tooling import reset_used_files, resolve_tools
+from .turn import run_tool_turn
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve_turn_config(config, effective_provider, model):
+    """Resolve max tokens / preserve_thinking / reasoning level for the turn.
+
+    The max-tokens and reasoning-level defaults are resolved for the
+    **effective model** (the one returned by ``resolve_runtime_config``):
+    a model-scoped config override wins, then the model's built-in default
+    from the provider config (falling back to the default model's entry for
+    models without a built-in entry).
+    """
+    max_output_tokens = load_max_output_tokens(effective_provider, model)
+    if max_output_tokens is None:
+        # Fall back to the provider's built-in default (from the provider
+        # config).
+        max_output_tokens = get_default_max_output_tokens_from_provider(
+            effective_provider, model
+        )
+    preserve_thinking = get_config_value("preserve_thinking")
+
+    # Reasoning level (reasoning_effort): --reasoning-level first (CLI), then
+    # the model-scoped config value, then the model's built-in default (e.g.
+    # "xhigh" for qwen3.8-max).
+    reasoning_level = config.reasoning_level or load_reasoning_level(
+        effective_provider, model
+    )
+    if reasoning_level is None:
+        reasoning_level = get_default_reasoning_level_from_provider(
+            effective_provider, model
+        )
+
+    return max_output_tokens, preserve_thinking, reasoning_level
+
+
+def _log_backend(config, base_url, model, api_type) -> None:
+    """Log the resolved backend for the turn (``--verbose`` only)."""
+    if config.verbose:
+        backend = base_url if base_url else "api.openai.com"
+        logger.info(
+            f"Agent pipeline: model={model} backend={backend} api_type={api_type}"
+        )
+
+
+def _runner_for(api_type: str):
+    """Return the pipeline runner module for a non-Completions API type.
+
+    ``None`` means the built-in Completions path (:mod:`janito.agent.completions`) applies.
+    """
+    if api_type == "Responses":
+        return responses_runner
+    if api_type == "Anthropic":
+        return anthropic_runner
+    if api_type == "DashScope":
+        return dashscope_runner
+    if api_type == "Gemini":
+        return gemini_runner
+    return None
+
+
+def _build_turn_kwargs(
+    model,
+    config,
+    tools_schemas,
+    messages,
+    max_output_tokens,
+    preserve_thinking,
+    reasoning_level,
+) -> dict:
+    """Build the ``chat.completions.create`` kwargs for one turn."""
+    call_kwargs = build_call_kwargs(
+        model,
+        config,
+        max_output_tokens,
+        preserve_thinking,
+        reasoning_level,
+    )
+    call_kwargs["messages"] = messages
+    if tools_schemas:
+        call_kwargs["tools"] = tools_schemas
+        call_kwargs["tool_choice"] = "auto"
+    return call_kwargs
+
+
+def _build_assistant_message(acc: CompletionsAccumulator, full_content: str) -> dict:
+    """Build the assistant message dict from the accumulated turn."""
+    assistant_message = {"role": "assistant", "content": full_content}
+    reasoning_content = acc.reasoning_content()
+    if reasoning_content:
+        assistant_message["reasoning_content"] = reasoning_content
+    # Native Gemini turns: keep the model's raw thought blocks (text +
+    # signature) so stateless follow-up turns can resend them verbatim
+    # (Gemini 3.x requires this for reasoning continuity).  Only the Gemini
+    # accumulator exposes ``thought_parts``; other runners never set it.
+    thought_parts = getattr(acc, "thought_parts", None) or []
+    if thought_parts:
+        assistant_message["thought_parts"] = thought_parts
+    # Native Responses-API image generation (image_generation tool): attach
+    # the saved image paths so the frontend can rebuild the content cards
+    # when the session history is reloaded.  Completions runners never set
+    # ``image_results``, so getattr keeps this a no-op for them.
+    image_results = getattr(acc, "image_results", None) or []
+    if image_results:
+        assistant_message["images"] = [
+            {"path": img["path"], "revised_prompt": img.get("revised_prompt", "")}
+            for img in image_results
+        ]
+    return assistant_message
+
+
+def _create_agent_client(runner, base_url, api_key):
+    """Create the SDK client for the API type (Completions is built-in)."""
+    if runner is None:
+        from openai import AsyncOpenAI  # only loaded for Completions
+
+        return AsyncOpenAI(api_key=api_key, base_url=base_url)
+    return runner.create_client(base_url, api_key)
+
+
+async def _close_client(client) -> None:
+    """Close an async SDK client (sync-only clients are left to the GC)."""
+    close = getattr(client, "close", None)
+    if inspect.iscoroutinefunction(close):
+        await close()
+
+
+def _resolve_route(config, effective_provider, api_type) -> tuple[str, str, Route]:
+    """Resolve the endpoint/model for the turn and its endpoint-pool route.
+
+    The other members of the provider's ``pool`` are resolved the same way
+    (see :mod:`janito.agent.routing`).
+
+    Returns ``(base_url, model, route)``; raises on a configuration error.
+    """
+    # Endpoint resolution honors the API type: providers with an
+    # ``endpoint_by_api_type`` map get their per-type base URL (e.g.
+    # DeepSeek's Anthropic-compatible URL, Alibaba's native-SDK URL).
+    base_url, api_key, model = resolve_runtime_config(
+        cli_model=config.model,
+        cli_provider=effective_provider,
+        cli_api_type=api_type,
+    )
+
+    def resolve_member(member):
+        return resolve_runtime_config(
+            cli_model=config.model, cli_provider=member, cli_api_type=api_type
+        )[:2]
+
+    route = resolve_route(effective_provider, (base_url, api_key), resolve_member)
+    return base_url, model, route
+
+
+def _turn_call_kwargs(
+    runner,
+    model,
+    config,
+    tools_schemas,
+    messages,
+    max_output_tokens,
+    preserve_thinking,
+    reasoning_level,
+):
+    """Build the per-type call kwargs for one turn."""
+    if runner is None:
+        return _build_turn_kwargs(
+            model,
+            config,
+            tools_schemas,
+            messages,
+            max_output_tokens,
+            preserve_thinking,
+            reasoning_level,
+        )
+    return runner.build_call_kwargs(
+        model,
+        messages,
+        tools_schemas,
+        config,
+        max_output_tokens,
+        preserve_thinking,
+        reasoning_level,
+    )
+
+
+def _new_accumulator(runner):
+    """A fresh stream accumulator for one attempt of a turn."""
+    return CompletionsAccumulator() if runner is None else runner.accumulator()
+
+
+async def _stream_turn(client, runner, call_kwargs, acc):
+    """Stream one API turn, yielding reasoning/token events.
+
+    The caller owns ``acc``; on completion it holds the full turn state for
+    end-of-turn assembly.
+    """
+    if runner is None:
+        stream = await client.chat.completions.create(**call_kwargs)
+        async for chunk in stream:
+            reasoning_delta, content_delta = acc.handle(chunk)
+            if reasoning_delta:
+                yield ReasoningEvent(content=reasoning_delta)
+            if content_delta:
+                yield TokenEvent(content=content_delta)
+        return
+    async for ev in runner.stream_turn_events(client, call_kwargs, acc):
+        yield ev
+
+
+def _log_trace(config, trace) -> None:
+    """Log the timed phases of the prompt (``--verbose`` only)."""
+    if getattr(config, "verbose", False):
+        lines = [
+            f"{phase:<24} {duration:>12}  {details}"
+            for phase, duration, details in trace_rows(trace)
+        ]
+        logger.info("Agent pipeline timings:\n" + "\n".join(lines))
+
+
+async def stream_prompt(
+    prompt: str,
+    messages: list[dict],
+    config: PipelineConfig,
+    tools: list[dict] | None = None,
+    use_mcp: bool = True,
+) -> AsyncGenerator[AgentEvent, None]:
+    """Yield structured events instead of printing to terminal.
+
+    Every phase of the prompt is timed (see :mod:`janito.agent.tracing`);
+    the trace is kept for ``/status`` and logged in verbose mode.
+
+    Args:
+        prompt: The user prompt to send.
+        messages: Caller-owned conversation history (mutated in place).
+        config: Runtime config from CLI args.
+        tools: Optional explicit tool schemas. ``None`` = auto-discover
+               (unless ``config.no_tools``).
+        use_mcp: If True, load and use MCP tools.
+    """
+    with start_trace(api_type=config.api_type) as root:
+        async with aclosing(
+            _stream_prompt(prompt, messages, config, tools, use_mcp)
+        ) as events:
+            async for ev in events:
+                yield ev
+    _log_trace(config, root.trace)
+
+
+def _select_tools(tools, tools_schemas, prompt, messages) -> ToolSelection | None:
+    """The conversation's tool selection, or ``None`` to send every schema.
+
+    Only auto-discovered tools are selected from (an explicit ``tools`` list
+    is sent as is); the conversation is identified by its history list.
+    """
+    if tools is not None:
+        return None
+    with span("tools.select", catalog=len(tools_schemas)) as phase:
+        selection = select_tools(tools_schemas, prompt, messages)
+        phase.set(selected=None if selection is None else len(selection.names))
+    return selection
+
+
+def _observe_tools(selection, acc, tools_schemas: list[dict]) -> list[dict]:
+    """The next round's schemas: the tools a round used or discovered join."""
+    if selection is not None and selection.observe(acc.tool_calls_list()):
+        return selection.schemas()
+    return tools_schemas
+
+
+async def _stream_prompt(
+    prompt, messages, config, tools, use_mcp
+) -> AsyncGenerator[AgentEvent, None]:
+    """The agentic loop of :func:`stream_prompt`, inside the prompt's trace."""
+    # Clear the in-process used-files tracker so per-prompt tracking only
+    # reflects the files touched while handling the *current* prompt (best
+    # effort, never raises), mirroring the CLI's ``send_prompt`` behaviour.
+    with span("tracking"):
+        reset_used_files()
+    # Effective provider for this turn: a session-only override picked from
+    # the chat-page combo wins over the CLI --provider, which wins over the
+    # persisted default (config.json / auth.json).  The session override is
+    # never written to disk -- see PipelineConfig.session_provider.
+    effective_provider = (
+        config.session_provider or config.provider or get_active_provider()
+    )
+    # The API type for this turn: --api-type first, then the provider's
+    # configured api-type (the web Settings drawer's per-provider combo, the
+    # same value the CLI's --set api-type=... writes), then the provider's
+    # built-in default (its default_api_type entry).
+    api_type = resolve_api_type(config.api_type, effective_provider)
+    runner = _runner_for(api_type)
+
+    try:
+        with span("config.resolve", provider=effective_provider) as phase:
+            base_url, model, route = _resolve_route(
+                config, effective_provider, api_type
+            )
+            phase.set(model=model)
+    except Exception as e:
+        yield ErrorEvent(message=str(e))
+        return
+
+    _log_backend(config, base_url, model, api_type)
+    # The SDK clients (one per endpoint of the pool used, with their
+    # connection pools) live for this prompt only: they are closed however
+    # the prompt ends -- done, error, or the driving task cancelled by the
+    # caller (web cancel button, CLI Ctrl+C).
+    routed = RoutedClients(
+        route, lambda url, key: _create_agent_client(runner, url, key)
+    )
+    try:
+        mcp_enabled = use_mcp
+        with span("mcp.load", enabled=use_mcp):
+            tools_schemas = await resolve_tools(config, tools, use_mcp)
+        # A large catalog is cut down to the conversation's tool selection
+        # (see janito.tooling.tool_selection).
+        selection = _select_tools(tools, tools_schemas, prompt, messages)
+        tools_schemas = selection.schemas() if selection else tools_schemas
+
+        max_output_tokens, preserve_thinking, reasoning_level = _resolve_turn_config(
+            config, effective_provider, model
+        )
+
+        messages.append({"role": "user", "content": prompt})
+
+        # Keep the re-sent history within the context window (compaction +
+        # pre-flight estimate); the caller remaps its rewind checkpoints from
+        # the compaction events.
+        budget = ContextBudget(effective_provider, model, tools_schemas)
+
+        for round_number in itertools.count(1):
+            with span("round", round=round_number):
+                for ev in budget.prepare(messages):
+                    yield ev
+                if budget.refused:
+                    return
+
+                # Superseded tool results are stubbed in the history sent.
+                call_kwargs = _turn_call_kwargs(
+                    runner,
+                    model,
+                    config,
+                    tools_schemas,
+                    superseded_history(messages),
+                    max_output_tokens,
+                    preserve_thinking,
+                    reasoning_level,
+                )
+
+                # Signal that we're waiting for the API (the browser and the CLI
+                # renderer show a spinner until the first event of the round).
+                yield WaitingEvent(
+                    phase="initial" if round_number == 1 else "after_tools"
+                )
+
+                # --- Stream the completion, yielding tokens as they arrive ---
+                # (on the route's endpoint, failing over on a transient error)
+                try:
+                    async for ev in routed.stream(
+                        lambda client, kwargs, acc: _stream_turn(
+                            client, runner, kwargs, acc
+                        ),
+                        call_kwargs,
+                        lambda: _new_accumulator(runner),
+                        budget,
+                    ):
+                        yield ev
+                except Exception as e:
+                    logger.error(f"API streaming error: {e}")
+                    yield ErrorEvent(message=f"API error: {e!s}")
+                    return
+
+                acc = routed.acc
+                budget.observe(acc)
+                full_content = acc.full_content()
+
+                # --- Tool calls -> continue the loop for the final response ---
+                if acc.tool_calls_list():
+                    async for ev in run_tool_turn(
+                        acc.tool_calls_list(),
+                        full_content,
+                        messages,
+                        mcp_enabled,
+                        thought_parts=getattr(acc, "thought_parts", None) or [],
+                        selection=selection,
+                    ):
+                        yield ev
+                    tools_schemas = _observe_tools(selection, acc, tools_schemas)
+                    continue
+
+                # --- No tool calls: final response ---
+                messages.append(_build_assistant_message(acc, full_content))
+
+                usage_event = acc.usage_event(max_tokens=max_output_tokens)
+                if usage_event:
+                    usage_event.queue_ms = budget.queue_ms
+                    yield usage_event
+
+                yield DoneEvent(full_content=full_content, message_count=len(messages))
+                return
+    finally:
+        # The rounds' calibration samples are written once per prompt.
+        flush_calibration()
+        await routed.aclose(_close_client)
@@ -1,11 +1,11 @@
-"""Responses API runner for the web agentic loop.
+"""Responses API runner for the async agent pipeline.
 
 The per-API adapter (call-kwargs building, history conversion, stream
 accumulation) lives in :mod:`janito.agent.responses` — the shared adapter
-layer used by both agent loops.  This module keeps the web-only glue:
+layer used by both agent loops.  This module keeps the async glue:
 :func:`create_client` (async SDK client) and :func:`stream_turn_events`
 (which drives the stream and yields reasoning/token/image events to the
-browser).
+caller).
 """
 
 import logging
@@ -0,0 +1,111 @@
+"""Endpoint-pool routing for the agent pipeline (failover between SDK clients).
+
+The async counterpart of the CLI ``Client._routed_round``: every round of a
+prompt goes to the endpoint its :class:`~janito.agent.routing.Route` picks
+(least outstanding requests, circuit breakers), and a round failing with a
+transient error before it streamed anything is retried on another endpoint
+with a fresh accumulator.  Once events have reached the caller the error is
+final (the tokens cannot be taken back); a failed attempt gives its token
+reservation back to the rate limiter.  The caller owns every conversation
+(no session state here), so no route is pinned.
+
+:class:`RoutedClients` owns the prompt's SDK clients, one per endpoint
+used; each feeds its endpoint's rate limiter and waits for it before a
+round (see :mod:`janito.agent.ratelimit`).
+"""
+
+import logging
+from collections.abc import AsyncGenerator, Callable
+from typing import Any
+
+from janito.agent.ratelimit import get_rate_limiter, install_header_hook
+from janito.agent.routing import Endpoint, Route
+from janito.agent.tracing import span
+
+from ..events import AgentEvent
+
+logger = logging.getLogger(__name__)
+
+
+class RoutedClients:
+    """The SDK clients of one prompt's route.
+
+    Args:
+        route: The prompt's route over the provider's endpoint pool.
+        create_client: ``create_client(base_url, api_key)`` for the API type.
+    """
+
+    def __init__(self, route: Route, create_client: Callable[[Any, Any], Any]):
+        self.route = route
+        self._create_client = create_client
+        self._clients: dict[Endpoint, Any] = {}
+        self.acc = None
+
+    async def aclose(self, close_client) -> None:
+        """Close every SDK client created for the prompt with ``close_client``."""
+        for client in self._clients.values():
+            await close_client(client)
+
+    def client_for(self, endpoint: Endpoint) -> Any:
+        """The endpoint's SDK client, created (and hooked) on first use."""
+        client = self._clients.get(endpoint)
+        if client is None:
+            with span("client.create", provider=endpoint.provider):
+                client = self._create_client(endpoint.base_url, endpoint.api_key)
+                install_header_hook(
+                    client, get_rate_limiter(endpoint.provider, endpoint.api_key)
+                )
+            self._clients[endpoint] = client
+        return client
+
+    async def stream(
+        self, stream_turn, call_kwargs: dict, new_accumulator, budget
+    ) -> AsyncGenerator[AgentEvent, None]:
+        """Stream one round, failing over while nothing was streamed.
+
+        Args:
+            stream_turn: ``stream_turn(client, call_kwargs, acc)``, the API
+                type's event stream.
+            call_kwargs: The round's call parameters.
+            new_accumulator: Builds an empty accumulator for an attempt.
+            budget: The prompt's ``ContextBudget`` (rate-limit wait).
+
+        Yields the round's events; :attr:`acc` then holds its accumulator.
+        Each attempt is a ``request`` span (rate-limit queue, send, stream;
+        the first event marks its time to first token).
+        """
+        while True:
+            endpoint = self.route.acquire()
+            self.acc = new_accumulator()
+            streamed = reserved = False
+            try:
+                client = self.client_for(endpoint)
+                with span("request", provider=endpoint.provider) as request:
+                    await budget.wait_for_rate_limit(
+                        get_rate_limiter(endpoint.provider, endpoint.api_key)
+                    )
+                    reserved = True
+                    request.mark("queue_ms")
+                    async for ev in stream_turn(client, call_kwargs, self.acc):
+                        if not streamed:
+                            request.mark("time_to_first_token_ms", since="queue_ms")
+                            streamed = True
+                        yield ev
+            except BaseException as e:
+                if reserved:
+                    # The failed attempt counts none of its reserved tokens.
+                    budget.release_reservation()
+                # Frees the slot on any exit (cancellation included); only
+                # transient errors before the first event fail over.
+                if not self.route.release(e) or streamed:
+                    raise
+                logger.warning(
+                    f"{endpoint.provider}: {type(e).__name__}; "
+                    "failing over to another endpoint"
+                )
+                continue
+            self.route.release()
+            return
+
+
+__all__ = ["RoutedClients"]
@@ -1,4 +1,4 @@
-"""Tool discovery (built-in + MCP) and execution for the web agent.
+"""Tool discovery (built-in + MCP) and execution for the async agent pipeline.
 
 The tools registry, MCP manager and usage-tracking helpers are always
 present within the package, so they are imported directly (no defensive
@@ -8,7 +8,7 @@ Tool *execution* is shared with the CLI loop: the synchronous core
 (:func:`janito.tooling.executor.run_tool`) does the routing, usage/used-
 files/changes tracking and failure shaping, and captures ``report_*``
 output through a progress callback.  This module wraps it in a thread and
-converts the captured output into ``ToolProgressEvent``s for the browser.
+converts the captured output into ``ToolProgressEvent``s for the caller.
 """
 
 import asyncio
@@ -19,6 +19,7 @@ from janito.tooling.executor import (
     is_mcp_tool as is_mcp_tool,  # re-exported for turn.py
 )
 from janito.tooling.executor import run_tool
+from janito.tooling.tool_selection import ToolSelection
 from janito.tooling.tools_registry import get_all_tool_schemas
 from janito.tooling.tools_registry import (
     get_tool_permissions as get_tool_permissions,  # re-exported for turn.py
@@ -66,7 +67,12 @@ async def resolve_tools(config, tools: list[dict] | None, use_mcp: bool) -> list
 
 
 async def execute_tool(
-    tool_call_id: str, tool_name: str, tool_args: dict, use_mcp: bool
+    tool_call_id: str,
+    tool_name: str,
+    tool_args: dict,
+    use_mcp: bool,
+    queued_at: float | None = None,
+    selection: ToolSelection | None = None,
 ):
     """Execute a single tool call, capturing report_* output as progress events.
 
@@ -74,7 +80,9 @@ async def execute_tool(
     The tool runs in a thread via the shared :func:`run_tool` core; the
     progress callback receives every ``report_*`` line (tools are
     synchronous, so the handler sees them in the same thread) and converts
-    it into a ``ToolProgressEvent``.
+    it into a ``ToolProgressEvent``.  ``queued_at`` is when the call became
+    ready to run and ``selection`` the conversation's tool selection (see
+    :func:`run_tool`).
     """
     progress_events: list[ToolProgressEvent] = []
 
@@ -84,10 +92,17 @@ async def execute_tool(
                 tool_call_id=tool_call_id,
                 level=level,
                 message=message,
+                end=end,
             )
         )
 
     result, error, exec_time_ms = await asyncio.to_thread(
-        run_tool, tool_name, tool_args, use_mcp, progress=handler
+        run_tool,
+        tool_name,
+        tool_args,
+        use_mcp,
+        progress=handler,
+        queued_at=queued_at,
+        selection=selection,
     )
     return result, progress_events, error, exec_time_ms
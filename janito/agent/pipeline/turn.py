@@ -8,6 +8,9 @@ events — all in the order the client expects.
 
 import json
 import logging
+import time
+
+from janito.tooling.tool_selection import ToolSelection
 
 from ..events import AgentEvent, ToolCallEvent, ToolResultEvent
 from .tooling import execute_tool, get_tool_permissions, is_mcp_tool
@@ -21,6 +24,7 @@ async def run_tool_turn(
     messages: list[dict],
     use_mcp: bool,
     thought_parts: list[dict] | None = None,
+    selection: ToolSelection | None = None,
 ):
     """Execute one turn's tool calls, mutating ``messages`` and yielding events.
 
@@ -32,6 +36,8 @@ async def run_tool_turn(
         thought_parts: Native Gemini thought blocks (text + signature) to
             keep on the assistant message so stateless follow-up turns resend
             them verbatim.  ``None`` (other API types) omits the key.
+        selection: The conversation's tool selection (searched by
+            ``discover_tools`` calls), if one is active.
 
     Yields:
         ToolCallEvent, ToolProgressEvent*, ToolResultEvent  (per tool)
@@ -48,6 +54,9 @@ async def run_tool_turn(
         assistant_msg["thought_parts"] = thought_parts
     messages.append(assistant_msg)
 
+    # The calls are ready to run from now on; each one's wait is its queue
+    # time (see janito.agent.tracing).
+    queued_at = time.perf_counter()
     for tc in tool_calls_list:
         tool_name = tc["function"]["name"]
         try:
@@ -77,6 +86,8 @@ async def run_tool_turn(
             tool_name,
             tool_args,
             use_mcp,
+            queued_at=queued_at,
+            selection=selection,
         )
 
         # Yield captured progress events (report_* output)
@@ -96,9 +107,9 @@ async def run_tool_turn(
                 "tool_call_id": tool_call_id,
                 "role": "tool",
                 "name": tool_name,
-                "content": json.dumps(result)
-                if not isinstance(result, str)
-                else result,
+                "content": (
+                    json.dumps(result) if not isinstance(result, str) else result
+                ),
             }
         )
 
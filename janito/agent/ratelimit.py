@@ -0,0 +1,314 @@
+"""Client-side rate limiting per provider and API key.
+
+Several web sessions or batch workers sending to the same provider used to
+burst into ``429`` responses, and the SDKs' blind retries made it worse.
+Both agent loops now ask a shared :class:`RateLimiter` for a slot before
+every streaming call and wait for it instead of failing:
+
+- **Buckets.**  One token bucket for requests and one for tokens per
+  ``(provider, API key)``, refilled continuously at the per-minute limit.
+  The limits come from the config (``--set rate-limit-rpm=...`` /
+  ``rate-limit-tpm=...``, stored per provider), else from the provider's
+  built-in ``rate_limits`` entry.  Without any limit the limiter only
+  honors the server's headers.
+- **Headers.**  The response headers feed the limiter
+  (:meth:`RateLimiter.observe_headers`): ``retry-after`` /
+  ``retry-after-ms`` pause the provider, OpenAI-style
+  ``x-ratelimit-{limit,remaining,reset}-{requests,tokens}`` and Anthropic's
+  ``anthropic-ratelimit-{requests,tokens}-{limit,remaining,reset}`` size
+  the buckets when nothing is configured and clamp them to what the server
+  says remains.  Both loops install a response hook on the SDK clients
+  they create (:func:`install_header_hook`); the DashScope and Gemini SDKs
+  only consult the limiter.
+- **Fairness.**  A reservation is taken under a lock and never starts
+  before an earlier one, so waiting callers (threads or coroutines) are
+  served in arrival order.  The token reservation is the request's
+  estimated input size; :meth:`RateLimiter.settle` corrects the bucket with
+  the tokens the round actually used.
+
+The time spent waiting is added to the prompt's usage (``queue_ms``) and
+shown in the usage summary.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+#: Longest pause a single header may impose (guards against bogus values).
+MAX_HEADER_PAUSE = 300.0
+
+# (provider, api_key) -> RateLimiter
+_limiters: dict[tuple[str, str], "RateLimiter"] = {}
+_limiters_lock = threading.Lock()
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class TokenBucket:
+    """A continuously refilled bucket that may go into debt.
+
+    Args:
+        per_minute: Capacity and refill rate (units per minute).
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.per_minute = float(per_minute)
+        self.level = self.per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._updated, 0.0)
+        self.level = min(self.per_minute, self.level + elapsed * self.per_minute / 60)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take ``amount`` units; returns the seconds until they are covered."""
+        self._refill(now)
+        self.level -= amount
+        if self.level >= 0:
+            return 0.0
+        return -self.level * 60 / self.per_minute
+
+    def give_back(self, amount: float, now: float) -> None:
+        """Return (or, when negative, take more) units after the fact."""
+        self._refill(now)
+        self.level = min(self.per_minute, self.level + amount)
+
+    def clamp(self, remaining: float, now: float) -> None:
+        """Never hold more than the server says remains."""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse a reset/retry duration into seconds.
+
+    Accepts plain seconds (``"2"``, ``"0.5"``), OpenAI's compound durations
+    (``"1m30s"``, ``"250ms"``), HTTP dates and RFC 3339 timestamps (both
+    relative to now).  Returns ``None`` when unparsable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(f"{n}{u}" for n, u in parts) == value:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    for parse in (_parse_iso, parsedate_to_datetime):
+        try:
+            moment = parse(value)
+        except (TypeError, ValueError):
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    return None
+
+
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _header_number(headers, name: str) -> float | None:
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """The request and token buckets of one provider and API key.
+
+    Args:
+        requests_per_minute: Configured request limit (``None`` = learn it
+            from the response headers).
+        tokens_per_minute: Configured token limit (``None`` = learn it from
+            the response headers).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._configured = {
+            "requests": requests_per_minute is not None,
+            "tokens": tokens_per_minute is not None,
+        }
+        self.buckets: dict[str, TokenBucket | None] = {
+            "requests": (
+                TokenBucket(requests_per_minute) if requests_per_minute else None
+            ),
+            "tokens": TokenBucket(tokens_per_minute) if tokens_per_minute else None,
+        }
+        self.paused_until = 0.0
+        self._last_start = 0.0
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve a request slot of ``tokens`` tokens.
+
+        Returns:
+            The seconds to wait before sending (``0.0`` = send now).
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self.paused_until, self._last_start)
+            for kind, amount in (("requests", 1), ("tokens", tokens)):
+                bucket = self.buckets[kind]
+                if bucket is not None and amount:
+                    start = max(start, now + bucket.reserve(amount, now))
+            self._last_start = start
+            return start - now
+
+    def settle(self, reserved_tokens: int, used_tokens: int | None) -> None:
+        """Correct the token bucket with the tokens a round actually used."""
+        if used_tokens is None:
+            return
+        with self._lock:
+            bucket = self.buckets["tokens"]
+            if bucket is not None:
+                bucket.give_back(reserved_tokens - used_tokens, time.monotonic())
+
+    def observe_headers(self, headers) -> None:
+        """Update the limiter from a response's rate-limit headers."""
+        with self._lock:
+            now = time.monotonic()
+            retry_after = parse_duration(headers.get("retry-after-ms"))
+            if retry_after is not None:
+                retry_after /= 1000
+            else:
+                retry_after = parse_duration(headers.get("retry-after"))
+            if retry_after:
+                self._pause(now, retry_after)
+            for kind in ("requests", "tokens"):
+                self._observe_kind(headers, kind, now)
+
+    def _observe_kind(self, headers, kind: str, now: float) -> None:
+        limit = _header_number(headers, f"x-ratelimit-limit-{kind}")
+        remaining = _header_number(headers, f"x-ratelimit-remaining-{kind}")
+        reset = headers.get(f"x-ratelimit-reset-{kind}")
+        if limit is None and remaining is None:
+            prefix = f"anthropic-ratelimit-{kind}"
+            limit = _header_number(headers, f"{prefix}-limit")
+            remaining = _header_number(headers, f"{prefix}-remaining")
+            reset = headers.get(f"{prefix}-reset")
+        if limit and not self._configured[kind]:
+            bucket = self.buckets[kind]
+            if bucket is None or bucket.per_minute != limit:
+                self.buckets[kind] = TokenBucket(limit)
+        bucket = self.buckets[kind]
+        if remaining is None:
+            return
+        if bucket is not None:
+            bucket.clamp(remaining, now)
+        if remaining <= 0:
+            self._pause(now, parse_duration(reset) or 0.0)
+
+    def _pause(self, now: float, seconds: float) -> None:
+        seconds = min(seconds, MAX_HEADER_PAUSE)
+        self.paused_until = max(self.paused_until, now + seconds)
+        logger.debug(f"Rate limited: pausing requests for {seconds:.2f}s")
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Wait (blocking) for a slot; returns the seconds waited."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Wait (without blocking the event loop) for a slot."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+def _configured_limits(provider: str) -> tuple[float | None, float | None]:
+    """The ``(rpm, tpm)`` limits: config values first, then built-ins."""
+    from janito.config_store import get_config_value
+    from janito.provider_accessors import get_default_rate_limits_from_provider
+
+    builtin = get_default_rate_limits_from_provider(provider) or {}
+    limits = []
+    for key, builtin_key in (
+        ("rate-limit-rpm", "requests_per_minute"),
+        ("rate-limit-tpm", "tokens_per_minute"),
+    ):
+        value = get_config_value(f"{provider}.{key}")
+        if value is None:
+            value = builtin.get(builtin_key)
+        limits.append(float(value) if value else None)
+    return limits[0], limits[1]
+
+
+def get_rate_limiter(provider: str | None, api_key: str | None) -> RateLimiter:
+    """The limiter shared by every request to ``provider`` with ``api_key``."""
+    key = ((provider or "").lower(), api_key or "")
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rpm, tpm = _configured_limits(key[0]) if key[0] else (None, None)
+            limiter = _limiters[key] = RateLimiter(rpm, tpm)
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget every limiter (the config changed, or between tests)."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def install_header_hook(client: Any, limiter: RateLimiter) -> bool:
+    """Feed ``limiter`` from every response of an SDK client.
+
+    The ``openai`` and ``anthropic`` SDK clients (sync and async) keep their
+    ``httpx`` client in ``_client``; a response event hook is appended to it,
+    so the headers arrive as soon as a (streamed) response starts.  Other
+    clients (DashScope, Gemini, test doubles) are left alone.
+
+    Returns:
+        Whether the hook was installed.
+    """
+    # Already loaded by the SDK whose client is hooked (not at import time).
+    import httpx
+
+    http = getattr(client, "_client", None)
+    if isinstance(http, httpx.AsyncClient):
+
+        async def on_response(response) -> None:
+            limiter.observe_headers(response.headers)
+
+    elif isinstance(http, httpx.Client):
+
+        def on_response(response) -> None:
+            limiter.observe_headers(response.headers)
+
+    else:
+        return False
+    hooks = http.event_hooks
+    hooks["response"] = [*hooks.get("response", []), on_response]
+    http.event_hooks = hooks
+    return True
+
+
+__all__ = [
+    "RateLimiter",
+    "TokenBucket",
+    "get_rate_limiter",
+    "parse_duration",
+    "install_header_hook",
+    "reset_rate_limiters",
+]
@@ -1,9 +1,9 @@
 """Shared Responses API adapter: call kwargs, history conversion, accumulation.
 
 The Responses-API turn pipeline used to live in the web runner
-(``janito.web.backend.agent.responses``); the pure parts — call-kwargs
+(``janito.agent.pipeline.responses``); the pure parts — call-kwargs
 building, conversation-history conversion and stream accumulation — moved
-here so both agent loops share them.  The web shim keeps the async glue
+here so both agent loops share them.  The pipeline runner keeps the async glue
 (:func:`create_client` and :func:`stream_turn_events`), which is loop- and
 transport-specific.
 
@@ -233,7 +233,9 @@ class ResponsesTurnAccumulator:
         self.content: list[str] = []
         self.reasoning: list[str] = []
         self.tool_calls: list[dict] = []  # [{call_id, name, arguments}]
-        self.partial_arguments: dict[str, str] = {}
+        # item id -> streamed argument fragments (joined once, when the
+        # function_call item is done)
+        self.partial_arguments: dict[str, list[str]] = {}
         self.usage = None
         # Native image generation results: [{path, revised_prompt}].  The
         # built-in ``image_generation`` tool returns base64 images directly
@@ -255,11 +257,8 @@ class ResponsesTurnAccumulator:
             self._raise_untyped_error(event)
             return None, None
 
-        if event_type in ("response.created", "response.completed"):
-            self.handle_completion_event(event)
-        elif event_type == "response.failed":
-            self._raise_failed_error(event)
-        elif event_type == "response.output_text.delta":
+        # Deltas are by far the most frequent events: test for them first.
+        if event_type == "response.output_text.delta":
             return None, self.handle_text_delta(event)
         elif event_type in (
             "response.reasoning_text.delta",
@@ -272,6 +271,10 @@ class ResponsesTurnAccumulator:
             self.handle_call_arguments_done(event)
         elif event_type == "response.output_item.done":
             self.handle_output_item(event)
+        elif event_type in ("response.created", "response.completed"):
+            self.handle_completion_event(event)
+        elif event_type == "response.failed":
+            self._raise_failed_error(event)
         return None, None
 
     def handle_completion_event(self, event) -> None:
@@ -294,15 +297,15 @@ class ResponsesTurnAccumulator:
 
     def handle_call_arguments_delta(self, event) -> None:
         """Accumulate per-item function_call arguments (split across deltas)."""
-        item_id = getattr(event, "item_id", None)
-        self.partial_arguments[item_id] = self.partial_arguments.get(item_id, "") + (
-            getattr(event, "delta", None) or ""
-        )
+        delta = getattr(event, "delta", None)
+        if delta:
+            item_id = getattr(event, "item_id", None)
+            self.partial_arguments.setdefault(item_id, []).append(delta)
 
     def handle_call_arguments_done(self, event) -> None:
         """Record the final arguments of a finished function_call item."""
         item_id = getattr(event, "item_id", None)
-        self.partial_arguments[item_id] = getattr(event, "arguments", None) or ""
+        self.partial_arguments[item_id] = [getattr(event, "arguments", None) or ""]
 
     def handle_output_item(self, event) -> None:
         """Append a finished output item to the collected turn state.
@@ -319,7 +322,7 @@ class ResponsesTurnAccumulator:
                     "call_id": getattr(item, "call_id", ""),
                     "name": getattr(item, "name", ""),
                     "arguments": getattr(item, "arguments", None)
-                    or self.partial_arguments.get(getattr(item, "id", ""), ""),
+                    or "".join(self.partial_arguments.get(getattr(item, "id", ""), ())),
                 }
             )
         elif item_type == "image_generation_call":
@@ -0,0 +1,272 @@
+"""Endpoint pools: load balancing and failover across keys and variants.
+
+A prompt used to go to the single ``(base_url, api_key)`` resolved for its
+provider, so one exhausted or failing key stopped every session.  With
+``janito -p openai --set pool=openai-work,openai-backup`` the provider and
+the listed variants (each with its own API key and endpoint, see
+:mod:`janito.config_variants`) form an :class:`EndpointPool` shared by every
+prompt of the process:
+
+- **Balancing.**  Each round goes to the endpoint with the fewest
+  outstanding requests.  Ties go to the endpoint the conversation used last
+  (provider-side prompt caches are per key), then to the least-picked one,
+  so new conversations alternate.
+- **Failover.**  A round failing with a transient error (``429``, ``5xx``,
+  timeouts, connection errors; see :func:`is_transient`) is retried on
+  another endpoint of the pool, once per endpoint.
+- **Circuit breakers.**  An endpoint failing :data:`BREAKER_THRESHOLD`
+  times in a row is skipped for :data:`BREAKER_COOLDOWN` seconds; the next
+  round after the cooldown is its trial (a success closes the breaker, a
+  failure reopens it).  When every endpoint is open, the one reopening
+  first is used rather than failing outright.
+- **Stickiness.**  Server-side conversation state lives with one account:
+  a Responses chain (``previous_response_id``) is bound to the endpoint
+  that created it (:meth:`Route.pin`) and never fails over.  Chains the
+  pool does not know (e.g. from a previous process) go to the provider
+  itself, the pool's first member.
+
+A :class:`Route` is one conversation's (one prompt's) view of a pool.  The
+model is the prompt's: pool members are variants of one provider and serve
+the same models.  Without a ``pool`` the route has a single endpoint and
+behaves exactly as before.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+#: Consecutive failures that open an endpoint's circuit breaker.
+BREAKER_THRESHOLD = 3
+
+#: Seconds an open breaker keeps its endpoint out of rotation.
+BREAKER_COOLDOWN = 30.0
+
+# Most response ids remembered per pool for Responses stickiness.
+_STICKY_LIMIT = 1024
+
+_TRANSIENT_ERROR_NAMES = frozenset(
+    {"APIConnectionError", "APITimeoutError", "RateLimitError"}
+)
+_TRANSIENT_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+# endpoint identities -> EndpointPool
+_pools: dict[tuple, "EndpointPool"] = {}
+_pools_lock = threading.Lock()
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed request is worth retrying (rate limit, 5xx, network)."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    return getattr(error, "status_code", None) in _TRANSIENT_STATUS_CODES
+
+
+@dataclass(eq=False)
+class Endpoint:
+    """One pool member and its balancing / breaker state.
+
+    Attributes:
+        provider: The provider or variant name (selects the API key and the
+            rate limiter).
+        base_url: Its resolved base URL (``None`` = the SDK default).
+        api_key: Its API key.
+        outstanding: Requests currently in flight.
+        picks: Requests sent so far (tie-breaker).
+        failures: Consecutive transient failures.
+        open_until: Monotonic time until which the breaker is open.
+    """
+
+    provider: str
+    base_url: str | None
+    api_key: str | None
+    outstanding: int = 0
+    picks: int = 0
+    failures: int = 0
+    open_until: float = 0.0
+
+    def is_open(self, now: float) -> bool:
+        """Whether the circuit breaker keeps the endpoint out of rotation."""
+        return self.failures >= BREAKER_THRESHOLD and now < self.open_until
+
+
+class EndpointPool:
+    """The endpoints of one provider's pool (see the module docstring).
+
+    Args:
+        endpoints: The members, the provider itself first.
+    """
+
+    def __init__(self, endpoints: list[Endpoint]) -> None:
+        self.endpoints = endpoints
+        self._lock = threading.Lock()
+        self._sticky: OrderedDict[str, Endpoint] = OrderedDict()
+
+    def pick(
+        self, prefer: Endpoint | None = None, exclude: set | frozenset = frozenset()
+    ) -> Endpoint | None:
+        """Take a request slot on the best endpoint not in ``exclude``."""
+        with self._lock:
+            now = time.monotonic()
+            candidates = [e for e in self.endpoints if e not in exclude]
+            if not candidates:
+                return None
+            closed = [e for e in candidates if not e.is_open(now)]
+            if closed:
+                endpoint = min(
+                    closed, key=lambda e: (e.outstanding, e is not prefer, e.picks)
+                )
+            else:
+                endpoint = min(candidates, key=lambda e: e.open_until)
+            self._take(endpoint)
+            return endpoint
+
+    def take(self, endpoint: Endpoint) -> Endpoint:
+        """Take a request slot on a given endpoint (a pinned conversation)."""
+        with self._lock:
+            self._take(endpoint)
+            return endpoint
+
+    @staticmethod
+    def _take(endpoint: Endpoint) -> None:
+        endpoint.outstanding += 1
+        endpoint.picks += 1
+
+    def release(self, endpoint: Endpoint, error: BaseException | None = None) -> None:
+        """Free a request slot, updating the endpoint's breaker.
+
+        Only transient errors count against the breaker (a ``400`` says
+        nothing about the endpoint's health).
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if error is None:
+                endpoint.failures = 0
+            elif is_transient(error):
+                endpoint.failures += 1
+                if endpoint.failures >= BREAKER_THRESHOLD:
+                    endpoint.open_until = time.monotonic() + BREAKER_COOLDOWN
+
+    def bind(self, key: str, endpoint: Endpoint) -> None:
+        """Remember that conversation ``key`` lives on ``endpoint``."""
+        with self._lock:
+            self._sticky[key] = endpoint
+            self._sticky.move_to_end(key)
+            while len(self._sticky) > _STICKY_LIMIT:
+                self._sticky.popitem(last=False)
+
+    def bound(self, key: str) -> Endpoint:
+        """The endpoint conversation ``key`` lives on (else the provider's)."""
+        with self._lock:
+            return self._sticky.get(key, self.endpoints[0])
+
+
+class Route:
+    """One conversation's use of a pool: balancing, failover and pinning.
+
+    Args:
+        pool: The provider's pool.
+        sticky_key: The server-side conversation to continue (a Responses
+            ``previous_response_id``); pins the route to its endpoint.
+    """
+
+    def __init__(self, pool: EndpointPool, sticky_key: str | None = None) -> None:
+        self.pool = pool
+        self.endpoint: Endpoint | None = None
+        self.pinned = pool.bound(sticky_key) if sticky_key else None
+        self._failed: set[Endpoint] = set()
+
+    def acquire(self) -> Endpoint:
+        """Take a request slot for the next round; returns its endpoint."""
+        if self.pinned is not None:
+            self.endpoint = self.pool.take(self.pinned)
+        else:
+            self.endpoint = self.pool.pick(prefer=self.endpoint, exclude=self._failed)
+        return self.endpoint
+
+    def release(self, error: BaseException | None = None) -> bool:
+        """Free the round's slot.
+
+        Returns:
+            Whether the failed round should be retried on another endpoint
+            (a transient error, an unpinned route and an endpoint left to
+            try).
+        """
+        self.pool.release(self.endpoint, error)
+        if error is None:
+            self._failed.clear()
+            return False
+        if self.pinned is not None or not is_transient(error):
+            return False
+        self._failed.add(self.endpoint)
+        return len(self._failed) < len(self.pool.endpoints)
+
+    def pin(self, key: str | None) -> None:
+        """Bind server-side conversation ``key`` to the current endpoint."""
+        if key and self.endpoint is not None:
+            self.pool.bind(key, self.endpoint)
+            self.pinned = self.endpoint
+
+
+def get_endpoint_pool(
+    members: list[tuple[str, str | None, str | None]],
+) -> EndpointPool:
+    """The process-wide pool of ``(provider, base_url, api_key)`` members.
+
+    The same members always map to the same pool, so the outstanding counts,
+    breakers and sticky chains are shared by every prompt and session.
+    """
+    key = tuple(members)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = EndpointPool([Endpoint(*m) for m in members])
+        return pool
+
+
+def reset_endpoint_pools() -> None:
+    """Forget every pool (the config changed, or between tests)."""
+    with _pools_lock:
+        _pools.clear()
+
+
+def resolve_route(
+    provider: str, primary: tuple[str | None, str | None], resolve, sticky_key=None
+) -> Route:
+    """The route for a prompt to ``provider``.
+
+    Args:
+        provider: The effective provider.
+        primary: Its already resolved ``(base_url, api_key)``.
+        resolve: ``resolve(member) -> (base_url, api_key)`` for the other
+            pool members; a member that cannot be resolved (e.g. no API key)
+            is left out of the pool.
+        sticky_key: See :class:`Route`.
+    """
+    from janito.config_variants import load_pool
+
+    members = [(provider, *primary)]
+    for member in load_pool(provider)[1:]:
+        try:
+            members.append((member, *resolve(member)))
+        except ValueError as e:
+            logger.warning(f"Skipping pool member '{member}': {e}")
+    return Route(get_endpoint_pool(members), sticky_key)
+
+
+__all__ = [
+    "BREAKER_COOLDOWN",
+    "BREAKER_THRESHOLD",
+    "Endpoint",
+    "EndpointPool",
+    "Route",
+    "get_endpoint_pool",
+    "is_transient",
+    "reset_endpoint_pools",
+    "resolve_route",
+]
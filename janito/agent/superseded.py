@@ -0,0 +1,350 @@
+"""Stub out superseded tool results in the re-sent history.
+
+When the agent reads ``foo.py``, edits it and reads it again, both full
+copies stay in the history and are re-sent on every later round, although
+only the last one still describes the file.  Before the call kwargs of a
+round are built, :func:`superseded_history` returns a *view* of the history
+in which every result that a later tool call made obsolete is replaced by a
+one-line stub (``[content superseded by a later read at step N]``, ``N``
+being the 1-based position of that later call among the conversation's tool
+calls).  A result is superseded when:
+
+- it is a ``ReadFile`` / ``ReadMultipleFiles`` result and every range it
+  returned was read again later (a later read of the same file from an
+  earlier or equal line, up to a later or equal line);
+- it read a file that a later successful ``CreateFile`` rewrote (the new
+  content is in that call's arguments);
+- it is a listing or search result (``ListFiles``, ``FindFiles``,
+  ``SearchText``, ``SearchRegex``) and the same call, with the same
+  arguments, was made again later.
+
+Edits in place (``ReplaceTextInFile``) do not supersede a read: most of the
+file it returned is still accurate.  Results shorter than
+:data:`janito.agent.context.ELIDE_MIN_CHARS` are kept, and the tool calls
+themselves are never touched, so every call keeps a result.
+
+The history itself is not modified: ``/history``, ``/rewind`` and saved
+sessions keep the original results.  The view is one list per conversation,
+updated in place, whose entries are the history's own message objects
+except for the stubbed ones, which are built once and reused while the
+original message is the same and its content equal; the incremental
+conversions of :mod:`janito.agent.history_cache` therefore keep their cached
+prefix across rounds.  The view covers the three history shapes the loops
+keep (OpenAI chat messages, Anthropic content blocks and Responses input
+items).  Set ``supersede-tool-results`` to ``false`` to send every result
+as is.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from .context import ELIDE_MIN_CHARS
+
+#: Reads whose results are superseded by later reads or rewrites.
+READ_TOOLS = frozenset({"ReadFile", "ReadMultipleFiles"})
+
+#: Tools whose result is superseded by a later identical call.
+REPEATABLE_TOOLS = frozenset({"ListFiles", "FindFiles", "SearchText", "SearchRegex"})
+
+#: Tools that rewrite a whole file (superseding earlier reads of it).
+REWRITE_TOOLS = frozenset({"CreateFile"})
+
+#: Conversations whose view is kept (least recently used first out).
+MAX_CONVERSATIONS = 16
+
+# json.dumps of a tool result leads with its "success" flag.
+_FAILED = re.compile(r'^\s*\{\s*"success"\s*:\s*false')
+
+
+def stub_text(reason: str, step: int) -> str:
+    """The stub that replaces a superseded result."""
+    return f"[content superseded by a later {reason} at step {step}]"
+
+
+def load_supersede_enabled() -> bool:
+    """The ``supersede-tool-results`` config value (enabled by default)."""
+    from janito.config_store import get_config_value
+
+    value = get_config_value("supersede-tool-results")
+    if isinstance(value, str):
+        return value.strip().lower() not in ("false", "0", "no", "off")
+    return value is None or bool(value)
+
+
+# ---------------------------------------------------------------------------
+# History shapes
+# ---------------------------------------------------------------------------
+
+
+def _calls_of(item: dict) -> list[tuple[str, str, Any]]:
+    """``(call_id, name, arguments)`` of the tool calls an entry makes."""
+    if item.get("type") == "function_call":
+        return [
+            (item.get("call_id") or "", item.get("name") or "", item.get("arguments"))
+        ]
+    if item.get("role") != "assistant":
+        return []
+    calls = [
+        (
+            call.get("id") or "",
+            (call.get("function") or {}).get("name") or "",
+            (call.get("function") or {}).get("arguments"),
+        )
+        for call in item.get("tool_calls") or []
+    ]
+    content = item.get("content")
+    if isinstance(content, list):
+        calls.extend(
+            (block.get("id") or "", block.get("name") or "", block.get("input"))
+            for block in content
+            if isinstance(block, dict) and block.get("type") == "tool_use"
+        )
+    return calls
+
+
+def _results_of(item: dict) -> list[tuple[str, str]]:
+    """``(call_id, text)`` of the tool results an entry carries."""
+    if item.get("role") == "tool":
+        return [(item.get("tool_call_id") or "", str(item.get("content") or ""))]
+    if item.get("type") == "function_call_output":
+        return [(item.get("call_id") or "", str(item.get("output") or ""))]
+    content = item.get("content")
+    if item.get("role") != "user" or not isinstance(content, list):
+        return []
+    return [
+        (block.get("tool_use_id") or "", str(block.get("content") or ""))
+        for block in content
+        if isinstance(block, dict) and block.get("type") == "tool_result"
+    ]
+
+
+def _stubbed(item: dict, stubs: dict[str, str]) -> dict:
+    """A copy of ``item`` with its superseded results replaced by stubs."""
+    if item.get("role") == "tool":
+        return {**item, "content": stubs[item.get("tool_call_id") or ""]}
+    if item.get("type") == "function_call_output":
+        return {**item, "output": stubs[item.get("call_id") or ""]}
+    return {
+        **item,
+        "content": [
+            (
+                {**block, "content": stubs[block.get("tool_use_id")]}
+                if isinstance(block, dict)
+                and block.get("type") == "tool_result"
+                and block.get("tool_use_id") in stubs
+                else block
+            )
+            for block in item["content"]
+        ],
+    }
+
+
+def _arguments(raw: Any) -> dict:
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw or "{}")
+        except ValueError:
+            return {}
+    return raw if isinstance(raw, dict) else {}
+
+
+# ---------------------------------------------------------------------------
+# Supersession rules
+# ---------------------------------------------------------------------------
+
+
+def _path(value: Any) -> str:
+    return os.path.normpath(str(value)) if value else ""
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_ranges(name: str, args: dict) -> list[tuple[str, int, int | None]]:
+    """``(path, first_line, last_line)`` of what a read returned (``None``: EOF)."""
+    max_lines = _int(args.get("max_lines"))
+    if name == "ReadFile":
+        start = _int(args.get("start_line")) or 1
+        end = start + max_lines - 1 if max_lines else None
+        return [(_path(args.get("filepath")), start, end)]
+    paths = args.get("filepaths") or []
+    if isinstance(paths, str):
+        paths = [paths]
+    return [(_path(p), 1, max_lines) for p in paths]
+
+
+def _covers(later: tuple[int, int | None], earlier: tuple[int, int | None]) -> bool:
+    start, end = later
+    return start <= earlier[0] and (
+        end is None or (earlier[1] is not None and end >= earlier[1])
+    )
+
+
+class _Later:
+    """What the calls after the current one (walking backwards) established."""
+
+    def __init__(self) -> None:
+        self.reads: dict[str, list[tuple[int, int | None, int]]] = {}
+        self.rewrites: dict[str, int] = {}
+        self.repeats: dict[str, int] = {}
+
+    def supersedes_read(self, ranges) -> str | None:
+        """The stub of a read whose every range was re-read or rewritten."""
+        reasons = []
+        for path, start, end in ranges:
+            read = next(
+                (
+                    step
+                    for s, e, step in self.reads.get(path, [])
+                    if _covers((s, e), (start, end))
+                ),
+                None,
+            )
+            if read is not None:
+                reasons.append((read, "read"))
+            elif path in self.rewrites:
+                reasons.append((self.rewrites[path], "rewrite"))
+            else:
+                return None
+        if not reasons:
+            return None
+        step, reason = max(reasons)
+        return stub_text(reason, step)
+
+    def observe(self, name: str, args: dict, step: int, ok: bool) -> str | None:
+        """Record one call (walking backwards); the stub of its result, if any."""
+        if name in READ_TOOLS:
+            ranges = _read_ranges(name, args)
+            stub = self.supersedes_read(ranges)
+            if ok:
+                for path, start, end in ranges:
+                    # Nearest later read first: it is the one the stub names.
+                    self.reads.setdefault(path, []).insert(0, (start, end, step))
+            return stub
+        if name in REWRITE_TOOLS:
+            if ok:
+                self.rewrites[_path(args.get("filepath"))] = step
+            return None
+        if name in REPEATABLE_TOOLS:
+            key = f"{name}:{json.dumps(args, sort_keys=True)}"
+            later = self.repeats.get(key)
+            self.repeats[key] = step
+            if later is not None:
+                reason = "listing" if name in ("ListFiles", "FindFiles") else "search"
+                return stub_text(reason, later)
+        return None
+
+
+def superseded_results(history: list[dict]) -> dict[str, str]:
+    """Map the call id of every superseded tool result to its stub text."""
+    calls: list[tuple[str, str, Any]] = []
+    results: dict[str, str] = {}
+    for item in history:
+        calls.extend(_calls_of(item))
+        results.update(_results_of(item))
+    later = _Later()
+    stubs: dict[str, str] = {}
+    for step in range(len(calls), 0, -1):
+        call_id, name, raw = calls[step - 1]
+        text = results.get(call_id)
+        if text is None:
+            continue  # not answered yet (or rewound): nothing to stub
+        stub = later.observe(name, _arguments(raw), step, not _FAILED.match(text))
+        if stub is not None and len(text) >= ELIDE_MIN_CHARS:
+            stubs[call_id] = stub
+    return stubs
+
+
+# ---------------------------------------------------------------------------
+# Per-conversation view
+# ---------------------------------------------------------------------------
+
+
+class SupersededView:
+    """One conversation's history with its superseded results stubbed."""
+
+    def __init__(self) -> None:
+        self._view: list[dict] = []
+        # id(original) -> (original, its content, stubs applied, stubbed copy)
+        self._stubbed: dict[int, tuple[dict, Any, dict[str, str], dict]] = {}
+
+    def view(self, history: list[dict]) -> list[dict]:
+        """The history to send (``history`` itself when nothing is superseded)."""
+        stubs = superseded_results(history)
+        if not stubs:
+            self._stubbed.clear()
+            return history
+        stubbed: dict[int, tuple[dict, Any, dict[str, str], dict]] = {}
+        entries = []
+        for item in history:
+            applied = {
+                call_id: stubs[call_id]
+                for call_id, _ in _results_of(item)
+                if call_id in stubs
+            }
+            if not applied:
+                entries.append(item)
+                continue
+            content = item.get("content", item.get("output"))
+            cached = self._stubbed.get(id(item))
+            if not (
+                cached
+                and cached[0] is item
+                and (cached[1] is content or cached[1] == content)
+                and cached[2] == applied
+            ):
+                cached = (item, content, applied, _stubbed(item, applied))
+            elif cached[1] is not content:
+                # Rehydrated web payload: same result, new string.
+                cached = (item, content, applied, cached[3])
+            stubbed[id(item)] = cached
+            entries.append(cached[3])
+        self._stubbed = stubbed
+        self._view[:] = entries
+        return self._view
+
+
+_views: "OrderedDict[int, tuple[list, SupersededView]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def superseded_history(history: list[dict] | None) -> list[dict] | None:
+    """The history a round sends, with superseded tool results stubbed.
+
+    Args:
+        history: The conversation's history (the caller-owned list, which
+            is not modified; the view is keyed by its identity).
+
+    Returns:
+        ``history`` itself when nothing is superseded (or the feature is
+        off), else the conversation's view list (see :class:`SupersededView`).
+    """
+    if not history or not load_supersede_enabled():
+        return history
+    key = id(history)
+    with _lock:
+        entry = _views.get(key)
+        if entry is None or entry[0] is not history:
+            entry = (history, SupersededView())
+        _views[key] = entry
+        _views.move_to_end(key)
+        while len(_views) > MAX_CONVERSATIONS:
+            _views.popitem(last=False)
+        return entry[1].view(history)
+
+
+__all__ = [
+    "SupersededView",
+    "load_supersede_enabled",
+    "stub_text",
+    "superseded_history",
+    "superseded_results",
+]
@@ -0,0 +1,381 @@
+"""Local, dependency-free token estimation.
+
+Token counts are only reported by the API after a request completes
+(:func:`~janito.agent.usage.normalize_usage`), but the agent loops need a
+size estimate *before* sending -- e.g. to decide when to compact the history
+(:mod:`janito.agent.context`) or to refuse a request that cannot fit the
+context window.  :func:`estimate_tokens` approximates the count from the
+serialized text (about four characters per token for English prose and
+JSON), which is close enough for budgeting without pulling in a tokenizer.
+
+**Calibration.**  Tokenizers differ between model families, so the raw
+estimate is scaled by a per-family ratio learned from the ``usage`` the API
+reports: after every round the loops call :func:`observe_usage` with the
+estimate they sent and the input tokens the provider counted, and the ratio
+(a moving average, clamped to a sane range) is persisted in
+``token_calibration.json`` in the config directory.  Observations are
+buffered in memory and written once per prompt (:func:`flush_calibration`,
+also run at exit), so a long tool loop does not take the file lock and
+fsync the file on every round.  The family is the
+provider name (every provider serves a single vendor's models, except the
+OpenAI-compatible gateways, which simply learn an average).
+
+**Breakdown.**  :func:`estimate_request` splits a request into the sections
+that drive its size -- system prompt, each tool schema, the conversation
+history and the latest tool results -- as a :class:`PromptEstimate`.  The
+CLI keeps the last one for ``/status`` (:func:`record_estimate`).
+"""
+
+import atexit
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from janito.json_store import TokenCalibrationStore
+
+logger = logging.getLogger(__name__)
+
+#: Average characters per token used by the estimator.
+CHARS_PER_TOKEN = 4.0
+
+#: Calibration ratios are clamped to this range, so one odd sample (e.g. a
+#: gateway that reports usage differently) cannot derail the estimator.
+MIN_RATIO = 0.25
+MAX_RATIO = 4.0
+
+#: Weight of a new observation in the per-family moving average.
+CALIBRATION_WEIGHT = 0.3
+
+#: Requests estimated below this size are too noisy to calibrate from.
+MIN_CALIBRATION_TOKENS = 200
+
+
+def _text_of(value: Any) -> str:
+    """The text a value is serialized to in a request payload."""
+    if isinstance(value, str):
+        return value
+    try:
+        return json.dumps(value, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the token count of a string or JSON-serializable value.
+
+    Lists of messages, tool schemas and plain strings are all accepted; the
+    estimate is based on the JSON serialization for non-string values.
+    ``None`` counts as zero.  The result is *uncalibrated* (see
+    :func:`calibration_ratio`).
+    """
+    if value is None:
+        return 0
+    text = _text_of(value)
+    if not text:
+        return 0
+    return int(len(text) / CHARS_PER_TOKEN) + 1
+
+
+# ---------------------------------------------------------------------------
+# Per-family calibration
+# ---------------------------------------------------------------------------
+
+
+def token_family(provider: str | None) -> str:
+    """The calibration family of a provider (``"default"`` when unknown)."""
+    return (provider or "default").lower()
+
+
+class TokenCalibration:
+    """Per-family ratio of reported to estimated input tokens.
+
+    Args:
+        store: Where the ratios persist; ``None`` keeps them in memory only.
+    """
+
+    def __init__(self, store: TokenCalibrationStore | None = None):
+        self.store = store
+        self._families: dict[str, dict[str, Any]] | None = None
+        self._dirty: set[str] = set()
+
+    def _entries(self) -> dict[str, dict[str, Any]]:
+        if self._families is None:
+            self._families = dict(self.store.get_families()) if self.store else {}
+        return self._families
+
+    def ratio(self, family: str) -> float:
+        """The calibration ratio for ``family`` (``1.0`` before any sample)."""
+        entry = self._entries().get(family) or {}
+        try:
+            return min(max(float(entry.get("ratio", 1.0)), MIN_RATIO), MAX_RATIO)
+        except (TypeError, ValueError):
+            return 1.0
+
+    def observe(self, family: str, estimated: int, actual: int | None) -> float:
+        """Fold one ``(estimated, reported)`` input-token sample into ``family``.
+
+        Samples from tiny requests or without a reported count are ignored.
+
+        Returns:
+            The family's (possibly updated) ratio.
+        """
+        if not actual or estimated < MIN_CALIBRATION_TOKENS:
+            return self.ratio(family)
+        sample = min(max(actual / estimated, MIN_RATIO), MAX_RATIO)
+        entry = self._entries().get(family)
+        if entry:
+            ratio = (1 - CALIBRATION_WEIGHT) * self.ratio(family)
+            ratio += CALIBRATION_WEIGHT * sample
+            samples = int(entry.get("samples", 0)) + 1
+        else:
+            ratio, samples = sample, 1
+        entry = {"ratio": round(ratio, 4), "samples": samples}
+        self._entries()[family] = entry
+        self._dirty.add(family)
+        logger.debug(
+            f"Token calibration for {family}: sample {sample:.3f}, "
+            f"ratio {entry['ratio']} ({samples} samples)"
+        )
+        return entry["ratio"]
+
+    def flush(self) -> bool:
+        """Write the entries observed since the last flush to the store.
+
+        Returns:
+            False when the store could not be written (the entries stay
+            pending), True otherwise.
+        """
+        if not self._dirty or self.store is None:
+            self._dirty.clear()
+            return True
+        entries = self._entries()
+        pending = {family: entries[family] for family in self._dirty}
+        if not self.store.update_families(pending):
+            return False
+        self._dirty.difference_update(pending)
+        return True
+
+
+# Module-level singleton backing the functions below.
+_calibration = TokenCalibration(TokenCalibrationStore())
+
+
+def calibration_ratio(family: str) -> float:
+    """The persisted calibration ratio for ``family``."""
+    return _calibration.ratio(family)
+
+
+def observe_usage(estimate: "PromptEstimate | None", actual: int | None) -> None:
+    """Calibrate ``estimate``'s family from the input tokens the API reported."""
+    if estimate is None:
+        return
+    _calibration.observe(estimate.family, estimate.raw_total, actual)
+
+
+def flush_calibration() -> None:
+    """Persist the calibration observed during the prompt (one write)."""
+    _calibration.flush()
+
+
+atexit.register(flush_calibration)
+
+
+# ---------------------------------------------------------------------------
+# Request breakdown
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class PromptEstimate:
+    """Pre-flight size estimate of one request, broken down by section.
+
+    The section counts are raw (uncalibrated) estimates; :attr:`total` and
+    :meth:`sections` apply the family's calibration ``ratio``.
+
+    Attributes:
+        system: The system prompt / instructions.
+        tools: One entry per tool schema, keyed by tool name.
+        history: The conversation history before the latest tool results.
+        tool_results: The tool results appended since the last model reply.
+        family: The calibration family (see :func:`token_family`).
+        ratio: The calibration ratio applied to the raw counts.
+    """
+
+    system: int = 0
+    tools: dict[str, int] = field(default_factory=dict)
+    history: int = 0
+    tool_results: int = 0
+    family: str = "default"
+    ratio: float = 1.0
+
+    @property
+    def raw_total(self) -> int:
+        """Uncalibrated estimate of the whole request."""
+        return self.system + sum(self.tools.values()) + self.history + self.tool_results
+
+    @property
+    def total(self) -> int:
+        """Calibrated estimate of the whole request."""
+        return self.calibrated(self.raw_total)
+
+    def calibrated(self, tokens: int) -> int:
+        """Scale a raw section count by the calibration ratio."""
+        return round(tokens * self.ratio)
+
+    def sections(self) -> list[tuple[str, int]]:
+        """``(label, calibrated tokens)`` per section, in request order."""
+        return [
+            ("System prompt", self.calibrated(self.system)),
+            (f"Tools ({len(self.tools)})", self.calibrated(sum(self.tools.values()))),
+            ("History", self.calibrated(self.history)),
+            ("Latest tool results", self.calibrated(self.tool_results)),
+        ]
+
+    def largest_tools(self, limit: int = 5) -> list[tuple[str, int]]:
+        """The ``limit`` largest tool schemas as ``(name, calibrated tokens)``."""
+        ranked = sorted(self.tools.items(), key=lambda kv: kv[1], reverse=True)
+        return [(name, self.calibrated(tokens)) for name, tokens in ranked[:limit]]
+
+    def describe(self) -> str:
+        """One-line human-readable breakdown."""
+        parts = ", ".join(f"{label.lower()} ~{n}" for label, n in self.sections())
+        return f"~{self.total} tokens ({parts})"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total,
+            "system": self.calibrated(self.system),
+            "tools": {name: self.calibrated(n) for name, n in self.tools.items()},
+            "history": self.calibrated(self.history),
+            "tool_results": self.calibrated(self.tool_results),
+            "family": self.family,
+            "ratio": self.ratio,
+        }
+
+
+class PromptTooLargeError(ValueError):
+    """A request cannot fit the model's context window, even after trimming.
+
+    Attributes:
+        estimate: The :class:`PromptEstimate` of the refused request.
+        max_input_tokens: The model's context window.
+    """
+
+    def __init__(self, estimate: PromptEstimate, max_input_tokens: int):
+        self.estimate = estimate
+        self.max_input_tokens = max_input_tokens
+        super().__init__(
+            f"Request too large: estimated {estimate.describe()} exceeds the "
+            f"model's context window of {max_input_tokens} tokens"
+        )
+
+
+def _is_system(item: dict) -> bool:
+    return item.get("role") in ("system", "developer")
+
+
+def _is_tool_result(item: dict) -> bool:
+    """Whether ``item`` carries tool output (any API's history format)."""
+    if item.get("role") == "tool" or item.get("type") == "function_call_output":
+        return True
+    content = item.get("content")
+    return (
+        item.get("role") == "user"
+        and isinstance(content, list)
+        and any(
+            isinstance(block, dict) and block.get("type") == "tool_result"
+            for block in content
+        )
+    )
+
+
+def _tool_name(schema: Any) -> str:
+    if not isinstance(schema, dict):
+        return "?"
+    function = schema.get("function")
+    if isinstance(function, dict) and function.get("name"):
+        return function["name"]
+    return schema.get("name") or schema.get("type") or "?"
+
+
+def estimate_request(
+    history: list[dict] | None,
+    tools: list[dict] | None = None,
+    system: Any = None,
+    family: str | None = None,
+) -> PromptEstimate:
+    """Estimate a request before sending it, section by section.
+
+    Args:
+        history: The re-sent conversation history (any API's format).
+        tools: The tool schemas offered to the model.
+        system: A system prompt sent outside the history (Anthropic/Gemini
+            ``system``).  When given, system-role history entries are not
+            counted (those APIs filter them out of the request); otherwise
+            the leading system-role entries form the system section.
+        family: The calibration family; ``None`` means ``"default"``.
+    """
+    family = family or token_family(None)
+    items = list(history or [])
+    if system is not None:
+        system_tokens = estimate_tokens(system)
+        items = [item for item in items if not _is_system(item)]
+    else:
+        head = 0
+        while head < len(items) and _is_system(items[head]):
+            head += 1
+        system_tokens = estimate_tokens(items[:head]) if head else 0
+        items = items[head:]
+
+    tail = len(items)
+    while tail > 0 and _is_tool_result(items[tail - 1]):
+        tail -= 1
+
+    tool_tokens: dict[str, int] = {}
+    for schema in tools or []:
+        name = _tool_name(schema)
+        tool_tokens[name] = tool_tokens.get(name, 0) + estimate_tokens(schema)
+
+    return PromptEstimate(
+        system=system_tokens,
+        tools=tool_tokens,
+        history=estimate_tokens(items[:tail]) if tail else 0,
+        tool_results=estimate_tokens(items[tail:]) if tail < len(items) else 0,
+        family=family,
+        ratio=calibration_ratio(family),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Last request (CLI /status)
+# ---------------------------------------------------------------------------
+
+_last_estimate: PromptEstimate | None = None
+
+
+def record_estimate(estimate: PromptEstimate | None) -> None:
+    """Remember the estimate of the request just sent (for ``/status``)."""
+    global _last_estimate
+    _last_estimate = estimate
+
+
+def last_estimate() -> PromptEstimate | None:
+    """The estimate of the most recent request, or ``None``."""
+    return _last_estimate
+
+
+__all__ = [
+    "CHARS_PER_TOKEN",
+    "PromptEstimate",
+    "PromptTooLargeError",
+    "TokenCalibration",
+    "calibration_ratio",
+    "estimate_request",
+    "estimate_tokens",
+    "flush_calibration",
+    "last_estimate",
+    "observe_usage",
+    "record_estimate",
+    "token_family",
+]
@@ -0,0 +1,377 @@
+"""Per-prompt phase timing: spans, ``-v`` / ``/status`` summaries, trace files.
+
+The usage line at the end of a prompt was the only latency signal: a slow
+turn could not be told apart from a slow MCP start, a long rate-limit queue,
+a late first token or a slow tool.  Both agent loops now record a tree of
+:class:`Span` objects for every prompt:
+
+- ``prompt`` -- the root (``Client.send`` / the web ``stream_prompt``), with
+  ``tracking`` (per-prompt resets), ``config.resolve``, ``mcp.load`` and one
+  ``round`` per model request below it.
+- ``round`` -- ``client.create`` (first use of an endpoint), ``request``
+  (send and stream, one span per failover attempt; ``queue_ms`` is the
+  rate-limit wait and ``time_to_first_token_ms`` the time from the send to
+  the first streamed text -- a round answering with tool calls only has
+  none), ``render`` and ``finalize`` (CLI output) and one ``tool`` span per
+  tool call.
+- ``tool`` -- ``queue_ms`` (from the end of the stream to the start of the
+  call), ``exec_ms`` and its ``tracking`` writes (used files, changes log).
+
+The current span is a :mod:`contextvars` variable, so spans opened in
+``asyncio`` tasks and ``asyncio.to_thread`` workers nest under the right
+parent; threads started by hand run in a copy of the caller's context.
+:func:`span` is a no-op outside a trace.
+
+A finished trace is kept for ``/status`` (:func:`last_trace`), summarised
+in ``-v`` output (:func:`trace_rows`) and, when ``trace-file`` is set,
+appended to that file as one OTLP/JSON ``ExportTraceServiceRequest`` per
+line -- the format of the OpenTelemetry Collector's file exporter, so the
+collector's ``otlpjsonfile`` receiver (or any OTLP/JSON reader) can load it.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+#: Instrumentation scope name written to trace files.
+SCOPE_NAME = "janito"
+
+_current: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "janito_span", default=None
+)
+
+_last_trace: "Trace | None" = None
+_export_lock = threading.Lock()
+
+
+@dataclass(eq=False)
+class Span:
+    """One timed phase of a prompt.
+
+    Attributes:
+        name: The phase (``"request"``, ``"tool"``, ...).
+        trace: The trace the span belongs to.
+        span_id: 16 hex digits.
+        parent: The enclosing span (``None`` for the root).
+        start_ns: Wall-clock start (``time.time_ns()``).
+        end_ns: Wall-clock end; ``None`` while the span is open.
+        attributes: Phase details (provider, tool name, ``queue_ms``, ...).
+        error: The exception message when the phase failed.
+    """
+
+    name: str
+    trace: "Trace"
+    span_id: str
+    parent: "Span | None" = None
+    start_ns: int = 0
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    _start: float = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        """Elapsed time (so far, while the span is open)."""
+        if self.end_ns is None:
+            return (time.perf_counter() - self._start) * 1000
+        return (self.end_ns - self.start_ns) / 1e6
+
+    @property
+    def depth(self) -> int:
+        """Nesting level below the root."""
+        depth, parent = 0, self.parent
+        while parent is not None:
+            depth, parent = depth + 1, parent.parent
+        return depth
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes (``None`` values are skipped)."""
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    def mark(self, attribute: str, since: str | None = None) -> None:
+        """Record the milliseconds elapsed under ``attribute`` (once).
+
+        Args:
+            attribute: The attribute to set.
+            since: An earlier mark to measure from (default: the start).
+        """
+        if attribute not in self.attributes:
+            elapsed = self.duration_ms - self.attributes.get(since, 0.0)
+            self.attributes[attribute] = round(elapsed, 1)
+
+    def end(self, error: BaseException | None = None) -> None:
+        """Close the span (measured with the monotonic clock)."""
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.end_ns = self.start_ns + int((time.perf_counter() - self._start) * 1e9)
+
+
+class _NullSpan:
+    """Stands in for a span outside a trace (every update is ignored)."""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def mark(self, attribute: str, since: str | None = None) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """The spans of one prompt.
+
+    Args:
+        trace_id: 32 hex digits.
+    """
+
+    def __init__(self, trace_id: str) -> None:
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Span | None:
+        """The ``prompt`` span."""
+        return self.spans[0] if self.spans else None
+
+    def open(self, name: str, parent: Span | None, attributes: dict) -> Span:
+        """Start a span of this trace."""
+        new = Span(
+            name,
+            self,
+            secrets.token_hex(8),
+            parent,
+            time.time_ns(),
+            _start=time.perf_counter(),
+        )
+        new.set(**attributes)
+        with self._lock:
+            self.spans.append(new)
+        return new
+
+    def ordered(self) -> list[Span]:
+        """The spans depth-first, children in start order."""
+        children: dict[Span | None, list[Span]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for s in sorted(spans, key=lambda s: s.start_ns):
+            children.setdefault(s.parent, []).append(s)
+        ordered: list[Span] = []
+
+        def visit(parent):
+            for child in children.get(parent, []):
+                ordered.append(child)
+                visit(child)
+
+        visit(None)
+        return ordered
+
+
+def current_span() -> Span | None:
+    """The innermost open span of the calling context, or ``None``."""
+    return _current.get()
+
+
+@contextmanager
+def _activate(new: Span) -> Iterator[Span]:
+    token = _current.set(new)
+    try:
+        yield new
+    except GeneratorExit:
+        raise  # an abandoned generator, not a failure
+    except BaseException as e:
+        new.end(e)
+        raise
+    finally:
+        if new.end_ns is None:
+            new.end()
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Closed from another context (an async generator finalized
+            # elsewhere): restore the parent by value.
+            _current.set(new.parent)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time a phase under the current span; a no-op outside a trace.
+
+    Outside a trace the yielded object accepts (and ignores) ``set`` and
+    ``mark``, so callers never check for ``None``.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield _NULL_SPAN
+        return
+    with _activate(parent.trace.open(name, parent, attributes)) as new:
+        yield new
+
+
+@contextmanager
+def start_trace(name: str = "prompt", **attributes: Any) -> Iterator[Span]:
+    """Record a new trace rooted at ``name`` for the enclosed prompt.
+
+    On exit the trace becomes :func:`last_trace` and is appended to the
+    ``trace-file``, if one is configured.
+    """
+    trace = Trace(secrets.token_hex(16))
+    root = trace.open(name, None, attributes)
+    try:
+        with _activate(root):
+            yield root
+    finally:
+        _finish(trace)
+
+
+def mark_first_token() -> None:
+    """Record ``time_to_first_token_ms`` on the current span (first call wins)."""
+    current = _current.get()
+    if current is not None:
+        current.mark("time_to_first_token_ms", since="queue_ms")
+
+
+def last_trace() -> Trace | None:
+    """The most recently finished trace of the process (for ``/status``)."""
+    return _last_trace
+
+
+def _finish(trace: Trace) -> None:
+    global _last_trace
+    _last_trace = trace
+    path = _trace_file()
+    if path:
+        export_trace(trace, path)
+
+
+def _trace_file() -> str | None:
+    from janito.config_store import get_config_value
+
+    value = get_config_value("trace-file")
+    return os.path.expanduser(str(value)) if value else None
+
+
+# ---------------------------------------------------------------------------
+# Summaries and export
+# ---------------------------------------------------------------------------
+
+# Attributes shown next to a span in the summaries, in this order.
+_SUMMARY_ATTRIBUTES = (
+    "round",
+    "provider",
+    "tool",
+    "time_to_first_token_ms",
+    "queue_ms",
+    "exec_ms",
+    "speculative",
+    "failed",
+    "cached_tokens",
+    "system_prompt_hash",
+    "system_prompt_bytes",
+)
+
+
+def trace_rows(trace: Trace) -> list[tuple[str, str, str]]:
+    """``(phase, duration, details)`` rows of a trace, indented by depth."""
+    rows = []
+    for s in trace.ordered():
+        details = []
+        for key in _SUMMARY_ATTRIBUTES:
+            if key in s.attributes:
+                value = s.attributes[key]
+                details.append(key if value is True else f"{key}={value}")
+        if s.error:
+            details.append(f"error={s.error}")
+        rows.append(
+            ("  " * s.depth + s.name, f"{s.duration_ms:.1f} ms", " ".join(details))
+        )
+    return rows
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings.
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+def _otlp_span(s: Span) -> dict[str, Any]:
+    otlp = {
+        "traceId": s.trace.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns if s.end_ns is not None else s.start_ns),
+        "attributes": _otlp_attributes(s.attributes),
+        # STATUS_CODE_ERROR = 2, STATUS_CODE_UNSET = 0
+        "status": {"code": 2, "message": s.error} if s.error else {"code": 0},
+    }
+    if s.parent is not None:
+        otlp["parentSpanId"] = s.parent.span_id
+    return otlp
+
+
+def to_otlp(trace: Trace) -> dict[str, Any]:
+    """The trace as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    from janito import __version__
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": "janito"})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": SCOPE_NAME, "version": __version__},
+                        "spans": [_otlp_span(s) for s in trace.ordered()],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def export_trace(trace: Trace, path: str) -> None:
+    """Append the trace to ``path`` as one JSON line (best-effort)."""
+    line = json.dumps(to_otlp(trace), separators=(",", ":"))
+    try:
+        with _export_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        logger.warning(f"Could not write the trace to {path}: {e}")
+
+
+__all__ = [
+    "Span",
+    "Trace",
+    "current_span",
+    "export_trace",
+    "last_trace",
+    "mark_first_token",
+    "span",
+    "start_trace",
+    "to_otlp",
+    "trace_rows",
+]
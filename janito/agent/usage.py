@@ -5,22 +5,36 @@ names the counters differently: Chat Completions reports
 ``prompt_tokens``/``completion_tokens`` (with ``prompt_tokens_details``),
 the Responses API reports ``input_tokens``/``output_tokens`` (with
 ``input_tokens_details``), and the native SDKs (Anthropic / DashScope) build
-a ``SimpleNamespace`` with ``input_tokens``/``output_tokens`` and no
-cached-token details.  :func:`normalize_usage` maps every shape onto one
+a ``SimpleNamespace`` with ``input_tokens``/``output_tokens`` (Anthropic adds
+``input_tokens_details`` with its prompt-cache reads and writes).  :func:`normalize_usage` maps every shape onto one
 dict; the CLI formats it as a Rich summary line
 (``janito.openai_client.client_support._display_usage``) and the web loop
 serializes it as a ``UsageEvent``.
+
+Both loops also sum the usage of every round of the current prompt
+(:func:`add_prompt_usage` / :func:`get_prompt_usage`, reset per prompt like
+the used-files tracker by the CLI) so the batch runner can report it per
+item.  The time spent waiting for the client-side rate limiter
+(:mod:`janito.agent.ratelimit`) is summed alongside as ``queue_ms``.
 """
 
 from typing import Any
 
+# Summed usage of the rounds of the current prompt.
+_prompt_usage: dict[str, int] = {}
+
+#: The counters of a normalized usage dict (see :func:`normalize_usage`).
+PROMPT_USAGE_COUNTERS = ("total", "input", "output", "cached", "cache_write")
+
 
 def normalize_usage(usage: Any) -> dict[str, Any] | None:
-    """Normalize any API usage object into ``{total, input, output, cached}``.
+    """Normalize any API usage object into ``{total, input, output, cached, cache_write}``.
 
-    ``None`` values are preserved (they mean "not reported") so callers can
-    decide how to display each counter.  Returns ``None`` when ``usage``
-    itself is ``None``.
+    ``cached`` counts prompt tokens read from the provider's cache and
+    ``cache_write`` the prompt tokens written to it (reported by Anthropic
+    prompt caching and some OpenAI-compatible gateways).  ``None`` values are
+    preserved (they mean "not reported") so callers can decide how to display
+    each counter.  Returns ``None`` when ``usage`` itself is ``None``.
     """
     if usage is None:
         return None
@@ -38,6 +52,9 @@ def normalize_usage(usage: Any) -> dict[str, Any] | None:
         "input": input_tokens,
         "output": output_tokens,
         "cached": getattr(details, "cached_tokens", None) if details else None,
+        "cache_write": (
+            getattr(details, "cache_write_tokens", None) if details else None
+        ),
     }
 
 
@@ -87,5 +104,39 @@ def usage_event_from_usage(usage: Any, max_tokens: int | None = None):
         input=stats["input"] or 0,
         output=stats["output"] or 0,
         cached=stats["cached"] or 0,
+        cache_write=stats["cache_write"] or 0,
         max_tokens=max_tokens,
     )
+
+
+def reset_prompt_usage() -> None:
+    """Forget the usage summed for the previous prompt."""
+    _prompt_usage.clear()
+
+
+def add_prompt_usage(stats: dict[str, Any] | None) -> None:
+    """Add one round's normalized usage (see :func:`normalize_usage`).
+
+    Counters a round did not report are skipped; ``rounds`` counts the
+    rounds added.
+    """
+    _prompt_usage["rounds"] = _prompt_usage.get("rounds", 0) + 1
+    for key, value in (stats or {}).items():
+        if value is not None:
+            _prompt_usage[key] = _prompt_usage.get(key, 0) + value
+
+
+def add_queue_wait(seconds: float) -> None:
+    """Add time spent waiting for a rate-limit slot (``queue_ms``).
+
+    Not a round: ``rounds`` is left untouched.
+    """
+    if seconds > 0:
+        _prompt_usage["queue_ms"] = _prompt_usage.get("queue_ms", 0) + round(
+            seconds * 1000
+        )
+
+
+def get_prompt_usage() -> dict[str, int]:
+    """The usage summed over the current prompt's rounds (a copy)."""
+    return dict(_prompt_usage)
@@ -0,0 +1,310 @@
+"""
+Terminal driver for the async agent pipeline (``async-pipeline``).
+
+With ``--set async-pipeline=true`` the CLI sends prompts through the same
+native asyncio pipeline as the web interface
+(:func:`janito.agent.pipeline.run_prompt`) instead of the synchronous
+``Client.send`` template method: async SDK clients, tools dispatched off the
+event loop, and cancellation by cancelling the task that drives the prompt.
+This module turns the pipeline's events back into terminal output:
+
+- **Streaming.**  Reasoning (dim) and content tokens are printed as they
+  arrive; a spinner runs while a round waits for its first event.
+- **Tools.**  The captured ``report_*`` lines of each tool are replayed on
+  the console when the call finishes (see
+  :func:`janito.tooling.reporter.replay_report`); failed calls print the
+  same ``Tool error`` line as the synchronous loop.
+- **Bookkeeping.**  Compactions are recorded for the shell's checkpoint
+  remapping; the used-files report and the usage line are printed at the
+  end of the prompt.
+
+The send function returned by :func:`make_async_send_prompt` has the
+interactive shell's union signature (see
+``janito.cli.chat._make_send_prompt_func``).  The history always lives
+client-side in ``previous_messages`` (for every API type), which is mutated
+in place and the assistant text returned, like Completions mode.  Ctrl+C
+cancels the running task; the shell then rolls the history back.  Pressing
+Enter while the model is being waited on (from a round's request to its
+tool calls or the end of the prompt, so never while a tool such as
+``AskUser`` reads stdin) cancels it too, but raises
+:class:`~janito.openai_client.completions_api.RequestCancelled`: the
+history is kept, as with the synchronous loop.
+"""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+from typing import Any
+
+from rich.console import Console
+
+from janito.agent.context import Compaction, record_compaction, reset_compactions
+from janito.agent.events import (
+    CompactionEvent,
+    DoneEvent,
+    ErrorEvent,
+    ImageEvent,
+    ReasoningEvent,
+    TokenEvent,
+    ToolCallEvent,
+    ToolProgressEvent,
+    ToolResultEvent,
+    UsageEvent,
+    WaitingEvent,
+)
+from janito.agent.pipeline import PipelineConfig, run_prompt
+from janito.agent.usage import reset_prompt_usage
+from janito.openai_client.completions_api import RequestCancelled, _is_enter_pressed
+from janito.tooling.changes import clear_changes
+from janito.tooling.reporter import replay_report
+from janito.tooling.used_files import format_used_files
+
+#: Seconds between two checks of stdin for an Enter press.
+ENTER_POLL_SECONDS = 0.1
+
+
+class PipelineError(RuntimeError):
+    """The async pipeline ended a prompt with an error event."""
+
+
+class EventRenderer:
+    """Print the agent events of one prompt in the terminal.
+
+    Args:
+        config: The prompt's pipeline settings (for the usage line).
+        console: The console to print to.
+    """
+
+    def __init__(self, config: PipelineConfig, console: Console) -> None:
+        self.config = config
+        self.console = console
+        self._status = None
+        self._streaming: str | None = None  # "reasoning" | "content" | None
+        self._usage: UsageEvent | None = None
+        #: Whether the prompt is waiting on the model (Enter cancels it).
+        self.awaiting_model = False
+
+    def render(self, event: Any) -> str | None:
+        """Print one event; returns the final content on ``DoneEvent``.
+
+        Raises:
+            PipelineError: On an ``ErrorEvent``.
+        """
+        self._stop_spinner()
+        self._track_wait(event)
+        if isinstance(event, WaitingEvent):
+            self._end_stream()
+            self._status = self.console.status(
+                "Waiting for response from the API server..."
+            )
+            self._status.start()
+        elif isinstance(event, ReasoningEvent):
+            self._stream("reasoning", event.content, style="dim")
+        elif isinstance(event, TokenEvent):
+            self._stream("content", event.content)
+        elif isinstance(event, (ToolProgressEvent, ToolResultEvent)):
+            self._end_stream()
+            self._render_tool_event(event)
+        elif isinstance(event, CompactionEvent):
+            self._render_compaction(event)
+        elif isinstance(event, ImageEvent):
+            self.console.print(f"Image saved: {event.path}", highlight=False)
+        elif isinstance(event, UsageEvent):
+            self._usage = event
+        elif isinstance(event, ErrorEvent):
+            self._end_stream()
+            raise PipelineError(event.message)
+        elif isinstance(event, DoneEvent):
+            self._end_stream()
+            self._render_summary(event.message_count)
+            return event.full_content
+        return None
+
+    def close(self) -> None:
+        """Stop the spinner (the prompt ended or was cancelled)."""
+        self._stop_spinner()
+
+    def _track_wait(self, event: Any) -> None:
+        # A round's request until its tool calls (tools may read stdin) or
+        # the end of the prompt.
+        if isinstance(event, (WaitingEvent, ToolCallEvent, DoneEvent)):
+            self.awaiting_model = isinstance(event, WaitingEvent)
+
+    def _stop_spinner(self) -> None:
+        if self._status is not None:
+            self._status.stop()
+            self._status = None
+
+    def _stream(self, kind: str, text: str, style: str | None = None) -> None:
+        if self._streaming not in (None, kind):
+            self.console.print()
+        self._streaming = kind
+        self.console.print(
+            text, end="", style=style, markup=False, highlight=False, soft_wrap=True
+        )
+
+    def _end_stream(self) -> None:
+        if self._streaming is not None:
+            self.console.print()
+            self._streaming = None
+
+    def _render_tool_event(self, event) -> None:
+        if isinstance(event, ToolProgressEvent):
+            replay_report(event.level, event.message, event.end)
+        elif event.error:
+            print(
+                f"\u274c Tool error: {event.tool_name} - {event.error}",
+                file=sys.stderr,
+            )
+
+    def _render_compaction(self, event: CompactionEvent) -> None:
+        compaction = Compaction(
+            start=event.start,
+            end=event.end,
+            inserted=event.inserted,
+            tokens_before=event.tokens_before,
+            tokens_after=event.tokens_after,
+            summarized_turns=event.summarized_turns,
+            elided_results=event.elided_results,
+        )
+        record_compaction(compaction)
+        self.console.print(f"[dim]{compaction.describe()}[/dim]", highlight=False)
+
+    def _render_summary(self, message_count: int) -> None:
+        used_files_report = format_used_files()
+        if used_files_report:
+            self.console.print(used_files_report, highlight=False)
+        if self._usage is None:
+            return
+        from janito.agent.pipeline.budget import resolve_max_input_tokens
+        from janito.openai_client.client_support import _display_usage
+        from janito.openai_client.completions_api import resolve_runtime_config
+
+        provider = self.config.effective_provider
+        _, _, model = resolve_runtime_config(
+            self.config.model, provider, self.config.api_type
+        )
+        usage = self._usage
+        _display_usage(
+            SimpleNamespace(
+                total_tokens=usage.total,
+                input_tokens=usage.input,
+                output_tokens=usage.output,
+                input_tokens_details=SimpleNamespace(
+                    cached_tokens=usage.cached,
+                    cache_write_tokens=usage.cache_write,
+                ),
+            ),
+            resolve_max_input_tokens(provider, model),
+            usage.max_tokens,
+            message_count,
+            self.console,
+            provider=provider,
+            model=model,
+        )
+
+
+async def _watch_enter(task: asyncio.Task, renderer: EventRenderer) -> bool:
+    """Cancel ``task`` when Enter is pressed while the model is awaited."""
+    while not task.done():
+        if renderer.awaiting_model and _is_enter_pressed():
+            task.cancel()
+            return True
+        await asyncio.sleep(ENTER_POLL_SECONDS)
+    return False
+
+
+async def _render_events(events, renderer: EventRenderer) -> str:
+    async for event in events:
+        content = renderer.render(event)
+        if content is not None:
+            return content
+    raise PipelineError("The prompt ended without a response")
+
+
+async def drive_prompt(
+    prompt: str,
+    messages: list[dict],
+    config: PipelineConfig,
+    tools: list[dict] | None = None,
+    console: Console | None = None,
+) -> str:
+    """Run one prompt through the pipeline, rendering its events.
+
+    Returns:
+        The assistant's final content.
+
+    Raises:
+        PipelineError: The pipeline reported an error (configuration, API or
+            an oversized request).
+        RequestCancelled: Enter was pressed while waiting on the model (the
+            history is kept).
+        asyncio.CancelledError: The driving task was cancelled.
+    """
+    renderer = EventRenderer(config, console or Console())
+    events = run_prompt(prompt, messages, config, tools=tools)
+    rendering = asyncio.ensure_future(_render_events(events, renderer))
+    watcher = asyncio.create_task(_watch_enter(rendering, renderer))
+    try:
+        return await rendering
+    except asyncio.CancelledError:
+        if watcher.done() and not watcher.cancelled() and watcher.result():
+            raise RequestCancelled(
+                "Request cancelled by user (pressed Enter)."
+            ) from None
+        raise
+    finally:
+        watcher.cancel()
+        renderer.close()
+        await events.aclose()
+
+
+def make_async_send_prompt(
+    api_type: str,
+    cli_model: str | None = None,
+    cli_provider: str | None = None,
+    reasoning_level: str | None = None,
+):
+    """Return a send-prompt callable that drives the async pipeline.
+
+    Args:
+        api_type: The canonical API type for the provider.
+        cli_model: Model passed via ``--model``.
+        cli_provider: Provider passed via ``--provider``.
+        reasoning_level: Reasoning depth passed via ``--reasoning-level``.
+    """
+
+    def send(
+        prompt,
+        verbose=False,
+        previous_messages=None,
+        previous_response_id=None,
+        previous_items=None,
+        instructions=None,
+        tools=None,
+        thinking=False,
+    ):
+        # Per-prompt tracking, like Client.send (the pipeline resets the
+        # used-files tracker itself).
+        clear_changes()
+        reset_compactions()
+        reset_prompt_usage()
+        messages = previous_messages
+        if messages is None:
+            messages = []
+            if instructions:
+                messages.append({"role": "system", "content": instructions})
+        config = PipelineConfig(
+            provider=cli_provider,
+            model=cli_model,
+            api_type=api_type,
+            thinking=thinking,
+            reasoning_level=reasoning_level,
+            verbose=verbose,
+        )
+        return asyncio.run(drive_prompt(prompt, messages, config, tools=tools))
+
+    return send
+
+
+__all__ = ["EventRenderer", "PipelineError", "drive_prompt", "make_async_send_prompt"]
@@ -0,0 +1,385 @@
+"""
+``--batch FILE.jsonl``: run many prompts with bounded concurrency.
+
+Scripts that run janito over hundreds of repositories or tickets used to
+start one process per prompt, serially, paying the interpreter start-up,
+plugin loading, tool-registry discovery, MCP connections and SDK client
+creation every time.  The batch runner reads all the prompts from one JSON
+Lines file and runs them through the regular ``Client`` pipeline (the same
+send functions as a single prompt) in a pool of worker processes:
+
+- **Items.**  One JSON object per line: ``prompt`` (required) plus the
+  optional per-item overrides ``id``, ``provider``, ``model``, ``api_type``,
+  ``reasoning_level`` and ``cwd``.  Items without an ``id`` are identified by
+  their line number.  Unknown fields, duplicate ids and invalid providers or
+  API types are reported before anything runs.
+- **Workers.**  ``--batch-concurrency`` worker processes each run one item
+  at a time.  Processes rather than threads, because the working directory
+  (``cwd``) and the per-prompt tracking (``./.janito/changes.jsonl``, the
+  used-files tracker, speculative tool calls) are process-wide.  A worker
+  loads the plugins, the tool registry and the MCP connections once and
+  shares its SDK clients across the items it runs
+  (:func:`~janito.openai_client.base_client.share_sdk_clients`).
+- **Results.**  One NDJSON record per item is written to stdout as soon as
+  the item finishes (in completion order): ``id``, ``status`` (``"ok"`` or
+  ``"error"``), ``content``, ``usage`` (summed over the item's rounds),
+  ``attempts``, ``duration_ms`` and ``error``.  The prompts' own console
+  output is discarded.  The exit status is 1 when any item failed.
+- **Retries.**  Transient failures (rate limits, 5xx, timeouts, connection
+  errors that survive the SDK's own retries and the endpoint pool's
+  failover; see :func:`janito.agent.routing.is_transient`) are retried
+  ``--batch-retries`` times with exponential back-off, honoring
+  ``Retry-After``.  A retry re-runs the whole prompt, tool calls included.
+- **Resume.**  With ``--batch-checkpoint FILE`` the records of the items
+  that succeeded are appended to ``FILE``; a later run with the same
+  checkpoint skips them, so an interrupted or partly failed batch resumes
+  where it stopped.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from ..agent.routing import is_transient
+
+#: Default number of worker processes.
+DEFAULT_CONCURRENCY = 4
+
+#: Default number of retries of a transient failure.
+DEFAULT_RETRIES = 2
+
+# Back-off before retry ``n`` (1-based) when the error carries no
+# Retry-After: RETRY_BASE_DELAY * 2 ** (n - 1) seconds, capped.
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+@dataclass
+class BatchItem:
+    """One prompt of a batch file (see the module docstring)."""
+
+    id: str
+    prompt: str
+    provider: str | None = None
+    model: str | None = None
+    api_type: str | None = None
+    reasoning_level: str | None = None
+    cwd: str | None = None
+
+
+@dataclass
+class BatchSettings:
+    """The session flags every worker applies before running items."""
+
+    config_dir: str | None = None
+    local: bool = False
+    log: str | None = None
+    no_tools: bool = False
+    privileges: Any = None
+    plugins: list[str] | None = None
+    no_plugins: bool = False
+    provider: str | None = None
+    model: str | None = None
+    api_type: str | None = None
+    reasoning_level: str | None = None
+    system_prompt: str | None = None
+    no_system_prompt: bool = False
+    thinking: bool = False
+    retries: int = DEFAULT_RETRIES
+
+    @classmethod
+    def from_args(cls, args) -> BatchSettings:
+        """Collect the settings from the parsed CLI arguments."""
+        from .. import privileges
+
+        values = {f.name: getattr(args, f.name, None) for f in fields(cls)}
+        values.update(
+            privileges=privileges.running_privileges,
+            plugins=args.plugin,
+            retries=args.batch_retries,
+        )
+        return cls(**{key: value for key, value in values.items() if value is not None})
+
+
+# ---------------------------------------------------------------------------
+# Batch file and checkpoint
+# ---------------------------------------------------------------------------
+
+
+def _parse_item(data: Any, line_number: int, base_dir: Path) -> BatchItem:
+    """Validate one decoded line and build its :class:`BatchItem`."""
+    from ..config_keys import normalize_api_type
+    from ..provider_validation import validate_provider_name
+
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    unknown = sorted(set(data) - {f.name for f in fields(BatchItem)})
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    if not isinstance(data.get("prompt"), str) or not data["prompt"].strip():
+        raise ValueError("'prompt' must be a non-empty string")
+    item = BatchItem(**{**data, "id": str(data.get("id", line_number))})
+    if item.provider:
+        item.provider = validate_provider_name(item.provider)
+    if item.api_type:
+        item.api_type = normalize_api_type(item.api_type)
+    if item.cwd:
+        item.cwd = str((base_dir / Path(item.cwd).expanduser()).resolve())
+    return item
+
+
+def load_batch(path: str | Path) -> list[BatchItem]:
+    """Read and validate a batch file (blank lines are skipped).
+
+    Relative ``cwd`` values are resolved against the current directory.
+
+    Raises:
+        ValueError: On an unreadable file, an invalid line or a duplicate id
+            (the message names the line).
+    """
+    try:
+        lines = Path(path).expanduser().read_text(encoding="utf-8").splitlines()
+    except OSError as e:
+        raise ValueError(f"Cannot read batch file {path}: {e}") from e
+    items: list[BatchItem] = []
+    seen: set[str] = set()
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = _parse_item(json.loads(line), line_number, Path.cwd())
+        except ValueError as e:
+            raise ValueError(f"{path}:{line_number}: {e}") from e
+        if item.id in seen:
+            raise ValueError(f"{path}:{line_number}: duplicate id '{item.id}'")
+        seen.add(item.id)
+        items.append(item)
+    return items
+
+
+def load_checkpoint(path: str | Path | None) -> set[str]:
+    """Ids of the items recorded as done in a checkpoint file.
+
+    A missing file is an empty checkpoint; a truncated last line (from an
+    interrupted run) is ignored.
+    """
+    if not path or not Path(path).expanduser().exists():
+        return set()
+    done = set()
+    for line in Path(path).expanduser().read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and record.get("status") == "ok":
+            done.add(str(record.get("id")))
+    return done
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+def _init_worker(settings: BatchSettings) -> None:
+    """Apply the session flags once per worker process."""
+    from .. import privileges
+    from ..config_dir import set_config_dir, set_local_config_mode
+    from ..openai_client.base_client import share_sdk_clients
+    from .logging_config import setup_logging
+
+    # stdout carries the parent's NDJSON records: the prompts' console
+    # output (answers, tool reports, usage lines) is discarded.
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")  # noqa: SIM115
+    set_config_dir(settings.config_dir)
+    set_local_config_mode(settings.local)
+    setup_logging(settings.log)
+    if settings.no_tools:
+        from ..tooling.tools_registry import disable_tools_loading
+
+        disable_tools_loading()
+    privileges.running_privileges = settings.privileges
+    from ..plugin_manager import load_installed_plugins, load_plugins
+
+    if not settings.no_plugins:
+        load_installed_plugins()
+    load_plugins(settings.plugins)
+    share_sdk_clients()
+
+
+def retry_delay(error: BaseException, attempt: int) -> float:
+    """Seconds to wait before retry ``attempt`` (1-based) of ``error``."""
+    response = getattr(error, "response", None)
+    retry_after = getattr(response, "headers", {}).get("retry-after")
+    try:
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    except (TypeError, ValueError):
+        return min(RETRY_BASE_DELAY * 2 ** (attempt - 1), RETRY_MAX_DELAY)
+
+
+def _send(item: BatchItem, settings: BatchSettings) -> tuple[str, dict]:
+    """Run one prompt through the Client pipeline; returns (content, usage)."""
+    from ..agent.usage import get_prompt_usage
+    from ..general_config import resolve_api_type
+    from .chat import _make_send_prompt_func
+    from .session_setup import SessionSetup
+
+    provider = item.provider or settings.provider
+    # --model belongs to --provider: an item naming another provider gets
+    # that provider's configured (else built-in default) model.
+    model = item.model
+    if model is None and item.provider in (None, settings.provider):
+        model = settings.model
+    setup = SessionSetup(
+        system_prompt=settings.system_prompt,
+        no_system_prompt=settings.no_system_prompt,
+    )
+    messages = setup.messages_context()
+    send = _make_send_prompt_func(
+        resolve_api_type(item.api_type or settings.api_type, provider, model),
+        cli_model=model,
+        cli_provider=provider,
+        reasoning_level=item.reasoning_level or settings.reasoning_level,
+    )
+    result = send(
+        item.prompt,
+        previous_messages=messages,
+        instructions=messages[0]["content"] if messages else None,
+        tools=setup.tools_arg(),
+        thinking=settings.thinking,
+    )
+    return getattr(result, "content", result), get_prompt_usage()
+
+
+def run_item(item: BatchItem, settings: BatchSettings) -> dict[str, Any]:
+    """Run one item (in its ``cwd``), retrying transient failures.
+
+    Returns:
+        The item's result record (see the module docstring).
+    """
+    start = time.monotonic()
+    previous_cwd = os.getcwd()
+    attempts = 0
+    record: dict[str, Any] = {"id": item.id}
+    try:
+        if item.cwd:
+            os.chdir(item.cwd)
+        while True:
+            attempts += 1
+            try:
+                content, usage = _send(item, settings)
+            except Exception as e:
+                if attempts <= settings.retries and is_transient(e):
+                    time.sleep(retry_delay(e, attempts))
+                    continue
+                raise
+            record.update(status="ok", content=content, usage=usage, error=None)
+            break
+    except Exception as e:
+        record.update(status="error", content=None, usage=None, error=_describe(e))
+    finally:
+        os.chdir(previous_cwd)
+    record["attempts"] = attempts
+    record["duration_ms"] = round((time.monotonic() - start) * 1000, 1)
+    return record
+
+
+def _describe(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+
+
+def _write_record(stream, record: dict[str, Any]) -> None:
+    stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+    stream.flush()
+
+
+def _run_pool(items, settings, concurrency, checkpoint) -> int:
+    """Run ``items`` in the worker pool; returns the number of failures."""
+    failures = 0
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(concurrency, len(items))),
+        # spawn (not fork): workers start from a clean interpreter on every
+        # platform instead of inheriting the parent's threads and locks.
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(settings,),
+    ) as pool:
+        futures = {pool.submit(run_item, item, settings): item for item in items}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:  # the worker process itself died
+                record = {
+                    "id": futures[future].id,
+                    "status": "error",
+                    "error": _describe(e),
+                }
+            _write_record(sys.stdout, record)
+            if record["status"] != "ok":
+                failures += 1
+            elif checkpoint is not None:
+                _write_record(checkpoint, record)
+    return failures
+
+
+def run_batch(args) -> int:
+    """Run the ``--batch`` file of the parsed CLI arguments.
+
+    Returns:
+        The exit status: 0 when every item succeeded (or was already done),
+        1 when any failed or the batch file is invalid.
+    """
+    try:
+        items = load_batch(args.batch)
+        done = load_checkpoint(args.batch_checkpoint)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    pending = [item for item in items if item.id not in done]
+    if len(pending) < len(items):
+        print(
+            f"Resuming: {len(items) - len(pending)} of {len(items)} item(s) "
+            f"already done in {args.batch_checkpoint}",
+            file=sys.stderr,
+        )
+    if not pending:
+        return 0
+
+    settings = BatchSettings.from_args(args)
+    checkpoint = None
+    if args.batch_checkpoint:
+        path = Path(args.batch_checkpoint).expanduser()
+        checkpoint = path.open("a", encoding="utf-8")
+    try:
+        failures = _run_pool(pending, settings, args.batch_concurrency, checkpoint)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    return 1 if failures else 0
+
+
+__all__ = [
+    "BatchItem",
+    "BatchSettings",
+    "DEFAULT_CONCURRENCY",
+    "DEFAULT_RETRIES",
+    "is_transient",
+    "load_batch",
+    "load_checkpoint",
+    "retry_delay",
+    "run_batch",
+    "run_item",
+]
@@ -1,5 +1,10 @@
 """
 CLI chat execution modes: interactive and single prompt.
+
+``__main__`` imports this module for every command (the version banner), so
+it stays cheap: the API client modules (and their SDKs) are imported by the
+send function of the API type in use, the shell only for an interactive
+session.
 """
 
 import os
@@ -7,9 +12,7 @@ from collections.abc import Callable
 
 from .. import __version__
 from ..general_config import load_provider_from_config, resolve_api_type
-from ..openai_client import RequestCancelled, resolve_runtime_config, send_prompt
 from ..provider_accessors import get_responses_in_server_from_provider
-from ..shell import InteractiveShell
 from ..tooling.path_utils import display_path
 
 # Whether the version banner has already been printed for this process, so it
@@ -18,6 +21,13 @@ from ..tooling.path_utils import display_path
 _banner_printed = False
 
 
+def send_prompt(*args, **kwargs):
+    """``completions_api.send_prompt``, imported on first use."""
+    from ..openai_client.completions_api import send_prompt as send_completions
+
+    return send_completions(*args, **kwargs)
+
+
 def _make_send_prompt_func(
     api_type: str,
     cli_model: str | None = None,
@@ -56,7 +66,29 @@ def _make_send_prompt_func(
         cli_model: Model passed via ``--model``.
         cli_provider: Provider passed via ``--provider``.
         reasoning_level: Reasoning depth passed via ``--reasoning-level``.
+
+    With ``async-pipeline`` enabled every API type is sent through the async
+    agent pipeline shared with the web interface instead (see
+    :mod:`janito.cli.async_send`; the history is kept client-side).
     """
+    from janito.agent.pipeline import load_async_pipeline_enabled
+
+    if load_async_pipeline_enabled():
+        from .async_send import make_async_send_prompt
+
+        return make_async_send_prompt(
+            api_type, cli_model, cli_provider, reasoning_level
+        )
+    return _make_client_send_func(api_type, cli_model, cli_provider, reasoning_level)
+
+
+def _make_client_send_func(
+    api_type: str,
+    cli_model: str | None,
+    cli_provider: str | None,
+    reasoning_level: str | None,
+):
+    """The ``Client``-pipeline send function (see ``_make_send_prompt_func``)."""
     if api_type == "Responses":
         from ..openai_client.conversations_api import send_prompt as send_responses
 
@@ -338,6 +370,8 @@ def run_interactive_chat(args):
     cli_provider = getattr(args, "provider", None)
     cli_reasoning_level = getattr(args, "reasoning_level", None)
     cli_api_type = getattr(args, "api_type", None)
+    from ..openai_client.completions_api import resolve_runtime_config
+
     try:
         _, _, model = resolve_runtime_config(cli_model, cli_provider)
     except ValueError:
@@ -370,6 +404,10 @@ def run_interactive_chat(args):
     # Choose system prompt based on enabled modes
     effective_system_prompt, no_tools = _resolve_system_prompt(args)
 
+    # The shell (prompt_toolkit, the slash commands) is only loaded for an
+    # interactive session, never for a single prompt.
+    from ..shell import InteractiveShell
+
     shell = InteractiveShell(
         model=model,
         no_history=args.no_history,
@@ -410,6 +448,8 @@ def run_single_prompt(args):
     """
     import sys
 
+    from ..openai_client.completions_api import RequestCancelled
+
     _print_full_privileges_warning(args)
     _enable_requested_toolsets(args)
 
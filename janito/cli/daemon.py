@@ -0,0 +1,631 @@
+"""
+``janito --daemon``: a resident process that runs the CLI's single prompts.
+
+Every ``janito "prompt"`` starts cold: the interpreter, the agent loop and
+the API SDK are imported, the plugins are loaded, the tools are discovered,
+each MCP service is spawned and initialized, and the SDK client opens new
+connections (TCP and TLS handshakes) -- hundreds of milliseconds to seconds
+before the first request is even sent.  Scripts and editor integrations
+that call janito many times pay that on every call.  With a daemon running,
+the CLI becomes a thin client of a warm process:
+
+- **Socket.**  The daemon listens on ``daemon.sock`` in the base config
+  directory (``~/.janito``, or the ``-c`` override; a path too long for
+  ``AF_UNIX`` moves under a hashed name to ``$XDG_RUNTIME_DIR``, else to a
+  private ``janito-<uid>`` directory of the temp directory).  The socket is
+  created with mode ``0600``, so only its owner can connect.  Its directory
+  must belong to the user and not be world-writable, and a client only
+  talks to a socket its user owns whose peer (``SO_PEERCRED`` /
+  ``LOCAL_PEERCRED``) runs as that user; the daemon drops peers of other
+  users the same way.  Unix domain sockets are required: the daemon is not
+  available on Windows.
+- **Warm state.**  At start-up the daemon loads the plugins, discovers every
+  tool, starts the MCP services, imports the agent loop and shares its SDK
+  clients across prompts
+  (:func:`~janito.openai_client.base_client.share_sdk_clients`); the config
+  file caches stay warm and are revalidated against the files on every read.
+- **Clients.**  A ``janito`` invocation that would run a single prompt
+  (a prompt argument or piped stdin; not ``--web``, ``--batch``, a flag
+  command or an interactive session) connects to the socket when it exists.
+  It sends its arguments, working directory, terminal properties (whether
+  stdout/stderr are terminals, their size and color variables) and then its
+  stdin; the daemon streams the prompt's stdout and stderr back and ends
+  with the exit status.  Without a daemon, with ``--no-daemon``, or when
+  the daemon declines the invocation, the prompt runs in-process as before.
+- **Per invocation.**  The working directory, ``-l``, ``-r`` / ``-w`` /
+  ``-x`` (the tools are filtered per invocation, see
+  :func:`~janito.tooling.tools_registry.privilege_scope`), ``--log`` and
+  every prompt flag apply to the invocation only.  The flags that shape the
+  warm state (``--no-tools``, ``--no-plugins``, ``--plugin``) must match
+  the daemon's, and so must the janito version; otherwise the daemon
+  declines and the client runs in-process.
+- **One at a time.**  The working directory, the privileges and the
+  per-prompt tracking are process-wide, so the daemon runs one prompt at a
+  time; other clients wait in the socket's backlog.
+- **Cancellation.**  Ctrl-C in the client closes the connection; the
+  daemon interrupts the prompt as if Ctrl-C had been pressed in it.
+- **Idle shutdown.**  The daemon exits (and removes its socket) after
+  ``daemon-idle-timeout`` seconds without a prompt (default
+  :data:`DEFAULT_IDLE_TIMEOUT`; ``0`` keeps it running).  Plugin and MCP
+  configuration changes take effect once it is restarted.
+
+The protocol is JSON Lines over the socket: the client's request object,
+the daemon's ``{"accept": true}`` or ``{"fallback": reason}``, the client's
+``{"stdin": text}``, then ``{"stdout": text}`` / ``{"stderr": text}``
+messages and a final ``{"exit": status}``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import traceback
+from contextlib import contextmanager, redirect_stderr
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+#: Seconds without a prompt before the daemon exits.
+DEFAULT_IDLE_TIMEOUT = 900
+
+#: Socket file name, in the base config directory.
+SOCKET_NAME = "daemon.sock"
+
+# AF_UNIX paths are limited to 104 (macOS) or 108 (Linux) bytes.
+_MAX_SOCKET_PATH = 100
+
+# Seconds a client has to send its request and stdin.
+_HANDSHAKE_TIMEOUT = 30.0
+
+#: Environment variables forwarded with a prompt: the terminal size and
+#: color settings rich reads when it creates a console.
+FORWARDED_ENV = ("COLUMNS", "LINES", "TERM", "COLORTERM", "NO_COLOR", "FORCE_COLOR")
+
+
+def _fallback_dir() -> Path:
+    """The directory of the sockets whose config-dir path is too long."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isabs(runtime) and _is_private_dir(Path(runtime)):
+        return Path(runtime)
+    return Path(tempfile.gettempdir()) / f"janito-{os.getuid()}"
+
+
+def socket_path() -> Path:
+    """The daemon socket of the base config directory."""
+    from ..config_dir import get_base_config_dir
+
+    path = Path(os.path.abspath(get_base_config_dir().expanduser())) / SOCKET_NAME
+    if len(str(path)) > _MAX_SOCKET_PATH:
+        digest = hashlib.sha256(str(path).encode()).hexdigest()[:16]
+        path = _fallback_dir() / f"janito-{digest}.sock"
+    return path
+
+
+def _is_private_dir(path: Path) -> bool:
+    """Whether ``path`` is a real directory of this user, not world-writable."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(st.st_mode)
+        and st.st_uid == os.getuid()
+        and not st.st_mode & stat.S_IWOTH
+    )
+
+
+def _is_trusted_socket(path: Path) -> bool:
+    """Whether ``path`` is a socket of this user in a private directory."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(st.st_mode)
+        and st.st_uid == os.getuid()
+        and _is_private_dir(path.parent)
+    )
+
+
+def _peer_uid(sock: socket.socket) -> int | None:
+    """The user id of the process at the other end (``None``: unknown)."""
+    try:
+        if hasattr(socket, "SO_PEERCRED"):  # Linux: struct ucred
+            creds = sock.getsockopt(
+                socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+            )
+            return struct.unpack("3i", creds)[1]
+        if hasattr(socket, "LOCAL_PEERCRED"):  # BSD / macOS: struct xucred
+            creds = sock.getsockopt(0, socket.LOCAL_PEERCRED, struct.calcsize("2I"))
+            return struct.unpack("2I", creds)[1]
+    except OSError as e:
+        logger.debug(f"Cannot read the daemon socket peer credentials: {e}")
+    return None
+
+
+def _is_own_peer(sock: socket.socket) -> bool:
+    uid = _peer_uid(sock)
+    return uid is None or uid == os.getuid()
+
+
+def _send(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _receive(reader) -> dict[str, Any] | None:
+    """The next message, or ``None`` once the peer closed the connection."""
+    line = reader.readline()
+    return json.loads(line) if line else None
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+
+def _terminal_env() -> dict[str, str]:
+    env = {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ}
+    if sys.stdout.isatty():
+        size = shutil.get_terminal_size()
+        env.setdefault("COLUMNS", str(size.columns))
+        env.setdefault("LINES", str(size.lines))
+    return env
+
+
+def _relay(reader) -> int:
+    """Copy the daemon's output to this process; returns the exit status."""
+    while True:
+        message = _receive(reader)
+        if message is None:
+            print("Error: the janito daemon closed the connection.", file=sys.stderr)
+            return 1
+        if "exit" in message:
+            return message["exit"]
+        for name in ("stdout", "stderr"):
+            if name in message:
+                stream = getattr(sys, name)
+                stream.write(message[name])
+                stream.flush()
+
+
+def forward(args, argv: list[str]) -> int | None:
+    """Run a single prompt in the running daemon.
+
+    Args:
+        args: The parsed CLI arguments.
+        argv: The command-line arguments (without the program name).
+
+    Returns:
+        The prompt's exit status, or ``None`` when it must run in-process:
+        no daemon is listening, the invocation is an interactive session or
+        the daemon declined it.
+    """
+    from .. import __version__
+
+    if sys.platform == "win32" or (args.prompt is None and sys.stdin.isatty()):
+        return None
+    path = socket_path()
+    if not path.exists():
+        return None
+    if not _is_trusted_socket(path):
+        logger.debug(f"Ignoring {path}: not a private socket of this user")
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError as e:
+        logger.debug(f"No janito daemon on {path}: {e}")
+        sock.close()
+        return None
+    if not _is_own_peer(sock):
+        logger.debug(f"Ignoring {path}: the daemon runs as another user")
+        sock.close()
+        return None
+    with sock, sock.makefile("rb") as reader:
+        request = {
+            "version": __version__,
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": _terminal_env(),
+            "tty": [sys.stdout.isatty(), sys.stderr.isatty()],
+        }
+        try:
+            _send(sock, request)
+            reply = _receive(reader)
+        except OSError as e:
+            logger.debug(f"The janito daemon did not answer: {e}")
+            return None
+        if not reply or not reply.get("accept"):
+            logger.debug(f"The janito daemon declined: {(reply or {}).get('fallback')}")
+            return None
+        try:
+            _send(sock, {"stdin": None if sys.stdin.isatty() else sys.stdin.read()})
+            return _relay(reader)
+        except KeyboardInterrupt:
+            # Closing the connection interrupts the prompt in the daemon.
+            print("\nOperation cancelled by user.", file=sys.stderr)
+            return 130
+
+
+# ---------------------------------------------------------------------------
+# Daemon side
+# ---------------------------------------------------------------------------
+
+
+class _RemoteStream(io.TextIOBase):
+    """A text stream sent to the client as ``{name: text}`` messages."""
+
+    def __init__(self, sock: socket.socket, name: str, tty: bool, lock):
+        self._sock = sock
+        self._name = name
+        self._tty = tty
+        self._lock = lock
+        self._gone = False
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text and not self._gone:
+            try:
+                with self._lock:
+                    _send(self._sock, {self._name: text})
+            except OSError:
+                # The client hung up (its prompt is being interrupted): the
+                # rest of the output is discarded.
+                self._gone = True
+        return len(text)
+
+
+def _session_flags(args, cwd: str) -> tuple:
+    """The flags that shape the warm state and must match the daemon's."""
+    plugins = sorted(
+        os.path.join(cwd, os.path.expanduser(p)) for p in args.plugin or []
+    )
+    return bool(args.no_tools), bool(args.no_plugins), tuple(plugins)
+
+
+class Daemon:
+    """The resident process (see the module docstring).
+
+    Args:
+        args: The parsed ``--daemon`` invocation; its session flags
+            (``--no-tools``, ``--no-plugins``, ``--plugin``) apply to every
+            prompt it serves.
+        path: The socket path (default: :func:`socket_path`).
+        idle_timeout: Seconds without a prompt before exiting (``0`` never;
+            default: ``daemon-idle-timeout``).
+    """
+
+    def __init__(self, args, path: Path | None = None, idle_timeout=None):
+        self.args = args
+        self.path = path or socket_path()
+        self.idle_timeout = (
+            _configured_idle_timeout() if idle_timeout is None else idle_timeout
+        )
+        self.session_flags = _session_flags(args, os.getcwd())
+        self._listener: socket.socket | None = None
+        self._client_gone = threading.Event()
+
+    def warm_up(self) -> None:
+        """Load what every prompt needs: plugins, tools, MCP services, SDKs."""
+        from .. import privileges
+        from ..mcp_manager import get_mcp_manager
+        from ..openai_client import completions_api
+        from ..openai_client.base_client import share_sdk_clients
+        from ..plugin_manager import load_installed_plugins, load_plugins
+        from ..tooling.tools_registry import get_all_tools, tools_loading_enabled
+        from . import chat  # noqa: F401 - the agent loop
+
+        # Discover every tool: each prompt filters them by its own flags.
+        privileges.running_privileges = None
+        if not self.args.no_plugins:
+            load_installed_plugins()
+        if self.args.plugin:
+            load_plugins(self.args.plugin)
+        get_all_tools()
+        if tools_loading_enabled():
+            try:
+                get_mcp_manager().load_services()
+            except Exception as e:
+                logger.warning(f"Failed to load MCP services: {e}")
+        completions_api.OpenAI  # noqa: B018 - imports the SDK
+        share_sdk_clients()
+
+    def serve_forever(self) -> None:
+        """Serve prompts until the idle timeout (or SIGTERM / Ctrl-C)."""
+        if self._listener is None:
+            self.listen()
+        # Cancellations arrive as SIGINT, which a shell ignores in the
+        # background jobs of a script (``janito --daemon &``).
+        previous = {
+            signal.SIGINT: signal.signal(signal.SIGINT, signal.default_int_handler),
+            signal.SIGTERM: signal.signal(signal.SIGTERM, _exit_on_sigterm),
+        }
+        try:
+            while True:
+                try:
+                    conn, _ = self._listener.accept()
+                    with conn:
+                        self.handle(conn)
+                except TimeoutError:
+                    logger.info("janito daemon idle, exiting")
+                    return
+                except KeyboardInterrupt:
+                    # A client's late cancellation, not the operator's Ctrl-C.
+                    if not self._client_gone.is_set():
+                        raise
+                    self._client_gone.clear()
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+            self.close()
+
+    def listen(self) -> None:
+        """Create the socket (replacing a stale one).
+
+        Raises:
+            OSError: The socket's directory is not private to this user.
+        """
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private_dir(self.path.parent):
+            raise OSError(
+                f"{self.path.parent} must belong to this user and not be "
+                "world-writable"
+            )
+        self.path.unlink(missing_ok=True)  # stale: nothing answered on it
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o177)  # the socket is created 0600
+        try:
+            listener.bind(str(self.path))
+        finally:
+            os.umask(umask)
+        listener.listen(16)
+        listener.settimeout(self.idle_timeout or None)
+        self._listener = listener
+
+    def close(self) -> None:
+        """Stop listening and remove the socket."""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            self.path.unlink(missing_ok=True)
+
+    def handle(self, conn: socket.socket) -> None:
+        """Serve one client connection."""
+        if not _is_own_peer(conn):
+            logger.warning("Dropped a daemon client of another user")
+            return
+        conn.settimeout(_HANDSHAKE_TIMEOUT)
+        with conn.makefile("rb") as reader:
+            try:
+                request = _receive(reader)
+                args, reason = self._accept(request)
+                if args is None:
+                    _send(conn, {"fallback": reason})
+                    return
+                _send(conn, {"accept": True})
+                stdin = (_receive(reader) or {}).get("stdin")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropped a daemon client: {e}")
+                return
+            conn.settimeout(None)
+            self._client_gone.clear()
+            done = threading.Event()
+            threading.Thread(
+                target=self._watch, args=(reader, done), daemon=True
+            ).start()
+            try:
+                exit_code = self._run(conn, request, args, stdin)
+            except KeyboardInterrupt:
+                exit_code = 130
+            done.set()
+            try:
+                _send(conn, {"exit": exit_code})
+                conn.shutdown(socket.SHUT_RDWR)  # ends the watcher's read
+            except OSError:
+                pass  # the client is gone
+
+    def _accept(self, request) -> tuple[Any, str | None]:
+        """Parse a request: ``(args, None)``, or ``(None, reason)`` to decline."""
+        from .. import __version__
+        from .parser import create_parser
+
+        if not isinstance(request, dict):
+            return None, "invalid request"
+        if request.get("version") != __version__:
+            return None, f"the daemon runs janito {__version__}"
+        try:
+            # An invalid command line is reported by the in-process run.
+            with redirect_stderr(io.StringIO()):
+                args = create_parser().parse_args(request["argv"])
+        except (SystemExit, KeyError, TypeError):
+            return None, "invalid arguments"
+        if _session_flags(args, request["cwd"]) != self.session_flags:
+            return None, "--no-tools, --no-plugins or --plugin differ"
+        return args, None
+
+    def _watch(self, reader, done: threading.Event) -> None:
+        """Interrupt the running prompt when its client disconnects."""
+        try:
+            reader.read()
+        except (OSError, ValueError):
+            pass
+        if not done.is_set():
+            self._client_gone.set()
+            signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+
+    def _run(self, conn, request: dict, args, stdin: str | None) -> int:
+        """Run the prompt with the client's cwd, streams and flags."""
+        with _invocation(conn, request):
+            try:
+                return _run_prompt(args, stdin) or 0
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+                    return 1
+                return e.code or 0
+            except KeyboardInterrupt:
+                print("\nOperation cancelled by user.", file=sys.stderr)
+                return 130
+            except Exception:
+                traceback.print_exc()
+                return 1
+
+
+def _exit_on_sigterm(signum, frame) -> None:
+    raise SystemExit(0)
+
+
+def _configured_idle_timeout() -> float:
+    from ..config_store import get_config_value
+
+    value = get_config_value("daemon-idle-timeout")
+    if value is None:
+        return float(DEFAULT_IDLE_TIMEOUT)
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid daemon-idle-timeout value: {value!r}")
+        return float(DEFAULT_IDLE_TIMEOUT)
+
+
+@contextmanager
+def _invocation(conn: socket.socket, request: dict):
+    """Apply a client's cwd, streams and terminal; restore the daemon's after."""
+    from .. import privileges
+    from ..config_dir import set_local_config_mode
+    from . import chat
+
+    lock = threading.Lock()
+    stdout_tty, stderr_tty = request.get("tty") or (False, False)
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    saved_env = {name: os.environ.get(name) for name in FORWARDED_ENV}
+    saved_cwd = os.getcwd()
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    sys.stdin = io.StringIO()
+    sys.stdout = _RemoteStream(conn, "stdout", bool(stdout_tty), lock)
+    sys.stderr = _RemoteStream(conn, "stderr", bool(stderr_tty), lock)
+    for name in FORWARDED_ENV:
+        os.environ.pop(name, None)
+    os.environ.update(request.get("env") or {})
+    try:
+        os.chdir(request["cwd"])
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        privileges.running_privileges = None
+        set_local_config_mode(False)
+        chat._banner_printed = False
+
+
+def _run_prompt(args, stdin: str | None) -> int | None:
+    """The single-prompt path of ``main()`` for one invocation."""
+    from ..__main__ import _setup_runtime
+    from ..tooling.tools_registry import privilege_scope
+    from . import chat
+    from .setup import validate_runtime_config
+
+    exit_code = _setup_runtime(args)
+    if exit_code is not None:
+        return exit_code
+    if not args.no_plugins or args.plugin:
+        chat.print_version_banner()
+    validate_runtime_config(args)
+    if stdin is not None:
+        if not stdin.strip():
+            print("Error: Empty prompt provided via stdin.", file=sys.stderr)
+            return 1
+        args.prompt = stdin.strip()
+    with privilege_scope():
+        chat.run_single_prompt(args)
+    return None
+
+
+def _is_listening(path: Path) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def serve(args) -> int:
+    """Run ``janito --daemon`` until it is idle for ``daemon-idle-timeout``.
+
+    Returns:
+        The exit status: 1 on Windows, when a daemon already listens on
+        the socket or when the socket cannot be created.
+    """
+    if sys.platform == "win32":
+        print(
+            "Error: --daemon needs Unix domain sockets and is not supported "
+            "on Windows.",
+            file=sys.stderr,
+        )
+        return 1
+    daemon = Daemon(args)
+    if _is_listening(daemon.path):
+        print(
+            f"Error: a janito daemon is already listening on {daemon.path}",
+            file=sys.stderr,
+        )
+        return 1
+    daemon.warm_up()
+    try:
+        daemon.listen()
+    except OSError as e:
+        print(f"Error: cannot listen on {daemon.path}: {e}", file=sys.stderr)
+        return 1
+    timeout = f"{daemon.idle_timeout:g} s" if daemon.idle_timeout else "none"
+    print(
+        f"janito daemon listening on {daemon.path} (idle timeout: {timeout})",
+        file=sys.stderr,
+    )
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+__all__ = [
+    "DEFAULT_IDLE_TIMEOUT",
+    "Daemon",
+    "FORWARDED_ENV",
+    "SOCKET_NAME",
+    "forward",
+    "serve",
+    "socket_path",
+]
@@ -1,25 +1,48 @@
-"""CLI command handlers."""
+"""CLI command handlers.
+
+Each handler module is imported on first use (PEP 562), so a command only
+loads its own handler's dependencies (e.g. ``--get`` never loads the plugin
+or MCP managers).
+"""
+
+# handler name -> the module defining it
+_HANDLER_MODULES = {
+    "handle_config_interactive": "config",
+    "handle_create_variant": "variants",
+    "handle_delete_secret": "secrets",
+    "handle_delete_variant": "variants",
+    "handle_get_config": "config",
+    "handle_get_secret": "secrets",
+    "handle_info": "info",
+    "handle_install_plugin": "plugins",
+    "handle_install_skill": "skills",
+    "handle_list_keys": "auth",
+    "handle_list_mcp": "tools",
+    "handle_list_models": "models",
+    "handle_list_plugins": "plugins",
+    "handle_list_secrets": "secrets",
+    "handle_list_skills": "skills",
+    "handle_list_tools": "tools",
+    "handle_set_api_key": "auth",
+    "handle_set_config": "config",
+    "handle_set_secret": "secrets",
+    "handle_show_config": "info",
+    "handle_show_providers": "providers",
+    "handle_show_system_prompt": "info",
+    "handle_uninstall_plugin": "plugins",
+    "handle_uninstall_skill": "skills",
+    "handle_unset_config": "config",
+}
+
+
+def __getattr__(name):
+    module = _HANDLER_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    return getattr(importlib.import_module(f".{module}", __name__), name)
 
-from .auth import handle_list_keys, handle_set_api_key
-from .config import (
-    handle_config_interactive,
-    handle_get_config,
-    handle_set_config,
-    handle_unset_config,
-)
-from .info import handle_info, handle_show_config, handle_show_system_prompt
-from .models import handle_list_models
-from .plugins import handle_install_plugin, handle_list_plugins, handle_uninstall_plugin
-from .providers import handle_show_providers
-from .secrets import (
-    handle_delete_secret,
-    handle_get_secret,
-    handle_list_secrets,
-    handle_set_secret,
-)
-from .skills import handle_install_skill, handle_list_skills, handle_uninstall_skill
-from .tools import handle_list_mcp, handle_list_tools
-from .variants import handle_create_variant, handle_delete_variant
 
 __all__ = [
     "handle_config_interactive",
@@ -2,8 +2,6 @@
 
 import sys
 
-import questionary
-
 from ...auth_config import get_api_key, set_api_key
 from ...config_cli import (
     ProviderRequiredError,
@@ -188,6 +186,9 @@ def _prompt_provider(existing_provider: str | None) -> str | None:
     # Pre-select the currently configured provider when it is one of the
     # supported choices (a hand-edited config may contain an unknown name).
     default = existing_provider if existing_provider in supported else None
+    # prompt_toolkit (under questionary) is only loaded for --config.
+    import questionary
+
     try:
         provider = questionary.select(
             "Select a provider",
@@ -289,7 +289,7 @@ def handle_show_system_prompt(args) -> int:
     from rich.console import Console
     from rich.table import Table
 
-    from ...system_prompt import SECTION_SKILLS, sync_default_sections
+    from ...system_prompt import SECTION_SKILLS, describe_prompt, sync_default_sections
 
     console = Console(markup=False)
 
@@ -301,6 +301,7 @@ def handle_show_system_prompt(args) -> int:
             title_style="bold",
             header_style="bold cyan",
             show_header=False,
+            caption=describe_prompt(prompt),
         )
         table.add_column("Content", overflow="fold")
         table.add_row(prompt.strip())
@@ -327,6 +328,7 @@ def handle_show_system_prompt(args) -> int:
         title=title,
         title_style="bold",
         header_style="bold cyan",
+        caption=describe_prompt(manager.render()),
     )
     table.add_column("Section", style="green", no_wrap=True)
     table.add_column("Lines", justify="right")
@@ -6,8 +6,6 @@ import tempfile
 import zipfile
 from pathlib import Path
 
-import requests
-
 from ...plugin_manager import (
     LOADED_PLUGINS,
     get_default_plugins_dir,
@@ -95,6 +93,8 @@ def _parse_github_repo_url(url: str) -> tuple[str, str]:
 
 def _download_zip(url: str, dest_path: Path) -> bool:
     """Download ``url`` to ``dest_path``; returns False on failure."""
+    import requests
+
     print(f"Downloading {url}...")
     try:
         response = requests.get(url, stream=True, timeout=60)
@@ -95,6 +95,8 @@ Examples:
   janito --uninstall-plugin codesearch                  # Uninstall an installed plugin by name
   janito --plugin ../plugins/janito-codesearch-plugin  # Load the codesearch plugin (tools, /codesearch)
   janito --list-plugins                                     # List loaded plugins and their on_start errors
+  janito --batch prompts.jsonl --batch-concurrency 8 > results.ndjson  # Run many prompts, NDJSON results
+  janito --daemon &                                         # Keep a warm daemon; later prompts run in it
   janito --create-variant alibaba-tokenplan                  # Register a provider variant (<provider>-<word>)
   janito --provider alibaba-tokenplan --set model=qwen-plus  # Configure the variant (per-variant model)
   janito --set-api-key sk-xxx --provider alibaba-tokenplan   # Store an API key for the variant
@@ -140,7 +142,8 @@ Note: --set and --set-api-key must be used in separate commands.
         "--verbose",
         action="store_true",
         help="Enable verbose output: model/backend/MCP info plus the API call "
-        "parameters (messages shown as tail only) and a response summary",
+        "parameters (messages shown as tail only), a response summary and the "
+        "timed phases of the prompt",
     )
 
     parser.add_argument(
@@ -460,6 +463,56 @@ Note: --set and --set-api-key must be used in separate commands.
         "Refuses to delete the configured default provider.",
     )
 
+    # --- Batch mode ---
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help='Run the prompts of a JSON Lines file (one {"prompt": ...} '
+        "object per line, with optional id/provider/model/api_type/"
+        "reasoning_level/cwd overrides) and write one NDJSON result per "
+        "prompt to stdout",
+    )
+
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Number of prompts run at the same time (default: 4, used with "
+        "--batch)",
+    )
+
+    parser.add_argument(
+        "--batch-retries",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Retries of a prompt failing with a transient error (rate limit, "
+        "5xx, timeout, connection error; default: 2, used with --batch)",
+    )
+
+    parser.add_argument(
+        "--batch-checkpoint",
+        metavar="FILE",
+        help="Append the results of successful prompts to FILE and skip the "
+        "prompts already recorded there (resume, used with --batch)",
+    )
+
+    # --- Resident daemon ---
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a resident process that serves later single prompts over a "
+        "per-user Unix socket, with plugins, tools, MCP services and SDK "
+        "clients kept warm (stops after daemon-idle-timeout seconds idle)",
+    )
+
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run the prompt in this process even when a daemon is running",
+    )
+
     # --- Web UI options ---
     parser.add_argument(
         "--web",
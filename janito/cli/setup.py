@@ -13,8 +13,6 @@ of failing deep inside the API call.
 
 import sys
 
-from ..openai_client.completions_api import resolve_runtime_config
-
 
 def validate_runtime_config(args=None) -> None:
     """Validate that the runtime configuration can be resolved.
@@ -33,6 +31,8 @@ def validate_runtime_config(args=None) -> None:
     """
     cli_model = getattr(args, "model", None) if args is not None else None
     cli_provider = getattr(args, "provider", None) if args is not None else None
+    from ..openai_client.completions_api import resolve_runtime_config
+
     try:
         resolve_runtime_config(cli_model, cli_provider)
     except ValueError as e:
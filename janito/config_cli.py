@@ -11,7 +11,7 @@ on read/write primitives.
 Provider-scoped keys (``model``, ``endpoint``) land under
 ``providers.<provider>.<key>``; model-scoped keys (``max-output-tokens``,
 ``max-input-tokens``, ``reasoning-level``, ``api-type``,
-``responses-in-server``) land under
+``responses-in-server``, ``prompt-caching``) land under
 ``providers.<provider>.models.<model>.<key>``, where the model is the
 provider's configured model or, failing that, its built-in default model.
 """
@@ -210,6 +210,10 @@ def set_config_from_cli(
 
     # Coerce values for keys that should be stored as integers.
     base_key = key.rsplit(".", 1)[-1]
+    if base_key == "pool":
+        from .config_variants import normalize_pool
+
+        value = normalize_pool(key.rsplit(".", 1)[0], value)
     if base_key in INT_VALUED_KEYS:
         value = _coerce_int_value(key, value)
 
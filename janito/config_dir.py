@@ -92,6 +92,15 @@ def get_config_dir() -> Path:
     return _config_dir
 
 
+def get_base_config_dir() -> Path:
+    """Get the base configuration directory, ignoring ``-l`` / ``--local``.
+
+    Returns:
+        Path: ``~/.janito``, or the value set via :func:`set_config_dir`.
+    """
+    return _config_dir
+
+
 def get_config_dirs() -> list[Path]:
     """Get the configuration directories used for resolution, in priority order.
 
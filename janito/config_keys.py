@@ -12,25 +12,48 @@ on read/write primitives.
 PROVIDER_SCOPED_KEYS = {
     "model",
     "endpoint",
+    "rate-limit-rpm",
+    "rate-limit-tpm",
+    "pool",
 }
 
 # Config keys that are stored per-provider *and* per-model (as
 # ``<provider>.models.<model>.<key>``).  These carry model-level settings
-# (token limits, reasoning level, API type, Responses-in-server flag), so
-# each provider/model pair keeps its own values.
+# (token limits, reasoning level, API type, Responses-in-server and
+# prompt-caching flags), so each provider/model pair keeps its own values.
 MODEL_SCOPED_KEYS = {
     "max-input-tokens",
     "max-output-tokens",
     "reasoning-level",
     "api-type",
     "responses-in-server",
+    "prompt-caching",
 }
 
 # Config keys whose values should be coerced to int when set via CLI.
-INT_VALUED_KEYS = {"max-input-tokens", "max-output-tokens"}
+INT_VALUED_KEYS = {
+    "blob-threshold",
+    "compact-threshold",
+    "daemon-idle-timeout",
+    "max-input-tokens",
+    "max-output-tokens",
+    "mcp-health-interval",
+    "mcp-idle-ttl",
+    "rate-limit-rpm",
+    "rate-limit-tpm",
+    "skills-prompt-tokens",
+    "tool-schema-budget",
+}
 
 # Config keys whose values should be coerced to bool when set via CLI.
-BOOL_VALUED_KEYS = {"responses-in-server"}
+BOOL_VALUED_KEYS = {
+    "responses-in-server",
+    "prompt-caching",
+    "live-render",
+    "speculative-tools",
+    "async-pipeline",
+    "supersede-tool-results",
+}
 
 
 def split_model_scoped_key(key: str) -> tuple[str, str, str] | None:
@@ -248,6 +248,34 @@ class ProviderConfigLoader:
             bool: The configured override (``True``/``False``), or ``None`` when
                 no override is stored (the built-in default applies).
         """
+        return self._load_model_scoped_bool("responses-in-server", cli_provider, model)
+
+    def load_prompt_caching(
+        self, cli_provider: str | None = None, model: str | None = None
+    ) -> bool | None:
+        """Load the prompt-caching override for a provider/model from config.json.
+
+        The override is stored under a model-scoped key
+        (``providers.<provider>.models.<model>.prompt-caching``) and decides
+        whether native Anthropic requests carry ``cache_control``
+        breakpoints.
+
+        Args:
+            cli_provider: Provider passed via ``--provider`` (may be None). If
+                not provided, the provider is read from config.json.
+            model: The model the value belongs to. ``None`` resolves to the
+                provider's configured model, else its built-in default model.
+
+        Returns:
+            bool: The configured override (``True``/``False``), or ``None`` when
+                no override is stored (the built-in default applies).
+        """
+        return self._load_model_scoped_bool("prompt-caching", cli_provider, model)
+
+    def _load_model_scoped_bool(
+        self, leaf: str, cli_provider: str | None, model: str | None
+    ) -> bool | None:
+        """Read a boolean model-scoped key (``None`` when it is not stored)."""
         from .config_keys import model_scoped_config_key
         from .config_store import get_config_value
 
@@ -257,9 +285,7 @@ class ProviderConfigLoader:
         model = self._resolve_model(cli_provider, model)
         if not model:
             return None
-        value = get_config_value(
-            model_scoped_config_key(provider, model, "responses-in-server")
-        )
+        value = get_config_value(model_scoped_config_key(provider, model, leaf))
         if value is None:
             return None
         # Tolerate string forms written by hand/older configs ("true"/"false").
@@ -431,6 +457,28 @@ def load_responses_in_server_from_config(
     return _loader.load_responses_in_server(cli_provider, model)
 
 
+def load_prompt_caching_from_config(
+    cli_provider: str | None = None,
+    model: str | None = None,
+) -> bool | None:
+    """Load the prompt-caching override for a provider/model from config.json.
+
+    The override is stored under a model-scoped key
+    (``providers.<provider>.models.<model>.prompt-caching``).
+
+    Args:
+        cli_provider: Provider passed via ``--provider`` (may be None). If not
+            provided, the provider is read from config.json.
+        model: The model the value belongs to. ``None`` resolves to the
+            provider's configured model, else its built-in default model.
+
+    Returns:
+        bool: The configured override (``True``/``False``), or ``None`` when
+            no override is stored (the built-in default applies).
+    """
+    return _loader.load_prompt_caching(cli_provider, model)
+
+
 def load_endpoint_from_config(cli_provider: str | None = None) -> str | None:
     """Load custom endpoint URL from ~/.janito/config.json if it exists.
 
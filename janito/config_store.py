@@ -6,8 +6,15 @@ model-scoped key handling) plus the module-level delegating functions
 (``load_config``, ``save_config``, ``get_config_value``, ``set_config_value``,
 ``unset_config_value``).  Extracted from :mod:`janito.general_config` so the
 core config module stays focused on resolution and provider helpers.
+
+The merged config is cached in :data:`janito.json_store.json_file_cache`
+(validated by stat-ing the files on every lookup, invalidated on save), so
+``get_config_value`` no longer re-reads and re-merges the files each time.
+Saves replace the file atomically and ``set`` / ``unset`` hold its advisory
+lock for the whole read-modify-write (see :func:`janito.json_store.locked`).
 """
 
+import copy
 import json
 import logging
 from pathlib import Path
@@ -15,6 +22,7 @@ from typing import Any
 
 from .config_dir import get_config_dir, get_config_file_paths
 from .config_keys import PROVIDER_SCOPED_KEYS, split_model_scoped_key
+from .json_store import atomic_write_json, json_file_cache, locked
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -104,8 +112,17 @@ class ConfigStore:
         so local values take precedence; otherwise the single base file is read.
 
         Returns:
-            Dict containing the config, or empty dict if no file exists or is invalid
+            Dict containing the config (a copy the caller may modify), or
+            empty dict if no file exists or is invalid
         """
+        return copy.deepcopy(self._view())
+
+    def _view(self) -> dict[str, Any]:
+        """The cached merged config (shared, read-only)."""
+        return json_file_cache.get(get_config_paths(), self._read)
+
+    def _read(self) -> dict[str, Any]:
+        """Read and merge the config files (see :meth:`load`)."""
         paths = get_config_paths()
         if not any(path.exists() for path in paths):
             logger.debug("Config file not found")
@@ -123,7 +140,7 @@ class ConfigStore:
         return merged
 
     def save(self, config: dict[str, Any]) -> None:
-        """Save the config dictionary to config.json.
+        """Save the config dictionary to config.json (replaced atomically).
 
         Args:
             config: Dictionary to save to config.json
@@ -132,9 +149,8 @@ class ConfigStore:
             IOError: If unable to write to the config file
         """
         config_path = get_config_path()
-        config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        with locked(config_path):
+            atomic_write_json(config_path, config)
         logger.debug(f"Saved config to {config_path}")
 
     def get(self, key: str) -> Any | None:
@@ -150,7 +166,13 @@ class ConfigStore:
         Returns:
             The config value, or None if not found or config file doesn't exist
         """
-        config = self.load()
+        value = self._lookup(self._view(), key)
+        # The cached config is shared: hand out a private copy of containers.
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    @staticmethod
+    def _lookup(config: dict[str, Any], key: str) -> Any | None:
+        """Resolve a (flat, provider- or model-scoped) key in ``config``."""
 
         # Model-scoped key (<provider>.models.<model>.<key>).
         model_scoped = split_model_scoped_key(key)
@@ -232,6 +254,10 @@ class ConfigStore:
             value: The value to set
         """
         logger.debug(f"Setting config '{key}' = {value}")
+        with locked(get_config_path()):
+            self._set(key, value)
+
+    def _set(self, key: str, value: Any) -> None:
         # Writes target the primary config file only (never the merged view),
         # so a --set in -l/--local mode stores the value in ./.janito without
         # copying the global entries into the local file.
@@ -274,6 +300,10 @@ class ConfigStore:
         Returns:
             bool: True if the key was removed, False if it didn't exist
         """
+        with locked(get_config_path()):
+            return self._unset(key)
+
+    def _unset(self, key: str) -> bool:
         # Writes target the primary config file only (see set).
         config = _load_config_file(get_config_path())
 
@@ -11,6 +11,11 @@ provider's built-in defaults (model, endpoint, API types, token limits,
 reasoning, thinking) while keeping its own per-variant overrides
 (``providers.<name>.*``) and its own API key in auth.json.
 
+Variants also make up **endpoint pools**: ``janito -p openai --set
+pool=openai-work,openai-backup`` lets prompts to ``openai`` spread over the
+provider and the listed variants (each with its own key and endpoint) and
+fail over between them (see :mod:`janito.agent.routing`).
+
 Extracted from :mod:`janito.general_config` so the core config module stays
 focused on resolution and provider helpers.
 """
@@ -19,6 +24,7 @@ import logging
 
 from .config_keys import normalize_provider
 from .config_store import _load_config_file, _store, get_config_path, get_config_value
+from .json_store import locked
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -118,19 +124,19 @@ def create_variant(name: str) -> str:
             f"Supported providers: {supported}"
         )
 
-    if is_registered_variant(normalized):
-        raise ValueError(f"Provider variant '{normalized}' already exists.")
-
     # Write to the primary config file only (never the merged view), the same
-    # write target --set / --unset use.  The variant is registered as an
-    # entry of the ``providers`` map.
-    config = _load_config_file(get_config_path())
-    providers = config.get("providers")
-    if not isinstance(providers, dict):
-        providers = {}
-        config["providers"] = providers
-    providers[normalized] = {}
-    _store.save(config)
+    # write target --set / --unset use (under the same lock).  The variant is
+    # registered as an entry of the ``providers`` map.
+    with locked(get_config_path()):
+        if is_registered_variant(normalized):
+            raise ValueError(f"Provider variant '{normalized}' already exists.")
+        config = _load_config_file(get_config_path())
+        providers = config.get("providers")
+        if not isinstance(providers, dict):
+            providers = {}
+            config["providers"] = providers
+        providers[normalized] = {}
+        _store.save(config)
     logger.info(f"Created provider variant '{normalized}'")
     return normalized
 
@@ -173,13 +179,14 @@ def delete_variant(name: str) -> bool:
 
     # Remove the variant's providers entry (its registration marker and any
     # per-variant config keys) from the primary config file.
-    config = _load_config_file(get_config_path())
-    providers = config.get("providers")
-    if isinstance(providers, dict) and normalized in providers:
-        del providers[normalized]
-        if not providers:
-            del config["providers"]
-        _store.save(config)
+    with locked(get_config_path()):
+        config = _load_config_file(get_config_path())
+        providers = config.get("providers")
+        if isinstance(providers, dict) and normalized in providers:
+            del providers[normalized]
+            if not providers:
+                del config["providers"]
+            _store.save(config)
 
     # Remove the variant's API key from auth.json (best-effort; a missing
     # key is not an error).
@@ -187,3 +194,64 @@ def delete_variant(name: str) -> bool:
 
     logger.info(f"Deleted provider variant '{normalized}'")
     return True
+
+
+def _base_provider(name: str) -> str:
+    """The built-in provider a provider or variant name derives from."""
+    from .provider_registry import parse_variant_name
+
+    parsed = parse_variant_name(name) if is_registered_variant(name) else None
+    return parsed[0] if parsed else name
+
+
+def normalize_pool(provider: str, value: str | list) -> str:
+    """Validate a ``pool`` value for ``provider`` and return its canonical form.
+
+    A pool lists providers or variants (comma-separated) that share
+    ``provider``'s base provider, so a request can go to any of them with
+    the same model.  ``provider`` itself is always the pool's first member
+    and need not be listed.
+
+    Args:
+        provider: The provider the pool belongs to.
+        value: The member names (a comma-separated string or a list).
+
+    Returns:
+        The canonical comma-separated member list (``""`` clears the pool).
+
+    Raises:
+        ValueError: If a member is unknown or derives from another provider.
+    """
+    from .provider_validation import validate_provider_name
+
+    names = value.split(",") if isinstance(value, str) else list(value)
+    base = _base_provider(normalize_provider(provider))
+    members: list[str] = []
+    for name in names:
+        if not str(name).strip():
+            continue
+        member = validate_provider_name(str(name).strip())
+        if _base_provider(normalize_provider(member)) != base:
+            raise ValueError(
+                f"Pool member '{member}' is not a variant of '{base}'. "
+                f"A pool may only list {base} and its variants ({base}-<word>)."
+            )
+        if member != provider and member not in members:
+            members.append(member)
+    return ",".join(members)
+
+
+def load_pool(provider: str) -> list[str]:
+    """The members of ``provider``'s endpoint pool, ``provider`` first.
+
+    Returns ``[provider]`` when no ``pool`` is configured.
+    """
+    value = get_config_value(f"{provider}.pool")
+    members = [provider]
+    if isinstance(value, str):
+        value = value.split(",")
+    for name in value or []:
+        name = str(name).strip()
+        if name and name not in members:
+            members.append(name)
+    return members
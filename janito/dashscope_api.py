@@ -213,11 +213,11 @@ class DashScopeClient(Client):
     api_type = "DashScope"
     backend_default = "https://dashscope-intl.aliyuncs.com/api/v1"
 
-    def _resolve_runtime_config(self):
+    def _resolve_runtime_config(self, provider=None):
         # This module is the "DashScope" API type, so endpoint resolution
         # picks the native-SDK base URL from the endpoint_by_api_type map.
         return resolve_runtime_config(
-            self.cli_model, self.cli_provider, cli_api_type="DashScope"
+            self.cli_model, provider or self.cli_provider, cli_api_type="DashScope"
         )
 
     def _create_sdk_client(self, base_url, api_key):
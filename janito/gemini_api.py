@@ -199,11 +199,11 @@ class GeminiClient(Client):
     api_type = "Gemini"
     backend_default = "https://generativelanguage.googleapis.com"
 
-    def _resolve_runtime_config(self):
+    def _resolve_runtime_config(self, provider=None):
         # This module is the "Gemini" API type, so endpoint resolution picks
         # the native-SDK base URL from the endpoint_by_api_type map.
         return resolve_runtime_config(
-            self.cli_model, self.cli_provider, cli_api_type="Gemini"
+            self.cli_model, provider or self.cli_provider, cli_api_type="Gemini"
         )
 
     def _create_sdk_client(self, base_url, api_key):
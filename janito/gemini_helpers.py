@@ -16,6 +16,7 @@ from typing import Any
 
 from rich.console import Console
 
+from janito.agent.history_cache import converted_history
 from janito.config_loaders import load_max_input_tokens, load_max_output_tokens
 from janito.openai_client.client_support import _display_usage
 from janito.provider_accessors import (
@@ -176,24 +177,33 @@ def _messages_to_contents(
     """
     contents: list[dict[str, Any]] = []
     for msg in messages:
-        role = msg.get("role")
-        if role == "system":
-            continue
-        if role == "assistant":
-            parts = _assistant_parts(msg)
-            if parts:
-                contents.append({"role": "model", "parts": parts})
-        elif role == "tool":
-            # Tool results go back as user parts with a function_response.
-            contents.append({"role": "user", "parts": [_tool_result_part(msg)]})
-        else:
-            # Plain user turn.  A leading system-role message was already
-            # folded into system_instruction, so this is the user's text.
-            content = msg.get("content")
-            contents.append({"role": "user", "parts": [{"text": str(content)}]})
+        _append_content(contents, msg)
     return contents
 
 
+def _append_content(contents: list[dict[str, Any]], msg: dict[str, Any]) -> None:
+    """Append the Gemini ``contents`` entry of one OpenAI-format message.
+
+    The step function of :func:`_messages_to_contents` (see
+    :mod:`janito.agent.history_cache`).
+    """
+    role = msg.get("role")
+    if role == "system":
+        return
+    if role == "assistant":
+        parts = _assistant_parts(msg)
+        if parts:
+            contents.append({"role": "model", "parts": parts})
+    elif role == "tool":
+        # Tool results go back as user parts with a function_response.
+        contents.append({"role": "user", "parts": [_tool_result_part(msg)]})
+    else:
+        # Plain user turn.  A leading system-role message was already
+        # folded into system_instruction, so this is the user's text.
+        content = msg.get("content")
+        contents.append({"role": "user", "parts": [{"text": str(content)}]})
+
+
 def _parse_arguments(arguments: Any) -> dict[str, Any]:
     """Parse a tool-call arguments JSON string into a dict (best effort)."""
     if isinstance(arguments, dict):
@@ -280,8 +290,10 @@ def _build_call_kwargs(
 ) -> dict[str, Any]:
     """Build the native Gemini ``generate_content`` call parameters.
 
-    The OpenAI-format history is converted to Gemini ``contents`` and the
-    tool schemas to ``function_declarations``; ``max_output_tokens`` and the
+    The OpenAI-format history is converted to Gemini ``contents`` (only the
+    messages added since the previous round; see
+    :mod:`janito.agent.history_cache`) and the tool schemas to
+    ``function_declarations``; ``max_output_tokens`` and the
     resolved reasoning level (sent as ``thinking_config.thinking_level``,
     which the Gemini API maps to the model's thinking depth) ride in the
     ``config`` dict.  ``tools`` is the effective model's built-in (native)
@@ -300,7 +312,7 @@ def _build_call_kwargs(
         config["tools"] = function_tools
     return {
         "model": model,
-        "contents": _messages_to_contents(messages),
+        "contents": converted_history(messages, _append_content, "gemini"),
         "config": config,
     }
 
@@ -21,7 +21,8 @@ Config keys come in three scopes:
 
 - **flat** keys (e.g. ``provider``, ``theme``);
 - **provider-scoped** keys (``PROVIDER_SCOPED_KEYS``: ``model``,
-  ``endpoint``), stored under ``providers.<provider>.<key>``;
+  ``endpoint``, ``rate-limit-rpm``, ``rate-limit-tpm``, ``pool``), stored
+  under ``providers.<provider>.<key>``;
 - **model-scoped** keys (``MODEL_SCOPED_KEYS``: ``max-input-tokens``,
   ``max-output-tokens``, ``reasoning-level``, ``api-type``,
   ``responses-in-server``), stored under
@@ -14,12 +14,37 @@ This module extracts that shared machinery into a :class:`JsonFileStore` base
 class; each store subclasses it and adds its domain-specific methods.  The
 three config modules keep their module-level functions as thin delegators to a
 module-level singleton, so existing import sites are unaffected.
+
+Reads go through :data:`json_file_cache`, shared with
+:class:`janito.config_store.ConfigStore`: a turn does dozens of
+``get_api_key`` / ``get_config_value`` lookups (and the shell toolbar one per
+redraw), each of which used to re-open, re-parse and re-merge the files.  A
+cached document is reused while every file it was read from keeps its
+``(mtime_ns, size, inode)``, so an external edit is picked up by the next
+lookup; the stores' own saves invalidate it at once.
+
+Writes are atomic and serialized across processes (batch workers and the
+web server share one config directory): :func:`atomic_write_json` writes a
+temporary file next to the target, fsyncs it and ``os.replace``-s it into
+place, so a reader (or a crash) never sees a truncated file, and every
+read-modify-write operation (``set``, ``delete``, ``unset``, ...) runs under
+:func:`locked`, an advisory lock on a ``<file>.lock`` sidecar, so two
+writers cannot interleave and lose each other's update.  Readers take no
+lock.
 """
 
+import copy
 import json
 import logging
 import os
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any
 
 from .config_dir import get_config_dir, get_config_file_paths
 
@@ -27,6 +52,216 @@ from .config_dir import get_config_dir, get_config_file_paths
 logger = logging.getLogger(__name__)
 
 
+#: A file modified this recently may be rewritten within the same timestamp
+#: tick without its stat changing (coarse filesystem clocks), so documents
+#: read from it are not trusted (the "racy git" problem).
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def _stat_key(path: str) -> tuple | None:
+    """The ``(mtime_ns, size, inode, device)`` of a file (``None`` if absent)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino, st.st_dev)
+
+
+class JsonFileCache:
+    """Documents built from JSON files, reused while the files are unchanged.
+
+    An entry is keyed by the (absolute) paths it was built from and
+    validated on every lookup by stat-ing them (see :func:`_stat_key`).
+    Documents are shared: callers must not mutate what :meth:`get` returns.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, ...], tuple[tuple, Any]] = {}
+
+    def get(self, paths: list[Path], build: Callable[[], Any]) -> Any:
+        """The document of ``paths``, from the cache or built by ``build()``.
+
+        ``build`` reads the files itself; an exception it raises (e.g.
+        invalid JSON) propagates and nothing is cached.
+        """
+        key = tuple(os.path.abspath(p) for p in paths)
+        stats = tuple(_stat_key(p) for p in key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == stats:
+            return entry[1]
+        document = build()
+        # Stats taken before the read: a write racing with it shows up as a
+        # changed stat on the next lookup.
+        cutoff = time.time_ns() - RACY_WINDOW_NS
+        if all(s is None or s[0] < cutoff for s in stats):
+            with self._lock:
+                self._entries[key] = (stats, document)
+        return document
+
+    def invalidate(self, path: Path) -> None:
+        """Drop every document read from ``path`` (it was just written)."""
+        path = os.path.abspath(path)
+        with self._lock:
+            for key in [k for k in self._entries if path in k]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached document."""
+        with self._lock:
+            self._entries.clear()
+
+
+#: The cache shared by every JSON config store.
+json_file_cache = JsonFileCache()
+
+
+# path -> the process's lock for it (serializes threads; the file lock
+# serializes processes).
+_path_locks: dict[str, threading.RLock] = {}
+_path_locks_guard = threading.Lock()
+# path -> (lock file descriptor, nesting depth); only touched by the thread
+# holding the path's RLock.
+_held: dict[str, tuple[int, int]] = {}
+
+
+def _lock_fd(fd: int) -> None:
+    if sys.platform == "win32":
+        import msvcrt
+
+        while True:
+            try:
+                # Locks the first byte; LK_LOCK gives up after ~10 seconds.
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _unlock_fd(fd: int) -> None:
+    if sys.platform == "win32":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def locked(path: Path | str) -> Iterator[None]:
+    """Hold the advisory write lock of ``path`` (``<path>.lock``).
+
+    Exclusive across threads and processes; re-entrant within a thread, so
+    a read-modify-write helper may call another that locks the same file
+    (e.g. ``ConfigStore.set`` -> ``ConfigStore.save``).  Readers do not
+    lock: writes are atomic (see :func:`atomic_write_json`).
+    """
+    key = os.path.abspath(path)
+    with _path_locks_guard:
+        path_lock = _path_locks.setdefault(key, threading.RLock())
+    with path_lock:
+        if key in _held:
+            fd, depth = _held[key]
+            _held[key] = (fd, depth + 1)
+        else:
+            os.makedirs(os.path.dirname(key), exist_ok=True)
+            fd = os.open(key + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                _lock_fd(fd)
+            except BaseException:
+                os.close(fd)
+                raise
+            _held[key] = (fd, 1)
+        try:
+            yield
+        finally:
+            fd, depth = _held[key]
+            if depth > 1:
+                _held[key] = (fd, depth - 1)
+            else:
+                del _held[key]
+                try:
+                    _unlock_fd(fd)
+                finally:
+                    os.close(fd)
+
+
+def _read_umask() -> int:
+    # os.umask can only be read by setting it; done once, at import time.
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# The process umask: new files get ``0o666 & ~_UMASK``, as with ``open()``.
+_UMASK = _read_umask()
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist a rename (best-effort; not possible on Windows)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path: Path | str, data: Any, *, mode: int | None = None) -> None:
+    """Replace ``path`` with ``data`` as JSON, atomically.
+
+    The document is written to a temporary file in the same directory,
+    flushed and fsynced, given ``mode`` (e.g. ``0o600``, before it becomes
+    visible) and renamed over ``path`` with ``os.replace``.  Readers see the
+    old or the new file, never a partial one; on failure the old file is
+    left as it was.  Invalidates :data:`json_file_cache` for ``path``.
+
+    Raises:
+        OSError: If the file cannot be written.
+        TypeError: If ``data`` is not JSON-serializable.
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp, mode)
+        elif os.path.exists(path):
+            # mkstemp creates 0600 files: keep the target's permissions.
+            os.chmod(tmp, os.stat(path).st_mode & 0o777)
+        else:
+            os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    finally:
+        json_file_cache.invalidate(path)
+    _fsync_directory(directory)
+
+
 class JsonFileStore:
     """A JSON config file with path resolution, merging and 0600 perms.
 
@@ -85,8 +320,18 @@ class JsonFileStore:
         """Load the config, merged across the resolution chain (local wins).
 
         Returns:
-            The parsed config, or a copy of ``default`` when no file exists.
+            The parsed config (a copy the caller may modify), or a copy of
+            ``default`` when no file exists.
         """
+        return copy.deepcopy(self._view())
+
+    def _view(self) -> dict:
+        """The cached config (shared, read-only; see :class:`JsonFileCache`)."""
+        paths = self.file_paths() if self.merge_local else [self.file_path()]
+        return json_file_cache.get(paths, self._read)
+
+    def _read(self) -> dict:
+        """Read the config from disk (see :meth:`load`)."""
         if self.merge_local:
             paths = self.file_paths()
             if not any(path.exists() for path in paths):
@@ -123,7 +368,8 @@ class JsonFileStore:
     def save(self, config: dict) -> bool:
         """Save ``config`` to the file (creating the directory if needed).
 
-        When ``chmod_600`` is set, the file is restricted to owner read/write.
+        The file is replaced atomically (see :func:`atomic_write_json`); when
+        ``chmod_600`` is set it is restricted to owner read/write.
         Best-effort: returns ``False`` (and logs) when the write fails, never
         raises.
 
@@ -136,29 +382,32 @@ class JsonFileStore:
         try:
             self.ensure_directory()
             path = self.file_path()
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=2)
-            if self.chmod_600:
-                os.chmod(path, 0o600)
+            with locked(path):
+                atomic_write_json(path, config, mode=0o600 if self.chmod_600 else None)
             logger.debug(f"Saved {self.filename} to {path}")
             return True
         except OSError as e:
             logger.error(f"Failed to save {self.filename}: {e}")
             return False
 
+    def locked(self):
+        """Hold the file's write lock (wrap every read-modify-write in it)."""
+        return locked(self.file_path())
+
     # ------------------------------------------------------------------
     # Generic key operations
     # ------------------------------------------------------------------
 
     def get(self, key: str) -> object:
         """Get a top-level value by key, or ``None`` when absent."""
-        return self.load().get(key)
+        return copy.deepcopy(self._view().get(key))
 
     def set(self, key: str, value: object) -> bool:
         """Set a top-level key and persist; returns success."""
-        config = self.load()
-        config[key] = value
-        return self.save(config)
+        with self.locked():
+            config = self.load()
+            config[key] = value
+            return self.save(config)
 
     def delete(self, key: str) -> bool:
         """Remove a top-level key and persist.
@@ -167,15 +416,16 @@ class JsonFileStore:
             bool: ``True`` if the key was removed, ``False`` if it did not
                 exist (or the save failed).
         """
-        config = self.load()
-        if key in config:
-            del config[key]
-            return self.save(config)
-        return False
+        with self.locked():
+            config = self.load()
+            if key in config:
+                del config[key]
+                return self.save(config)
+            return False
 
     def list_keys(self, *, exclude: set[str] | frozenset = frozenset()) -> list:
         """List the top-level keys, optionally excluding metadata keys."""
-        return [k for k in self.load().keys() if k not in exclude]
+        return [k for k in self._view() if k not in exclude]
 
 
 class AuthConfigStore(JsonFileStore):
@@ -192,17 +442,17 @@ class AuthConfigStore(JsonFileStore):
         provider is the default.
         """
         logger.debug(f"Setting API key for provider: {provider}")
-        config = self.load()
-        config[provider] = api_key
-        result = self.save(config)
-        if result:
-            logger.info(f"API key saved for provider: {provider}")
-        return result
+        with self.locked():
+            config = self.load()
+            config[provider] = api_key
+            result = self.save(config)
+            if result:
+                logger.info(f"API key saved for provider: {provider}")
+            return result
 
     def get_api_key(self, provider: str) -> str | None:
         """Get the API key for a provider, or ``None`` when absent."""
-        config = self.load()
-        api_key = config.get(provider)
+        api_key = self._view().get(provider)
         if api_key:
             logger.debug(f"API key found for provider: {provider}")
         else:
@@ -215,11 +465,12 @@ class AuthConfigStore(JsonFileStore):
 
     def delete_api_key(self, provider: str) -> bool:
         """Delete the API key for a provider; returns ``True`` if removed."""
-        config = self.load()
-        if provider in config:
-            del config[provider]
-            return self.save(config)
-        return False
+        with self.locked():
+            config = self.load()
+            if provider in config:
+                del config[provider]
+                return self.save(config)
+            return False
 
 
 class SecretsConfigStore(JsonFileStore):
@@ -231,17 +482,17 @@ class SecretsConfigStore(JsonFileStore):
     def set_secret(self, key: str, value: str) -> bool:
         """Store a secret; returns success."""
         logger.debug(f"Setting secret: {key}")
-        config = self.load()
-        config[key] = value
-        result = self.save(config)
-        if result:
-            logger.info(f"Secret saved: {key}")
-        return result
+        with self.locked():
+            config = self.load()
+            config[key] = value
+            result = self.save(config)
+            if result:
+                logger.info(f"Secret saved: {key}")
+            return result
 
     def get_secret(self, key: str) -> str | None:
         """Get a secret value, or ``None`` when absent."""
-        config = self.load()
-        value = config.get(key)
+        value = self._view().get(key)
         if value:
             logger.debug(f"Secret found: {key}")
         else:
@@ -250,19 +501,20 @@ class SecretsConfigStore(JsonFileStore):
 
     def delete_secret(self, key: str) -> bool:
         """Delete a secret; returns ``True`` if removed."""
-        config = self.load()
-        if key in config:
-            del config[key]
-            return self.save(config)
-        return False
+        with self.locked():
+            config = self.load()
+            if key in config:
+                del config[key]
+                return self.save(config)
+            return False
 
     def list_secrets(self) -> list:
         """List all configured secret keys."""
-        return list(self.load().keys())
+        return list(self._view())
 
     def secret_exists(self, key: str) -> bool:
         """Check whether a secret key is present."""
-        return key in self.load()
+        return key in self._view()
 
 
 class McpConfigStore(JsonFileStore):
@@ -282,11 +534,10 @@ class McpConfigStore(JsonFileStore):
         )
 
     def save(self, config: dict) -> bool:
-        """Save ``config``; raises on I/O failure (strict, no chmod)."""
+        """Save ``config`` atomically; raises on I/O failure (strict, no chmod)."""
         path = self.file_path()
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2)
+        with locked(path):
+            atomic_write_json(path, config)
         logger.debug(f"Saved {self.filename} to {path}")
         return True
 
@@ -296,25 +547,131 @@ class McpConfigStore(JsonFileStore):
 
     def add_service(self, name: str, service_config: dict) -> None:
         """Add or update an MCP service."""
-        config = self.load()
-        if "services" not in config:
-            config["services"] = {}
-        config["services"][name] = service_config
-        self.save(config)
+        with self.locked():
+            config = self.load()
+            if "services" not in config:
+                config["services"] = {}
+            config["services"][name] = service_config
+            self.save(config)
 
     def remove_service(self, name: str) -> bool:
         """Remove an MCP service; returns ``True`` if it existed."""
-        config = self.load()
-        services = config.get("services", {})
-        if name in services:
-            del services[name]
-            config["services"] = services
-            self.save(config)
-            logger.info(f"Removed MCP service: {name}")
-            return True
-        logger.debug(f"MCP service not found for removal: {name}")
-        return False
+        with self.locked():
+            config = self.load()
+            services = config.get("services", {})
+            if name in services:
+                del services[name]
+                config["services"] = services
+                self.save(config)
+                logger.info(f"Removed MCP service: {name}")
+                return True
+            logger.debug(f"MCP service not found for removal: {name}")
+            return False
 
     def list_services(self) -> dict:
         """Return the mapping of service names to their configurations."""
         return self.load().get("services", {})
+
+
+class McpToolCatalogStore(JsonFileStore):
+    """Storage for ``~/.janito/mcp_tools_cache.json`` (converted MCP tools).
+
+    One entry per service name, holding the fingerprint it was recorded
+    under (service config + the server's reported ``serverInfo``) and the
+    tool schemas already converted to the OpenAI function format.  A cache
+    file, not configuration: single document, no local merge, no chmod.
+    """
+
+    def __init__(self):
+        super().__init__(
+            "mcp_tools_cache.json",
+            chmod_600=False,
+            merge_local=False,
+            default={"services": {}},
+        )
+
+    def get_entry(self, name: str) -> dict | None:
+        """Get the cached catalog entry for a service, or ``None``."""
+        entry = self.load().get("services", {}).get(name)
+        return entry if isinstance(entry, dict) else None
+
+    def set_entry(self, name: str, entry: dict) -> bool:
+        """Store (replace) the catalog entry for a service; returns success."""
+        with self.locked():
+            config = self.load()
+            config.setdefault("services", {})[name] = entry
+            return self.save(config)
+
+    def delete_entry(self, name: str) -> bool:
+        """Drop the catalog entry for a service; returns ``True`` if removed."""
+        with self.locked():
+            config = self.load()
+            services = config.get("services", {})
+            if name in services:
+                del services[name]
+                return self.save(config)
+            return False
+
+
+class SkillsIndexStore(JsonFileStore):
+    """Storage for ``~/.janito/skills_index.json`` (the skills catalog).
+
+    One entry per skills root (keyed by its absolute path): the mtimes the
+    root's layout was indexed under and, per skill directory, its name,
+    description and resource names (see :mod:`janito.tooling.skills_index`).
+    A cache file like :class:`McpToolCatalogStore`: single document, no
+    local merge, no chmod.
+    """
+
+    def __init__(self):
+        super().__init__(
+            "skills_index.json",
+            chmod_600=False,
+            merge_local=False,
+            default={"roots": {}},
+        )
+
+    def get_roots(self) -> dict:
+        """Get every indexed root entry (``{root path: entry}``)."""
+        roots = self.load().get("roots", {})
+        return roots if isinstance(roots, dict) else {}
+
+    def update_roots(self, entries: dict, removed: list[str] = ()) -> bool:
+        """Store (replace) the given root entries, drop ``removed``; returns success."""
+        with self.locked():
+            config = self.load()
+            roots = config.setdefault("roots", {})
+            roots.update(entries)
+            for root in removed:
+                roots.pop(root, None)
+            return self.save(config)
+
+
+class TokenCalibrationStore(JsonFileStore):
+    """Storage for ``~/.janito/token_calibration.json`` (estimator ratios).
+
+    One entry per provider family: the moving average of reported/estimated
+    input tokens and the number of samples it was built from (see
+    :mod:`janito.agent.tokens`).  A cache file like
+    :class:`McpToolCatalogStore`: single document, no local merge, no chmod.
+    """
+
+    def __init__(self):
+        super().__init__(
+            "token_calibration.json",
+            chmod_600=False,
+            merge_local=False,
+            default={"families": {}},
+        )
+
+    def get_families(self) -> dict:
+        """Get every recorded family entry (``{family: {ratio, samples}}``)."""
+        families = self.load().get("families", {})
+        return families if isinstance(families, dict) else {}
+
+    def update_families(self, entries: dict) -> bool:
+        """Store (replace) the given family entries in one write; returns success."""
+        with self.locked():
+            config = self.load()
+            config.setdefault("families", {}).update(entries)
+            return self.save(config)
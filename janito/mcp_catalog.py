@@ -0,0 +1,105 @@
+"""
+On-disk cache of converted MCP tool catalogs (``~/.janito/mcp_tools_cache.json``).
+
+Listing an MCP server's tools (``tools/list``) and converting every schema to
+the OpenAI function format happens whenever :class:`~janito.mcp_manager.MCPManager`
+needs the catalog.  This module persists the converted catalog per service so
+a fresh process can advertise the tools as soon as the server has answered
+``initialize``; the manager then revalidates it in the background.
+
+An entry is only reused when its fingerprint matches: a hash of the service
+configuration plus the ``serverInfo`` name/version the server reported, so
+editing the service or upgrading the server invalidates it.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any
+
+from .json_store import McpToolCatalogStore
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Module-level singleton store backing every function below.
+_store = McpToolCatalogStore()
+
+
+def catalog_fingerprint(
+    service_config: dict[str, Any], server_info: dict[str, Any] | None
+) -> str:
+    """Fingerprint a service catalog by its config and reported server identity.
+
+    Args:
+        service_config: The service configuration (from ``mcp_services.json``).
+        server_info: The ``serverInfo`` from the ``initialize`` response.
+
+    Returns:
+        A hex SHA-256 digest; equal inputs always give the same digest.
+    """
+    server_info = server_info or {}
+    payload = {
+        "config": service_config or {},
+        "server": {
+            "name": server_info.get("name"),
+            "version": server_info.get("version"),
+        },
+    }
+    data = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def get_cached_tools(name: str, fingerprint: str) -> list[dict] | None:
+    """Get the cached converted tools for a service.
+
+    Args:
+        name: The service name.
+        fingerprint: The current :func:`catalog_fingerprint` of the service.
+
+    Returns:
+        The cached OpenAI-format tool schemas, or ``None`` when there is no
+        entry or it was recorded under a different fingerprint.
+    """
+    entry = _store.get_entry(name)
+    if not entry or entry.get("fingerprint") != fingerprint:
+        return None
+    tools = entry.get("tools")
+    if not isinstance(tools, list):
+        return None
+    logger.debug(f"Using cached MCP tool catalog for '{name}' ({len(tools)} tools)")
+    return tools
+
+
+def save_cached_tools(
+    name: str,
+    fingerprint: str,
+    tools: list[dict],
+    server_info: dict[str, Any] | None = None,
+) -> bool:
+    """Persist the converted tools for a service under ``fingerprint``.
+
+    Args:
+        name: The service name.
+        fingerprint: The :func:`catalog_fingerprint` the tools belong to.
+        tools: The OpenAI-format tool schemas.
+        server_info: The reported ``serverInfo`` (kept for inspection).
+
+    Returns:
+        bool: ``True`` on success, ``False`` when the write failed.
+    """
+    entry = {
+        "fingerprint": fingerprint,
+        "server": dict(server_info or {}),
+        "tools": tools,
+    }
+    return _store.set_entry(name, entry)
+
+
+def invalidate_cached_tools(name: str) -> bool:
+    """Drop the cached catalog for a service (e.g. on ``tools/list_changed``).
+
+    Returns:
+        bool: ``True`` if an entry was removed.
+    """
+    return _store.delete_entry(name)
@@ -20,10 +20,9 @@ Usage:
         transport.disconnect()
 """
 
-# Core exports
+# Core exports (the transports are loaded on first use, see __getattr__)
 from .base import MCPTransport
 from .factory import create_transport
-from .http import HttpTransport
 
 # Protocol exports for error handling and advanced usage
 from .protocols import ConnectionError as MCPConnectionError
@@ -38,7 +37,20 @@ from .protocols import (
     parse_message,
     serialize_message,
 )
-from .stdio import StdioTransport
+
+# Transport classes loaded lazily (PEP 562): ``requests`` (HTTP) is only
+# imported once an HTTP service is used.
+_LAZY_TRANSPORTS = {"HttpTransport": ".http", "StdioTransport": ".stdio"}
+
+
+def __getattr__(name):
+    module = _LAZY_TRANSPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    return getattr(importlib.import_module(module, __name__), name)
+
 
 __all__ = [
     # Main classes
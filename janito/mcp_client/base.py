@@ -4,6 +4,7 @@ MCP Transport base class and abstract interface.
 
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -21,8 +22,18 @@ class MCPTransport(ABC):
     - is_connected property
     - send_request for JSON-RPC calls
     - send_notification for one-way messages
+
+    Attributes:
+        server_info: The ``serverInfo`` (``name``/``version``) the server
+            reported in its ``initialize`` response; empty until connected.
+        notification_handler: Optional ``(method, params)`` callback invoked
+            for server-initiated notifications (e.g.
+            ``notifications/tools/list_changed``).
     """
 
+    server_info: dict[str, Any] = {}
+    notification_handler: Callable[[str, dict], None] | None = None
+
     @property
     @abstractmethod
     def is_connected(self) -> bool:
@@ -77,6 +88,22 @@ class MCPTransport(ABC):
             params: Optional parameters
         """
 
+    def _record_server_info(self, result: dict) -> None:
+        """Remember the ``serverInfo`` from an ``initialize`` result."""
+        info = result.get("serverInfo") if isinstance(result, dict) else None
+        self.server_info = dict(info) if isinstance(info, dict) else {}
+
+    def _notify(self, method: str, params: dict) -> None:
+        """Forward a server notification to :attr:`notification_handler`."""
+        logger.debug(f"Received notification: {method}")
+        handler = self.notification_handler
+        if handler is None:
+            return
+        try:
+            handler(method, params or {})
+        except Exception as e:
+            logger.debug(f"Notification handler failed for {method}: {e}")
+
     def list_tools(self) -> list[dict]:
         """
         List available tools from the server.
@@ -55,6 +55,7 @@ class HttpTransport(MCPTransport):
         try:
             result = self.send_request("initialize", get_initialize_params())
             validate_initialize_response(result)
+            self._record_server_info(result)
 
             self._connected = True
             logger.info(f"Connected to MCP server: {self.url}")
@@ -171,6 +172,12 @@ class HttpTransport(MCPTransport):
                 try:
                     message = json.loads(data)
 
+                    # Server notifications may be interleaved with the
+                    # response on the same stream (e.g. tools/list_changed).
+                    if "id" not in message and "method" in message:
+                        self._notify(message["method"], message.get("params", {}))
+                        continue
+
                     # Check for matching JSON-RPC response
                     if "id" in message and message["id"] == request_id:
                         return message
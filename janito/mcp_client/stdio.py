@@ -93,6 +93,7 @@ class StdioTransport(MCPTransport):
             # Send initialize request
             result = self._send_request_sync("initialize", get_initialize_params())
             validate_initialize_response(result)
+            self._record_server_info(result)
 
             logger.info(f"Connected to MCP server: {self.command}")
 
@@ -159,7 +160,7 @@ class StdioTransport(MCPTransport):
 
     def _handle_notification(self, method: str, params: dict) -> None:
         """Handle incoming notification from the server."""
-        logger.debug(f"Received notification: {method}")
+        self._notify(method, params)
 
     def _send_request_sync(self, method: str, params: dict = None) -> dict:
         """
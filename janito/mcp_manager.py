@@ -4,30 +4,72 @@ MCP Manager - manages multiple MCP server connections and tool routing.
 
 import json
 import logging
+import threading
+import time
+from functools import partial
 from typing import Any
 
+from .mcp_catalog import (
+    catalog_fingerprint,
+    get_cached_tools,
+    invalidate_cached_tools,
+    save_cached_tools,
+)
 from .mcp_client.base import MCPTransport
 from .mcp_client.factory import create_transport
 from .mcp_config import get_service, list_services
+from .mcp_supervisor import (
+    STATE_CRASHED,
+    STATE_IDLE,
+    STATE_RUNNING,
+    MCPSupervisor,
+    ServiceHealth,
+)
 from .tooling.reporter import report_error, report_progress, report_result, report_start
 
 logger = logging.getLogger(__name__)
 
+# Server notification announcing that a service's tool list changed.
+TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+
 
 class MCPManager:
     """
     Manages multiple MCP server connections and provides unified tool access.
+
+    Each service's converted tool catalog is cached in memory and persisted
+    on disk (see :mod:`janito.mcp_catalog`), keyed by the service config and
+    the server's reported identity.  A freshly connected service advertises
+    its cached catalog immediately while a background thread revalidates it
+    with ``tools/list``; a ``notifications/tools/list_changed`` from the
+    server drops both copies so the next listing is live.
+
+    Loaded services are watched by an :class:`~janito.mcp_supervisor.MCPSupervisor`
+    (health checks, crash restarts with backoff, idle shutdown with lazy
+    restart on the next call); see :meth:`service_status`.
     """
 
     def __init__(self):
         """Initialize the MCP manager."""
         self._clients: dict[str, MCPTransport] = {}
-        self._tools_cache: list[dict] | None = None
-        self._cache_valid = False
+        # service name -> the config it was loaded from (catalog fingerprint)
+        self._service_configs: dict[str, dict] = {}
+        # service name -> converted (OpenAI-format) tool schemas
+        self._service_tools: dict[str, list[dict]] = {}
         # service name -> set of tool names, used by call_tool to avoid
-        # re-listing tools on every invocation. Invalidated whenever the
-        # set of connected services changes.
+        # re-listing tools on every invocation. Kept in sync with
+        # _service_tools.
         self._service_tool_names: dict[str, set[str]] = {}
+        # Guards the per-service catalogs, which background revalidation
+        # threads and notification handlers update concurrently.
+        self._lock = threading.RLock()
+        # service name -> lock serializing its (slow) connects and
+        # disconnects, which run outside ``_lock``
+        self._service_locks: dict[str, threading.Lock] = {}
+        self._revalidations: dict[str, threading.Thread] = {}
+        # service name -> supervision record (state, restarts, latency)
+        self._health: dict[str, ServiceHealth] = {}
+        self._supervisor: MCPSupervisor | None = None
 
     @property
     def connected_services(self) -> list[str]:
@@ -38,6 +80,10 @@ class MCPManager:
         """
         Load and connect to MCP services.
 
+        Newly connected services whose catalog is cached on disk (for the
+        same config and server identity) advertise it right away; it is
+        revalidated in the background.
+
         Args:
             service_names: Optional list of specific service names to load.
                          If None, loads all configured services.
@@ -58,17 +104,20 @@ class MCPManager:
 
             try:
                 transport = create_transport(config)
+                transport.notification_handler = partial(self._on_notification, name)
                 if transport.connect():
                     self._clients[name] = transport
+                    self._service_configs[name] = config
+                    self._health[name] = ServiceHealth(last_used=time.monotonic())
                     logger.info(f"Loaded MCP service: {name}")
+                    self._restore_catalog(name)
                 else:
                     logger.warning(f"Failed to connect to MCP service: {name}")
             except Exception as e:
                 logger.error(f"Error loading MCP service '{name}': {e}")
 
-        # Invalidate cache when services change
-        self._cache_valid = False
-        self._service_tool_names.clear()
+        if self._clients:
+            self._ensure_supervisor()
 
     def unload_service(self, name: str) -> None:
         """
@@ -84,8 +133,9 @@ class MCPManager:
                 logger.debug(f"Error disconnecting service '{name}': {e}")
             finally:
                 del self._clients[name]
-                self._cache_valid = False
-                self._service_tool_names.pop(name, None)
+                self._service_configs.pop(name, None)
+                self._health.pop(name, None)
+                self._forget_service_tools(name)
                 logger.info(f"Unloaded MCP service: {name}")
 
     def unload_all(self) -> None:
@@ -98,52 +148,133 @@ class MCPManager:
         """
         Get all tools from all connected MCP servers.
 
+        Services whose catalog is already known (listed earlier or restored
+        from the on-disk cache) are not re-listed unless ``force_refresh``.
+        Services shut down for inactivity keep advertising their catalog
+        without being woken up.
+
         Args:
             force_refresh: If True, bypass cache and refresh tools
 
         Returns:
             List of OpenAI-formatted tool schemas
         """
-        if self._cache_valid and not force_refresh:
-            return self._tools_cache or []
-
         all_tools = []
 
-        for service_name, client in self._clients.items():
+        for service_name, client in list(self._clients.items()):
             try:
+                with self._lock:
+                    tools = self._service_tools.get(service_name)
+                health = self._health.get(service_name)
+                idle = health is not None and health.state == STATE_IDLE
+                if idle and tools is not None and not force_refresh:
+                    all_tools.extend(tools)
+                    continue
+
                 if not client.is_connected:
-                    # Try to reconnect
-                    if client.connect():
+                    # Try to reconnect (restart_service drops the catalog if
+                    # the server changed, so it is listed again below).
+                    if self.restart_service(service_name):
                         logger.info(f"Reconnected MCP service: {service_name}")
                     else:
                         logger.warning(f"Service '{service_name}' is not connected")
                         continue
+                    with self._lock:
+                        tools = self._service_tools.get(service_name)
 
-                # Get tools from this service
-                mcp_tools = client.list_tools()
-
-                # Cache the tool names so call_tool doesn't re-list on every call
-                self._service_tool_names[service_name] = {
-                    tool.get("name") for tool in mcp_tools
-                }
-
-                # Convert MCP tools to OpenAI format with service prefix
-                for tool in mcp_tools:
-                    openai_tool = self._convert_tool_to_openai(service_name, tool)
-                    all_tools.append(openai_tool)
+                if tools is None or force_refresh:
+                    tools = self._refresh_service_tools(service_name, client)
+                all_tools.extend(tools)
 
             except Exception as e:
                 logger.error(f"Error getting tools from service '{service_name}': {e}")
 
-        # Cache the results
-        self._tools_cache = all_tools
-        self._cache_valid = True
-
         logger.info(
             f"Retrieved {len(all_tools)} tools from {len(self._clients)} MCP services"
         )
         return all_tools
 
+    # ------------------------------------------------------------------
+    # Per-service tool catalogs (memory + on-disk cache)
+    # ------------------------------------------------------------------
+
+    def _fingerprint(self, service_name: str, client: MCPTransport) -> str:
+        """The catalog fingerprint of a connected service."""
+        return catalog_fingerprint(
+            self._service_configs.get(service_name, {}), client.server_info
+        )
+
+    def _set_service_tools(self, service_name: str, tools: list[dict]) -> None:
+        """Install a service's converted tools and their bare-name index."""
+        prefix_len = len(service_name) + 1
+        names = {t.get("function", {}).get("name", "")[prefix_len:] for t in tools}
+        with self._lock:
+            self._service_tools[service_name] = tools
+            self._service_tool_names[service_name] = names
+
+    def _forget_service_tools(self, service_name: str) -> None:
+        """Drop a service's in-memory catalog so the next listing is live."""
+        with self._lock:
+            self._service_tools.pop(service_name, None)
+            self._service_tool_names.pop(service_name, None)
+
+    def _refresh_service_tools(
+        self, service_name: str, client: MCPTransport
+    ) -> list[dict]:
+        """List a service's tools live, convert, cache and persist them."""
+        mcp_tools = client.list_tools()
+        tools = [self._convert_tool_to_openai(service_name, t) for t in mcp_tools]
+        self._set_service_tools(service_name, tools)
+        # list_tools() swallows errors and returns []: only persist catalogs
+        # listed from a live connection.
+        if client.is_connected:
+            save_cached_tools(
+                service_name,
+                self._fingerprint(service_name, client),
+                tools,
+                client.server_info,
+            )
+        return tools
+
+    def _restore_catalog(self, service_name: str) -> None:
+        """Advertise a just-connected service's cached catalog, if valid."""
+        client = self._clients[service_name]
+        cached = get_cached_tools(service_name, self._fingerprint(service_name, client))
+        if cached is None:
+            return
+        self._set_service_tools(service_name, cached)
+        self._revalidate_in_background(service_name)
+
+    def _revalidate_in_background(self, service_name: str) -> None:
+        """Re-list a service's tools on a daemon thread to refresh the cache."""
+
+        def revalidate():
+            client = self._clients.get(service_name)
+            if client is None or not client.is_connected:
+                return
+            try:
+                with self._lock:
+                    before = self._service_tools.get(service_name)
+                after = self._refresh_service_tools(service_name, client)
+                if after != before:
+                    logger.info(f"MCP tool catalog changed for '{service_name}'")
+            except Exception as e:
+                logger.debug(f"Background revalidation of '{service_name}' failed: {e}")
+
+        thread = threading.Thread(
+            target=revalidate, name=f"mcp-revalidate-{service_name}", daemon=True
+        )
+        self._revalidations[service_name] = thread
+        thread.start()
+
+    def _on_notification(self, service_name: str, method: str, params: dict) -> None:
+        """Handle a server notification (invalidate on ``tools/list_changed``)."""
+        if method != TOOLS_LIST_CHANGED:
+            return
+        logger.info(f"MCP service '{service_name}' reported a tool list change")
+        self._forget_service_tools(service_name)
+        invalidate_cached_tools(service_name)
+
     def _convert_tool_to_openai(self, service_name: str, mcp_tool: dict) -> dict:
         """
         Convert an MCP tool schema to OpenAI function format.
@@ -216,20 +347,23 @@ class MCPManager:
         # Find the service that provides this tool. We can't split on "_"
         # (service names may contain underscores), so check each client by
         # stripping its own name prefix.
-        for service_name, client in self._clients.items():
+        for service_name, client in list(self._clients.items()):
+            if not prefixed_name.startswith(f"{service_name}_"):
+                continue
             tool_name = prefixed_name[len(service_name) + 1 :]
 
             # Check if this client has this tool
-            if not client.is_connected:
-                continue
             if not self._service_has_tool(service_name, tool_name):
                 continue
+            # Idle or crashed services are (re)started lazily on demand.
+            if not client.is_connected and not self.restart_service(service_name):
+                continue
 
             # Show which service we're calling
             report_progress(f" [{service_name}]", end="")
 
             try:
-                result = client.call_tool(tool_name, arguments)
+                result = self._timed_call(service_name, client, tool_name, arguments)
                 processed_result = self._process_tool_result(result)
 
                 # Report success with result summary
@@ -245,6 +379,119 @@ class MCPManager:
         report_error(f"MCP tool not found: {prefixed_name}")
         raise ValueError(f"Tool not found: {prefixed_name}")
 
+    def _timed_call(
+        self, service_name: str, client: MCPTransport, tool_name: str, arguments: dict
+    ) -> Any:
+        """Call a tool on a service, recording its latency in the service health."""
+        health = self._health.get(service_name)
+        started = time.monotonic()
+        try:
+            result = client.call_tool(tool_name, arguments)
+        except Exception as e:
+            if health is not None:
+                health.record_call(time.monotonic() - started, e)
+            raise
+        if health is not None:
+            health.record_call(time.monotonic() - started)
+        return result
+
+    # ------------------------------------------------------------------
+    # Supervision (see janito.mcp_supervisor)
+    # ------------------------------------------------------------------
+
+    def get_client(self, name: str) -> MCPTransport | None:
+        """Get the transport of a loaded service, or ``None``."""
+        return self._clients.get(name)
+
+    def get_health(self, name: str) -> ServiceHealth | None:
+        """Get the supervision record of a loaded service, or ``None``."""
+        return self._health.get(name)
+
+    def service_status(self) -> dict[str, dict[str, Any]]:
+        """Per-service state, restart count and call latency of loaded services."""
+        status = {}
+        for name, client in list(self._clients.items()):
+            health = self._health.get(name)
+            entry = health.to_dict() if health is not None else {}
+            entry["connected"] = client.is_connected
+            entry["tools"] = len(self._service_tools.get(name) or [])
+            status[name] = entry
+        return status
+
+    def _service_lock(self, name: str) -> threading.Lock:
+        """The lock serializing one service's connects and disconnects."""
+        with self._lock:
+            return self._service_locks.setdefault(name, threading.Lock())
+
+    def restart_service(self, name: str) -> bool:
+        """(Re)connect a loaded service, e.g. after a crash or idle shutdown.
+
+        The in-memory catalog is replaced by the on-disk cache entry for the
+        (possibly new) server identity, or dropped so it is listed again.
+
+        Returns:
+            True when the service is connected afterwards.
+        """
+        with self._service_lock(name):
+            with self._lock:
+                client = self._clients.get(name)
+                health = self._health.get(name)
+            if client is None:
+                return False
+            # A crashed service may still hold a live transport (a stdio
+            # server that stopped answering pings): restart it for real.
+            crashed = health is not None and health.state == STATE_CRASHED
+            if client.is_connected and not crashed:
+                return True
+            # Connecting may take long: the other services stay usable.
+            try:
+                client.disconnect()
+                connected = client.connect()
+            except Exception as e:
+                logger.error(f"Error restarting MCP service '{name}': {e}")
+                connected = False
+            with self._lock:
+                if self._clients.get(name) is not client:
+                    return False  # unloaded meanwhile
+                if not connected:
+                    if health is not None:
+                        health.last_error = (
+                            getattr(client, "_error", None) or "connect failed"
+                        )
+                    return False
+                if health is not None:
+                    health.state = STATE_RUNNING
+                    health.restarts += 1
+                    health.failures = 0
+                    health.last_error = None
+                    health.last_used = time.monotonic()
+                self._forget_service_tools(name)
+                self._restore_catalog(name)
+        logger.info(f"Restarted MCP service: {name}")
+        return True
+
+    def idle_shutdown(self, name: str) -> None:
+        """Stop an idle service; it keeps its catalog and restarts on next call."""
+        with self._service_lock(name):
+            with self._lock:
+                client = self._clients.get(name)
+                health = self._health.get(name)
+            if client is None:
+                return
+            try:
+                client.disconnect()
+            except Exception as e:
+                logger.debug(f"Error stopping idle service '{name}': {e}")
+            if health is not None:
+                health.state = STATE_IDLE
+        logger.info(f"Stopped idle MCP service: {name}")
+
+    def _ensure_supervisor(self) -> None:
+        """Start the supervisor thread on first use."""
+        if self._supervisor is None:
+            self._supervisor = MCPSupervisor(self)
+        self._supervisor.start()
+
     def _service_has_tool(self, service_name: str, tool_name: str) -> bool:
         """
         Check whether a connected service exposes a tool, using the cached
@@ -362,10 +609,13 @@ class MCPManager:
 
     def shutdown(self) -> None:
         """Shutdown all connections and cleanup."""
+        if self._supervisor is not None:
+            self._supervisor.stop()
+            self._supervisor = None
         self.unload_all()
-        self._tools_cache = None
-        self._cache_valid = False
-        self._service_tool_names.clear()
+        with self._lock:
+            self._service_tools.clear()
+            self._service_tool_names.clear()
         logger.info("MCP Manager shutdown complete")
 
 
@@ -0,0 +1,243 @@
+"""
+MCP service supervisor - health checks, crash restarts and idle shutdown.
+
+:class:`~janito.mcp_manager.MCPManager` owns one :class:`MCPSupervisor`. A
+daemon thread wakes up every ``mcp-health-interval`` seconds and, for each
+loaded service:
+
+- shuts it down when it has not been used for ``mcp-idle-ttl`` seconds (its
+  tool catalog stays advertised; the next call restarts it lazily);
+- pings it (``ping``) and marks it ``crashed`` when the process died or the
+  server stopped answering;
+- restarts crashed services with exponential backoff.
+
+Per-service state, restart counts and call latency are kept in a
+:class:`ServiceHealth` record, exposed through ``/mcp status`` and
+``/api/mcp/status``.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from .config_store import get_config_value
+from .mcp_client.protocols import RPCError
+
+logger = logging.getLogger(__name__)
+
+# Service states reported by ServiceHealth.state
+STATE_RUNNING = "running"
+STATE_IDLE = "idle"
+STATE_CRASHED = "crashed"
+
+# Defaults for the supervisor config keys (seconds; 0 disables).
+DEFAULT_HEALTH_INTERVAL = 30
+DEFAULT_IDLE_TTL = 900
+
+# Restart backoff: base * 2 ** (failures - 1), capped.
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 300.0
+
+
+@dataclass
+class ServiceHealth:
+    """Supervision record for one loaded MCP service.
+
+    Attributes:
+        state: ``running``, ``idle`` (shut down for inactivity, restarted on
+            the next call) or ``crashed`` (waiting for a backoff restart).
+        restarts: Number of successful restarts (crash or idle wake-up).
+        failures: Consecutive failed health checks / restart attempts.
+        calls: Number of tool calls routed to the service.
+        errors: Number of tool calls that raised.
+        total_latency: Cumulative tool-call latency in seconds.
+        last_latency: Latency of the most recent tool call in seconds.
+        last_used: ``time.monotonic()`` of the last call (or of the load).
+        last_error: The most recent health-check or call error.
+        next_restart_at: ``time.monotonic()`` before which a crashed service
+            is not restarted.
+    """
+
+    state: str = STATE_RUNNING
+    restarts: int = 0
+    failures: int = 0
+    calls: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    last_latency: float | None = None
+    last_used: float = 0.0
+    last_error: str | None = None
+    next_restart_at: float = 0.0
+
+    def record_call(self, latency: float, error: Exception | None = None) -> None:
+        """Account one tool call and its latency."""
+        self.calls += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        self.last_used = time.monotonic()
+        if error is not None:
+            self.errors += 1
+            self.last_error = str(error)
+
+    @property
+    def avg_latency(self) -> float | None:
+        """Mean tool-call latency in seconds, or ``None`` before any call."""
+        return self.total_latency / self.calls if self.calls else None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for the ``/api/mcp`` endpoints (latencies in ms)."""
+
+        def ms(seconds):
+            return round(seconds * 1000, 1) if seconds is not None else None
+
+        return {
+            "state": self.state,
+            "restarts": self.restarts,
+            "failures": self.failures,
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_latency_ms": ms(self.avg_latency),
+            "last_latency_ms": ms(self.last_latency),
+            "idle_seconds": round(time.monotonic() - self.last_used, 1),
+            "last_error": self.last_error,
+        }
+
+
+def backoff_delay(failures: int) -> float:
+    """Restart delay after ``failures`` consecutive failures (seconds)."""
+    if failures <= 0:
+        return 0.0
+    return min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+
+
+def _config_seconds(key: str, default: int) -> float:
+    """Read a non-negative seconds value from the config (``default`` on error)."""
+    value = get_config_value(key)
+    if value is None:
+        return float(default)
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid {key} value: {value!r}")
+        return float(default)
+
+
+class MCPSupervisor:
+    """Periodic health checks, crash restarts and idle shutdown for a manager.
+
+    Args:
+        manager: The :class:`~janito.mcp_manager.MCPManager` to supervise.
+        interval: Seconds between checks; ``None`` reads
+            ``mcp-health-interval`` from the config (``0`` disables the
+            background thread; :meth:`check` can still be called directly).
+        idle_ttl: Seconds of inactivity before a service is shut down;
+            ``None`` reads ``mcp-idle-ttl`` (``0`` disables idle shutdown).
+    """
+
+    def __init__(
+        self, manager, interval: float | None = None, idle_ttl: float | None = None
+    ):
+        self.manager = manager
+        self.interval = (
+            _config_seconds("mcp-health-interval", DEFAULT_HEALTH_INTERVAL)
+            if interval is None
+            else interval
+        )
+        self.idle_ttl = (
+            _config_seconds("mcp-idle-ttl", DEFAULT_IDLE_TTL)
+            if idle_ttl is None
+            else idle_ttl
+        )
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background thread (no-op when running or disabled)."""
+        if self.running or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="mcp-supervisor", daemon=True
+        )
+        self._thread.start()
+        logger.debug(
+            f"MCP supervisor started (interval={self.interval}s, idle_ttl={self.idle_ttl}s)"
+        )
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.debug(f"MCP supervisor check failed: {e}")
+
+    def check(self, now: float | None = None) -> None:
+        """Run one supervision pass over every loaded service."""
+        now = time.monotonic() if now is None else now
+        for name in self.manager.connected_services:
+            health = self.manager.get_health(name)
+            if health is None or health.state == STATE_IDLE:
+                continue
+            if self.idle_ttl and now - health.last_used > self.idle_ttl:
+                self.manager.idle_shutdown(name)
+                continue
+            if health.state == STATE_CRASHED:
+                if now >= health.next_restart_at:
+                    self.try_restart(name, now)
+                continue
+            if not self.ping(name):
+                self.mark_crashed(name, now)
+
+    def ping(self, name: str) -> bool:
+        """Whether a service's transport is alive and answers ``ping``."""
+        client = self.manager.get_client(name)
+        if client is None or not client.is_connected:
+            return False
+        try:
+            client.send_request("ping")
+        except RPCError:
+            # The server answered (e.g. method not found): it is alive.
+            return True
+        except Exception as e:
+            health = self.manager.get_health(name)
+            if health is not None:
+                health.last_error = str(e)
+            return False
+        return True
+
+    def mark_crashed(self, name: str, now: float) -> None:
+        """Record a failed health check and schedule a backoff restart."""
+        health = self.manager.get_health(name)
+        if health is None:
+            return
+        health.state = STATE_CRASHED
+        health.failures += 1
+        health.next_restart_at = now + backoff_delay(health.failures)
+        logger.warning(
+            f"MCP service '{name}' is not responding; restarting in "
+            f"{health.next_restart_at - now:.0f}s"
+        )
+
+    def try_restart(self, name: str, now: float) -> bool:
+        """Restart a crashed service; reschedule with a longer backoff on failure."""
+        if self.manager.restart_service(name):
+            return True
+        health = self.manager.get_health(name)
+        if health is not None:
+            health.failures += 1
+            health.next_restart_at = now + backoff_delay(health.failures)
+        return False
@@ -1,11 +1,25 @@
-from .completions_api import (
-    RequestCancelled,
-    get_env_config,
-    resolve_runtime_config,
-    send_prompt,
-)
-from .conversations_api import ConversationResult
-from .conversations_api import send_prompt as send_prompt_responses
+# The client modules are loaded on first use (PEP 562): importing one of them
+# (e.g. ``janito.openai_client.anthropic_api``) runs this package first, and
+# must not pull in the Completions and Responses clients with it.
+_LAZY_EXPORTS = {
+    "ConversationResult": ("conversations_api", "ConversationResult"),
+    "RequestCancelled": ("completions_api", "RequestCancelled"),
+    "get_env_config": ("completions_api", "get_env_config"),
+    "resolve_runtime_config": ("completions_api", "resolve_runtime_config"),
+    "send_prompt": ("completions_api", "send_prompt"),
+    "send_prompt_responses": ("conversations_api", "send_prompt"),
+}
+
+
+def __getattr__(name):
+    target = _LAZY_EXPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    module, attribute = target
+    return getattr(importlib.import_module(f".{module}", __name__), attribute)
+
 
 __all__ = [
     "ConversationResult",
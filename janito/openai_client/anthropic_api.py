@@ -24,7 +24,10 @@ parameter).  Tool calls are executed with the shared
 blocks are appended to the history before the next round, repeating until the
 model emits a final text answer.  ``send_prompt`` returns the assistant text
 and mutates ``previous_messages`` in place (Completions-style), so the
-interactive shell treats this mode exactly like Completions.
+interactive shell treats this mode exactly like Completions.  Each round
+carries prompt-cache breakpoints (tools, system prompt, rolling end of the
+history) unless the model disables ``prompt-caching``; see
+:func:`janito.agent.anthropic.apply_cache_breakpoints`.
 
 The Messages API stream handling lives in
 :mod:`janito.openai_client.anthropic_stream` and the shared client helpers in
@@ -41,6 +44,9 @@ from typing import Any
 
 from rich.console import Console
 
+# Shared prompt-caching breakpoints (also used by the web runner)
+from janito.agent.anthropic import apply_cache_breakpoints, cache_tools
+
 # Import general configuration handling
 from janito.config_loaders import load_max_input_tokens, load_max_output_tokens
 
@@ -48,6 +54,7 @@ from janito.config_loaders import load_max_input_tokens, load_max_output_tokens
 from janito.provider_accessors import (
     get_default_max_input_tokens_from_provider,
     get_default_max_output_tokens_from_provider,
+    get_prompt_caching_from_provider,
 )
 
 # Import the tool executor (routes tool calls to the MCP manager or the
@@ -199,11 +206,11 @@ class AnthropicClient(Client):
     api_type = "Anthropic"
     backend_default = "https://api.anthropic.com"
 
-    def _resolve_runtime_config(self):
+    def _resolve_runtime_config(self, provider=None):
         # This module is the "Anthropic" API type, so endpoint resolution
         # picks the native-SDK base URL from the endpoint_by_api_type map.
         return resolve_runtime_config(
-            self.cli_model, self.cli_provider, cli_api_type="Anthropic"
+            self.cli_model, provider or self.cli_provider, cli_api_type="Anthropic"
         )
 
     def _create_sdk_client(self, base_url, api_key):
@@ -243,7 +250,11 @@ class AnthropicClient(Client):
         # local list and the appended messages would never propagate back to
         # the caller.
         messages.append({"role": "user", "content": prompt})
-        return {"messages": messages, "system": system}
+        return {
+            "messages": messages,
+            "system": system,
+            "prompt_caching": get_prompt_caching_from_provider(provider, model),
+        }
 
     def _build_call_kwargs(
         self,
@@ -257,7 +268,11 @@ class AnthropicClient(Client):
         # system is a top-level parameter that may be sent on every round (the
         # Messages API is stateless and the full history is re-sent each time).
         return _build_call_kwargs(
-            model, state["messages"], max_output_tokens, state["system"]
+            model,
+            state["messages"],
+            max_output_tokens,
+            state["system"],
+            prompt_caching=state.get("prompt_caching", False),
         )
 
     def _run_stream_round(
@@ -272,6 +287,10 @@ class AnthropicClient(Client):
         model,
         console,
     ):
+        # Tools are attached per call (see _stream_response); mark the last
+        # definition so the tool list is part of the cached prefix.
+        if state.get("prompt_caching"):
+            tools_schemas = cache_tools(tools_schemas)
         try:
             (
                 full_content,
@@ -385,8 +404,14 @@ def _build_call_kwargs(
     messages: list[dict[str, Any]],
     max_output_tokens: int,
     system: str | None,
+    prompt_caching: bool = False,
 ) -> dict[str, Any]:
-    """Build the Anthropic Messages call parameters for one round."""
+    """Build the Anthropic Messages call parameters for one round.
+
+    With ``prompt_caching``, the system prompt and the rolling end of the
+    history get ``cache_control`` breakpoints (on copies; the client-side
+    history is not modified).
+    """
     # System-role messages are filtered out of the payload; they were folded
     # into the top-level system parameter by _resolve_system_prompt.
     call_kwargs: dict[str, Any] = {
@@ -397,6 +422,8 @@ def _build_call_kwargs(
     if system:
         call_kwargs["system"] = system
     call_kwargs["stream"] = True
+    if prompt_caching:
+        apply_cache_breakpoints(call_kwargs)
     return call_kwargs
 
 
@@ -479,7 +506,7 @@ def _finalize_response(
             label="Messages",
             input_attr="input_tokens",
             output_attr="output_tokens",
-            cached_details_attr=None,
+            cached_details_attr="input_tokens_details",
             provider=provider,
             model=model,
         )
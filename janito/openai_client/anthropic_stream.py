@@ -17,10 +17,13 @@ and drives the per-event handlers.  The module-level ``_consume_stream`` /
 
 import json
 import logging
-from types import SimpleNamespace
 from typing import Any
 
+from janito.agent.anthropic import usage_namespace
+from janito.tooling.speculative import speculate_tool_call
+
 from .client_support import _extract_raw_attrs
+from .live_stream import push_delta
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -40,10 +43,14 @@ class AnthropicStreamConsumer:
         self.content: list[str] = []
         self.reasoning: list[str] = []
         self.tool_use_blocks: list[dict[str, Any]] = []
-        # index -> {type, text, id, name, json} while a block is in flight
+        # index -> {type, id, name, parts} while a block is in flight;
+        # ``parts`` collects the text/thinking/JSON fragments, joined once
+        # on content_block_stop
         self.blocks: dict[int, dict[str, Any]] = {}
         self.input_tokens: int | None = None
         self.output_tokens: int | None = None
+        self.cache_read_tokens: int | None = None
+        self.cache_write_tokens: int | None = None
         self.raw_attrs: dict[str, Any] = {}
         self._events_seen = 0
 
@@ -64,13 +71,16 @@ class AnthropicStreamConsumer:
     @property
     def usage_info(self) -> Any:
         """A ``SimpleNamespace`` usage object, or ``None`` when the API
-        reported no usage (``input_tokens``/``output_tokens`` both unset)."""
-        if self.input_tokens is None and self.output_tokens is None:
-            return None
-        return SimpleNamespace(
-            total_tokens=(self.input_tokens or 0) + (self.output_tokens or 0),
-            input_tokens=self.input_tokens,
-            output_tokens=self.output_tokens,
+        reported no usage (``input_tokens``/``output_tokens`` both unset).
+
+        Prompt-cache reads/writes are folded into ``input_tokens`` and
+        reported in ``input_tokens_details`` (see
+        :func:`janito.agent.anthropic.usage_namespace`)."""
+        return usage_namespace(
+            self.input_tokens,
+            self.output_tokens,
+            self.cache_read_tokens,
+            self.cache_write_tokens,
         )
 
     # ------------------------------------------------------------------
@@ -125,12 +135,13 @@ class AnthropicStreamConsumer:
     def handle_event(self, event) -> bool:
         """Dispatch one stream event; return True when the stream is complete."""
         event_type = getattr(event, "type", None)
-        if event_type == "message_start":
+        # Deltas are by far the most frequent events: test for them first.
+        if event_type == "content_block_delta":
+            self.handle_content_block_delta(event)
+        elif event_type == "message_start":
             self.handle_message_start(event)
         elif event_type == "content_block_start":
             self.handle_content_block_start(event)
-        elif event_type == "content_block_delta":
-            self.handle_content_block_delta(event)
         elif event_type == "content_block_stop":
             self.handle_content_block_stop(event)
         elif event_type == "message_delta":
@@ -143,7 +154,7 @@ class AnthropicStreamConsumer:
         return False
 
     def handle_message_start(self, event) -> None:
-        """Record the input tokens and the raw message metadata."""
+        """Record the input/prompt-cache tokens and the raw message metadata."""
         message = getattr(event, "message", None)
         if message is not None:
             # Raw top-level message metadata (id, model, role, stop_reason,
@@ -155,6 +166,10 @@ class AnthropicStreamConsumer:
             usage = getattr(message, "usage", None)
             if usage is not None:
                 self.input_tokens = getattr(usage, "input_tokens", None)
+                self.cache_read_tokens = getattr(usage, "cache_read_input_tokens", None)
+                self.cache_write_tokens = getattr(
+                    usage, "cache_creation_input_tokens", None
+                )
 
     def handle_content_block_start(self, event) -> None:
         """Open a new content block indexed by ``index``."""
@@ -164,10 +179,9 @@ class AnthropicStreamConsumer:
         content_block = getattr(event, "content_block", None)
         self.blocks[index] = {
             "type": getattr(content_block, "type", None),
-            "text": "",
             "id": getattr(content_block, "id", None),
             "name": getattr(content_block, "name", None),
-            "json": "",
+            "parts": [],
         }
 
     def handle_content_block_delta(self, event) -> None:
@@ -181,11 +195,15 @@ class AnthropicStreamConsumer:
             return
         delta_type = getattr(delta, "type", None)
         if delta_type == "text_delta":
-            block["text"] += getattr(delta, "text", "") or ""
+            text = getattr(delta, "text", "") or ""
+            block["parts"].append(text)
+            push_delta(content=text)
         elif delta_type == "thinking_delta":
-            block["text"] += getattr(delta, "thinking", "") or ""
+            thinking = getattr(delta, "thinking", "") or ""
+            block["parts"].append(thinking)
+            push_delta(reasoning=thinking)
         elif delta_type == "input_json_delta":
-            block["json"] += getattr(delta, "partial_json", "") or ""
+            block["parts"].append(getattr(delta, "partial_json", "") or "")
 
     def handle_content_block_stop(self, event) -> None:
         """Flush a finished block into content, reasoning or tool_use_blocks."""
@@ -194,12 +212,16 @@ class AnthropicStreamConsumer:
         if block is None:
             return
         if block["type"] == "text":
-            self.content.append(block["text"])
+            self.content.append("".join(block["parts"]))
         elif block["type"] == "thinking":
-            if block["text"]:
-                self.reasoning.append(block["text"])
+            thinking = "".join(block["parts"])
+            if thinking:
+                self.reasoning.append(thinking)
         elif block["type"] == "tool_use":
-            self.tool_use_blocks.append(_parse_tool_use_block(block))
+            tool_use = _parse_tool_use_block(block)
+            self.tool_use_blocks.append(tool_use)
+            # The block is complete: start a read-only tool right away.
+            speculate_tool_call(tool_use["id"], tool_use["name"], tool_use["input"])
 
     def handle_message_delta(self, event) -> None:
         """Record the output tokens and the raw stop_reason."""
@@ -215,8 +237,9 @@ class AnthropicStreamConsumer:
 
 def _parse_tool_use_block(block: dict[str, Any]) -> dict[str, Any]:
     """Parse a finished tool_use block into ``{"id", "name", "input"}``."""
+    arguments = "".join(block["parts"])
     try:
-        parsed = json.loads(block["json"]) if block["json"].strip() else {}
+        parsed = json.loads(arguments) if arguments.strip() else {}
     except json.JSONDecodeError:
         logger.warning("Failed to parse Anthropic tool-use arguments")
         parsed = {}
@@ -248,6 +271,8 @@ _STATE_KEYS = (
     "blocks",
     "input_tokens",
     "output_tokens",
+    "cache_read_tokens",
+    "cache_write_tokens",
     "raw_attrs",
 )
 
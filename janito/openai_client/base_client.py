@@ -27,14 +27,46 @@ those names directly (e.g. ``CompletionsClient._resolve_runtime_config``
 calls the ``resolve_runtime_config`` global of ``completions_api``).
 """
 
+import itertools
 import logging
+import time
 from typing import Any
 
 from rich.console import Console
 
+from janito.agent.context import (
+    ContextCompactor,
+    preflight_request,
+    record_compaction,
+    reset_compactions,
+)
+from janito.agent.ratelimit import get_rate_limiter, install_header_hook
+from janito.agent.routing import resolve_route
+from janito.agent.superseded import superseded_history
+from janito.agent.tokens import (
+    estimate_tokens,
+    flush_calibration,
+    observe_usage,
+    record_estimate,
+    token_family,
+)
+from janito.agent.tracing import current_span, span, start_trace
+from janito.agent.usage import (
+    add_prompt_usage,
+    add_queue_wait,
+    normalize_usage,
+    reset_prompt_usage,
+)
 from janito.config_store import get_config_value
 from janito.general_config import get_active_provider
+from janito.system_prompt import trace_attributes
 from janito.tooling.changes import clear_changes
+from janito.tooling.speculative import (
+    SpeculativeToolRunner,
+    begin_speculative_round,
+    load_speculative_enabled,
+    reset_speculation,
+)
 from janito.tooling.used_files import reset_used_files
 
 from .client_support import (
@@ -45,11 +77,62 @@ from .client_support import (
     _print_verbose_api_call,
     _print_verbose_api_response,
     _print_verbose_info,
+    _print_verbose_trace,
 )
+from .live_stream import watch_deltas
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# SDK clients reused across prompts, keyed by (client class, base URL, API
+# key); ``None`` (the default) creates a new SDK client for every prompt.
+_shared_sdk_clients: dict[tuple, Any] | None = None
+
+
+def share_sdk_clients(enabled: bool = True) -> None:
+    """Reuse one SDK client per client class, endpoint and key across prompts.
+
+    Creating an SDK client (its HTTP pool and TLS context) costs tens of
+    milliseconds per prompt; long-running callers that send many prompts
+    (the ``--batch`` runner) enable sharing once.  Off by default so every
+    interactive prompt picks up the current module-level SDK factory.
+    """
+    global _shared_sdk_clients
+    _shared_sdk_clients = {} if enabled else None
+
+
+def _select_tools(prompt, tools, mcp_tools, kwargs: dict[str, Any]):
+    """The turn's tool selection, or ``None`` to send the whole catalog.
+
+    Only auto-discovered tools are selected from: an explicit ``tools`` list
+    is always sent as is.  The conversation is identified by its client-side
+    history when there is one.
+    """
+    if tools is not None:
+        return None
+    from janito.tooling.tool_selection import select_tools
+    from janito.tooling.tools_registry import get_all_tool_schemas
+
+    with span("tools.select") as phase:
+        catalog = get_all_tool_schemas() + mcp_tools
+        selection = select_tools(catalog, prompt, kwargs.get("previous_messages"))
+        phase.set(
+            catalog=len(catalog),
+            selected=None if selection is None else len(selection.names),
+        )
+    return selection
+
+
+def _system_prompt_text(kwargs: dict[str, Any]) -> str | None:
+    """The system prompt a turn sends, from its conversation-context kwargs."""
+    if kwargs.get("instructions"):
+        return kwargs["instructions"]
+    messages = kwargs.get("previous_messages") or []
+    if messages and messages[0].get("role") == "system":
+        content = messages[0].get("content")
+        return content if isinstance(content, str) else None
+    return None
+
 
 class Client:
     """Shared agent-loop pipeline for a single API backend.
@@ -113,25 +196,70 @@ class Client:
             stateless clients, or a ``ConversationResult`` for the Responses
             client.
         """
+        # Every phase of the turn is timed (see janito.agent.tracing); the
+        # trace is kept for /status and summarized here in verbose mode.
+        with start_trace(api_type=self.api_type) as root:
+            # The prompt's digest tells a changed system prompt apart from a
+            # provider-side cache miss when ``cached_tokens`` drops.
+            root.set(**trace_attributes(_system_prompt_text(kwargs)))
+            try:
+                result = self._send_turn(
+                    prompt, verbose=verbose, tools=tools, thinking=thinking, **kwargs
+                )
+            finally:
+                # The rounds' calibration samples are written once per prompt.
+                flush_calibration()
+        if verbose:
+            _print_verbose_trace(Console(), root.trace)
+        return result
+
+    def _send_turn(self, prompt, *, verbose, tools, thinking, **kwargs):
+        """The turn pipeline of :meth:`send`, inside the prompt's trace."""
         # Reset per-prompt tracking so ./janito/changes.jsonl and the
         # "Used files" report only describe the current prompt.
-        clear_changes()
-        reset_used_files()
+        with span("tracking"):
+            clear_changes()
+            reset_used_files()
+        reset_compactions()
+        reset_prompt_usage()
+        # Read-only tool calls may start while the model is still streaming
+        # (results left over from a cancelled turn are dropped here).
+        reset_speculation(
+            SpeculativeToolRunner() if load_speculative_enabled() else None
+        )
 
-        base_url, api_key, model = self._resolve_runtime_config()
-        client = self._create_sdk_client(base_url, api_key)
-        logger.debug(f"{type(self).__name__} client created with base_url={base_url}")
+        with span("config.resolve") as phase:
+            base_url, api_key, model = self._resolve_runtime_config()
+            provider = self._active_provider()
+            # The rounds go to the provider's endpoint pool (a single
+            # endpoint without a ``pool``); a Responses chain stays where it
+            # was created.
+            route = resolve_route(
+                provider,
+                (base_url, api_key),
+                lambda member: self._resolve_runtime_config(member)[:2],
+                sticky_key=kwargs.get("previous_response_id"),
+            )
+            phase.set(provider=provider, model=model)
+        clients: dict = {}
 
         # Initialize MCP manager and load services if enabled; the tool
         # executor routes tool calls to the MCP manager or the built-in
         # registry and tracks usage/used-files/changes around each call.
-        mcp_manager, mcp_tools = _load_mcp(self.use_mcp)
+        with span("mcp.load", enabled=self.use_mcp):
+            mcp_manager, mcp_tools = _load_mcp(self.use_mcp)
         tool_executor = self._create_tool_executor(mcp_manager)
-        tools_schemas = self._resolve_tools(tools, mcp_tools)
+        # A large catalog is cut down to the conversation's tool selection
+        # (see janito.tooling.tool_selection).
+        selection = _select_tools(prompt, tools, mcp_tools, kwargs)
+        if selection is not None:
+            tool_executor.selection = selection
+            tools_schemas = self._resolve_tools(selection.schemas(), [])
+        else:
+            tools_schemas = self._resolve_tools(tools, mcp_tools)
 
         logger.debug(f"Using {len(tools_schemas)} tools total")
 
-        provider = self._active_provider()
         (
             thinking,
             max_output_tokens,
@@ -154,86 +282,227 @@ class Client:
         # messages list vs server-side response id vs client-side items).
         state = self._init_conversation_state(prompt, provider, model, **kwargs)
 
-        while True:
-            # Build the base call parameters for one round.
-            call_kwargs = self._build_call_kwargs(
-                model,
-                state,
-                max_output_tokens,
-                reasoning_level,
-                preserve_thinking,
-                thinking,
-            )
+        # Keep the re-sent history under compact-threshold percent of the
+        # context window (summarize old turns, elide old tool results).
+        compactor = ContextCompactor(max_input_tokens)
+        reserved_tokens = estimate_tokens(tools_schemas)
+
+        for round_number in itertools.count(1):
+            with span("round", round=round_number):
+                self._compact_context(compactor, state, reserved_tokens, console)
+                # Pre-flight size check: trims the history or raises
+                # PromptTooLargeError before anything is uploaded.
+                estimate = self._preflight(
+                    state, tools_schemas, max_input_tokens, provider, console
+                )
 
-            # In verbose mode, show the request that is about to be sent
-            # (messages/input truncated to their tail, tools by name).
-            if verbose:
-                self._print_verbose_api_call(console, call_kwargs, tools_schemas)
-
-            # Consume the full stream under a progress bar (the blocking work
-            # runs in a worker thread via the module's _run_with_progress_bar
-            # while the main thread drives the spinner).
-            (
-                full_content,
-                reasoning_content,
-                tool_calls,
-                usage_info,
-                raw_attrs,
-            ) = self._run_stream_round(
-                client,
-                call_kwargs,
-                tools_schemas,
-                state,
-                base_url=base_url,
-                api_key=api_key,
-                model=model,
-                console=console,
-            )
+                # Build the base call parameters for one round (superseded
+                # tool results are stubbed in the history sent).
+                call_kwargs = self._build_call_kwargs(
+                    model,
+                    self._request_state(state),
+                    max_output_tokens,
+                    reasoning_level,
+                    preserve_thinking,
+                    thinking,
+                )
 
-            # In verbose mode, show a compact summary of the response.
-            if verbose:
-                self._print_verbose_api_response(
-                    console,
+                # In verbose mode, show the request that is about to be sent
+                # (messages/input truncated to their tail, tools by name).
+                if verbose:
+                    self._print_verbose_api_call(console, call_kwargs, tools_schemas)
+
+                # Consume the full stream under a progress bar (the blocking work
+                # runs in a worker thread via the module's _run_with_progress_bar
+                # while the main thread drives the spinner), failing over to
+                # another endpoint of the pool on a transient error.
+                begin_speculative_round()
+                round_result, limiter, reserved = self._routed_round(
+                    route,
+                    clients,
+                    call_kwargs,
+                    tools_schemas,
+                    state,
+                    estimate=estimate,
+                    model=model,
+                    console=console,
+                )
+                (
                     full_content,
                     reasoning_content,
                     tool_calls,
                     usage_info,
-                    state,
-                    raw_attrs=raw_attrs,
-                )
+                    raw_attrs,
+                ) = round_result
+
+                # Calibrate the estimator (and the limiter's token bucket) from
+                # the tokens actually counted.
+                self._observe_usage(estimate, usage_info, limiter, reserved)
+
+                # In verbose mode, show a compact summary of the response.
+                if verbose:
+                    self._print_verbose_api_response(
+                        console,
+                        full_content,
+                        reasoning_content,
+                        tool_calls,
+                        usage_info,
+                        state,
+                        raw_attrs=raw_attrs,
+                    )
+
+                logger.debug("API streaming response completed")
+                with span("render"):
+                    _display_reasoning(reasoning_content, console)
+                    # Display the assembled response using rich markdown
+                    _display_content(full_content, console)
+
+                # Check if the model wants to call tools
+                if tool_calls:
+                    # Record the assistant's tool calls, execute every call and
+                    # append the tool responses to the history, then loop to get
+                    # the final response after the tool calls.
+                    state = self._handle_tool_calls(
+                        tool_calls,
+                        full_content,
+                        reasoning_content,
+                        state,
+                        tool_executor,
+                    )
+                    # Tools used or discovered this round join the selection.
+                    if selection is not None and selection.observe(tool_calls):
+                        tools_schemas = self._resolve_tools(selection.schemas(), [])
+                    continue
+
+                # No more tool calls, return the final response.
+                with span("finalize"):
+                    return self._finalize(
+                        full_content,
+                        reasoning_content,
+                        state,
+                        usage_info,
+                        max_input_tokens,
+                        max_output_tokens,
+                        console,
+                        provider=provider,
+                        model=model,
+                    )
 
-            logger.debug("API streaming response completed")
-            _display_reasoning(reasoning_content, console)
+    # ------------------------------------------------------------------
+    # Shared helpers (base implementation; not monkeypatched by tests)
+    # ------------------------------------------------------------------
 
-            # Display the assembled response using rich markdown
-            _display_content(full_content, console)
+    def _sdk_client(self, base_url, api_key, provider=None):
+        """The SDK client for the prompt: shared when enabled, else a new one.
 
-            # Check if the model wants to call tools
-            if tool_calls:
-                # Record the assistant's tool calls, execute every call and
-                # append the tool responses to the history, then loop to get
-                # the final response after the tool calls.
-                state = self._handle_tool_calls(
-                    tool_calls, full_content, reasoning_content, state, tool_executor
-                )
-                continue
+        New clients feed their response headers to the rate limiter of
+        ``provider`` (default: the active one; see
+        :func:`janito.agent.ratelimit.install_header_hook`).
+        """
+        key = (type(self), base_url, api_key)
+        if _shared_sdk_clients is not None and key in _shared_sdk_clients:
+            return _shared_sdk_clients[key]
+        client = self._create_sdk_client(base_url, api_key)
+        install_header_hook(
+            client, get_rate_limiter(provider or self._active_provider(), api_key)
+        )
+        if _shared_sdk_clients is not None:
+            _shared_sdk_clients[key] = client
+        return client
 
-            # No more tool calls, return the final response.
-            return self._finalize(
-                full_content,
-                reasoning_content,
-                state,
-                usage_info,
-                max_input_tokens,
-                max_output_tokens,
-                console,
-                provider=provider,
-                model=model,
-            )
+    def _routed_round(
+        self,
+        route,
+        clients,
+        call_kwargs,
+        tools_schemas,
+        state,
+        *,
+        estimate,
+        model,
+        console,
+    ):
+        """Run one streaming round on the route's endpoint, failing over.
 
-    # ------------------------------------------------------------------
-    # Shared helpers (base implementation; not monkeypatched by tests)
-    # ------------------------------------------------------------------
+        ``clients`` caches the prompt's SDK client per endpoint.  A round
+        failing with a transient error before it streamed any content or
+        reasoning is retried on another endpoint of the pool (see
+        :class:`janito.agent.routing.Route`); once text has been shown the
+        error is final.  A failed attempt gives its reserved tokens back to
+        the rate limiter.  A Responses round pins the route to the endpoint
+        holding its server-side state.
+
+        Returns:
+            ``(round_result, limiter, reserved_tokens)``.
+        """
+        while True:
+            endpoint = route.acquire()
+            reserved = deltas = None
+            try:
+                client = self._endpoint_client(clients, endpoint)
+                # The request span covers the rate-limit queue, the send and
+                # the stream (the worker thread marks the first token).
+                with (
+                    watch_deltas() as deltas,
+                    span("request", provider=endpoint.provider) as request,
+                ):
+                    # Queue behind earlier requests to the same provider and
+                    # key (client-side rate limit, fed by the response
+                    # headers).
+                    limiter = get_rate_limiter(endpoint.provider, endpoint.api_key)
+                    reserved = self._wait_for_rate_limit(limiter, estimate, console)
+                    request.mark("queue_ms")
+                    round_result = self._run_stream_round(
+                        client,
+                        call_kwargs,
+                        tools_schemas,
+                        state,
+                        base_url=endpoint.base_url,
+                        api_key=endpoint.api_key,
+                        model=model,
+                        console=console,
+                    )
+            except BaseException as e:
+                if reserved is not None:
+                    # The failed attempt counts none of its reserved tokens.
+                    limiter.settle(reserved, 0)
+                # Frees the slot on any exit (Ctrl+C included); only
+                # transient errors before the first delta fail over.
+                if not route.release(e) or (deltas is not None and deltas.seen):
+                    raise
+                console.print(
+                    f"[dim]{endpoint.provider}: {type(e).__name__}; "
+                    "failing over to another endpoint[/dim]",
+                    highlight=False,
+                )
+                continue
+            route.release()
+            if isinstance(state, dict):
+                route.pin(state.get("response_id"))
+            return round_result, limiter, reserved
+
+    def _endpoint_client(self, clients, endpoint):
+        """The endpoint's SDK client from ``clients``, created on first use."""
+        client = clients.get(endpoint)
+        if client is None:
+            with span("client.create", provider=endpoint.provider):
+                client = clients[endpoint] = self._sdk_client(
+                    endpoint.base_url, endpoint.api_key, provider=endpoint.provider
+                )
+        return client
+
+    def _wait_for_rate_limit(self, limiter, estimate, console) -> int:
+        """Wait for the provider's rate limiter; returns the tokens reserved."""
+        reserved = estimate.total if estimate is not None else 0
+        delay = limiter.reserve(reserved)
+        if delay > 0:
+            if delay >= 1:
+                console.print(
+                    f"[dim]Rate limit: waiting {delay:.1f}s[/dim]", highlight=False
+                )
+            time.sleep(delay)
+            add_queue_wait(delay)
+        return reserved
 
     def _active_provider(self) -> str:
         """The provider in effect: ``--provider`` or the configured default."""
@@ -243,6 +512,91 @@ class Client:
         """Read a config value (e.g. ``preserve_thinking``)."""
         return get_config_value(key)
 
+    def _context_history(self, state) -> list[dict[str, Any]] | None:
+        """The client-side history re-sent every round (``None`` when none).
+
+        The Completions/DashScope state *is* the messages list; the
+        Anthropic/Gemini state carries it under ``"messages"``.
+        """
+        if isinstance(state, list):
+            return state
+        if isinstance(state, dict):
+            return state.get("messages")
+        return None
+
+    def _request_state(self, state):
+        """``state`` with its history replaced by the one a round sends.
+
+        Superseded tool results are stubbed in a view of the history (see
+        :mod:`janito.agent.superseded`); the history itself, and so
+        ``/history`` and saved sessions, keep the original results.
+        """
+        history = self._context_history(state)
+        view = superseded_history(history)
+        if view is history:
+            return state
+        if isinstance(state, list):
+            return view
+        return {
+            key: view if value is history else value for key, value in state.items()
+        }
+
+    def _compact_context(self, compactor, state, reserved_tokens, console) -> None:
+        """Compact the history in place when it nears the context window."""
+        history = self._context_history(state)
+        compaction = compactor.compact(history, reserved_tokens=reserved_tokens)
+        if compaction is None:
+            return
+        record_compaction(compaction)
+        console.print(f"[dim]{compaction.describe()}[/dim]", highlight=False)
+
+    def _system_prompt(self, state) -> Any:
+        """A system prompt sent outside the history (Anthropic/Gemini)."""
+        return state.get("system") if isinstance(state, dict) else None
+
+    def _preflight(self, state, tools_schemas, max_input_tokens, provider, console):
+        """Estimate the next request; trim it, or refuse it when oversized.
+
+        Returns:
+            The :class:`~janito.agent.tokens.PromptEstimate` of the request,
+            or ``None`` when the history lives server-side (nothing to
+            estimate).
+
+        Raises:
+            PromptTooLargeError: The request cannot fit the context window.
+        """
+        history = self._context_history(state)
+        if history is None:
+            return None
+        estimate, compaction = preflight_request(
+            history,
+            tools_schemas,
+            self._system_prompt(state),
+            max_input_tokens,
+            token_family(provider),
+        )
+        if compaction is not None:
+            record_compaction(compaction)
+            console.print(f"[dim]{compaction.describe()}[/dim]", highlight=False)
+        record_estimate(estimate)
+        logger.debug(f"Request estimate: {estimate.describe()}")
+        return estimate
+
+    def _observe_usage(self, estimate, usage_info, limiter=None, reserved=0) -> None:
+        """Sum the round's usage and calibrate the estimator from its input.
+
+        The rate limiter's token bucket is corrected from the reserved
+        estimate to the tokens the round actually used.
+        """
+        usage = normalize_usage(usage_info)
+        add_prompt_usage(usage)
+        round_span = current_span()
+        if usage and round_span is not None:
+            round_span.set(cached_tokens=usage["cached"])
+        observe_usage(estimate, (usage or {}).get("input"))
+        if limiter is not None and usage and usage["input"] is not None:
+            limiter.settle(reserved, usage["input"] + (usage["output"] or 0))
+
     def _print_verbose_info(self, console, base_url, model, mcp_manager) -> None:
         """Print model/backend/MCP info in verbose mode."""
         _print_verbose_info(console, base_url, model, mcp_manager, self.backend_default)
@@ -286,8 +640,12 @@ class Client:
     # Hooks every subclass must implement (forwarding to its module globals)
     # ------------------------------------------------------------------
 
-    def _resolve_runtime_config(self):
-        """Resolve ``(base_url, api_key, model)`` (module-global forwarder)."""
+    def _resolve_runtime_config(self, provider=None):
+        """Resolve ``(base_url, api_key, model)`` (module-global forwarder).
+
+        ``provider`` resolves another provider (an endpoint-pool member)
+        instead of ``--provider`` / the configured default.
+        """
         raise NotImplementedError
 
     def _create_sdk_client(self, base_url, api_key):
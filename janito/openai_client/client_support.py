@@ -23,7 +23,7 @@ from rich.panel import Panel
 from rich.text import Text
 
 # Shared usage normalization (also used by the web loop's UsageEvent).
-from janito.agent.usage import format_tokens, normalize_usage
+from janito.agent.usage import format_tokens, get_prompt_usage, normalize_usage
 
 # Import MCP manager
 from janito.mcp_manager import get_mcp_manager
@@ -308,6 +308,8 @@ def _print_verbose_api_response(
                     parts.append(f"{label}: {stats[key]}")
             if stats.get("cached") is not None:
                 parts.append(f"Cached: {stats['cached']}")
+            if stats.get("cache_write"):
+                parts.append(f"Cache write: {stats['cache_write']}")
             lines.append("Usage: " + " | ".join(parts))
     if response_id:
         lines.append(f"Response id: {response_id}")
@@ -321,6 +323,34 @@ def _print_verbose_api_response(
     )
 
 
+def _trace_table(trace, title: str = "Timings"):
+    """A table of a prompt's phase spans (see :mod:`janito.agent.tracing`)."""
+    from rich.table import Table
+
+    from janito.agent.tracing import trace_rows
+
+    table = Table(
+        title=title,
+        title_style="bold",
+        header_style="bold cyan",
+        show_header=False,
+        box=None,
+        pad_edge=False,
+    )
+    table.add_column("Phase", style="green", no_wrap=True)
+    table.add_column("Duration", justify="right", no_wrap=True)
+    table.add_column("Details", overflow="fold")
+    for row in trace_rows(trace):
+        # Text cells: error messages may contain square brackets.
+        table.add_row(*(Text(cell) for cell in row))
+    return table
+
+
+def _print_verbose_trace(console: Console, trace) -> None:
+    """Print the timed phases of the prompt in verbose mode."""
+    console.print(_trace_table(trace), highlight=False)
+
+
 def _display_reasoning(reasoning_content: str, console: Console) -> None:
     """Show the reasoning panel when the model produced reasoning text."""
     if reasoning_content:
@@ -341,6 +371,13 @@ def _display_content(full_content: str, console: Console) -> None:
         console.print(Markdown(full_content))
 
 
+def _format_count(label: str, count: int, limit: int | None) -> str:
+    """``"<label>: <count>"``, with ``/<limit>`` when the limit is known."""
+    if limit is None:
+        return f"{label}: {format_tokens(count)}"
+    return f"{label}: {format_tokens(count)}/{format_tokens(limit)}"
+
+
 def _display_usage(
     usage_info: Any,
     max_input_tokens: int | None,
@@ -373,7 +410,10 @@ def _display_usage(
     model and the normalized token counts (cached input tokens are billed at
     the provider's cache-hit rate); it falls back to ``N/A`` when the
     provider or model is unknown, or when no cost module exists for the
-    provider.
+    provider.  When the API reports prompt-cache writes (Anthropic prompt
+    caching), ``Cache write: <n>`` follows the cached-token count.  When the
+    prompt waited for the client-side rate limiter, ``Queued: <s>`` reports
+    the total wait.
     """
     stats = normalize_usage(usage_info)
     if stats is None:
@@ -382,26 +422,24 @@ def _display_usage(
     input_tokens = stats["input"]
     output_tokens = stats["output"]
     cached_tokens = stats["cached"] if cached_details_attr is not None else None
+    cache_write_tokens = (
+        stats["cache_write"] if cached_details_attr is not None else None
+    )
 
     parts = []
     if total_tokens is not None:
         parts.append(f"Total: {format_tokens(total_tokens)}")
     if input_tokens is not None:
-        if max_input_tokens is not None:
-            parts.append(
-                f"In: {format_tokens(input_tokens)}/{format_tokens(max_input_tokens)}"
-            )
-        else:
-            parts.append(f"In: {format_tokens(input_tokens)}")
+        parts.append(_format_count("In", input_tokens, max_input_tokens))
     if output_tokens is not None:
-        if max_output_tokens is not None:
-            parts.append(
-                f"Out: {format_tokens(output_tokens)}/{format_tokens(max_output_tokens)}"
-            )
-        else:
-            parts.append(f"Out: {format_tokens(output_tokens)}")
+        parts.append(_format_count("Out", output_tokens, max_output_tokens))
     if cached_tokens is not None:
         parts.append(f"Cached: {format_tokens(cached_tokens)}")
+    if cache_write_tokens:
+        parts.append(f"Cache write: {format_tokens(cache_write_tokens)}")
+    queue_ms = get_prompt_usage().get("queue_ms")
+    if queue_ms:
+        parts.append(f"Queued: {queue_ms / 1000:.1f}s")
     parts.append(f"{label}: {message_count}")
     if provider is not None and model is not None:
         cost = get_provider_cost(
@@ -3,13 +3,13 @@ OpenAI client module for sending prompts to OpenAI-compatible endpoints.
 Uses streaming (SSE) to display tokens as they arrive.
 """
 
+import contextvars
 import logging
 import sys
 import threading
 from typing import Any
 
-from openai import AuthenticationError, NotFoundError, OpenAI
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.console import Console
 
 # Import auth handling (API keys come from the auth store, not the environment)
 from janito.auth_config import get_api_key
@@ -21,7 +21,9 @@ from janito.general_config import load_provider_from_config
 # Import provider configuration for base URLs and built-in defaults
 from ..provider_accessors import (
     get_default_model_from_provider,
+    requires_api_key,
     requires_explicit_model,
+    uses_mock_server,
 )
 from ..provider_validation import is_custom_provider
 
@@ -58,6 +60,12 @@ from .completions_stream import (  # noqa: F401 (re-exported for backward compat
     _consume_tool_call_delta,
     _stream_response,
 )
+from .live_stream import (
+    LiveStreamView,
+    StreamBuffer,
+    live_render_enabled,
+    set_stream_buffer,
+)
 
 # Import tools
 
@@ -68,6 +76,17 @@ from .completions_stream import (  # noqa: F401 (re-exported for backward compat
 logger = logging.getLogger(__name__)
 
 
+def OpenAI(**kwargs):  # noqa: N802 (stands in for the SDK class)
+    """``openai.OpenAI(**kwargs)``, the SDK imported on first use.
+
+    The other API types and the flag-driven commands import this module
+    without ever creating a client, so they never pay for the SDK.
+    """
+    from openai import OpenAI as sdk_client_class
+
+    return sdk_client_class(**kwargs)
+
+
 def resolve_runtime_config(
     cli_model: str | None = None,
     cli_provider: str | None = None,
@@ -128,6 +147,10 @@ def resolve_runtime_config(
 
     # API key from the auth store (no environment variables).
     api_key = get_api_key(provider)
+    if not api_key and not requires_api_key(provider):
+        # Credential-less providers (the offline mock) still need a
+        # non-empty key for the SDK clients.
+        api_key = "mock"
     if not api_key:
         logger.error(f"No API key configured for provider '{provider}'")
         raise ValueError(
@@ -173,6 +196,10 @@ def resolve_runtime_config(
 
         api_type = resolve_api_type(cli_api_type, provider)
         base_url = get_endpoint_for_api_type(provider, api_type)
+    if base_url and uses_mock_server(provider):
+        from ..providers.mock.server import ensure_mock_server
+
+        ensure_mock_server(base_url)
 
     logger.debug(f"Runtime config resolved: base_url={base_url}, model={model}")
     return base_url, api_key, model
@@ -247,6 +274,35 @@ def _is_enter_pressed() -> bool:
         return False
 
 
+def _wait_with_spinner(thread, cancel_event, description):
+    """Show a spinner until ``thread`` ends or Enter is pressed."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True,
+    ) as progress:
+        task = progress.add_task(description, total=None)
+        while thread.is_alive():
+            if _is_enter_pressed():
+                cancel_event.set()
+                break
+            progress.update(task, advance=0.1)
+            thread.join(timeout=0.1)
+
+
+def _wait_with_live_view(thread, cancel_event, buffer, description, console):
+    """Render the streamed text live until ``thread`` ends or Enter is pressed."""
+    with LiveStreamView(buffer, description, console=console) as view:
+        while thread.is_alive():
+            if _is_enter_pressed():
+                cancel_event.set()
+                break
+            view.tick()
+            thread.join(timeout=0.1)
+
+
 def _run_with_progress_bar(func, *args, **kwargs):
     """Run a function with a Rich progress bar in a separate thread.
 
@@ -254,36 +310,37 @@ def _run_with_progress_bar(func, *args, **kwargs):
     if the user presses Enter, the in-flight request is aborted through a
     shared ``cancel_event`` and :class:`RequestCancelled` is raised (an
     interrupt without rolling the conversation history back, unlike Ctrl+C).
+
+    On a terminal (and unless ``live-render`` is disabled) the streamed
+    content and reasoning are rendered live instead of the bare spinner; see
+    :mod:`janito.openai_client.live_stream`.
     """
     result = [None]
     exception = [None]
     cancel_event = threading.Event()
+    buffer = StreamBuffer()
 
     def target():
+        # The stream consumers push their deltas to this thread's buffer.
+        set_stream_buffer(buffer)
         try:
             result[0] = func(*args, **kwargs, cancel_event=cancel_event)
         except Exception as e:
             exception[0] = e
+        finally:
+            set_stream_buffer(None)
 
-    # Create and start the thread
-    thread = threading.Thread(target=target)
+    # Create and start the thread; it runs in a copy of the caller's
+    # context so the stream lands in the current trace span.
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(target,))
     thread.start()
 
-    # Show progress bar while waiting
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        transient=True,
-    ) as progress:
-        task = progress.add_task(
-            "Waiting for response from the API server...", total=None
-        )
-        while thread.is_alive():
-            if _is_enter_pressed():
-                cancel_event.set()
-                break
-            progress.update(task, advance=0.1)
-            thread.join(timeout=0.1)
+    description = "Waiting for response from the API server..."
+    console = Console()
+    if live_render_enabled(console):
+        _wait_with_live_view(thread, cancel_event, buffer, description, console)
+    else:
+        _wait_with_spinner(thread, cancel_event, description)
 
     cancelled = cancel_event.is_set()
     if not cancelled:
@@ -363,8 +420,8 @@ class CompletionsClient(Client):
 
     api_type = "Completions"
 
-    def _resolve_runtime_config(self):
-        return resolve_runtime_config(self.cli_model, self.cli_provider)
+    def _resolve_runtime_config(self, provider=None):
+        return resolve_runtime_config(self.cli_model, provider or self.cli_provider)
 
     def _create_sdk_client(self, base_url, api_key):
         # base_url can be None for standard OpenAI
@@ -434,6 +491,8 @@ class CompletionsClient(Client):
         model,
         console,
     ):
+        from openai import AuthenticationError, NotFoundError
+
         try:
             (
                 full_content,
@@ -19,8 +19,10 @@ re-exported from ``completions_api``).
 import logging
 
 from janito.agent.completions import CompletionsAccumulator
+from janito.tooling.speculative import speculate_tool_call
 
 from .client_support import _extract_raw_attrs
+from .live_stream import push_delta
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -40,6 +42,12 @@ class CompletionsStreamConsumer(CompletionsAccumulator):
     # the shared base calls it ``_fold_tool_call_delta``.
     handle_tool_call_delta = CompletionsAccumulator._fold_tool_call_delta
 
+    # Start read-only tool calls as soon as their arguments are complete.
+    track_tool_call_arguments = True
+
+    def on_tool_call_ready(self, call) -> None:
+        speculate_tool_call(call["id"], call["name"], call["arguments"])
+
     def handle(self, chunk) -> tuple[str | None, str | None]:
         """Process one chunk, also capturing the raw response metadata.
 
@@ -48,14 +56,17 @@ class CompletionsStreamConsumer(CompletionsAccumulator):
         ``created``, ``system_fingerprint``, ...) and the terminal
         ``finish_reason`` are kept in ``raw_attrs`` for the verbose response
         dump.  ``content``/``usage``/``choices`` are surfaced elsewhere, so
-        they are skipped here.
+        they are skipped here.  The metadata repeats on every chunk, so it is
+        only read from the first chunk and from the terminal ones (carrying a
+        ``finish_reason``, or the usage-only chunk without ``choices``).
         """
         result = super().handle(chunk)
-        self.raw_attrs.update(_extract_raw_attrs(chunk, skip=("choices", "usage")))
-        if chunk.choices:
-            finish = getattr(chunk.choices[0], "finish_reason", None)
-            if finish:
-                self.raw_attrs["finish_reason"] = finish
+        choices = chunk.choices
+        finish = getattr(choices[0], "finish_reason", None) if choices else None
+        if self.chunks == 1 or finish or not choices:
+            self.raw_attrs.update(_extract_raw_attrs(chunk, skip=("choices", "usage")))
+        if finish:
+            self.raw_attrs["finish_reason"] = finish
         return result
 
     @property
@@ -105,7 +116,7 @@ class CompletionsStreamConsumer(CompletionsAccumulator):
             # next chunk arrives so the worker can close the connection.
             if cancel_event is not None and cancel_event.is_set():
                 break
-            self.handle(chunk)
+            push_delta(*self.handle(chunk))
 
         return (
             self.full_content,
@@ -134,13 +145,15 @@ def _consume_chunk(delta, collected_content, collected_reasoning, tool_calls_map
     """Accumulate content/reasoning/tool-call deltas from one chunk delta.
 
     Legacy bridge: aliases the caller-supplied collections to a consumer,
-    applies the chunk, and relies on in-place mutation to propagate.
+    applies the chunk, and relies on in-place mutation to propagate (the
+    streamed ``arguments`` fragments are joined back into ``tool_calls_map``).
     """
     consumer = CompletionsStreamConsumer()
     consumer.content = collected_content
     consumer.reasoning = collected_reasoning
     consumer.tool_calls = tool_calls_map
     consumer.handle_chunk(delta)
+    consumer.join_tool_call_arguments()
 
 
 def _consume_tool_call_delta(tc_delta, tool_calls_map):
@@ -148,6 +161,7 @@ def _consume_tool_call_delta(tc_delta, tool_calls_map):
     consumer = CompletionsStreamConsumer()
     consumer.tool_calls = tool_calls_map
     consumer.handle_tool_call_delta(tc_delta)
+    consumer.join_tool_call_arguments()
 
 
 def _stream_response(client, call_kwargs, tools_schemas, cancel_event=None):
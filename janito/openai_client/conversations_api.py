@@ -43,8 +43,6 @@ import logging
 from dataclasses import dataclass
 from typing import Any
 
-from openai import AuthenticationError, NotFoundError, OpenAI
-
 # Import the tool executor (routes tool calls to the MCP manager or the
 # built-in registry and tracks usage/used-files/changes around each call)
 from janito.tooling.executor import ToolExecutor
@@ -68,7 +66,8 @@ from .client_support import (  # noqa: F401 (re-exported for backward compat)
 # Shared helpers reused from the Chat Completions implementation so both
 # modules stay in sync: runtime config resolution and the progress spinner
 # runner.
-from .completions_api import (
+from .completions_api import (  # OpenAI: the SDK client, imported on first use
+    OpenAI,
     RequestCancelled,
     _run_with_progress_bar,
     resolve_runtime_config,
@@ -250,8 +249,8 @@ class ResponsesClient(Client):
 
     api_type = "Responses"
 
-    def _resolve_runtime_config(self):
-        return resolve_runtime_config(self.cli_model, self.cli_provider)
+    def _resolve_runtime_config(self, provider=None):
+        return resolve_runtime_config(self.cli_model, provider or self.cli_provider)
 
     def _create_sdk_client(self, base_url, api_key):
         # base_url can be None for standard OpenAI
@@ -310,6 +309,11 @@ class ResponsesClient(Client):
             ],
         }
 
+    def _context_history(self, state):
+        # Only stateless providers re-send a client-side history; server-side
+        # conversations live on the server (conversation_items is None).
+        return state["conversation_items"]
+
     def _build_call_kwargs(
         self,
         model,
@@ -357,6 +361,8 @@ class ResponsesClient(Client):
         model,
         console,
     ):
+        from openai import AuthenticationError, NotFoundError
+
         try:
             (
                 full_content,
@@ -20,6 +20,7 @@ from types import SimpleNamespace
 from typing import Any
 
 from .client_support import _extract_raw_attrs
+from .live_stream import push_delta
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -112,8 +113,9 @@ class DashScopeStreamConsumer:
     def __init__(self) -> None:
         self.content: list[str] = []
         self.reasoning: list[str] = []
-        # index -> {id, name, arguments}
-        self.tool_calls: dict[int, dict[str, str]] = {}
+        # index -> {id, name, arguments}; ``arguments`` is the list of
+        # streamed fragments (joined once, in _build_tool_use_blocks)
+        self.tool_calls: dict[int, dict[str, Any]] = {}
         self.input_tokens: int | None = None
         self.output_tokens: int | None = None
         self.total_tokens: int | None = None
@@ -210,11 +212,6 @@ class DashScopeStreamConsumer:
         if status_code is not None and status_code != 200:
             _raise_dashscope_error(chunk, status_code)
 
-        # Raw top-level chunk metadata (request_id, status_code, ...) for the
-        # verbose dump; output (content/tool calls) and usage are surfaced
-        # elsewhere.
-        self.raw_attrs.update(_extract_raw_attrs(chunk, skip=("output", "usage")))
-
         output = _get(chunk, "output") or {}
         choices = _get(output, "choices") or []
         if not choices:
@@ -228,6 +225,12 @@ class DashScopeStreamConsumer:
         self.consume_usage(chunk)
 
         finish_reason = _get(choice, "finish_reason")
+        # Raw top-level chunk metadata (request_id, status_code, ...) for the
+        # verbose dump; output (content/tool calls) and usage are surfaced
+        # elsewhere.  It repeats on every chunk, so only the first and the
+        # terminal chunks are read.
+        if not self.raw_attrs or finish_reason:
+            self.raw_attrs.update(_extract_raw_attrs(chunk, skip=("output", "usage")))
         if finish_reason:
             self.raw_attrs["finish_reason"] = finish_reason
         if finish_reason == "stop":
@@ -248,6 +251,7 @@ class DashScopeStreamConsumer:
         reasoning = _get(message, "reasoning_content") or ""
         if reasoning:
             self.reasoning.append(reasoning)
+        push_delta(reasoning, content)
 
         # Tool-call requests stream across many chunks: each chunk carries a
         # partial tool_call with an ``index`` and the ``arguments`` JSON is
@@ -259,15 +263,19 @@ class DashScopeStreamConsumer:
     def handle_tool_call(self, tc) -> None:
         """Merge one DashScope tool-call chunk into the per-index map."""
         idx = _get(tc, "index", 0) or 0
-        entry = self.tool_calls.setdefault(idx, {"id": "", "name": "", "arguments": ""})
-        if _get(tc, "id"):
-            entry["id"] = _get(tc, "id")
+        entry = self.tool_calls.get(idx)
+        if entry is None:
+            entry = self.tool_calls[idx] = {"id": "", "name": "", "arguments": []}
+        call_id = _get(tc, "id")
+        if call_id:
+            entry["id"] = call_id
         function = _get(tc, "function") or {}
-        if _get(function, "name"):
-            entry["name"] = _get(function, "name")
+        name = _get(function, "name")
+        if name:
+            entry["name"] = name
         arguments = _get(function, "arguments")
         if arguments:
-            entry["arguments"] += arguments
+            entry["arguments"].append(arguments)
 
     def consume_usage(self, chunk) -> None:
         """Keep the most recent usage reported by the API."""
@@ -295,14 +303,14 @@ def _raise_dashscope_error(chunk, status_code: int) -> None:
 
 
 def _build_tool_use_blocks(
-    tool_calls_map: dict[int, dict[str, str]],
+    tool_calls_map: dict[int, dict[str, Any]],
 ) -> list[dict[str, str]]:
     """Flatten the accumulated tool calls into a sorted block list."""
     return [
         {
             "id": tool_calls_map[idx]["id"],
             "name": tool_calls_map[idx]["name"],
-            "arguments": tool_calls_map[idx]["arguments"] or "{}",
+            "arguments": "".join(tool_calls_map[idx]["arguments"]) or "{}",
         }
         for idx in sorted(tool_calls_map)
     ]
@@ -339,12 +347,29 @@ _STATE_KEYS = (
 )
 
 
+def _fragment_calls(tool_calls_map: dict[int, dict[str, Any]]) -> dict:
+    """A legacy map (joined ``arguments`` strings) in the consumer's form."""
+    return {
+        idx: {**call, "arguments": [call.get("arguments") or ""]}
+        for idx, call in tool_calls_map.items()
+    }
+
+
+def _join_calls(calls: dict, tool_calls_map: dict[int, dict[str, Any]]) -> None:
+    """Write the consumer's calls into a legacy map, ``arguments`` joined."""
+    for idx, call in calls.items():
+        entry = tool_calls_map.setdefault(idx, {})
+        entry.update(call)
+        entry["arguments"] = "".join(call["arguments"])
+
+
 def _consumer_from_state(state: dict[str, Any]) -> DashScopeStreamConsumer:
     """Build a consumer seeded from a legacy ``state`` dict."""
     consumer = DashScopeStreamConsumer()
     for key in _STATE_KEYS:
         if key in state:
             setattr(consumer, key, state[key])
+    consumer.tool_calls = _fragment_calls(state.get("tool_calls") or {})
     return consumer
 
 
@@ -353,7 +378,9 @@ def _state_from_consumer(
 ) -> None:
     """Write a consumer's parts back into a legacy ``state`` dict."""
     for key in _STATE_KEYS:
-        state[key] = getattr(consumer, key)
+        if key != "tool_calls":
+            state[key] = getattr(consumer, key)
+    _join_calls(consumer.tool_calls, state.setdefault("tool_calls", {}))
 
 
 def _consume_stream(stream, cancel_event=None):
@@ -381,8 +408,9 @@ def _consume_message(message, state: dict[str, Any]) -> None:
 def _consume_tool_call(tc, tool_calls_map: dict[int, dict[str, str]]) -> None:
     """Merge one tool-call chunk into a legacy per-index map (in-place)."""
     consumer = DashScopeStreamConsumer()
-    consumer.tool_calls = tool_calls_map
+    consumer.tool_calls = _fragment_calls(tool_calls_map)
     consumer.handle_tool_call(tc)
+    _join_calls(consumer.tool_calls, tool_calls_map)
 
 
 def _consume_usage(chunk, state: dict[str, Any]) -> None:
@@ -31,6 +31,7 @@ import logging
 from typing import Any
 
 from .client_support import _extract_raw_attrs
+from .live_stream import push_delta
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -52,6 +53,7 @@ class GeminiStreamConsumer:
         self.usage: Any = None
         self.raw_attrs: dict[str, Any] = {}
         self.done: bool = False
+        self.chunks = 0
 
     # ------------------------------------------------------------------
     # Chunk folding
@@ -62,15 +64,15 @@ class GeminiStreamConsumer:
 
         Also captures the chunk's raw top-level metadata (``model_version``,
         ``response_id``, ``create_time``, ...) and the terminal
-        ``finish_reason`` for the verbose response dump.
+        ``finish_reason`` for the verbose response dump.  The metadata
+        repeats on every chunk, so it is only read from the first chunk and
+        the terminal one.
         """
+        self.chunks += 1
         usage = getattr(chunk, "usage_metadata", None)
         if usage is not None:
             self.usage = usage
-
-        self.raw_attrs.update(
-            _extract_raw_attrs(chunk, skip=("candidates", "usage_metadata"))
-        )
+        was_done = self.done
 
         reasoning_delta: str | None = None
         content_delta: str | None = None
@@ -82,14 +84,20 @@ class GeminiStreamConsumer:
                     text, kind = delta
                     if kind == "reasoning":
                         reasoning_delta = text
+                        push_delta(reasoning=text)
                     elif kind == "content":
                         content_delta = text
+                        push_delta(content=text)
             finish = getattr(candidate, "finish_reason", None)
             if finish is not None:
                 finish_name = getattr(finish, "name", None) or str(finish)
                 self.raw_attrs["finish_reason"] = finish_name
                 if finish_name != "FINISH_REASON_UNSPECIFIED":
                     self.done = True
+        if self.chunks == 1 or self.done != was_done:
+            self.raw_attrs.update(
+                _extract_raw_attrs(chunk, skip=("candidates", "usage_metadata"))
+            )
         return reasoning_delta, content_delta
 
     def _fold_part(self, part) -> tuple[Any, str] | None:
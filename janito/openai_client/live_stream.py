@@ -0,0 +1,232 @@
+"""Live rendering of streamed content and reasoning in the CLI.
+
+The stream consumers (Completions, Responses, Anthropic, DashScope, Gemini)
+run in the worker thread started by
+:func:`~janito.openai_client.completions_api._run_with_progress_bar`, while
+the main thread shows a spinner and polls stdin for Enter-to-cancel.  Without
+live rendering nothing reaches the console until the whole answer has
+arrived.
+
+With live rendering, the runner installs a :class:`StreamBuffer` for the
+worker thread (:func:`set_stream_buffer`) and the consumers push every
+content / reasoning delta into it (:func:`push_delta`, a no-op when no
+buffer is installed -- e.g. in the web backend or in tests).  The main thread
+keeps owning the console: :class:`LiveStreamView` shows the tail of the
+streamed text in a transient ``rich.live.Live`` region, re-rendering the
+Markdown at most every :data:`LIVE_REFRESH_SECONDS` (re-parsing a growing
+answer on every token would cost more than the network).  The region
+disappears when the stream ends and the usual reasoning panel / Markdown
+answer are printed once, so the final output is unchanged.
+
+Live rendering is on for terminals unless ``live-render`` is set to
+``false`` in the config; redirected output keeps the plain spinner.
+
+:func:`watch_deltas` tells the caller of a round whether any delta was
+streamed: a round may fail over to another endpoint only before that (see
+``Client._routed_round``).
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.panel import Panel
+from rich.spinner import Spinner
+from rich.text import Text
+
+from janito.agent.tracing import mark_first_token
+
+#: Minimum interval between two re-renders of the live region.
+LIVE_REFRESH_SECONDS = 0.2
+
+#: Lines of reasoning kept visible while the model is thinking.
+REASONING_TAIL_LINES = 4
+
+# The buffer of the stream consumed by the current (worker) thread.
+_local = threading.local()
+
+# The watch of the round being streamed; the worker thread runs in a copy
+# of the caller's context, so it reports to the caller's watch.
+_watch: "ContextVar[DeltaWatch | None]" = ContextVar("janito_delta_watch", default=None)
+
+
+class StreamBuffer:
+    """Thread-safe accumulation of streamed content and reasoning deltas.
+
+    The worker thread appends; the main thread reads snapshots.  ``version``
+    grows with every non-empty delta so readers can skip unchanged states.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._content: list[str] = []
+        self._reasoning: list[str] = []
+        self.version = 0
+
+    def push(self, reasoning: str | None = None, content: str | None = None) -> None:
+        """Append one reasoning and/or content delta."""
+        if not reasoning and not content:
+            return
+        with self._lock:
+            if reasoning:
+                self._reasoning.append(reasoning)
+            if content:
+                self._content.append(content)
+            self.version += 1
+
+    def snapshot(self) -> tuple[str, str, int]:
+        """``(reasoning, content, version)`` streamed so far."""
+        with self._lock:
+            return "".join(self._reasoning), "".join(self._content), self.version
+
+
+class DeltaWatch:
+    """Whether a round has streamed any content or reasoning yet."""
+
+    def __init__(self):
+        self.seen = False
+
+
+@contextmanager
+def watch_deltas() -> Iterator[DeltaWatch]:
+    """Watch the deltas streamed in the enclosed block (see :func:`push_delta`)."""
+    watch = DeltaWatch()
+    token = _watch.set(watch)
+    try:
+        yield watch
+    finally:
+        _watch.reset(token)
+
+
+def set_stream_buffer(buffer: StreamBuffer | None) -> None:
+    """Install (or clear) the buffer the current thread's deltas go to."""
+    _local.buffer = buffer
+
+
+def push_delta(reasoning: str | None = None, content: str | None = None) -> None:
+    """Forward a streamed delta to the current thread's buffer, if any.
+
+    The first non-empty delta of a request also marks its time to first
+    token (see :mod:`janito.agent.tracing`).
+    """
+    if reasoning or content:
+        mark_first_token()
+        watch = _watch.get()
+        if watch is not None:
+            watch.seen = True
+    buffer = getattr(_local, "buffer", None)
+    if buffer is not None:
+        buffer.push(reasoning, content)
+
+
+def live_render_enabled(console: Console) -> bool:
+    """Whether streamed text should be rendered live on ``console``."""
+    if not console.is_terminal:
+        return False
+    from janito.config_store import get_config_value
+
+    value = get_config_value("live-render")
+    if isinstance(value, str):
+        return value.strip().lower() not in ("false", "0", "no", "off")
+    return value is None or bool(value)
+
+
+def _tail(text: str, lines: int) -> str:
+    """The last ``lines`` lines of ``text``."""
+    parts = text.rstrip("\n").split("\n")
+    return "\n".join(parts[-lines:]) if lines > 0 else ""
+
+
+class LiveStreamView:
+    """Transient console region showing the tail of a streamed answer.
+
+    Args:
+        buffer: The buffer the worker thread streams into.
+        description: Spinner text shown until the first delta arrives.
+        console: Target console (``None`` uses Rich's global console).
+        refresh_seconds: Minimum interval between two re-renders.
+    """
+
+    def __init__(
+        self,
+        buffer: StreamBuffer,
+        description: str,
+        console: Console | None = None,
+        refresh_seconds: float = LIVE_REFRESH_SECONDS,
+    ):
+        self.buffer = buffer
+        self.console = console or Console()
+        self.refresh_seconds = refresh_seconds
+        self.renders = 0
+        self._spinner = Spinner("dots", text=description)
+        self._live = Live(
+            self._spinner,
+            console=self.console,
+            auto_refresh=False,
+            transient=True,
+        )
+        self._version = 0
+        self._last_render = 0.0
+
+    def __enter__(self):
+        self._live.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._live.__exit__(*exc_info)
+
+    def tick(self, now: float | None = None) -> bool:
+        """Re-render when new text arrived and the throttle interval elapsed.
+
+        Returns:
+            Whether the region was re-rendered with new text.
+        """
+        now = time.monotonic() if now is None else now
+        if now - self._last_render < self.refresh_seconds:
+            return False
+        self._last_render = now
+        reasoning, content, version = self.buffer.snapshot()
+        if version == self._version:
+            # Nothing new: only advance the spinner.
+            self._live.refresh()
+            return False
+        self._version = version
+        self._live.update(self.render(reasoning, content), refresh=True)
+        self.renders += 1
+        return True
+
+    def render(self, reasoning: str, content: str):
+        """The live region for the text streamed so far."""
+        # Leave room for the panel borders and the status line.
+        height = max(self.console.height - 4, 3)
+        parts = []
+        if reasoning and not content:
+            parts.append(
+                Panel(
+                    Text(_tail(reasoning, REASONING_TAIL_LINES), style="dim"),
+                    title="💭 Reasoning",
+                    border_style="cyan",
+                )
+            )
+        if content:
+            parts.append(Markdown(_tail(content, height)))
+        self._spinner.update(text="Streaming... (press Enter to cancel)")
+        parts.append(self._spinner)
+        return Group(*parts)
+
+
+__all__ = [
+    "DeltaWatch",
+    "LIVE_REFRESH_SECONDS",
+    "LiveStreamView",
+    "StreamBuffer",
+    "live_render_enabled",
+    "push_delta",
+    "set_stream_buffer",
+    "watch_deltas",
+]
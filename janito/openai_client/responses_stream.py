@@ -18,7 +18,10 @@ and drives the per-event handlers.  The module-level ``_consume_response_stream`
 import logging
 from typing import Any
 
+from janito.tooling.speculative import speculate_tool_call
+
 from .client_support import _extract_raw_attrs
+from .live_stream import push_delta
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -39,7 +42,9 @@ class ResponsesStreamConsumer:
         self.content: list[str] = []
         self.reasoning: list[str] = []
         self.tool_calls: list[dict[str, Any]] = []
-        self.partial_arguments: dict[str, str] = {}
+        # item id -> streamed argument fragments (joined once, when the
+        # function_call item is done)
+        self.partial_arguments: dict[str, list[str]] = {}
         self.usage_info: Any = None
         self.response_id: str | None = None
         self.raw_attrs: dict[str, Any] = {}
@@ -121,21 +126,15 @@ class ResponsesStreamConsumer:
             _handle_untyped_error(event)
             return
 
-        if event_type in ("response.created", "response.completed"):
+        # Deltas are by far the most frequent events: test for them first.
+        if event_type in _TEXT_DELTA_EVENTS:
+            self.handle_text_delta(event)
+        elif event_type in _CALL_ARGUMENTS_EVENTS:
+            self.handle_call_arguments(event)
+        elif event_type in ("response.created", "response.completed"):
             self.handle_completion_event(event)
         elif event_type == "response.failed":
             _raise_failed_error(event)
-        elif event_type in (
-            "response.output_text.delta",
-            "response.reasoning_text.delta",
-            "response.reasoning_summary_text.delta",
-        ):
-            self.handle_text_delta(event)
-        elif event_type in (
-            "response.function_call_arguments.delta",
-            "response.function_call_arguments.done",
-        ):
-            self.handle_call_arguments(event)
         elif event_type == "response.output_item.done":
             self.handle_output_item(event)
 
@@ -160,31 +159,48 @@ class ResponsesStreamConsumer:
             return
         if event.type == "response.output_text.delta":
             self.content.append(event.delta)
+            push_delta(content=event.delta)
         else:
             self.reasoning.append(event.delta)
+            push_delta(reasoning=event.delta)
 
     def handle_call_arguments(self, event) -> None:
         """Assemble per-item function_call arguments (split across deltas)."""
         if event.type == "response.function_call_arguments.done":
-            self.partial_arguments[event.item_id] = event.arguments or ""
+            self.partial_arguments[event.item_id] = [event.arguments or ""]
             return
-        item_id = event.item_id
-        self.partial_arguments[item_id] = self.partial_arguments.get(item_id, "") + (
-            event.delta or ""
-        )
+        if event.delta:
+            self.partial_arguments.setdefault(event.item_id, []).append(event.delta)
 
     def handle_output_item(self, event) -> None:
         """Append a finished function_call output item to the tool calls."""
         item = event.item
         if getattr(item, "type", None) != "function_call":
             return
-        self.tool_calls.append(
-            {
-                "call_id": item.call_id,
-                "name": item.name,
-                "arguments": item.arguments or self.partial_arguments.get(item.id, ""),
-            }
-        )
+        call = {
+            "call_id": item.call_id,
+            "name": item.name,
+            "arguments": item.arguments
+            or "".join(self.partial_arguments.get(item.id, ())),
+        }
+        self.tool_calls.append(call)
+        # The item is complete: start a read-only tool right away.
+        speculate_tool_call(call["call_id"], call["name"], call["arguments"])
+
+
+_TEXT_DELTA_EVENTS = frozenset(
+    (
+        "response.output_text.delta",
+        "response.reasoning_text.delta",
+        "response.reasoning_summary_text.delta",
+    )
+)
+_CALL_ARGUMENTS_EVENTS = frozenset(
+    (
+        "response.function_call_arguments.delta",
+        "response.function_call_arguments.done",
+    )
+)
 
 
 def _handle_untyped_error(event) -> None:
@@ -248,6 +248,54 @@ def requires_explicit_model(provider: str) -> bool:
     return found.default_model() == "custom"
 
 
+def requires_api_key(provider: str) -> bool:
+    """Whether a provider needs an API key from the auth store.
+
+    Args:
+        provider: The provider name (case-insensitive).
+
+    Returns:
+        ``False`` when the provider declares ``requires_api_key: False``
+        (e.g. the offline ``mock`` provider), ``True`` otherwise (including
+        unknown providers).
+    """
+    found = _registry.get(provider)
+    if found is None:
+        return True
+    return found.info.get("requires_api_key", True) is not False
+
+
+def uses_mock_server(provider: str) -> bool:
+    """Whether a provider's endpoint is the in-process mock server.
+
+    Args:
+        provider: The provider name (case-insensitive).
+
+    Returns:
+        ``True`` when the provider declares ``mock_server: True`` (see
+        :mod:`janito.providers.mock.server`), ``False`` otherwise.
+    """
+    found = _registry.get(provider)
+    return found is not None and found.info.get("mock_server") is True
+
+
+def get_default_rate_limits_from_provider(provider: str) -> dict | None:
+    """
+    Get the built-in client-side rate limits of a provider.
+
+    Args:
+        provider: The provider name (case-insensitive)
+
+    Returns:
+        The provider's ``rate_limits`` entry (``requests_per_minute`` /
+        ``tokens_per_minute``), or ``None`` when it declares none (the
+        limiter then learns the limits from the response headers, see
+        :mod:`janito.agent.ratelimit`).
+    """
+    found = _registry.get(provider)
+    return found.info.get("rate_limits") if found is not None else None
+
+
 def get_default_max_output_tokens_from_provider(
     provider: str, model: str | None = None
 ) -> int | None:
@@ -608,6 +656,35 @@ def get_responses_in_server_from_provider(
     return found.responses_in_server(model)
 
 
+def get_prompt_caching_from_provider(
+    provider: str | None, model: str | None = None
+) -> bool:
+    """
+    Get whether a provider's model uses Anthropic prompt caching.
+
+    When ``True``, native Anthropic requests (API type ``Anthropic``) carry
+    ``cache_control`` breakpoints on the tool definitions, the system prompt
+    and the rolling end of the conversation (see
+    :func:`janito.agent.anthropic.apply_cache_breakpoints`), so each tool
+    round re-reads the shared prefix from the cache instead of re-billing
+    it.  A per-provider/model override stored under
+    ``providers.<name>.models.<model>.prompt-caching`` (``--set
+    prompt-caching=false``) wins over the built-in default.
+
+    Args:
+        provider: The provider name (case-insensitive)
+        model: The model name. ``None`` means the provider's default model.
+
+    Returns:
+        ``True`` unless the model (or a config override) disables it; unknown
+        providers default to ``True``.
+    """
+    found = _registry.get(provider) if provider else None
+    if found is None:
+        return True
+    return found.prompt_caching(model)
+
+
 def get_provider_cost(
     provider: str,
     model: str,
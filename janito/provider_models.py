@@ -105,6 +105,14 @@ class ModelConfig:
         """
         return bool(self._data.get("responses_in_server", True))
 
+    def prompt_caching(self) -> bool:
+        """Whether native Anthropic requests carry ``cache_control`` breakpoints.
+
+        Absent defaults to ``True`` (endpoints without prompt caching ignore
+        the markers).
+        """
+        return bool(self._data.get("prompt_caching", True))
+
 
 class Provider:
     """A supported provider from :data:`janito.providers._PROVIDER_CONFIGS` with typed accessors.
@@ -295,6 +303,20 @@ class Provider:
             return override
         return self.model_config(model).responses_in_server()
 
+    def prompt_caching(self, model: str | None = None) -> bool:
+        """Whether the model's native Anthropic requests use prompt caching.
+
+        A per-provider/model override stored in ``~/.janito/config.json``
+        under ``providers.<name>.models.<model>.prompt-caching`` wins over
+        the built-in default (``True`` when the model does not declare it).
+        """
+        from .config_loaders import load_prompt_caching_from_config
+
+        override = load_prompt_caching_from_config(self._name, model)
+        if override is not None:
+            return override
+        return self.model_config(model).prompt_caching()
+
     def endpoint_for(self, api_type: str | None = None) -> str | None:
         """Get the base URL for this provider, honoring ``endpoint_by_api_type``.
 
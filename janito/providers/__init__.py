@@ -46,6 +46,17 @@ Provider-level fields:
     ``CUSTOM_ENDPOINT`` marker means the endpoint must come from config.
   - "endpoint_by_api_type" (optional): per-API-type base URLs, e.g. the
     native-SDK URL next to the OpenAI-compatible one.
+  - "requires_api_key" (optional): ``False`` for providers that need no
+    credentials (the offline ``mock`` provider); a placeholder key is sent
+    when none is stored.  Absent means an API key is required.
+  - "mock_server" (optional): ``True`` when the provider's loopback
+    endpoint is served by :mod:`janito.providers.mock.server`, started
+    in-process on first use.
+  - "rate_limits" (optional): the client-side limits every request to the
+    provider waits for, ``{"requests_per_minute": ..., "tokens_per_minute":
+    ...}`` (see ``janito.agent.ratelimit``).  ``--set rate-limit-rpm=...`` /
+    ``rate-limit-tpm=...`` override them; absent means the limits are learnt
+    from the provider's rate-limit response headers.
   - "gemini_flavor" (optional): whether the provider's API uses the Gemini
     (Google) flavor of the OpenAI-compatible surface.  When ``True``, the
     ``enable_thinking`` extra-body flag is not sent (the field does not
@@ -77,6 +88,12 @@ Model-level fields (each entry of the ``models`` dict):
     re-send the entire conversation history on every request (like Chat
     Completions). Absent defaults to ``True`` (the Responses API design).
     Only meaningful when the model also supports "Responses".
+  - "prompt_caching": whether native Anthropic requests carry
+    ``cache_control`` breakpoints (tools, system prompt and the rolling end
+    of the conversation) so tool rounds re-read the shared prefix from the
+    prompt cache. Absent defaults to ``True``; overridable per model with
+    ``--set prompt-caching=...``. Only meaningful for the "Anthropic" API
+    type.
   - "max_input_tokens": the maximum input-token (context window) limit used
     as the built-in default. Absent/``None`` means there is no built-in
     limit (the caller falls back to its own default).
@@ -130,6 +147,7 @@ from .custom.config import PROVIDER_CONFIG as _CUSTOM_CONFIG
 from .deepseek.config import PROVIDER_CONFIG as _DEEPSEEK_CONFIG
 from .google.config import PROVIDER_CONFIG as _GOOGLE_CONFIG
 from .minimax.config import PROVIDER_CONFIG as _MINIMAX_CONFIG
+from .mock.config import PROVIDER_CONFIG as _MOCK_CONFIG
 from .moonshot.config import PROVIDER_CONFIG as _MOONSHOT_CONFIG
 from .openai.config import PROVIDER_CONFIG as _OPENAI_CONFIG
 from .openrouter.config import PROVIDER_CONFIG as _OPENROUTER_CONFIG
@@ -162,6 +180,10 @@ _PROVIDER_CONFIGS: dict[str, dict] = {
     # Special case: requires an endpoint from config (--set endpoint) and has
     # no built-in default model (and therefore no built-in model entries).
     "custom": _CUSTOM_CONFIG,
+    # Offline stand-in: a local server (janito.providers.mock.server) that
+    # streams scripted answers and tool calls with configurable latency and
+    # errors, for benchmarks and CI without network or API key.
+    "mock": _MOCK_CONFIG,
 }
 
 # Optional Python package required by each non-OpenAI API type.
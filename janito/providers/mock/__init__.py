@@ -0,0 +1 @@
+"""Offline mock provider package (local OpenAI/Anthropic-compatible server)."""
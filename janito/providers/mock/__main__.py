@@ -0,0 +1,43 @@
+"""Run the mock provider's server standalone.
+
+Usage::
+
+    python -m janito.providers.mock [--host 127.0.0.1] [--port 8769] \
+        [--scenario scenario.json]
+"""
+
+import argparse
+import sys
+
+from .config import MOCK_PORT
+from .scenario import load_scenario
+from .server import MockServer
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m janito.providers.mock",
+        description="Serve the offline mock provider API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind")
+    parser.add_argument("--port", type=int, default=MOCK_PORT, help="port to bind")
+    parser.add_argument("--scenario", help="scenario JSON file (see scenario.py)")
+    args = parser.parse_args(argv)
+    try:
+        scenario = load_scenario(args.scenario)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    server = MockServer((args.host, args.port), scenario)
+    print(f"Mock provider API on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Built-in configuration for the offline "mock" provider.
+
+``PROVIDER_CONFIG`` is the config entry for ``mock``: a local stand-in for an
+OpenAI/Anthropic-compatible API served by
+:mod:`janito.providers.mock.server`.  It needs no API key and no network;
+when the endpoint is the built-in loopback URL the server is started
+in-process on first use.  See :mod:`janito.providers.template.config` for
+the full reference of every CONFIG option.
+"""
+
+#: Loopback port of the built-in mock endpoint.
+MOCK_PORT = 8769
+
+#: The config entry for the ``mock`` provider.
+PROVIDER_CONFIG: dict = {
+    "default_model": "mock-1",
+    "endpoint": f"http://127.0.0.1:{MOCK_PORT}/v1",
+    # The Anthropic SDK appends /v1/messages to its base URL itself.
+    "endpoint_by_api_type": {
+        "Completions": f"http://127.0.0.1:{MOCK_PORT}/v1",
+        "Responses": f"http://127.0.0.1:{MOCK_PORT}/v1",
+        "Anthropic": f"http://127.0.0.1:{MOCK_PORT}",
+    },
+    # No credentials: a placeholder key is sent when none is stored.
+    "requires_api_key": False,
+    # Start janito.providers.mock.server in-process when nothing listens on
+    # the (loopback) endpoint yet.
+    "mock_server": True,
+    "models": {
+        "mock-1": {
+            "supported_api_types": ["Completions", "Responses", "Anthropic"],
+            "default_api_type": "Completions",  # built-in default (the first supported type)
+            # The mock server keeps no state: every request re-sends the
+            # whole conversation.
+            "responses_in_server": False,
+            "max_input_tokens": 128000,
+            "max_output_tokens": 8192,
+        },
+    },
+}
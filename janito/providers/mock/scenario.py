@@ -0,0 +1,242 @@
+"""Deterministic behaviour of the mock provider's server.
+
+A :class:`MockScenario` decides, for every request the mock server receives,
+what the "model" answers and how fast: the tool calls of each scripted round,
+the final answer, the time to first token, the delay between two streamed
+tokens and which requests fail.  The same scenario and the same requests
+always produce the same streams, so runs are comparable across commits.
+
+**Rounds.** The server is stateless, like the real APIs: every request
+re-sends the conversation.  The round of a request is the number of
+tool-result batches after the last user message (0 for a fresh prompt, 1
+after the first tool round, ...).  Round ``n`` answers with the scripted
+``tool_calls[n]`` when there is one, otherwise with the final answer.
+
+**Scenario files.**  The mock server and the ``mock-scenario`` config key
+read scenarios from JSON files holding the :class:`MockScenario` fields::
+
+    {
+        "ttft_ms": 300,
+        "inter_token_ms": 15,
+        "output_tokens": 200,
+        "tool_calls": [[{"name": "ListFiles", "arguments": {"directory": "."}}]],
+        "error_rate": 0.05,
+        "error_kinds": ["429", "500", "disconnect"]
+    }
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+#: Error kinds the server can inject.
+ERROR_KINDS = ("429", "500", "disconnect")
+
+# Vocabulary of the generated answers.
+_WORDS = (
+    "the agent reads the file and checks each change before it writes "
+    "a short summary of what was found in the tree so far"
+).split()
+
+
+@dataclass
+class MockToolCall:
+    """One scripted tool call of a round."""
+
+    call_id: str
+    name: str
+    arguments: str
+    #: ``arguments`` split into the streamed fragments.
+    fragments: list[str] = field(default_factory=list)
+
+
+@dataclass
+class MockTurn:
+    """What the server streams for one request.
+
+    Attributes:
+        round: The request's round (see the module docstring).
+        tokens: The answer text, one entry per streamed token.
+        tool_calls: The tool calls requested instead of an answer.
+        input_tokens: The reported input tokens (estimated from the body).
+        error: The injected error kind, or ``None``.
+    """
+
+    round: int
+    tokens: list[str]
+    tool_calls: list[MockToolCall]
+    input_tokens: int
+    error: str | None = None
+
+    @property
+    def text(self) -> str:
+        """The whole answer text."""
+        return "".join(self.tokens)
+
+    @property
+    def output_tokens(self) -> int:
+        """The reported output tokens (text tokens plus argument chunks)."""
+        return len(self.tokens) + sum(len(call.fragments) for call in self.tool_calls)
+
+
+@dataclass
+class MockScenario:
+    """Timing, content and failure settings of the mock server.
+
+    Attributes:
+        ttft_ms: Delay before the first streamed event (time to first token).
+        inter_token_ms: Delay between two streamed tokens.
+        output_tokens: Tokens of the generated final answer.
+        content: A fixed final answer (split on spaces) instead of the
+            generated one.
+        tool_calls: Scripted tool calls per round: ``tool_calls[n]`` is the
+            list of ``{"name", "arguments"}`` calls requested in round ``n``.
+        argument_chunk_chars: Size of the streamed tool-argument fragments.
+        fail_first: Fail this many requests before serving any.
+        error_rate: Probability of failing any later request.
+        error_kinds: Kinds of the injected errors (see :data:`ERROR_KINDS`),
+            used round-robin.
+        seed: Seed of the generated answers and of the error draws.
+    """
+
+    ttft_ms: int = 0
+    inter_token_ms: int = 0
+    output_tokens: int = 32
+    content: str | None = None
+    tool_calls: list[list[dict]] = field(default_factory=list)
+    argument_chunk_chars: int = 16
+    fail_first: int = 0
+    error_rate: float = 0.0
+    error_kinds: list[str] = field(default_factory=lambda: ["429"])
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        unknown = [kind for kind in self.error_kinds if kind not in ERROR_KINDS]
+        if unknown or not self.error_kinds:
+            raise ValueError(
+                f"Unknown mock error kinds {unknown}; use any of {list(ERROR_KINDS)}"
+            )
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> MockScenario:
+        """Build a scenario from a dict of :class:`MockScenario` fields.
+
+        Raises:
+            ValueError: On an unknown field.
+        """
+        known = {f.name for f in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown mock scenario fields: {', '.join(unknown)}")
+        return cls(**data)
+
+    @property
+    def requests(self) -> int:
+        """Requests planned so far."""
+        return self._requests
+
+    def plan(self, round_index: int, input_tokens: int) -> MockTurn:
+        """Decide the answer (or failure) of the next request."""
+        with self._lock:
+            self._requests += 1
+            number = self._requests
+            failed = number <= self.fail_first or (
+                self.error_rate > 0 and self._random.random() < self.error_rate
+            )
+        error = self.error_kinds[(number - 1) % len(self.error_kinds)]
+        calls = self._round_tool_calls(round_index)
+        return MockTurn(
+            round=round_index,
+            tokens=[] if calls else self._answer_tokens(),
+            tool_calls=calls,
+            input_tokens=input_tokens,
+            error=error if failed else None,
+        )
+
+    def _round_tool_calls(self, round_index: int) -> list[MockToolCall]:
+        if round_index >= len(self.tool_calls):
+            return []
+        calls = []
+        for index, call in enumerate(self.tool_calls[round_index]):
+            arguments = json.dumps(call.get("arguments") or {})
+            calls.append(
+                MockToolCall(
+                    call_id=f"call_{round_index}_{index}",
+                    name=call["name"],
+                    arguments=arguments,
+                    fragments=chunk_arguments(arguments, self.argument_chunk_chars),
+                )
+            )
+        return calls
+
+    def _answer_tokens(self) -> list[str]:
+        if self.content is not None:
+            words = self.content.split(" ")
+            return [word + " " for word in words[:-1]] + [words[-1]]
+        offset = self.seed % len(_WORDS)
+        return [
+            _WORDS[(offset + n) % len(_WORDS)] + " " for n in range(self.output_tokens)
+        ]
+
+
+def chunk_arguments(arguments: str, size: int = 16) -> list[str]:
+    """Split a tool call's JSON arguments into streamed fragments."""
+    size = max(size, 1)
+    return [arguments[i : i + size] for i in range(0, len(arguments), size)] or [""]
+
+
+def load_scenario(path: str | Path | None) -> MockScenario:
+    """Load a scenario JSON file (``None``: the default scenario).
+
+    Raises:
+        ValueError: When the file is not a JSON object of scenario fields.
+    """
+    if not path:
+        return MockScenario()
+    try:
+        data = json.loads(Path(path).expanduser().read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read mock scenario {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Mock scenario {path} must be a JSON object")
+    return MockScenario.from_dict(data)
+
+
+def request_round(kinds: list[str]) -> int:
+    """The round of a request from its message kinds.
+
+    Args:
+        kinds: ``"user"``, ``"tool"`` or anything else per message, in order.
+
+    Returns:
+        The number of runs of consecutive ``"tool"`` entries after the last
+        ``"user"`` entry.
+    """
+    rounds = 0
+    previous: Any = None
+    for kind in kinds:
+        if kind == "user":
+            rounds = 0
+        elif kind == "tool" and previous != "tool":
+            rounds += 1
+        previous = kind
+    return rounds
+
+
+__all__ = [
+    "ERROR_KINDS",
+    "MockScenario",
+    "MockToolCall",
+    "MockTurn",
+    "chunk_arguments",
+    "load_scenario",
+    "request_round",
+]
@@ -0,0 +1,467 @@
+"""Local stand-in server for the offline "mock" provider.
+
+A stdlib ``ThreadingHTTPServer`` that speaks just enough of three streaming
+APIs for janito's clients to run unchanged against it:
+
+- ``POST /v1/chat/completions`` -- Chat Completions SSE chunks (content and
+  ``tool_calls`` deltas, a usage chunk, ``[DONE]``);
+- ``POST /v1/responses`` -- Responses API events (``response.created``,
+  ``output_text`` / ``function_call_arguments`` deltas, ``output_item.done``,
+  ``response.completed`` with usage);
+- ``POST /v1/messages`` -- Anthropic Messages events (``message_start``,
+  ``text_delta`` / ``input_json_delta`` blocks, ``message_delta`` with usage).
+
+What each request streams, how fast and whether it fails comes from the
+:class:`~janito.providers.mock.scenario.MockScenario` (see that module).
+Injected errors are a ``429`` (with ``Retry-After: 0``) or ``500`` JSON error
+in the API's error shape, or a ``disconnect``: the connection is dropped
+halfway through the stream.
+
+With ``--provider mock`` janito starts the server in-process on the built-in
+loopback endpoint (:func:`ensure_mock_server`).  It can also run on its own,
+e.g. to load-test several janito processes against one server::
+
+    python -m janito.providers.mock --port 8769 --scenario scenario.json
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from .scenario import MockScenario, MockTurn, request_round
+
+logger = logging.getLogger(__name__)
+
+#: Model name reported when the request names none.
+DEFAULT_MODEL = "mock-1"
+
+# A streamed frame and whether it carries a token (paced by inter_token_ms).
+Frame = tuple[bytes, bool]
+
+# Servers started in-process by ensure_mock_server, keyed by (host, port).
+_servers: dict[tuple[str, int], MockServer] = {}
+_servers_lock = threading.Lock()
+
+
+def _sse(data: dict | str, event: str | None = None) -> bytes:
+    """Encode one server-sent event."""
+    payload = data if isinstance(data, str) else json.dumps(data)
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {payload}\n\n".encode()
+
+
+def _estimate_input_tokens(body: bytes) -> int:
+    """Rough input-token count of a request (4 bytes per token)."""
+    return max(len(body) // 4, 1)
+
+
+# ---------------------------------------------------------------------------
+# Message kinds (for the request round)
+# ---------------------------------------------------------------------------
+
+
+def _completions_kinds(request: dict) -> list[str]:
+    return [
+        m.get("role") if m.get("role") in ("user", "tool") else "other"
+        for m in request.get("messages") or []
+    ]
+
+
+def _responses_kinds(request: dict) -> list[str]:
+    items = request.get("input")
+    if isinstance(items, str):
+        return ["user"]
+    kinds = []
+    for item in items or []:
+        if item.get("type") == "function_call_output":
+            kinds.append("tool")
+        elif item.get("role") == "user":
+            kinds.append("user")
+        else:
+            kinds.append("other")
+    return kinds
+
+
+def _anthropic_kinds(request: dict) -> list[str]:
+    kinds = []
+    for message in request.get("messages") or []:
+        content = message.get("content")
+        if message.get("role") != "user":
+            kinds.append("other")
+        elif (
+            isinstance(content, list)
+            and content
+            and all(block.get("type") == "tool_result" for block in content)
+        ):
+            kinds.append("tool")
+        else:
+            kinds.append("user")
+    return kinds
+
+
+# ---------------------------------------------------------------------------
+# Stream encoders
+# ---------------------------------------------------------------------------
+
+
+def completions_frames(turn: MockTurn, model: str) -> Iterator[Frame]:
+    """Chat Completions SSE chunks for ``turn``."""
+    base = {
+        "id": f"chatcmpl-mock-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+    }
+
+    def chunk(delta: dict, finish_reason: str | None = None) -> bytes:
+        choice = {"index": 0, "delta": delta, "finish_reason": finish_reason}
+        return _sse({**base, "choices": [choice]})
+
+    yield chunk({"role": "assistant", "content": ""}), False
+    for token in turn.tokens:
+        yield chunk({"content": token}), True
+    for index, call in enumerate(turn.tool_calls):
+        head = {
+            "index": index,
+            "id": call.call_id,
+            "type": "function",
+            "function": {"name": call.name, "arguments": ""},
+        }
+        yield chunk({"tool_calls": [head]}), False
+        for fragment in call.fragments:
+            delta = {"index": index, "function": {"arguments": fragment}}
+            yield chunk({"tool_calls": [delta]}), True
+    yield chunk({}, "tool_calls" if turn.tool_calls else "stop"), False
+    usage = {
+        "prompt_tokens": turn.input_tokens,
+        "completion_tokens": turn.output_tokens,
+        "total_tokens": turn.input_tokens + turn.output_tokens,
+        "prompt_tokens_details": {"cached_tokens": 0},
+    }
+    yield _sse({**base, "choices": [], "usage": usage}), False
+    yield _sse("[DONE]"), False
+
+
+def responses_frames(turn: MockTurn, model: str) -> Iterator[Frame]:
+    """Responses API events for ``turn``."""
+    sequence = iter(range(1_000_000_000))
+    response = {
+        "id": f"resp_mock_{uuid.uuid4().hex[:12]}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "in_progress",
+        "output": [],
+        "usage": None,
+        "error": None,
+    }
+
+    def event(kind: str, **data) -> bytes:
+        return _sse({"type": kind, "sequence_number": next(sequence), **data}, kind)
+
+    yield event("response.created", response=response), False
+    output = []
+    if turn.tokens:
+        item = {
+            "id": "msg_mock_0",
+            "type": "message",
+            "role": "assistant",
+            "status": "in_progress",
+            "content": [],
+        }
+        yield event("response.output_item.added", output_index=0, item=item), False
+        for token in turn.tokens:
+            yield event(
+                "response.output_text.delta",
+                item_id=item["id"],
+                output_index=0,
+                content_index=0,
+                delta=token,
+            ), True
+        text = {"type": "output_text", "text": turn.text, "annotations": []}
+        item = {**item, "status": "completed", "content": [text]}
+        yield event("response.output_item.done", output_index=0, item=item), False
+        output.append(item)
+    for index, call in enumerate(turn.tool_calls):
+        item = {
+            "id": f"fc_mock_{index}",
+            "type": "function_call",
+            "call_id": call.call_id,
+            "name": call.name,
+            "arguments": "",
+            "status": "in_progress",
+        }
+        yield event("response.output_item.added", output_index=index, item=item), False
+        for fragment in call.fragments:
+            yield event(
+                "response.function_call_arguments.delta",
+                item_id=item["id"],
+                output_index=index,
+                delta=fragment,
+            ), True
+        yield event(
+            "response.function_call_arguments.done",
+            item_id=item["id"],
+            output_index=index,
+            arguments=call.arguments,
+        ), False
+        item = {**item, "arguments": call.arguments, "status": "completed"}
+        yield event("response.output_item.done", output_index=index, item=item), False
+        output.append(item)
+    usage = {
+        "input_tokens": turn.input_tokens,
+        "input_tokens_details": {"cached_tokens": 0},
+        "output_tokens": turn.output_tokens,
+        "output_tokens_details": {"reasoning_tokens": 0},
+        "total_tokens": turn.input_tokens + turn.output_tokens,
+    }
+    completed = {**response, "status": "completed", "output": output, "usage": usage}
+    yield event("response.completed", response=completed), False
+
+
+def anthropic_frames(turn: MockTurn, model: str) -> Iterator[Frame]:
+    """Anthropic Messages events for ``turn``."""
+    message = {
+        "id": f"msg_mock_{uuid.uuid4().hex[:12]}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [],
+        "stop_reason": None,
+        "stop_sequence": None,
+        "usage": {"input_tokens": turn.input_tokens, "output_tokens": 1},
+    }
+
+    def event(kind: str, **data) -> bytes:
+        return _sse({"type": kind, **data}, kind)
+
+    yield event("message_start", message=message), False
+    index = 0
+    if turn.tokens:
+        block = {"type": "text", "text": ""}
+        yield event("content_block_start", index=index, content_block=block), False
+        for token in turn.tokens:
+            delta = {"type": "text_delta", "text": token}
+            yield event("content_block_delta", index=index, delta=delta), True
+        yield event("content_block_stop", index=index), False
+        index += 1
+    for call in turn.tool_calls:
+        block = {"type": "tool_use", "id": call.call_id, "name": call.name, "input": {}}
+        yield event("content_block_start", index=index, content_block=block), False
+        for fragment in call.fragments:
+            delta = {"type": "input_json_delta", "partial_json": fragment}
+            yield event("content_block_delta", index=index, delta=delta), True
+        yield event("content_block_stop", index=index), False
+        index += 1
+    stop_reason = "tool_use" if turn.tool_calls else "end_turn"
+    yield event(
+        "message_delta",
+        delta={"stop_reason": stop_reason, "stop_sequence": None},
+        usage={"output_tokens": turn.output_tokens},
+    ), False
+    yield event("message_stop"), False
+
+
+# path -> (message kinds, stream encoder, Anthropic-shaped errors)
+_ROUTES = {
+    "/v1/chat/completions": (_completions_kinds, completions_frames, False),
+    "/v1/responses": (_responses_kinds, responses_frames, False),
+    "/v1/messages": (_anthropic_kinds, anthropic_frames, True),
+}
+
+
+# ---------------------------------------------------------------------------
+# HTTP server
+# ---------------------------------------------------------------------------
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Serve one mock API request (see the module docstring)."""
+
+    server: MockServer
+    # Streamed frames are small writes: without TCP_NODELAY the client's
+    # delayed ACK stalls every round by ~40 ms.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args) -> None:
+        logger.debug("mock server: " + format % args)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path.rstrip("/") != "/v1/models":
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        models = [{"id": DEFAULT_MODEL, "object": "model", "owned_by": "janito"}]
+        self._send_json(200, {"object": "list", "data": models})
+
+    def do_POST(self) -> None:
+        route = _ROUTES.get(urlsplit(self.path).path.rstrip("/"))
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if route is None:
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+        kinds, frames, anthropic = route
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send_error(400, "Request body is not JSON", anthropic)
+            return
+        if not request.get("stream"):
+            self._send_error(400, "The mock server only serves streams", anthropic)
+            return
+        turn = self.server.scenario.plan(
+            request_round(kinds(request)), _estimate_input_tokens(body)
+        )
+        if turn.error in ("429", "500"):
+            self._send_error(
+                int(turn.error), f"Injected mock error {turn.error}", anthropic
+            )
+            return
+        self._stream(frames(turn, request.get("model") or DEFAULT_MODEL), turn)
+
+    def _stream(self, frames: Iterator[Frame], turn: MockTurn) -> None:
+        scenario = self.server.scenario
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.flush()
+        frames = list(frames)
+        # A disconnect drops the connection halfway through the stream.
+        cut = len(frames) // 2 if turn.error == "disconnect" else None
+        time.sleep(scenario.ttft_ms / 1000)
+        first_token = True
+        for position, (frame, is_token) in enumerate(frames):
+            if position == cut:
+                self._drop_connection()
+                return
+            if is_token:
+                if not first_token and scenario.inter_token_ms:
+                    time.sleep(scenario.inter_token_ms / 1000)
+                first_token = False
+            self.wfile.write(frame)
+            self.wfile.flush()
+
+    def _drop_connection(self) -> None:
+        self.close_connection = True
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _send_error(self, status: int, message: str, anthropic: bool) -> None:
+        if anthropic:
+            kind = "rate_limit_error" if status == 429 else "api_error"
+            payload = {"type": "error", "error": {"type": kind, "message": message}}
+        else:
+            kind = "rate_limit_exceeded" if status == 429 else "server_error"
+            payload = {"error": {"message": message, "type": kind, "code": kind}}
+        self._send_json(status, payload, {"Retry-After": "0"} if status == 429 else {})
+
+    def _send_json(
+        self, status: int, payload: dict, headers: dict | None = None
+    ) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockServer(ThreadingHTTPServer):
+    """The mock API server.
+
+    Args:
+        address: ``(host, port)`` to bind (port ``0`` picks a free port).
+        scenario: What the server streams (the default scenario when
+            ``None``).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], scenario: MockScenario | None = None):
+        super().__init__(address, MockRequestHandler)
+        self.scenario = scenario or MockScenario()
+
+    @property
+    def base_url(self) -> str:
+        """The OpenAI-compatible base URL (``.../v1``)."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> MockServer:
+        """Serve from a daemon thread; returns ``self``."""
+        thread = threading.Thread(
+            target=self.serve_forever,
+            kwargs={"poll_interval": 0.1},
+            name="janito-mock-server",
+            daemon=True,
+        )
+        thread.start()
+        return self
+
+
+def _is_listening(host: str, port: int) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def ensure_mock_server(base_url: str, scenario: MockScenario | None = None) -> bool:
+    """Start the in-process mock server behind ``base_url`` unless one runs.
+
+    Only loopback URLs are served in-process; a server already listening
+    there (e.g. ``python -m janito.providers.mock``) is used as-is.
+
+    Returns:
+        Whether a server was started.
+    """
+    parts = urlsplit(base_url)
+    host, port = parts.hostname or "", parts.port or 80
+    if host not in ("127.0.0.1", "localhost", "::1"):
+        return False
+    with _servers_lock:
+        if (host, port) in _servers or _is_listening(host, port):
+            return False
+        if scenario is None:
+            scenario = _configured_scenario()
+        try:
+            server = MockServer((host, port), scenario)
+        except OSError:
+            # Another process (e.g. a --batch worker) bound it first.
+            return False
+        _servers[(host, port)] = server.start()
+    logger.debug(f"Started the mock provider server on {host}:{port}")
+    return True
+
+
+def _configured_scenario() -> MockScenario:
+    """The scenario named by the ``mock-scenario`` config key (or the default)."""
+    from janito.config_store import get_config_value
+
+    from .scenario import load_scenario
+
+    return load_scenario(get_config_value("mock-scenario"))
+
+
+__all__ = [
+    "DEFAULT_MODEL",
+    "MockRequestHandler",
+    "MockServer",
+    "anthropic_frames",
+    "completions_frames",
+    "ensure_mock_server",
+    "responses_frames",
+]
@@ -54,6 +54,13 @@ PROVIDER_CONFIG: dict = {
         # Native-SDK API types (e.g. "Anthropic", "DashScope") go here too.
         "Anthropic": "https://api.example.com/anthropic",
     },
+    #: Client-side rate limits (optional).  Every request to the provider
+    #: first waits for a slot in these per-minute budgets, shared per API
+    #: key by all the sessions of the process (see
+    #: :mod:`janito.agent.ratelimit`).  ``--set rate-limit-rpm=...`` /
+    #: ``rate-limit-tpm=...`` override them.  Omit the key to learn the
+    #: limits from the provider's ``x-ratelimit-*`` response headers.
+    "rate_limits": {"requests_per_minute": 500, "tokens_per_minute": 200000},
     #: Whether the provider's API uses a provider-specific "flavor" of the
     #: OpenAI-compatible surface (optional).  When ``True`` (e.g. Google's
     #: ``gemini_flavor``), API-call building applies provider-specific
@@ -93,6 +100,13 @@ PROVIDER_CONFIG: dict = {
             #: to ``True``.  Only meaningful when the model also supports
             #: "Responses".
             "responses_in_server": True,
+            #: Whether native Anthropic requests (API type "Anthropic")
+            #: carry ``cache_control`` prompt-caching breakpoints on the
+            #: tool definitions, the system prompt and the rolling end of
+            #: the conversation.  Absent defaults to ``True`` (endpoints
+            #: without prompt caching ignore the markers); override per
+            #: model with ``--set prompt-caching=false``.
+            "prompt_caching": True,
             #: The maximum input-token (context window) limit used as the
             #: built-in default.  Absent/``None`` means there is no
             #: built-in limit (the caller falls back to its own default).
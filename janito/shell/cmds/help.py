@@ -103,6 +103,7 @@ class HelpCmdHandler(CmdHandler):
         mcp.add_row("/mcp add <name> stdio <cmd>", "Add stdio service")
         mcp.add_row("/mcp add <name> http <url>", "Add HTTP service")
         mcp.add_row("/mcp list", "List MCP services")
+        mcp.add_row("/mcp status", "Show MCP service health")
         mcp.add_row("/mcp remove <name>", "Remove an MCP service")
         console.print(mcp)
 
@@ -5,6 +5,7 @@ Usage:
     /mcp add <name> stdio <command> [args...]        - Add a stdio transport service
     /mcp add <name> http <url> [--header KEY:VALUE]  - Add an HTTP transport service
     /mcp list                                       - List all MCP services
+    /mcp status                                     - Show supervisor state of loaded services
     /mcp remove <name>                              - Remove an MCP service
     /mcp                                            - Show this help message
 
@@ -22,11 +23,10 @@ import shlex
 
 # Import MCP config functions
 from janito.mcp_config import (
+    add_service,
     get_mcp_config_path,
     list_services,
-    load_mcp_config,
     remove_service,
-    save_mcp_config,
 )
 
 from .base import CmdHandler
@@ -64,6 +64,8 @@ class McpCmdHandler(CmdHandler):
             self._handle_add(parts[2])
         elif subcommand == "list":
             self._handle_list()
+        elif subcommand == "status":
+            self._handle_status()
         elif subcommand == "remove" or subcommand == "rm" or subcommand == "delete":
             if len(parts) < 3:
                 print("Error: /mcp remove requires <name> argument")
@@ -130,14 +132,8 @@ class McpCmdHandler(CmdHandler):
 
         command = " ".join(command_parts)
 
-        # Load current config
-        config = load_mcp_config()
-
-        # Add the service
-        config["services"][name] = {"transport": "stdio", "command": command, "env": {}}
-
-        # Save config
-        save_mcp_config(config)
+        # Add the service (a locked read-modify-write of the config file)
+        add_service(name, {"transport": "stdio", "command": command, "env": {}})
 
         print(f"[OK] MCP service '{name}' added successfully")
         print("  Transport: stdio")
@@ -174,20 +170,14 @@ class McpCmdHandler(CmdHandler):
                 print(f"Warning: Ignoring unexpected argument: {args[i]}")
                 i += 1
 
-        # Load current config
-        config = load_mcp_config()
-
         # Build service config
         service_config = {"transport": "http", "url": url}
 
         if headers:
             service_config["headers"] = headers
 
-        # Add the service
-        config["services"][name] = service_config
-
-        # Save config
-        save_mcp_config(config)
+        # Add the service (a locked read-modify-write of the config file)
+        add_service(name, service_config)
 
         print(f"[OK] MCP service '{name}' added successfully")
         print("  Transport: http")
@@ -253,6 +243,46 @@ class McpCmdHandler(CmdHandler):
         console.print(table)
         print(f"Config file: {get_mcp_config_path()}")
 
+    def _handle_status(self) -> None:
+        """Show the supervisor view of loaded services as a rich table."""
+        from rich.console import Console
+        from rich.table import Table
+
+        from janito.mcp_manager import get_mcp_manager
+
+        console = Console(markup=False)
+        status = get_mcp_manager().service_status()
+        if not status:
+            print("No MCP services loaded in this session.")
+            return
+
+        table = Table(
+            title="MCP Service Status",
+            title_style="bold",
+            header_style="bold cyan",
+        )
+        table.add_column("Service", style="green", no_wrap=True)
+        table.add_column("State", no_wrap=True)
+        table.add_column("Restarts", justify="right")
+        table.add_column("Calls", justify="right")
+        table.add_column("Avg latency", justify="right")
+        table.add_column("Idle", justify="right")
+        table.add_column("Last error", overflow="fold")
+
+        for name, entry in status.items():
+            avg = entry.get("avg_latency_ms")
+            table.add_row(
+                name,
+                entry.get("state", "?"),
+                str(entry.get("restarts", 0)),
+                f"{entry.get('calls', 0)} ({entry.get('errors', 0)} failed)",
+                f"{avg:.0f} ms" if avg is not None else "-",
+                f"{entry.get('idle_seconds', 0):.0f}s",
+                entry.get("last_error") or "",
+            )
+
+        console.print(table)
+
     def _handle_remove(self, name: str) -> None:
         """Remove an MCP service.
 
@@ -290,6 +320,9 @@ class McpCmdHandler(CmdHandler):
             "Add an HTTP transport service",
         )
         usage.add_row("/mcp list", "List all configured MCP services")
+        usage.add_row(
+            "/mcp status", "Show state, restarts and call latency of loaded services"
+        )
         usage.add_row("/mcp remove <name>", "Remove an MCP service")
         console.print(usage)
 
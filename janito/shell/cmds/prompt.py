@@ -25,7 +25,11 @@ class PromptCmdHandler(CmdHandler):
         from rich.console import Console
         from rich.table import Table
 
-        from janito.system_prompt import SECTION_SKILLS, sync_default_sections
+        from janito.system_prompt import (
+            SECTION_SKILLS,
+            describe_prompt,
+            sync_default_sections,
+        )
 
         # Get the actual system prompt from the shell
         effective_prompt = shell.get_system_prompt()
@@ -53,6 +57,7 @@ class PromptCmdHandler(CmdHandler):
                 title=title,
                 title_style="bold",
                 header_style="bold cyan",
+                caption=describe_prompt(effective_prompt),
             )
             table.add_column("Section", style="green", no_wrap=True)
             table.add_column("Lines", justify="right")
@@ -72,6 +77,7 @@ class PromptCmdHandler(CmdHandler):
             title_style="bold",
             header_style="bold cyan",
             show_header=False,
+            caption=describe_prompt(effective_prompt),
         )
         table.add_column("Content", overflow="fold")
         table.add_row(effective_prompt.strip())
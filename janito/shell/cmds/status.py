@@ -167,6 +167,56 @@ def _print_config_info(
     Console(markup=False).print(table)
 
 
+def _print_request_estimate() -> None:
+    """Print where the tokens of the last request went (pre-flight estimate).
+
+    Nothing is printed before the first request of the session (or when the
+    last one ran on a server-side Responses conversation, which keeps the
+    history out of the client's view).
+    """
+    from janito.agent.tokens import last_estimate
+
+    estimate = last_estimate()
+    if estimate is None:
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(
+        title="Last Request (estimated tokens)",
+        title_style="bold",
+        header_style="bold cyan",
+        show_header=False,
+        box=None,
+        pad_edge=False,
+    )
+    table.add_column("Section", style="green", no_wrap=True)
+    table.add_column("Tokens", justify="right")
+    for label, tokens in estimate.sections():
+        table.add_row(label, f"~{tokens}")
+    for name, tokens in estimate.largest_tools():
+        table.add_row(f"  {name}", f"~{tokens}")
+    table.add_row("Total", f"~{estimate.total}")
+    table.add_row("Calibration", f"x{estimate.ratio:.2f} ({estimate.family})")
+    Console(markup=False).print(table)
+
+
+def _print_last_trace() -> None:
+    """Print the timed phases of the last prompt (nothing before the first)."""
+    from janito.agent.tracing import last_trace
+
+    trace = last_trace()
+    if trace is None:
+        return
+
+    from rich.console import Console
+
+    from janito.openai_client.client_support import _trace_table
+
+    Console().print(_trace_table(trace, title="Last Prompt (timings)"))
+
+
 class StatusCmdHandler(CmdHandler):
     """Command handler for /status command."""
 
@@ -182,6 +232,8 @@ class StatusCmdHandler(CmdHandler):
                 getattr(shell, "thinking", False),
                 getattr(shell, "api_type", None),
             )
+            _print_request_estimate()
+            _print_last_trace()
             return True
         return False
 
@@ -13,6 +13,7 @@ from typing import TYPE_CHECKING, Any
 from prompt_toolkit.formatted_text import HTML
 from rich.console import Console
 
+from ..agent.context import pop_compactions, shift_checkpoints
 from ..openai_client import RequestCancelled
 from .session import _SessionMixin
 
@@ -355,6 +356,7 @@ class InteractiveShell(_SessionMixin):
         )
         self.response_checkpoint = len(self.response_chain)
         self.mirrored_checkpoint = len(self.mirrored_history)
+        items_before = self.conversation_items
         try:
             result = self.send_prompt_func(
                 user_input,
@@ -372,6 +374,7 @@ class InteractiveShell(_SessionMixin):
             # else is needed there.
             if hasattr(result, "input_items"):
                 self._record_responses_result(result)
+            self._apply_compactions(items_before)
             # On success, keep the checkpoint where it is (before this turn)
             # so /rewind can undo the last exchange. The next turn will
             # update it before its own send_prompt call.
@@ -395,6 +398,7 @@ class InteractiveShell(_SessionMixin):
                 # items yet). Either way, store them so the next turn
                 # re-sends them.
                 self.conversation_items = items
+                self._apply_compactions(items_before)
             elif self.conversation_items is not None:
                 # Fallback for stateless flows where the exception carries no
                 # items (e.g. the abort happened before the client built
@@ -412,12 +416,14 @@ class InteractiveShell(_SessionMixin):
             )
         except KeyboardInterrupt:
             # Rollback any messages appended during this prompt
+            self._apply_compactions(items_before)
             self._rollback_history()
             print(
                 "Request interrupted, previous prompt/answer removed from the conversation history."
             )
         except Exception as e:
             # Rollback on any other unexpected error as well
+            self._apply_compactions(items_before)
             self._rollback_history()
             print(f"Error: {e}")
         # Note: send_prompt_func already appends user and assistant messages
@@ -442,6 +448,30 @@ class InteractiveShell(_SessionMixin):
         mirrored = self.mirrored_history or []
         return len(self.messages_history) + len(mirrored) + len(conversation_items)
 
+    def _apply_compactions(self, items_before: list[dict[str, Any]] | None) -> None:
+        """Remap checkpoints after the client compacted the history.
+
+        Compaction (see :mod:`janito.agent.context`) replaces older turns
+        with a summary, shifting every later index; checkpoints that fell
+        inside the summarized span are dropped since those turns can no
+        longer be rewound to individually.
+
+        Args:
+            items_before: ``conversation_items`` before the send.  Stateless
+                Responses clients compact a copy of the items; when the shell
+                still holds the original list (the turn failed before the
+                copy was handed back), nothing was compacted on its side.
+        """
+        compactions = pop_compactions()
+        if items_before is not None and self.conversation_items is items_before:
+            return
+        for compaction in compactions:
+            shift_checkpoints(self.history_checkpoints, compaction)
+            shifted = compaction.shift(self.conversation_checkpoint)
+            self.conversation_checkpoint = (
+                compaction.start + compaction.inserted if shifted is None else shifted
+            )
+
     def _rollback_history(self) -> None:
         """Roll the conversation history back to the most recent checkpoint.
 
@@ -11,12 +11,38 @@ and ``agents.md`` sections in sync with the tool registry and the cwd
 Every consumer (``janito.cli.session_setup.SessionSetup``, the shell ``/prompt``
 command, ``--show-system-prompt`` and the web backend) manipulates the prompt
 through this shared manager so the sections stay consistent.
+
+Providers cache the longest byte prefix a request shares with an earlier one
+(OpenAI and DeepSeek automatically, Anthropic at its cache breakpoints) and
+bill it as ``cached_tokens``.  The system prompt heads every request, so it
+must stay byte-identical across turns, and a change must invalidate as
+little of it as possible:
+
+- Sections are ordered from the most to the least stable, whatever the
+  order they were added in: the built-in ``start`` text, then the plugin
+  sections, then the skills advertisement, then any other section, and the
+  project's ``AGENTS.md`` -- the text most likely to be edited during a
+  session -- last.
+- :meth:`SysPromptManager.render` caches the rendered prompt until a
+  section's text actually changes (sections are compared by content
+  hash), and the ``AGENTS.md`` file is only re-read when its mtime or size
+  changed.
+- :meth:`SysPromptManager.digest` (``--show-system-prompt``, ``/prompt``,
+  and the ``system_prompt_hash`` / ``system_prompt_bytes`` attributes of a
+  prompt's trace) identifies the prompt that was sent: an unchanged digest
+  with a low ``cached_tokens`` points at the provider, a changed digest at
+  the prompt.
 """
 
 from __future__ import annotations
 
+import hashlib
 import os
+import time
 from collections.abc import Iterator
+from typing import Any
+
+from janito.json_store import RACY_WINDOW_NS
 
 # The built-in base prompt used to seed the ``start`` section.  Kept without
 # leading/trailing newlines: :meth:`SysPromptManager.render` appends a newline
@@ -32,16 +58,59 @@ SECTION_AGENTS_MD = "agents.md"
 SECTION_PLUGINS = "plugins"
 
 
+def _stability_rank(name: str) -> int:
+    """Where a section goes: lower ranks (more stable text) come first."""
+    if name == SECTION_START:
+        return 0
+    if name.startswith(f"{SECTION_PLUGINS}:"):
+        return 1
+    if name == SECTION_SKILLS:
+        return 2
+    if name == SECTION_AGENTS_MD:
+        return 4
+    return 3
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def prompt_digest(prompt: str) -> str:
+    """Short content hash of a rendered prompt (16 hex digits of its SHA-256)."""
+    return _content_hash(prompt)[:16]
+
+
+def trace_attributes(prompt: str | None) -> dict[str, Any]:
+    """The ``system_prompt_hash`` / ``system_prompt_bytes`` of a prompt's trace."""
+    if not prompt:
+        return {}
+    return {
+        "system_prompt_hash": prompt_digest(prompt),
+        "system_prompt_bytes": len(prompt.encode("utf-8")),
+    }
+
+
+def describe_prompt(prompt: str) -> str:
+    """One-line fingerprint of a prompt: its digest and its size in bytes."""
+    return f"sha256:{prompt_digest(prompt)} ({len(prompt.encode('utf-8'))} bytes)"
+
+
 class SysPromptManager:
     """Manage the system prompt as an ordered list of named sections.
 
     A section is a ``(section_name, section_text)`` pair.  The ``start``
     section is created in :meth:`__init__`, always stays first and cannot be
-    deleted; every other section name must be unique.
+    deleted; every other section name must be unique.  Sections are kept in
+    stability order (see the module docstring); sections of the same rank
+    keep the order they were added in.
     """
 
     def __init__(self, start_prompt: str) -> None:
         self._sections: list[tuple[str, str]] = [(SECTION_START, start_prompt)]
+        # Content hash of each section, and the rendered prompt (with its
+        # digest) until a section changes.
+        self._hashes: dict[str, str] = {SECTION_START: _content_hash(start_prompt)}
+        self._rendered: tuple[str, str] | None = None
 
     def add_section(self, name: str, prompt: str) -> None:
         """Append a new section.
@@ -55,7 +124,13 @@ class SysPromptManager:
         """
         if self._find(name) is not None:
             raise ValueError(f"a section named {name!r} already exists")
-        self._sections.append((name, prompt))
+        rank = _stability_rank(name)
+        index = len(self._sections)
+        while index > 0 and _stability_rank(self._sections[index - 1][0]) > rank:
+            index -= 1
+        self._sections.insert(index, (name, prompt))
+        self._hashes[name] = _content_hash(prompt)
+        self._rendered = None
 
     def update_section(self, name: str, prompt: str) -> None:
         """Replace the text of an existing section.
@@ -70,7 +145,12 @@ class SysPromptManager:
         index = self._find(name)
         if index is None:
             raise ValueError(f"no section named {name!r} to update")
+        digest = _content_hash(prompt)
+        if digest == self._hashes.get(name):
+            return  # unchanged: the rendered prompt stays valid
         self._sections[index] = (name, prompt)
+        self._hashes[name] = digest
+        self._rendered = None
 
     def del_section(self, name: str) -> None:
         """Remove a section.
@@ -88,14 +168,31 @@ class SysPromptManager:
         if index is None:
             raise ValueError(f"no section named {name!r} to delete")
         del self._sections[index]
+        del self._hashes[name]
+        self._rendered = None
 
     def render(self) -> str:
         """Assemble the full prompt from all sections.
 
         A newline is appended at the end of every section to provide a visual
-        context separation between sections.
+        context separation between sections.  The result is cached until a
+        section changes.
         """
-        return "".join(text + "\n" for _, text in self._sections)
+        return self._render()[0]
+
+    def digest(self) -> str:
+        """The :func:`prompt_digest` of the rendered prompt (cached with it)."""
+        return self._render()[1]
+
+    def section_hashes(self) -> dict[str, str]:
+        """The content hash (SHA-256, hex) of every section, by name."""
+        return dict(self._hashes)
+
+    def _render(self) -> tuple[str, str]:
+        if self._rendered is None:
+            prompt = "".join(text + "\n" for _, text in self._sections)
+            self._rendered = (prompt, prompt_digest(prompt))
+        return self._rendered
 
     def get_all_sections(self) -> Iterator[tuple[str, str]]:
         """Yield ``(section_name, section_text)`` for every section."""
@@ -113,22 +210,40 @@ class SysPromptManager:
 SYSTEM_PROMPT_MANAGER = SysPromptManager(SYSTEM_PROMPT)
 
 
+# The last AGENTS.md read: (path, mtime_ns, size) -> stripped content.
+_agents_md_cache: tuple[tuple[str, int, int], str | None] | None = None
+
+
 def _load_agents_md() -> str | None:
     """Read the cwd ``AGENTS.md``, returning its stripped content.
 
     Returns ``None`` when the file is missing, unreadable or empty
-    (whitespace-only).
+    (whitespace-only).  The file is only re-read when its path, mtime or
+    size changed since the last call, or when it was modified within
+    :data:`janito.json_store.RACY_WINDOW_NS` of being read (a same-size
+    rewrite in the same mtime tick leaves its stat unchanged).
     """
+    global _agents_md_cache
     agents_md_path = os.path.join(os.getcwd(), "AGENTS.md")
+    try:
+        st = os.stat(agents_md_path)
+    except OSError:
+        return None
+    key = (agents_md_path, st.st_mtime_ns, st.st_size)
+    if _agents_md_cache is not None and _agents_md_cache[0] == key:
+        return _agents_md_cache[1]
+    agents_content = None
     if os.path.isfile(agents_md_path):
         try:
             with open(agents_md_path, encoding="utf-8") as f:
-                agents_content = f.read().strip()
-            if agents_content:
-                return agents_content
+                agents_content = f.read().strip() or None
         except OSError:
-            pass
-    return None
+            return None
+    # Stat taken before the read: a write racing with it shows up as a
+    # changed stat on the next call.
+    if st.st_mtime_ns < time.time_ns() - RACY_WINDOW_NS:
+        _agents_md_cache = (key, agents_content)
+    return agents_content
 
 
 def _set_section(manager: SysPromptManager, name: str, text: str | None) -> None:
@@ -18,9 +18,12 @@ import sys
 import time
 from typing import Any
 
+from ..agent.tracing import span
 from ..mcp_manager import MCPManager, get_mcp_manager
 from .changes import record_change
-from .reporter import set_report_handler
+from .reporter import replay_report, set_report_handler
+from .speculative import SpeculativeOutcome, take_speculative_result
+from .tool_selection import DISCOVER_TOOL, ToolSelection, run_discover_tools
 from .tools_registry import get_tool_by_name
 from .tools_usage import record_tool_use
 from .used_files import record_used_file
@@ -46,6 +49,40 @@ def is_mcp_tool(tool_name: str) -> bool:
     return False
 
 
+def invoke_tool(
+    tool_name: str,
+    tool_args: dict[str, Any],
+    use_mcp: bool = True,
+    mcp_manager: MCPManager | None = None,
+    selection: ToolSelection | None = None,
+) -> tuple[Any, str | None]:
+    """Route one tool call and return ``(result, error)`` without bookkeeping.
+
+    A failing call is converted into a structured ``{"success": False, ...}``
+    result (``error`` carries the exception message) instead of raising.
+    Used by :func:`run_tool` and by the speculative runner
+    (:mod:`janito.tooling.speculative`), which defers the bookkeeping until
+    its result is claimed.  ``selection`` is the calling conversation's tool
+    selection, whose catalog ``discover_tools`` searches.
+    """
+    try:
+        if use_mcp and is_mcp_tool(tool_name):
+            manager = mcp_manager or get_mcp_manager()
+            return manager.call_tool(tool_name, tool_args), None
+        if tool_name == DISCOVER_TOOL:
+            # The tool-selection meta-tool (see janito.tooling.tool_selection)
+            # is not a registry tool: it is only offered with a selection.
+            return run_discover_tools(selection, **tool_args), None
+        tool_fn = get_tool_by_name(tool_name)
+        return tool_fn(**tool_args), None
+    except Exception as e:  # noqa: BLE001 - a failing tool must not stop the loop
+        logger.error(f"Tool {tool_name} failed: {e}")
+        return {
+            "success": False,
+            "error": f"Tool execution failed: {e!s}",
+        }, str(e)
+
+
 def run_tool(
     tool_name: str,
     tool_args: dict[str, Any],
@@ -53,16 +90,20 @@ def run_tool(
     *,
     mcp_manager: MCPManager | None = None,
     progress: Any = None,
+    prefetched: SpeculativeOutcome | None = None,
+    queued_at: float | None = None,
+    selection: ToolSelection | None = None,
 ) -> tuple[Any, str | None, int]:
     """Execute a single tool call and return ``(result, error, exec_time_ms)``.
 
     This is the **shared tool-execution core** used by both agent loops:
 
     - the CLI ``ToolExecutor.execute_tool_call`` (called synchronously),
-    - the web agent loop, which runs it in a thread via
-      ``asyncio.to_thread`` (``janito.web.backend.agent.tooling.execute_tool``).
+    - the async agent pipeline, which runs it in a thread via
+      ``asyncio.to_thread`` (``janito.agent.pipeline.tooling.execute_tool``).
 
-    It routes the call to the MCP manager or the built-in tools registry,
+    It routes the call to the MCP manager or the built-in tools registry
+    (or the ``discover_tools`` meta-tool),
     tracks usage / used files / changes (best-effort, never raises), and
     converts a failing call into a structured ``{"success": False, ...}``
     result instead of raising, so a failing tool never aborts the agent
@@ -81,6 +122,15 @@ def run_tool(
             ``None``, the global manager (see :func:`get_mcp_manager`) is
             used lazily.
         progress: Optional ``(level, message, end)`` report callback.
+        prefetched: The result of a speculative run of this very call (see
+            :mod:`janito.tooling.speculative`): the tool is not invoked
+            again, its captured report lines are replayed instead.
+        queued_at: ``time.perf_counter()`` when the call became ready to run
+            (the end of the model's stream); the wait until it starts is
+            recorded as the ``queue_ms`` of its ``tool`` span (see
+            :mod:`janito.agent.tracing`).
+        selection: The conversation's tool selection (see
+            :func:`invoke_tool`).
 
     Returns:
         A tuple ``(result, error, exec_time_ms)``: ``result`` is the raw
@@ -88,41 +138,43 @@ def run_tool(
         failure), ``error`` is ``None`` on success, and ``exec_time_ms`` is
         the wall-clock execution time.
     """
-    record_tool_use(tool_name)
-    if progress is not None:
-        set_report_handler(progress)
-    start = time.time()
-    error: str | None = None
-    result: Any = None
-    try:
-        if use_mcp and is_mcp_tool(tool_name):
-            manager = mcp_manager or get_mcp_manager()
-            result = manager.call_tool(tool_name, tool_args)
-        else:
-            tool_fn = get_tool_by_name(tool_name)
-            result = tool_fn(**tool_args)
-    except Exception as e:  # noqa: BLE001 - a failing tool must not stop the loop
-        logger.error(f"Tool {tool_name} failed: {e}")
-        error = str(e)
-        result = {
-            "success": False,
-            "error": f"Tool execution failed: {e!s}",
-        }
-    finally:
+    with span("tool", tool=tool_name) as phase:
+        if prefetched is not None:
+            phase.set(speculative=True)
+        if queued_at is not None:
+            phase.set(queue_ms=round((time.perf_counter() - queued_at) * 1000, 1))
+        record_tool_use(tool_name)
         if progress is not None:
-            set_report_handler(None)  # restore default (Rich console)
-
-    # Track which files this successful call touched (only when the first
-    # argument is "filepath"; best-effort, never raises). A tool signals
-    # logical failure via a falsy "success" key in its result dict; such
-    # calls are not tracked.
-    if error is None and not (
-        isinstance(result, dict) and result.get("success") is False
-    ):
-        record_used_file(tool_name, tool_args)
-        # Log the execution to ./.janito/changes.jsonl so the /changes
-        # command can replay it (best-effort, never raises).
-        record_change(tool_name, tool_args)
+            set_report_handler(progress)
+        start = time.time()
+        try:
+            if prefetched is not None:
+                for level, message, end in prefetched.reports:
+                    replay_report(level, message, end)
+                result, error = prefetched.result, prefetched.error
+            else:
+                result, error = invoke_tool(
+                    tool_name, tool_args, use_mcp, mcp_manager, selection
+                )
+        finally:
+            if progress is not None:
+                set_report_handler(None)  # restore default (Rich console)
+        phase.set(exec_ms=round((time.time() - start) * 1000, 1))
+        if error is not None:
+            phase.set(failed=True)
+
+        # Track which files this successful call touched (only when the first
+        # argument is "filepath"; best-effort, never raises). A tool signals
+        # logical failure via a falsy "success" key in its result dict; such
+        # calls are not tracked.
+        if error is None and not (
+            isinstance(result, dict) and result.get("success") is False
+        ):
+            with span("tracking"):
+                record_used_file(tool_name, tool_args)
+                # Log the execution to ./.janito/changes.jsonl so the /changes
+                # command can replay it (best-effort, never raises).
+                record_change(tool_name, tool_args)
 
     return result, error, int((time.time() - start) * 1000)
 
@@ -150,6 +202,9 @@ class ToolExecutor:
                 :func:`janito.mcp_manager.get_mcp_manager`) is used lazily.
         """
         self._mcp_manager = mcp_manager
+        #: The conversation's tool selection (set by the agent loop when one
+        #: is active), searched by ``discover_tools`` calls.
+        self.selection: ToolSelection | None = None
 
     @property
     def mcp_manager(self) -> MCPManager:
@@ -240,15 +295,22 @@ class ToolExecutor:
                 :meth:`build_assistant_message`).
             messages: The conversation history; mutated in place.
         """
+        # The calls are ready to run from now on; each one's wait is its
+        # queue time.
+        queued_at = time.perf_counter()
         for tool_call in tool_calls:
-            messages.append(self.execute_tool_call(tool_call))
+            messages.append(self.execute_tool_call(tool_call, queued_at=queued_at))
 
-    def execute_tool_call(self, tool_call: dict[str, Any]) -> dict[str, Any]:
+    def execute_tool_call(
+        self, tool_call: dict[str, Any], queued_at: float | None = None
+    ) -> dict[str, Any]:
         """Execute a single tool call and return the ``tool``-role message.
 
         Args:
             tool_call: One tool-call dict with ``id`` and a ``function``
                 object carrying ``name`` and ``arguments`` (JSON string).
+            queued_at: When the call became ready to run (see
+                :func:`run_tool`).
 
         Returns:
             dict: A ``tool``-role message whose ``content`` is the JSON
@@ -263,12 +325,16 @@ class ToolExecutor:
         logger.info(f"Tool call: {tool_name}({tool_args})")
 
         # The shared core does the routing, usage/used-files/changes tracking
-        # and failure shaping (see run_tool).
+        # and failure shaping (see run_tool).  A read-only call may already
+        # have run while the model was still streaming; its result is reused.
         tool_result, error, _ = run_tool(
             tool_name,
             tool_args,
             use_mcp=True,
             mcp_manager=self.mcp_manager,
+            prefetched=take_speculative_result(tool_call_id, tool_name, tool_args),
+            queued_at=queued_at,
+            selection=self.selection,
         )
         if error:
             print(f"\u274c Tool error: {tool_name} - {error}", file=sys.stderr)
@@ -283,6 +349,7 @@ class ToolExecutor:
 
 __all__ = [
     "ToolExecutor",
+    "invoke_tool",
     "is_mcp_tool",
     "run_tool",
 ]
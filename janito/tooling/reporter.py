@@ -250,3 +250,35 @@ def report_info(message: str, end: str = "\n") -> None:
         return
     _console.print(f"\u2139\ufe0f  {message}", style=Colors.CYAN, end=end)
     _console.file.flush()
+
+
+def replay_report(level: str, message: str, end: str = "\n") -> None:
+    """Re-emit a report line captured earlier as ``(level, message, end)``.
+
+    Used for tool calls that ran speculatively with their output captured
+    (see :mod:`janito.tooling.speculative`).  With a report handler the line
+    is forwarded as-is; on the console it is printed like the original
+    ``report_*`` call (``start`` lines use the read-only tool style, the
+    only tools run speculatively).
+    """
+    handler = _report_handler.get()
+    if handler:
+        handler(level, message, end)
+        return
+    if level == "start":
+        report_start(message, end=end, color=Colors.GREEN, prefix=" ")
+    elif level == "diff":
+        _console.print(message, end=end, highlight=False)
+        _console.file.flush()
+    else:
+        _REPLAY.get(level, report_progress)(message, end=end)
+
+
+_REPLAY: dict[str, Callable[..., None]] = {
+    "progress": report_progress,
+    "output": report_output,
+    "result": report_result,
+    "error": report_error,
+    "warning": report_warning,
+    "info": report_info,
+}
@@ -0,0 +1,235 @@
+"""
+On-disk index of the skills catalog (``~/.janito/skills_index.json``).
+
+Discovering skills used to walk every skills root two levels deep and read
+every ``SKILL.md`` in full just to extract its description, then list every
+skill directory's resources -- at every startup.  With a few hundred shared
+skills that is hundreds of file reads before the first prompt.
+
+This module keeps, per skills root, what discovery needs (each skill's
+name, source, description and resource names) together with the mtimes it
+was read under, and revalidates it with ``stat`` calls only:
+
+- The root's layout (which directories hold a ``SKILL.md``) is reused while
+  the root and each grouping directory (a level-1 directory without a
+  ``SKILL.md``) keep their mtime; adding, removing or renaming a skill
+  directory changes the mtime of its parent.
+- A skill's entry is reused while its directory (resources added, removed
+  or renamed) and its ``SKILL.md`` (mtime and size) are unchanged, and is
+  re-read otherwise.
+
+Anything modified within :data:`janito.json_store.RACY_WINDOW_NS` of the
+scan is not trusted (a rewrite within the same timestamp tick would not
+change the mtime), so it is read again on the next scan.  The full
+``SKILL.md`` content is only read by ``load_skill``.
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from janito.json_store import RACY_WINDOW_NS, SkillsIndexStore
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+SKILL_FILE = "SKILL.md"
+
+# Module-level singleton store backing every function below.
+_store = SkillsIndexStore()
+
+
+def extract_description(content: str) -> str:
+    """Extract a short description from SKILL.md content.
+
+    The YAML front matter, headers and code fences are skipped; the first two
+    remaining non-empty lines are joined.
+    """
+    if not content:
+        return ""
+
+    # Skip YAML front matter if present
+    if content.startswith("---"):
+        parts = content.split("---", 2)
+        if len(parts) >= 3:
+            content = parts[2].strip()
+
+    description_lines = []
+    for line in content.split("\n"):
+        line = line.strip()
+        if line.startswith("#") or line.startswith("```"):
+            continue  # Skip headers and code blocks
+        if line:
+            description_lines.append(line)
+        if len(description_lines) >= 2:
+            break
+
+    # Keep the complete extracted description.  The shell/UI is responsible
+    # for wrapping it to fit the available display width.
+    return " ".join(description_lines)
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _trusted(mtime_ns: int | None, now_ns: int) -> bool:
+    """Whether an mtime is old enough for an unchanged value to mean no change."""
+    return mtime_ns is not None and now_ns - mtime_ns > RACY_WINDOW_NS
+
+
+def _walk_layout(base: Path) -> tuple[list[Path], dict[str, int]]:
+    """Find the skill directories of a root (two levels deep) and its groups."""
+    skill_dirs: list[Path] = []
+    groups: dict[str, int] = {}
+    for level1 in sorted(base.iterdir()):
+        if not level1.is_dir():
+            continue
+        if (level1 / SKILL_FILE).exists():
+            skill_dirs.append(level1)
+            continue
+        mtime = _mtime_ns(level1)
+        if mtime is not None:
+            groups[str(level1)] = mtime
+        for level2 in sorted(level1.iterdir()):
+            if level2.is_dir() and (level2 / SKILL_FILE).exists():
+                skill_dirs.append(level2)
+    return skill_dirs, groups
+
+
+def _cached_layout(cached: dict | None, base_mtime: int, now_ns: int):
+    """The indexed skill directories, if the root's layout is unchanged."""
+    if not cached or cached.get("mtime_ns") != base_mtime:
+        return None
+    if not _trusted(base_mtime, now_ns):
+        return None
+    groups = cached.get("groups", {})
+    for group, mtime in groups.items():
+        if _mtime_ns(Path(group)) != mtime or not _trusted(mtime, now_ns):
+            return None
+    return [Path(path) for path in cached.get("skills", {})], groups
+
+
+def _skill_entry(path: Path, cached: dict | None, now_ns: int) -> dict | None:
+    """The index entry of a skill directory, reused from ``cached`` if valid."""
+    try:
+        dir_mtime = os.stat(path).st_mtime_ns
+        md_stat = os.stat(path / SKILL_FILE)
+    except OSError:
+        return None
+    key = {
+        "dir_mtime_ns": dir_mtime,
+        "mtime_ns": md_stat.st_mtime_ns,
+        "size": md_stat.st_size,
+    }
+    if (
+        cached
+        and all(cached.get(k) == v for k, v in key.items())
+        and _trusted(dir_mtime, now_ns)
+        and _trusted(md_stat.st_mtime_ns, now_ns)
+    ):
+        return cached
+    description = ""
+    try:
+        with open(path / SKILL_FILE, encoding="utf-8") as f:
+            description = extract_description(f.read())
+    except (OSError, UnicodeDecodeError):
+        pass
+    resources = sorted(
+        item.name
+        for item in path.iterdir()
+        if item.is_file() and item.name != SKILL_FILE
+    )
+    return {
+        "name": path.name,
+        "description": description,
+        "resources": resources,
+        **key,
+    }
+
+
+def scan_root(base: Path, source: str, cached: dict | None = None) -> dict | None:
+    """Index one skills root, reusing whatever ``cached`` still describes.
+
+    Args:
+        base: The skills root (e.g. ``~/.janito/skills``).
+        source: Its label (``"home"``, ``"agents"`` or ``"local"``).
+        cached: The root's previous entry from the index, if any.
+
+    Returns:
+        The root's entry (``{"source", "mtime_ns", "groups", "skills"}``,
+        ``skills`` mapping each skill directory to its
+        ``{name, description, resources, ...mtimes}``), or ``None`` when the
+        root does not exist.
+    """
+    base_mtime = _mtime_ns(base)
+    if base_mtime is None or not base.is_dir():
+        return None
+    now_ns = time.time_ns()
+    layout = _cached_layout(cached, base_mtime, now_ns)
+    if layout is None:
+        layout = _walk_layout(base)
+    skill_dirs, groups = layout
+    previous = (cached or {}).get("skills", {})
+    skills = {}
+    for path in skill_dirs:
+        entry = _skill_entry(path, previous.get(str(path)), now_ns)
+        if entry is None:
+            # Removed under an unchanged layout (racy mtime): walk again.
+            return scan_root(base, source, None)
+        skills[str(path)] = entry
+    return {
+        "source": source,
+        "mtime_ns": base_mtime,
+        "groups": groups,
+        "skills": skills,
+    }
+
+
+def load_index(roots: list[tuple[Path, str]]) -> list[dict[str, Any]]:
+    """Index every skills root, in order, updating the on-disk index.
+
+    Args:
+        roots: ``(path, source)`` pairs, in precedence order (later roots
+            override earlier ones).
+
+    Returns:
+        One ``{name, path, source, description, resources}`` record per
+        discovered skill, roots in the given order.  The index file is only
+        written when an entry changed or an indexed root no longer exists.
+    """
+    try:
+        indexed = _store.get_roots()
+    except Exception as e:  # a corrupt cache is rebuilt
+        logger.debug(f"Ignoring unreadable skills index: {e}")
+        indexed = {}
+    changed: dict[str, dict] = {}
+    records = []
+    for base, source in roots:
+        key = str(Path(base).absolute())
+        cached = indexed.get(key)
+        entry = scan_root(Path(base), source, cached)
+        if entry is None:
+            continue
+        if entry != cached:
+            changed[key] = entry
+        for path, skill in entry["skills"].items():
+            records.append(
+                {
+                    "name": skill["name"],
+                    "path": path,
+                    "source": source,
+                    "description": skill["description"],
+                    "resources": skill["resources"],
+                }
+            )
+    # Forget roots that no longer exist (e.g. a deleted project).
+    removed = [key for key in indexed if key not in changed and not os.path.isdir(key)]
+    if (changed or removed) and not _store.update_roots(changed, removed):
+        logger.debug("Could not write the skills index")
+    return records
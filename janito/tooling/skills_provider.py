@@ -16,6 +16,14 @@ loaded from the correct directory regardless of whether the skill lives in the
 home, ``.agents`` or local ``.janito`` directory.  When a skill name exists in
 multiple locations the **local** copy takes precedence, making it easy to override a
 globally installed skill with a project-specific variant.
+
+Discovery goes through the on-disk skills index
+(:mod:`janito.tooling.skills_index`), revalidated by directory mtimes, so a
+startup with hundreds of skills costs a few ``stat`` calls instead of
+reading every ``SKILL.md``.  The advertisement is budgeted
+(``skills-prompt-tokens``): when the catalog does not fit, project skills
+are listed first and the ``search_skills`` tool lets the model find the rest
+by keyword.
 """
 
 from pathlib import Path
@@ -23,6 +31,19 @@ from typing import Any
 
 from janito.config_dir import get_config_dir
 from janito.tooling.reporter import report_error, report_result, report_start
+from janito.tooling.skills_index import SKILL_FILE, load_index
+
+#: Token budget of the skills advertisement (``skills-prompt-tokens``).
+DEFAULT_PROMPT_TOKENS = 2000
+
+#: Descriptions are cut to this many characters in the advertisement.
+MAX_ADVERTISED_DESCRIPTION = 200
+
+#: Number of matches ``search_skills`` returns.
+MAX_SEARCH_RESULTS = 10
+
+# Which skills are advertised first when the catalog exceeds the budget.
+_SOURCE_PRIORITY = {"local": 0, "agents": 1, "home": 2}
 
 
 def get_default_skills_dir() -> Path:
@@ -55,7 +76,8 @@ class Skill:
             ``"local"``.
         description: Short description extracted from SKILL.md.
         content: Cached SKILL.md content (populated by :meth:`load_content`).
-        resources: Mapping of resource file name → path.
+        resources: Mapping of resource file name → path (from the skills
+            index when given, otherwise scanned on first access).
     """
 
     def __init__(
@@ -65,16 +87,24 @@ class Skill:
         description: str = "",
         content: str = "",
         source: str = "home",
+        resources: list[str] | None = None,
     ):
         self.name = name
         self.path = path
         self.source = source
         self.description = description
         self.content = content
-        self.resources: dict[str, Path] = {}
-
-        # Discover resources in the skill directory
-        self._discover_resources()
+        self._resources: dict[str, Path] | None = None
+        if resources is not None:
+            self._resources = {item: path / item for item in resources}
+
+    @property
+    def resources(self) -> dict[str, Path]:
+        """Resource file name → path (the indexed names, or a scan)."""
+        if self._resources is None:
+            self._resources = {}
+            self._discover_resources()
+        return self._resources
 
     def _discover_resources(self):
         """Scan skill directory for additional resources."""
@@ -82,12 +112,12 @@ class Skill:
             return
 
         for item in self.path.iterdir():
-            if item.is_file() and item.name != "SKILL.md":
-                self.resources[item.name] = item
+            if item.is_file() and item.name != SKILL_FILE:
+                self._resources[item.name] = item
 
     def load_content(self) -> str:
         """Load the full SKILL.md content."""
-        skill_md = self.path / "SKILL.md"
+        skill_md = self.path / SKILL_FILE
         if skill_md.exists():
             with open(skill_md, encoding="utf-8") as f:
                 self.content = f.read()
@@ -167,85 +197,21 @@ class SkillsProvider:
         self._discover_skills()
 
     def _discover_skills(self):
-        """Scan all skill paths for SKILL.md files.
+        """Load the skills of all skill paths from the skills index.
 
         Paths are searched in order.  When a skill name appears in more than
         one path the *last* one processed wins.  ``skill_paths`` is ordered
-        ``[home, local]`` so that **local skills override home skills**.
+        ``[home, agents, local]`` so that **local skills override home
+        skills**.
         """
-        for base_path, source in self.skill_paths:
-            if not base_path.exists():
-                continue
-
-            # Search up to 2 levels deep for SKILL.md files
-            for level1 in base_path.iterdir():
-                if not level1.is_dir():
-                    continue
-
-                skill_md = level1 / "SKILL.md"
-                if skill_md.exists():
-                    # It's a skill directory
-                    self._add_skill(level1.name, level1, source)
-                    continue
-
-                # Check one more level deep
-                for level2 in level1.iterdir():
-                    if not level2.is_dir():
-                        continue
-                    skill_md = level2 / "SKILL.md"
-                    if skill_md.exists():
-                        self._add_skill(level2.name, level2, source)
-
-    def _add_skill(self, name: str, path: Path, source: str = "home"):
-        """Add a skill to the provider.
-
-        Args:
-            name: Skill name (directory name).
-            path: Path to the skill directory.
-            source: ``"home"`` or ``"local"`` – where the skill was found.
-        """
-        # Extract description from SKILL.md if available
-        description = ""
-        skill_md = path / "SKILL.md"
-        if skill_md.exists():
-            try:
-                with open(skill_md, encoding="utf-8") as f:
-                    content = f.read()
-                    # Extract description from first paragraph
-                    description = self._extract_description(content)
-            except Exception:
-                pass
-
-        self._skills[name] = Skill(name, path, description, source=source)
-
-    def _extract_description(self, content: str) -> str:
-        """Extract a short description from SKILL.md content."""
-        if not content:
-            return ""
-
-        # Skip YAML front matter if present
-        if content.startswith("---"):
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                content = parts[2].strip()
-
-        # Get first paragraph (non-empty lines)
-        lines = content.split("\n")
-        description_lines = []
-        for line in lines:
-            line = line.strip()
-            if line.startswith("#"):
-                continue  # Skip headers
-            if line.startswith("```"):
-                continue  # Skip code blocks
-            if line:
-                description_lines.append(line)
-            if len(description_lines) >= 2:
-                break
-
-        # Keep the complete extracted description.  The shell/UI is
-        # responsible for wrapping it to fit the available display width.
-        return " ".join(description_lines)
+        for record in load_index(self.skill_paths):
+            self._skills[record["name"]] = Skill(
+                record["name"],
+                Path(record["path"]),
+                record["description"],
+                source=record["source"],
+                resources=record["resources"],
+            )
 
     def get_skill(self, name: str) -> Skill | None:
         """Get a skill by name."""
@@ -270,10 +236,16 @@ class SkillsProvider:
             )
         return result
 
-    def get_advertisement(self) -> str:
+    def get_advertisement(self, budget: int | None = None) -> str:
         """
         Generate the skills advertisement section for system prompt.
 
+        Args:
+            budget: Token budget of the section (default:
+                ``skills-prompt-tokens``).  Skills that do not fit are left
+                out -- project skills are kept first -- and a closing line
+                points the model at ``search_skills``.
+
         Returns:
             String with skill names and descriptions (~100 tokens per skill)
         """
@@ -287,12 +259,69 @@ class SkillsProvider:
             "Use these skills when the user's request matches their description:",
             "",
         ]
-
+        listed = self._advertised(skills, budget)
         for skill in skills:
-            lines.append(f"- **{skill['name']}**: {skill['description']}")
+            if skill["name"] in listed:
+                lines.append(listed[skill["name"]])
+        hidden = len(skills) - len(listed)
+        if hidden:
+            lines.append(
+                f"- ... and {hidden} more skill(s): call search_skills(query)"
+                " to find them by keyword."
+            )
 
         return "\n".join(lines)
 
+    def is_truncated(self, budget: int | None = None) -> bool:
+        """Whether the advertisement leaves skills out (see ``search_skills``)."""
+        skills = self.list_skills()
+        return len(self._advertised(skills, budget)) < len(skills)
+
+    def _advertised(self, skills: list[dict], budget: int | None) -> dict[str, str]:
+        """The advertisement line of each skill that fits the budget."""
+        from janito.agent.tokens import estimate_tokens
+
+        if budget is None:
+            budget = configured_prompt_tokens()
+        ranked = sorted(
+            skills, key=lambda s: (_SOURCE_PRIORITY.get(s["source"], 3), s["name"])
+        )
+        listed: dict[str, str] = {}
+        for skill in ranked:
+            description = skill["description"]
+            if len(description) > MAX_ADVERTISED_DESCRIPTION:
+                description = description[: MAX_ADVERTISED_DESCRIPTION - 3] + "..."
+            line = f"- **{skill['name']}**: {description}"
+            budget -= estimate_tokens(line)
+            if budget < 0:
+                break
+            listed[skill["name"]] = line
+        return listed
+
+    def search(self, query: str, limit: int = MAX_SEARCH_RESULTS) -> list[dict]:
+        """Find skills by keyword, best matches first.
+
+        Every word of ``query`` scores a skill when it appears in its name
+        (3 points), description (2) or resource names (1).
+
+        Returns:
+            :meth:`list_skills` records of the matching skills.
+        """
+        words = [w for w in query.lower().split() if w]
+        scored = []
+        for record in self.list_skills():
+            skill = self._skills[record["name"]]
+            name = skill.name.lower()
+            description = skill.description.lower()
+            resources = " ".join(skill.resources).lower()
+            score = sum(
+                3 * (w in name) + 2 * (w in description) + (w in resources)
+                for w in words
+            )
+            if score:
+                scored.append((-score, record["name"], record))
+        return [record for _, _, record in sorted(scored)[:limit]]
+
     def get_skill_tool_schemas(self) -> list[dict[str, Any]]:
         """
         Get tool schemas for skill operations.
@@ -357,6 +386,17 @@ class SkillsProvider:
         ]
 
 
+def configured_prompt_tokens() -> int:
+    """The ``skills-prompt-tokens`` config value (token budget of the skills)."""
+    from janito.config_store import get_config_value
+
+    value = get_config_value("skills-prompt-tokens")
+    try:
+        return DEFAULT_PROMPT_TOKENS if value is None else max(int(value), 0)
+    except (TypeError, ValueError):
+        return DEFAULT_PROMPT_TOKENS
+
+
 # Global skills provider instance
 _global_skills_provider: SkillsProvider | None = None
 
@@ -468,14 +508,48 @@ def read_skill_resource(skill_name: str, resource_name: str) -> str:
     return f"# {skill_name}/{resource_name}\n\n{content}"
 
 
+def search_skills(query: str) -> str:
+    """
+    Search the installed skills by keyword, for skills the system prompt does not list.
+
+    Args:
+        query: Keywords to look for in skill names, descriptions and resource names (e.g., 'pdf forms')
+
+    Returns:
+        The matching skills with their descriptions, best matches first
+    """
+    report_start(f"🔎 Searching skills for '{query}'...", end="")
+
+    matches = get_skills_provider().search(query)
+    if not matches:
+        message = f"No skills match '{query}'."
+        report_result(message)
+        return message
+
+    report_result(f"Found {len(matches)} skill(s)")
+    lines = [f"Skills matching '{query}' (load one with load_skill):"]
+    for match in matches:
+        lines.append(
+            f"- **{match['name']}** ({match['source']}): {match['description']}"
+        )
+    return "\n".join(lines)
+
+
 def get_skills_advertisement() -> str:
     """Get the skills advertisement for system prompt."""
     return get_skills_provider().get_advertisement()
 
 
 def get_skills_tools() -> dict[str, Any]:
-    """Get skill-related tools as a dict mapping names to functions."""
-    return {
+    """Get skill-related tools as a dict mapping names to functions.
+
+    ``search_skills`` is only offered when the advertisement leaves skills
+    out.
+    """
+    tools = {
         "load_skill": load_skill,
         "read_skill_resource": read_skill_resource,
     }
+    if get_skills_provider().is_truncated():
+        tools["search_skills"] = search_skills
+    return tools
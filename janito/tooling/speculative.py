@@ -0,0 +1,325 @@
+"""
+Speculative execution of read-only tool calls while the model still streams.
+
+A model round that requests several tool calls streams them one after the
+other, and the agent loop only executes them once the whole stream has
+ended.  When the first call's arguments were complete seconds before the
+stream finished, that time is wasted.  The stream consumers therefore report
+each tool call as soon as its arguments are complete
+(:func:`speculate_tool_call`):
+
+- Chat Completions streams the ``arguments`` JSON in fragments with no
+  per-call end marker, so :class:`JsonObjectTracker` detects incrementally
+  when the top-level JSON object has been closed;
+- Anthropic reports a ``tool_use`` block complete on ``content_block_stop``;
+- Responses reports a ``function_call`` item complete on
+  ``response.output_item.done``.
+
+The active :class:`SpeculativeToolRunner` runs the call in a background
+thread when it is *safe* to run early: a built-in tool of
+:data:`SPECULATIVE_TOOLS`, which only read the local workspace.  Being
+declared read-only (``@tool(permissions="r")``) is not enough: ``AskUser``
+prompts on stdin (which the main thread polls for Enter-to-cancel while
+streaming) and ``GetUrl`` goes to the network.  Anything else (write/exec
+tools, MCP tools) waits for the normal execution path, and so does every
+call after it in the same round: a ``ReadFile`` that follows a
+``CreateFile`` of the same path must see the new content.  The tool's ``report_*`` lines are
+captured instead of printed and replayed when the result is used, and the
+usage / used-files bookkeeping happens at that point too
+(:func:`~janito.tooling.executor.run_tool` with ``prefetched=``), so the
+console output and the tracking are identical to a regular call.
+
+When the stream finishes, :class:`~janito.tooling.executor.ToolExecutor`
+asks :func:`take_speculative_result` for a result matching the call id, name
+and parsed arguments before executing it; a miss (or a call that is still
+running) simply falls back to / waits for the speculative run.  Results that
+are never claimed (e.g. the user cancelled the stream) are dropped at the
+next prompt.  Set ``speculative-tools`` to ``false`` to disable it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+#: Worker threads running speculative tool calls.
+MAX_SPECULATIVE_WORKERS = 4
+
+#: Built-in tools that may run before the stream ends: side-effect free,
+#: non-interactive and local.
+SPECULATIVE_TOOLS = frozenset(
+    {
+        "ReadFile",
+        "ReadMultipleFiles",
+        "ListFiles",
+        "FindFiles",
+        "SearchText",
+        "SearchRegex",
+    }
+)
+
+
+class JsonObjectTracker:
+    """Incrementally detect when a streamed JSON object is complete.
+
+    Fragments are fed as they arrive; the tracker follows string literals,
+    escapes and brace/bracket nesting, so each character is scanned once.
+    The object is complete once the top-level ``{...}`` has been closed and
+    nothing but whitespace follows it.
+    """
+
+    __slots__ = ("depth", "in_string", "escape", "started", "closed", "invalid")
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.closed = False
+        self.invalid = False
+
+    @property
+    def complete(self) -> bool:
+        """Whether a whole top-level JSON object has been fed."""
+        return self.closed and not self.invalid
+
+    def feed(self, fragment: str) -> bool:
+        """Scan one fragment; returns :attr:`complete`."""
+        if self.invalid:
+            return False
+        for char in fragment:
+            if self.closed:
+                if not char.isspace():
+                    self.invalid = True
+                    return False
+                continue
+            self._scan(char)
+        return self.complete
+
+    def _scan_string(self, char: str) -> None:
+        if self.escape:
+            self.escape = False
+        elif char == "\\":
+            self.escape = True
+        elif char == '"':
+            self.in_string = False
+
+    def _scan(self, char: str) -> None:
+        if self.in_string:
+            self._scan_string(char)
+        elif char == '"':
+            self.in_string = True
+        elif char in "{[":
+            if not self.started and char != "{":
+                self.invalid = True
+            self.started = True
+            self.depth += 1
+        elif char in "}]":
+            self.depth -= 1
+            if self.depth == 0:
+                self.closed = True
+        elif not self.started and not char.isspace():
+            # Arguments must be a JSON object.
+            self.invalid = True
+
+
+@dataclass
+class SpeculativeOutcome:
+    """A finished speculative run, ready to be replayed by ``run_tool``.
+
+    Attributes:
+        result: The raw tool result (shaped like a failed ``run_tool`` result
+            when the tool raised).
+        error: The exception message, or ``None`` on success.
+        reports: The ``(level, message, end)`` report lines the tool emitted.
+        exec_time_ms: Wall-clock execution time of the speculative run.
+    """
+
+    result: Any
+    error: str | None
+    reports: list[tuple[str, str, str]] = field(default_factory=list)
+    exec_time_ms: int = 0
+
+
+def _run_speculatively(tool_name: str, tool_args: dict) -> SpeculativeOutcome:
+    """Invoke a built-in tool with its report lines captured."""
+    from .executor import invoke_tool
+    from .reporter import set_report_handler
+
+    reports: list[tuple[str, str, str]] = []
+    set_report_handler(
+        lambda level, message, end: reports.append((level, message, end))
+    )
+    start = time.time()
+    try:
+        result, error = invoke_tool(tool_name, tool_args, use_mcp=False)
+    finally:
+        # Pool threads are reused: never leak the capturing handler.
+        set_report_handler(None)
+    return SpeculativeOutcome(result, error, reports, int((time.time() - start) * 1000))
+
+
+class SpeculativeToolRunner:
+    """Run read-only tool calls early and hand their results back later.
+
+    Calls must be reported in the order the model made them; once a round
+    reports a call that is not eligible, the later calls of that round are
+    not started (see :meth:`begin_round`).
+
+    Args:
+        allowed: Names of the tools that may run speculatively (default
+            :data:`SPECULATIVE_TOOLS`).
+    """
+
+    def __init__(self, allowed: frozenset[str] | set[str] = SPECULATIVE_TOOLS) -> None:
+        self.allowed = allowed
+        self._blocked = False
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[str, dict, Future]] = {}
+        self._pool: ThreadPoolExecutor | None = None
+        self.hits = 0
+
+    def eligible(self, tool_name: str) -> bool:
+        """Whether ``tool_name`` is safe to run before the stream ends."""
+        return tool_name in self.allowed
+
+    def begin_round(self) -> None:
+        """Start a model round: its calls may run early again."""
+        with self._lock:
+            self._blocked = False
+
+    def dispatch(self, call_id: str, tool_name: str, arguments: Any) -> bool:
+        """Start a tool call whose arguments are complete, if eligible.
+
+        Args:
+            call_id: The API's tool call id.
+            tool_name: The tool the model asked to call.
+            arguments: The arguments as a JSON string or an already parsed
+                dict.
+
+        Returns:
+            Whether the call was started.
+        """
+        with self._lock:
+            if self._blocked:
+                return False
+            if not self.eligible(tool_name):
+                # Later calls of the round may depend on this one's effects.
+                self._blocked = True
+                return False
+        if not call_id:
+            return False
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments or "{}")
+            except ValueError:
+                return False
+        if not isinstance(arguments, dict):
+            return False
+        with self._lock:
+            if call_id in self._pending:
+                return False
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=MAX_SPECULATIVE_WORKERS,
+                    thread_name_prefix="janito-speculative",
+                )
+            future = self._pool.submit(_run_speculatively, tool_name, arguments)
+            self._pending[call_id] = (tool_name, arguments, future)
+        logger.debug(f"Speculatively running {tool_name} ({call_id})")
+        return True
+
+    def take(
+        self, call_id: str, tool_name: str, tool_args: dict
+    ) -> SpeculativeOutcome | None:
+        """Claim the speculative result of a call, waiting if it still runs.
+
+        Returns ``None`` when the call was not run speculatively or its name
+        or arguments differ from the final call.
+        """
+        with self._lock:
+            entry = self._pending.pop(call_id, None)
+        if entry is None:
+            return None
+        name, arguments, future = entry
+        if name != tool_name or arguments != tool_args:
+            future.cancel()
+            return None
+        outcome = future.result()
+        self.hits += 1
+        logger.debug(f"Reusing speculative result of {tool_name} ({call_id})")
+        return outcome
+
+    def discard(self) -> None:
+        """Drop every unclaimed result (not-yet-started calls are cancelled)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for _, _, future in pending.values():
+            future.cancel()
+
+
+def load_speculative_enabled() -> bool:
+    """The ``speculative-tools`` config value (enabled by default)."""
+    from janito.config_store import get_config_value
+
+    value = get_config_value("speculative-tools")
+    if isinstance(value, str):
+        return value.strip().lower() not in ("false", "0", "no", "off")
+    return value is None or bool(value)
+
+
+# Module-level runner used by the CLI turn (None: speculation is off).
+_runner: SpeculativeToolRunner | None = None
+
+
+def reset_speculation(runner: SpeculativeToolRunner | None = None) -> None:
+    """Start a prompt: drop leftovers and install ``runner`` (or none)."""
+    global _runner
+    if _runner is not None:
+        _runner.discard()
+    _runner = runner
+
+
+def begin_speculative_round() -> None:
+    """Start a model round on the active runner (if any)."""
+    runner = _runner
+    if runner is not None:
+        runner.begin_round()
+
+
+def speculate_tool_call(call_id: str, tool_name: str, arguments: Any) -> bool:
+    """Stream-consumer hook: a tool call's arguments are complete."""
+    runner = _runner
+    if runner is None:
+        return False
+    return runner.dispatch(call_id, tool_name, arguments)
+
+
+def take_speculative_result(
+    call_id: str, tool_name: str, tool_args: dict
+) -> SpeculativeOutcome | None:
+    """Claim the speculative result of a call from the active runner."""
+    runner = _runner
+    if runner is None:
+        return None
+    return runner.take(call_id, tool_name, tool_args)
+
+
+__all__ = [
+    "SPECULATIVE_TOOLS",
+    "JsonObjectTracker",
+    "SpeculativeOutcome",
+    "SpeculativeToolRunner",
+    "begin_speculative_round",
+    "load_speculative_enabled",
+    "reset_speculation",
+    "speculate_tool_call",
+    "take_speculative_result",
+]
@@ -0,0 +1,355 @@
+"""
+Per-conversation tool selection: a budgeted subset of the tool schemas.
+
+Every request used to carry every tool schema: the built-in toolsets, the
+skill and plugin tools and every MCP tool.  With a handful of MCP servers
+that is tens of thousands of tokens per round, most of them for tools the
+conversation never needs.  When the catalog exceeds ``tool-schema-budget``
+tokens (default 8000, ``0`` sends every tool), each turn sends a selection
+instead:
+
+- the **core** tools (:data:`CORE_TOOLS`: reading, editing and searching
+  files, running code, skills) and the ``tool-pins`` config value
+  (comma-separated tool names, always sent);
+- the tools the conversation already **used**;
+- the tools most **relevant** to the prompt, ranked by BM25 over the tool
+  names and descriptions (:class:`ToolIndex`), while the budget allows;
+- :data:`DISCOVER_TOOL`, a meta-tool the model calls to search the whole
+  catalog; the tools it returns join the selection from the next round on.
+
+The selection of a conversation only grows, and new tools are appended
+after the ones already sent, so the tools prefix of the request stays
+byte-identical across rounds and turns (prompt caching).  Tools the model
+calls outside the selection still run: selection only decides which
+schemas are sent.
+
+Both loops use it: the CLI ``Client.send`` pipeline and the async agent
+pipeline call :func:`select_tools` once per turn and
+:meth:`ToolSelection.observe` after every round of tool calls.  They hand
+the conversation's selection to the tool executor, whose
+``discover_tools`` calls search that conversation's catalog
+(:meth:`ToolSelection.discover`).
+"""
+
+import json
+import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+#: Token budget of the tool schemas (``tool-schema-budget``).
+DEFAULT_SCHEMA_BUDGET = 8000
+
+#: The meta-tool that searches the whole catalog.
+DISCOVER_TOOL = "discover_tools"
+
+#: Tools always sent when the selection is active.
+CORE_TOOLS = frozenset(
+    {
+        "ReadFile",
+        "ReadMultipleFiles",
+        "CreateFile",
+        "ReplaceTextInFile",
+        "ListFiles",
+        "FindFiles",
+        "SearchText",
+        "RunBashCode",
+        "RunPythonCode",
+        "AskUser",
+        "load_skill",
+        "read_skill_resource",
+        "search_skills",
+    }
+)
+
+#: Relevant tools added per turn (besides core, pinned and used tools).
+MAX_RELEVANT = 8
+
+#: Tools returned by one ``discover_tools`` call.
+MAX_DISCOVERED = 8
+
+#: Conversations whose selection is kept (least recently used first out).
+MAX_CONVERSATIONS = 16
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from get has have how i in is it me "
+    "my of on or please so that the this to use what when with you your".split()
+)
+
+
+def _terms(text: str) -> list[str]:
+    """Lowercase word terms, splitting camelCase and snake_case names."""
+    text = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", text or "")
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in _STOPWORDS]
+
+
+def schema_name(schema: dict) -> str:
+    """The tool name of an OpenAI-format (Chat Completions) schema."""
+    function = schema.get("function")
+    return (function if isinstance(function, dict) else schema).get("name", "")
+
+
+def _description(schema: dict) -> str:
+    function = schema.get("function")
+    return (function if isinstance(function, dict) else schema).get(
+        "description", ""
+    ) or ""
+
+
+class ToolIndex:
+    """BM25 index over the names and descriptions of a tool catalog.
+
+    Name terms count twice: a prompt that names a tool's subject ("the
+    issue tracker") should rank it above tools that merely mention it.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, catalog: list[dict]) -> None:
+        self._docs: list[tuple[str, Counter, int]] = []
+        document_frequency: Counter = Counter()
+        for schema in catalog:
+            name = schema_name(schema)
+            terms = _terms(name) * 2 + _terms(_description(schema))
+            counts = Counter(terms)
+            self._docs.append((name, counts, len(terms)))
+            document_frequency.update(counts.keys())
+        total = len(self._docs)
+        self._idf = {
+            term: math.log(1 + (total - n + 0.5) / (n + 0.5))
+            for term, n in document_frequency.items()
+        }
+        self._avg_length = (
+            sum(length for _, _, length in self._docs) / total if total else 0.0
+        )
+
+    def search(self, query: str, limit: int = MAX_DISCOVERED) -> list[str]:
+        """The names of the best-matching tools (score > 0), best first."""
+        terms = set(_terms(query))
+        scored = []
+        for position, (name, counts, length) in enumerate(self._docs):
+            score = 0.0
+            for term in terms & counts.keys():
+                frequency = counts[term]
+                norm = 1 - self.B + self.B * length / (self._avg_length or 1)
+                score += (
+                    self._idf[term]
+                    * frequency
+                    * (self.K1 + 1)
+                    / (frequency + self.K1 * norm)
+                )
+            if score > 0:
+                scored.append((-score, position, name))
+        return [name for _, _, name in sorted(scored)[:limit]]
+
+
+def _call_parts(call: dict) -> tuple[str, Any]:
+    """``(name, arguments)`` of a tool call in any of the loops' shapes."""
+    function = call.get("function")
+    if isinstance(function, dict):
+        return function.get("name") or "", function.get("arguments")
+    return call.get("name") or "", call.get("input", call.get("arguments"))
+
+
+def _history_calls(history: list[dict] | None) -> list[dict]:
+    """The tool calls recorded in a history (OpenAI or Anthropic shape)."""
+    calls = []
+    for message in history or []:
+        if message.get("role") != "assistant":
+            continue
+        calls.extend(message.get("tool_calls") or [])
+        content = message.get("content")
+        if isinstance(content, list):
+            calls.extend(
+                block
+                for block in content
+                if isinstance(block, dict) and block.get("type") == "tool_use"
+            )
+    return calls
+
+
+def _query_of(arguments: Any) -> str:
+    if isinstance(arguments, str):
+        try:
+            arguments = json.loads(arguments or "{}")
+        except ValueError:
+            return ""
+    return str(arguments.get("query", "")) if isinstance(arguments, dict) else ""
+
+
+class ToolSelection:
+    """The growing, ordered tool selection of one conversation."""
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self._catalog: dict[str, dict] = {}
+        self._index: ToolIndex | None = None
+        self._seeded = False
+
+    def update(
+        self,
+        catalog: list[dict],
+        prompt: str,
+        history: list[dict] | None,
+        budget: int,
+        pins: list[str],
+    ) -> None:
+        """Select the tools of a new turn (the selection only grows)."""
+        from janito.agent.tokens import estimate_tokens
+
+        names = [schema_name(s) for s in catalog]
+        if self._index is None or list(self._catalog) != names:
+            self._index = ToolIndex(catalog)
+        self._catalog = dict(zip(names, catalog, strict=True))
+        self.names = [n for n in self.names if n in self._catalog]
+
+        self._add(n for n in names if n in CORE_TOOLS)
+        self._add(pins)
+        if not self._seeded:
+            # A resumed conversation keeps the tools it already used.
+            self._seeded = True
+            self.observe(_history_calls(history))
+        used = sum(estimate_tokens(self._catalog[n]) for n in self.names)
+        for name in self._index.search(prompt, MAX_RELEVANT):
+            if name in self.names:
+                continue
+            cost = estimate_tokens(self._catalog[name])
+            if used + cost > budget:
+                break
+            self.names.append(name)
+            used += cost
+
+    def observe(self, tool_calls: list[dict]) -> bool:
+        """Add the tools a round called, or discovered; ``True`` if it grew."""
+        before = len(self.names)
+        for call in tool_calls or []:
+            name, arguments = _call_parts(call)
+            if name == DISCOVER_TOOL and self._index is not None:
+                self._add(self._index.search(_query_of(arguments), MAX_DISCOVERED))
+            else:
+                self._add([name])
+        return len(self.names) > before
+
+    def discover(self, query: str) -> str:
+        """Answer a ``discover_tools`` call of this conversation."""
+        from .reporter import report_result, report_start
+
+        report_start(f"🧰 Discovering tools for '{query}'...", end="")
+        names = self._index.search(query) if self._index else []
+        if not names:
+            message = f"No tools match '{query}'."
+            report_result(message)
+            return message
+        report_result(f"Found {len(names)} tool(s)")
+        lines = [f"Tools matching '{query}' (available from your next step):"]
+        for name in names:
+            description = _description(self._catalog[name]).split("\n")[0]
+            lines.append(f"- **{name}**: {description}")
+        return "\n".join(lines)
+
+    def schemas(self) -> list[dict]:
+        """The selected schemas, in selection order, plus ``discover_tools``."""
+        from .schema import get_function_schema
+
+        selected = [self._catalog[n] for n in self.names]
+        return selected + [get_function_schema(discover_tools)]
+
+    def _add(self, names) -> None:
+        for name in names:
+            if name in self._catalog and name not in self.names:
+                self.names.append(name)
+
+
+_selections: "OrderedDict[int | None, tuple[Any, ToolSelection]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def configured_budget() -> int:
+    """The ``tool-schema-budget`` config value (``0``: send every tool)."""
+    from janito.config_store import get_config_value
+
+    value = get_config_value("tool-schema-budget")
+    try:
+        return DEFAULT_SCHEMA_BUDGET if value is None else max(int(value), 0)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid tool-schema-budget value: {value!r}")
+        return DEFAULT_SCHEMA_BUDGET
+
+
+def configured_pins() -> list[str]:
+    """The ``tool-pins`` config value: tool names that are always sent."""
+    from janito.config_store import get_config_value
+
+    value = get_config_value("tool-pins")
+    if isinstance(value, list):
+        return [str(name).strip() for name in value if str(name).strip()]
+    return [name.strip() for name in str(value or "").split(",") if name.strip()]
+
+
+def select_tools(
+    catalog: list[dict], prompt: str, history: list[dict] | None = None
+) -> ToolSelection | None:
+    """Select the tools of a turn, or ``None`` to send the whole catalog.
+
+    Args:
+        catalog: Every available tool schema (OpenAI format).
+        prompt: The turn's prompt (ranks the relevant tools).
+        history: The conversation's history list, which identifies the
+            conversation (``None``: one shared selection, e.g. for the
+            server-side Responses chain).
+
+    Returns:
+        The conversation's :class:`ToolSelection`, updated for this turn,
+        or ``None`` when the catalog fits ``tool-schema-budget``.
+    """
+    from janito.agent.tokens import estimate_tokens
+
+    budget = configured_budget()
+    if not budget or estimate_tokens(catalog) <= budget:
+        return None
+    key = None if history is None else id(history)
+    with _lock:
+        entry = _selections.get(key)
+        if entry is None or entry[0] is not history:
+            entry = (history, ToolSelection())
+        _selections[key] = entry
+        _selections.move_to_end(key)
+        while len(_selections) > MAX_CONVERSATIONS:
+            _selections.popitem(last=False)
+        selection = entry[1]
+        selection.update(catalog, prompt, history, budget, configured_pins())
+    logger.debug(f"Selected {len(selection.names)} of {len(catalog)} tools")
+    return selection
+
+
+# The meta-tool's schema; the executors route its calls to
+# run_discover_tools with the selection of the calling conversation.
+def discover_tools(query: str) -> str:
+    """
+    Search every available tool by keyword, including tools not offered yet.
+
+    The tools found become available from your next step on.
+
+    Args:
+        query: Keywords describing the capability you need (e.g., 'create github issue')
+
+    Returns:
+        The matching tools with their descriptions, best matches first
+    """
+    return run_discover_tools(None, query)
+
+
+def run_discover_tools(selection: ToolSelection | None, query: str) -> str:
+    """Run a ``discover_tools`` call over a conversation's catalog.
+
+    Args:
+        selection: The selection of the conversation the call belongs to
+            (``None``: no selection is active, nothing to search).
+        query: The call's ``query`` argument.
+    """
+    return (selection or ToolSelection()).discover(query)
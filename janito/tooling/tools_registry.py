@@ -21,10 +21,11 @@ declare ``global`` only where they rebind a name (``_tools_initialized``,
 ``_skills_enabled``, ``_tools_loading_enabled``).
 """
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from typing import Any
 
-from ..tools import discover_toolsets
+from ..tools import _check_tool_privileges, _skipped_tools, discover_toolsets
 from .schema import get_function_schema
 from .skills_provider import get_skills_advertisement, get_skills_tools
 
@@ -266,9 +267,37 @@ You should load a skill when the user's request matches its description or you n
         global _skills_enabled
         self.ensure_initialized()
         _skills_enabled = False
-        for tool_name in ["load_skill", "read_skill_resource"]:
+        for tool_name in ["load_skill", "read_skill_resource", "search_skills"]:
             AVAILABLE_TOOLS.pop(tool_name, None)
 
+    @contextmanager
+    def privilege_scope(self) -> Iterator[None]:
+        """Restrict the tools to the current ``running_privileges`` for a block.
+
+        Discovery applies the privileges once, so a long-lived process that
+        serves invocations with different ``-r`` / ``-w`` / ``-x`` flags
+        (the resident daemon, :mod:`janito.cli.daemon`) discovers every tool
+        without restrictions and filters that set per invocation.  On exit
+        the registry (toolsets added in the block included) and the skipped
+        tools are restored.
+        """
+        self.ensure_initialized()
+        saved_tools = dict(AVAILABLE_TOOLS)
+        saved_toolsets = set(_loaded_toolsets)
+        saved_skipped = dict(_skipped_tools)
+        for name, tool in saved_tools.items():
+            if not _check_tool_privileges(tool):
+                del AVAILABLE_TOOLS[name]
+        try:
+            yield
+        finally:
+            AVAILABLE_TOOLS.clear()
+            AVAILABLE_TOOLS.update(saved_tools)
+            _loaded_toolsets.clear()
+            _loaded_toolsets.update(saved_toolsets)
+            _skipped_tools.clear()
+            _skipped_tools.update(saved_skipped)
+
     def disable_tools_loading(self) -> None:
         """Disable loading of non-skill tools (``--no-tools``).
 
@@ -428,6 +457,11 @@ def register_plugin_tools(tools: dict[str, Callable]) -> None:
     _registry.register_plugin_tools(tools)
 
 
+def privilege_scope():
+    """Restrict the tools to the current ``running_privileges`` for a block."""
+    return _registry.privilege_scope()
+
+
 def tools_loading_enabled() -> bool:
     """Whether non-skill tools are loaded (False after ``--no-tools``)."""
     return _registry.tools_loading_enabled()
@@ -3,8 +3,8 @@
 The call-parameter building and stream accumulation now live in
 :mod:`janito.agent.completions` (the shared per-API adapter layer used by
 both the CLI ``Client.send`` and the web ``stream_prompt`` loops).  This
-module re-exports them under their historical web names so the orchestration
-loop (``loop.py``) and existing tests keep their import paths.
+module re-exports them under their historical web names so existing callers
+and tests keep their import paths.
 """
 
 from janito.agent.completions import (  # noqa: F401
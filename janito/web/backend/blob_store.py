@@ -0,0 +1,292 @@
+"""Content-addressed store for large tool payloads of web sessions.
+
+A web session keeps its whole conversation in memory for as long as it
+lives (an hour idle by default), and :mod:`.session_store` rewrites the
+whole file on every save.  File contents, command logs and fetched pages
+make up most of that history, so both costs grow with every large tool
+result, and the same file read in several sessions is stored once per
+session.
+
+Tool results of at least ``blob-threshold`` characters (default
+:data:`DEFAULT_BLOB_THRESHOLD`, ``0`` keeps everything inline) are moved
+out of line, to ``./.janito/blobs/<sha256>.gz`` (gzip-compressed, named
+after the SHA-256 of the text, so identical payloads are stored once), and
+the message keeps a reference instead of the text::
+
+    {"role": "tool", "tool_call_id": "...", "name": "ReadFile",
+     "content": {"blob": "<sha256>", "size": 48213}}
+
+- :func:`stored_message` gives the form a message is saved in (writing its
+  blob if needed), so a save never serializes a large payload.
+- :func:`release` replaces the payloads of a history by references in
+  place, after a turn, when the session is persisted.
+- :func:`hydrate` puts the payloads back in place for the duration of a
+  turn (the agent loop builds its requests, compaction estimates and stubs
+  from the real text); :func:`in_use` keeps :func:`release` off a history
+  while a turn runs on it.  The rehydrated text equals the released one, so
+  the request path's per-conversation caches
+  (:mod:`janito.agent.history_cache`, :mod:`janito.agent.superseded`) keep
+  their converted prefix across turns; they hold the payloads of the few
+  most recent conversations only.
+- :func:`hydrated_copy` renders a history with its payloads for the
+  browser, leaving the references in memory.
+
+Blob files are immutable and written atomically; recently read payloads
+are kept in a small shared cache (:data:`CACHE_BYTES`).  Blobs no saved
+session references any more are removed by :func:`prune` at server start.
+Like the other persistence modules this one never raises: a blob that
+cannot be written stays inline, and a missing blob is rehydrated as a
+short notice.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Directory (relative to the current working directory) of the blobs, next
+# to ``./.janito/sessions``.
+BLOBS_DIR = Path(".janito") / "blobs"
+
+#: Tool results of at least this many characters are stored out of line.
+DEFAULT_BLOB_THRESHOLD = 8192
+
+#: Total size (characters) of the rehydrated payloads kept in memory.
+CACHE_BYTES = 8 * 1024 * 1024
+
+#: Unreferenced blobs younger than this (seconds) survive :func:`prune`
+#: (another server in the same directory may have just written them).
+PRUNE_GRACE_SECONDS = 3600
+
+_lock = threading.Lock()
+_cache: OrderedDict[str, str] = OrderedDict()
+_cache_size = 0
+_in_use: Counter = Counter()
+
+
+def get_blobs_dir() -> Path:
+    """Return the absolute path to the blobs directory (``<cwd>/.janito/blobs``)."""
+    return Path.cwd() / BLOBS_DIR
+
+
+def blob_path(digest: str) -> Path:
+    """Return the file path of a blob."""
+    return get_blobs_dir() / f"{digest}.gz"
+
+
+def load_blob_threshold() -> int:
+    """The ``blob-threshold`` config value (characters; ``0`` disables)."""
+    from janito.config_store import get_config_value
+
+    value = get_config_value("blob-threshold")
+    if value is None:
+        return DEFAULT_BLOB_THRESHOLD
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid blob-threshold value: {value!r}")
+        return DEFAULT_BLOB_THRESHOLD
+
+
+def is_ref(message: dict) -> bool:
+    """Whether a message holds a blob reference instead of its content."""
+    content = message.get("content")
+    return isinstance(content, dict) and "blob" in content
+
+
+def _remember(digest: str, text: str) -> None:
+    global _cache_size
+    with _lock:
+        if digest in _cache:
+            _cache.move_to_end(digest)
+            return
+        _cache[digest] = text
+        _cache_size += len(text)
+        while _cache_size > CACHE_BYTES and len(_cache) > 1:
+            _, evicted = _cache.popitem(last=False)
+            _cache_size -= len(evicted)
+
+
+def put_blob(text: str) -> str | None:
+    """Store ``text`` (once per content) and return its digest, or ``None``."""
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest)
+    try:
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+            tmp.write_bytes(gzip.compress(data, compresslevel=6))
+            os.replace(tmp, path)
+    except OSError as e:
+        logger.debug(f"Failed to write blob {digest}: {e}")
+        return None
+    _remember(digest, text)
+    return digest
+
+
+def get_blob(digest: str) -> str | None:
+    """The text of a blob, or ``None`` when it cannot be read."""
+    with _lock:
+        text = _cache.get(digest)
+        if text is not None:
+            _cache.move_to_end(digest)
+            return text
+    try:
+        text = gzip.decompress(blob_path(digest).read_bytes()).decode("utf-8")
+    except (OSError, EOFError, UnicodeDecodeError) as e:
+        logger.debug(f"Failed to read blob {digest}: {e}")
+        return None
+    _remember(digest, text)
+    return text
+
+
+def _ref_of(message: dict, threshold: int) -> dict | None:
+    """The reference replacing a message's content, if it is stored out of line."""
+    content = message.get("content")
+    if (
+        not threshold
+        or message.get("role") != "tool"
+        or not isinstance(content, str)
+        or len(content) < threshold
+    ):
+        return None
+    digest = put_blob(content)
+    return None if digest is None else {"blob": digest, "size": len(content)}
+
+
+def _text_of_ref(ref: dict) -> str:
+    text = get_blob(str(ref.get("blob")))
+    if text is None:
+        return f"[tool output unavailable: blob {ref.get('blob')} is missing]"
+    return text
+
+
+def stored_message(message: dict, threshold: int | None = None) -> dict:
+    """The form ``message`` is saved in: its large content as a reference."""
+    ref = _ref_of(message, load_blob_threshold() if threshold is None else threshold)
+    return message if ref is None else {**message, "content": ref}
+
+
+def release(messages: list[dict]) -> int:
+    """Replace the large tool payloads of a history by references, in place.
+
+    Skipped while a turn runs on ``messages`` (see :func:`in_use`).
+
+    Returns:
+        The number of payloads released.
+    """
+    with _lock:
+        if _in_use[id(messages)]:
+            return 0
+    threshold = load_blob_threshold()
+    released = 0
+    for message in messages:
+        ref = _ref_of(message, threshold)
+        if ref is not None:
+            message["content"] = ref
+            released += 1
+    return released
+
+
+def hydrate(messages: list[dict]) -> int:
+    """Put the payloads of a history's references back in place.
+
+    Returns:
+        The number of payloads rehydrated.
+    """
+    hydrated = 0
+    for message in messages:
+        if is_ref(message):
+            message["content"] = _text_of_ref(message["content"])
+            hydrated += 1
+    return hydrated
+
+
+def hydrated_copy(messages: list[dict]) -> list[dict]:
+    """A copy of a history with its payloads (for rendering); refs stay put."""
+    return [
+        {**m, "content": _text_of_ref(m["content"])} if is_ref(m) else m
+        for m in messages
+    ]
+
+
+@contextlib.contextmanager
+def in_use(messages: list[dict]) -> Iterator[None]:
+    """Keep :func:`release` off ``messages`` while a turn runs on it."""
+    key = id(messages)
+    with _lock:
+        _in_use[key] += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _in_use[key] -= 1
+            if not _in_use[key]:
+                del _in_use[key]
+
+
+def referenced(messages: list[dict]) -> set[str]:
+    """The digests a history references."""
+    return {str(m["content"]["blob"]) for m in messages if is_ref(m)}
+
+
+def prune(keep: set[str], grace_seconds: float = PRUNE_GRACE_SECONDS) -> int:
+    """Remove the blobs not in ``keep`` (older than ``grace_seconds``).
+
+    Returns:
+        The number of blob files removed. Never raises.
+    """
+    removed = 0
+    try:
+        directory = get_blobs_dir()
+        if not directory.is_dir():
+            return 0
+        cutoff = time.time() - grace_seconds
+        for path in directory.glob("*.gz"):
+            digest = path.name[: -len(".gz")]
+            if digest in keep or path.stat().st_mtime > cutoff:
+                continue
+            path.unlink()
+            removed += 1
+    except OSError as e:
+        logger.debug(f"Failed to prune blobs: {e}")
+    return removed
+
+
+def clear_cache() -> None:
+    """Drop the in-memory cache of rehydrated payloads."""
+    global _cache_size
+    with _lock:
+        _cache.clear()
+        _cache_size = 0
+
+
+__all__ = [
+    "BLOBS_DIR",
+    "DEFAULT_BLOB_THRESHOLD",
+    "blob_path",
+    "clear_cache",
+    "get_blob",
+    "get_blobs_dir",
+    "hydrate",
+    "hydrated_copy",
+    "in_use",
+    "is_ref",
+    "load_blob_threshold",
+    "prune",
+    "put_blob",
+    "referenced",
+    "release",
+    "stored_message",
+]
@@ -3,6 +3,8 @@
 import os
 from dataclasses import dataclass
 
+from janito.agent.pipeline import PipelineConfig
+
 
 def _resolve_model_from_config(provider: str | None) -> str | None:
     """Resolve the model from the config file for the given/active provider.
@@ -20,11 +22,15 @@ def _resolve_model_from_config(provider: str | None) -> str | None:
 
 
 @dataclass
-class WebServerConfig:
+class WebServerConfig(PipelineConfig):
     """Runtime configuration for the web server, built from CLI args.
 
     Mirrors the logic in ``cli/chat.py::run_interactive_chat()`` for choosing
-    system prompts and enabling toolsets.
+    system prompts and enabling toolsets.  The prompt settings the agent
+    pipeline reads (provider, model, API type, thinking, ``no_tools`` and the
+    session-only ``session_provider`` / ``thinking_override`` overrides set
+    from the chat page) are inherited from
+    :class:`~janito.agent.pipeline.PipelineConfig`.
     """
 
     # --- Server binding ---
@@ -32,94 +38,12 @@ class WebServerConfig:
     web_port: int = 8080
     no_web_open: bool = False
 
-    # --- AI / provider (resolved from auth store + config file) ---
-    provider: str | None = None  # args.provider
-    model: str | None = None  # args.model (or from provider config)
-    # args.api_type -- overrides the provider's configured api-type for the
-    # whole server run (like the CLI chat modes).  ``None`` = follow the
-    # provider's configured api-type (the web Settings drawer's per-provider
-    # combo, written to config.json) or its built-in default.
-    api_type: str | None = None
-
-    # Session-only provider override set from the chat-page topbar combo.
-    # Unlike ``provider`` (which mirrors the persisted default), this is
-    # never written to ``~/.janito/config.json``: it only affects this
-    # running server and is lost on restart.  ``None`` means "no override"
-    # (fall back to the persisted/default provider).
-    session_provider: str | None = None
-
     # --- Session defaults (from CLI flags) ---
-    thinking: bool = False  # -t / --thinking
-    verbose: bool = False  # -v / --verbose
     no_history: bool = False  # --no-history
 
-    # Runtime thinking override set from the status-bar toggle (POST
-    # /api/config/thinking). In-memory only — never written to
-    # ~/.janito/config.json and lost on restart (like session_provider).
-    # ``None`` = no override (follow the CLI flag, else the provider default).
-    thinking_override: bool | None = None
-
-    @property
-    def effective_provider(self) -> str | None:
-        """The provider in effect for the next prompt.
-
-        Resolution order mirrors :attr:`effective_thinking`: the session-only
-        combo override, then the CLI ``--provider``, then the persisted
-        default provider.
-        """
-        from janito.general_config import get_active_provider
-
-        return self.session_provider or self.provider or get_active_provider()
-
-    @property
-    def effective_thinking(self):
-        """The thinking mode in effect for the next prompt.
-
-        Resolution order: the runtime ``thinking_override`` (status-bar
-        toggle) first, then the explicit ``--thinking`` CLI flag, then the
-        effective provider's built-in ``thinking`` resolved for the
-        **effective model** (``self.model``: the CLI ``--model``, else the
-        provider's configured model, else its built-in default model).  The
-        value may be a plain ``True`` flag (DeepSeek / Alibaba-Qwen, which
-        reason by default) or a pass-through dict for providers with a
-        structured thinking parameter (MiniMax-M3: ``{'type':
-        'adaptive'}``); falsy means thinking is off.  The effective provider
-        is the session-only combo override, else the CLI ``--provider``,
-        else the persisted default.
-        """
-        if self.thinking_override is not None:
-            return self.thinking_override
-        if self.thinking:
-            return True
-        from janito.provider_accessors import get_default_thinking_from_provider
-
-        return get_default_thinking_from_provider(self.effective_provider, self.model)
-
-    def effective_tools_for(self, api_type: str):
-        """The effective model's built-in (native) tools for an API type.
-
-        Resolution order mirrors :attr:`effective_thinking`: the effective
-        provider (session-only combo override, else the CLI ``--provider``,
-        else the persisted default) resolved for the **effective model**
-        (``self.model``: the CLI ``--model``, else the provider's configured
-        model, else its built-in default model).  Returns the model's
-        built-in ``tools`` entry for ``api_type`` from the provider config
-        (e.g. alibaba's ``qwen3.8-max`` enables ``code_interpreter`` /
-        ``web_search`` / ``web_extractor`` on the Responses API only), or
-        ``None`` when the model declares no built-in tools for that API
-        type.  These are not function tools: each ``type`` is enabled
-        through request-body flags on the API call.
-        """
-        from janito.provider_accessors import get_default_tools_from_provider
-
-        return get_default_tools_from_provider(
-            self.effective_provider, self.model, api_type=api_type
-        )
-
     # --- System prompt ---
     system_prompt: str | None = None  # -S "custom prompt"
     no_system_prompt: bool = False  # -Z
-    no_tools: bool = False  # implied by -Z
     no_plugins: bool = False  # --no-plugins (do not autoload ~/.janito/plugins)
 
     # --- Security ---
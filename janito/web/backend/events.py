@@ -8,6 +8,7 @@ tests keep their import paths.
 
 from janito.agent.events import (  # noqa: F401
     AgentEvent,
+    CompactionEvent,
     DoneEvent,
     ErrorEvent,
     ImageEvent,
@@ -24,6 +25,7 @@ from janito.agent.events import (  # noqa: F401
 
 __all__ = [
     "AgentEvent",
+    "CompactionEvent",
     "DoneEvent",
     "ErrorEvent",
     "ImageEvent",
@@ -12,9 +12,10 @@ import logging
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+from janito.agent.context import Compaction, shift_checkpoints
 from janito.tooling.prompting import set_prompt_handler
 
-from ..events import event_to_dict
+from ..events import CompactionEvent, event_to_dict
 from ..prompts import PromptRegistry, WebPromptHandler
 from ..session import ConversationSession, SessionManager
 
@@ -115,9 +116,14 @@ async def _stream_to_websocket(
     messages: list[dict],
     config,
     prompt_registry: PromptRegistry | None = None,
+    checkpoints: list[int] | None = None,
 ):
     """Run ``stream_prompt`` and forward every event to the client.
 
+    When ``stream_prompt`` compacts ``messages`` it yields a
+    :class:`CompactionEvent`; the session's rewind ``checkpoints`` (when
+    given) are remapped to the shortened history before it is forwarded.
+
     When a ``prompt_registry`` is provided (web mode), an in-browser prompt
     handler is installed for the duration of the turn: interactive tools
     (the AskUser tool) present their question as a non-blocking inline card
@@ -144,6 +150,17 @@ async def _stream_to_websocket(
         config=config,
         use_mcp=True,
     ):
+        if checkpoints is not None and isinstance(event, CompactionEvent):
+            shift_checkpoints(
+                checkpoints,
+                Compaction(
+                    start=event.start,
+                    end=event.end,
+                    inserted=event.inserted,
+                    tokens_before=event.tokens_before,
+                    tokens_after=event.tokens_after,
+                ),
+            )
         await websocket.send_json(event_to_dict(event))
 
 
@@ -169,7 +186,12 @@ async def _run_turn(
 
     stream_task = asyncio.ensure_future(
         _stream_to_websocket(
-            websocket, content, session.messages, config, prompt_registry
+            websocket,
+            content,
+            session.messages,
+            config,
+            prompt_registry,
+            checkpoints=session.history_checkpoints,
         )
     )
     cancel_task = asyncio.ensure_future(
@@ -221,9 +243,10 @@ async def _run_prompt_turn(
     """Run one prompt turn with the shared error handling.
 
     Persists the finished turn on success (normal completion or client
-    cancel \u2014 the latter already rolled back to the checkpoint); on an
-    unexpected error it rolls the history back to the checkpoint and reports
-    the failure to the client, mirroring the shell's behaviour.  Any prompts
+    cancel \u2014 the latter already rolled back to the checkpoint) and when
+    the client disconnects mid-turn; on an unexpected error it rolls the
+    history back to the checkpoint and reports the failure to the client,
+    mirroring the shell's behaviour.  Any prompts
     queued while this turn was running stay in ``pending_prompts`` for the
     caller to drain.
     """
@@ -233,6 +256,9 @@ async def _run_prompt_turn(
         )
         sessions.persist(session)
     except WebSocketDisconnect:
+        # Nobody reads the rest of the turn, but the session stays: save it
+        # and release its large tool results like any other finished turn.
+        sessions.persist(session)
         raise
     except Exception as e:
         logger.exception("Error during stream_prompt")
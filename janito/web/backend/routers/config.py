@@ -270,7 +270,10 @@ async def set_session_provider(request: Request):
     """
     from janito.auth_config import get_api_key
     from janito.config_loaders import load_model_from_config
-    from janito.provider_accessors import get_default_model_from_provider
+    from janito.provider_accessors import (
+        get_default_model_from_provider,
+        requires_api_key,
+    )
     from janito.provider_validation import validate_provider_name
 
     try:
@@ -288,7 +291,7 @@ async def set_session_provider(request: Request):
     except ValueError as e:
         return JSONResponse({"detail": str(e)}, status_code=400)
 
-    if not get_api_key(provider):
+    if not get_api_key(provider) and requires_api_key(provider):
         return JSONResponse(
             {
                 "detail": (
@@ -359,6 +362,7 @@ async def set_default_provider(request: Request):
     from janito.auth_config import get_api_key
     from janito.config_loaders import load_model_from_config
     from janito.config_store import set_config_value
+    from janito.provider_accessors import requires_api_key
     from janito.provider_validation import validate_provider_name
 
     try:
@@ -376,7 +380,7 @@ async def set_default_provider(request: Request):
     except ValueError as e:
         return JSONResponse({"detail": str(e)}, status_code=400)
 
-    if not get_api_key(provider):
+    if not get_api_key(provider) and requires_api_key(provider):
         return JSONResponse(
             {
                 "detail": (
@@ -24,6 +24,7 @@ async def list_services(request: Request):
 
     manager = _get_manager()
     connected = set(manager.connected_services)
+    status = manager.service_status()
 
     services = []
     for name, cfg in _list_services().items():
@@ -34,6 +35,7 @@ async def list_services(request: Request):
                 "connected": name in connected,
                 "transport": transport_type,
                 "config": {k: v for k, v in cfg.items() if k.lower() not in ("env",)},
+                "health": status.get(name),
             }
         )
 
@@ -71,3 +73,10 @@ async def list_mcp_tools(request: Request):
         logger.warning(f"Failed to list MCP tools: {e}")
         tools = []
     return {"tools": tools, "count": len(tools)}
+
+
+@router.get("/status")
+async def mcp_status(request: Request):
+    """Supervisor view: per-service state, restart counts and call latency."""
+    manager = _get_manager()
+    return {"services": manager.service_status()}
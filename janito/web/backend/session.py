@@ -6,6 +6,7 @@ import time
 import uuid
 from dataclasses import dataclass, field
 
+from . import blob_store
 from .config import WebServerConfig
 from .session_store import delete_session_file, load_sessions, save_session
 
@@ -67,7 +68,8 @@ class ConversationSession:
     def to_dict(self) -> dict:
         return {
             **self.to_summary(),
-            "messages": self.messages,
+            # Large tool results are kept as blob references in memory.
+            "messages": blob_store.hydrated_copy(self.messages),
             "system_prompt": self.system_prompt,
             "provider": self.provider,
             "model": self.model,
@@ -80,8 +82,9 @@ class SessionManager:
     Each session's conversation history is mirrored to
     ``./.janito/sessions/<session_id>.jsonl`` (see
     :mod:`janito.web.backend.session_store`) so conversations survive a
-    server restart. Persistence is skipped entirely when
-    ``config.no_history`` is set (``--no-history``).
+    server restart, with its large tool results in ``./.janito/blobs`` (see
+    :mod:`janito.web.backend.blob_store`). Persistence is skipped entirely
+    when ``config.no_history`` is set (``--no-history``).
     """
 
     def __init__(self, config: WebServerConfig, ttl_seconds: int = 3600):
@@ -98,6 +101,9 @@ class SessionManager:
         """Write the session to disk unless ``--no-history`` was passed."""
         if self.config.no_history:
             return
+        # Large tool results leave memory once the turn is over; the agent
+        # loop rehydrates them for the next one.
+        blob_store.release(session.messages)
         save_session(session)
 
     def load_from_disk(self) -> int:
@@ -128,6 +134,11 @@ class SessionManager:
             loaded += 1
         if loaded:
             logger.info(f"Restored {loaded} session(s) from disk")
+        # Blobs of deleted sessions (or replaced history) are removed.
+        keep: set[str] = set()
+        for session in self.list_sessions():
+            keep |= blob_store.referenced(session.messages)
+        blob_store.prune(keep)
         return loaded
 
     def create(self) -> ConversationSession:
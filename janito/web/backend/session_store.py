@@ -10,7 +10,8 @@ File format (one JSON object per line):
     line 1:   session metadata
               ``{"session_id", "title", "created_at", "last_active", "system_prompt"}``
     line 2+:  the OpenAI-format conversation messages (``{"role": ...}``),
-              one per line, in order.
+              one per line, in order; large tool results are references
+              to ``./.janito/blobs`` (see :mod:`.blob_store`).
 
 The whole file is rewritten whenever the in-memory conversation changes, so
 the on-disk state always matches the session exactly — including rollbacks
@@ -30,6 +31,8 @@ import threading
 from pathlib import Path
 from typing import Any
 
+from .blob_store import load_blob_threshold, stored_message
+
 logger = logging.getLogger(__name__)
 
 # Directory (relative to the current working directory) where the session
@@ -94,8 +97,11 @@ def save_session(session) -> None:
                 meta_file.write("\n")
             with path.open("w", encoding="utf-8") as f:
                 f.write(json.dumps(_session_meta(session), ensure_ascii=False) + "\n")
+                # Large tool payloads are saved as blob references.
+                threshold = load_blob_threshold()
                 for msg in session.messages:
-                    f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+                    stored = stored_message(msg, threshold)
+                    f.write(json.dumps(stored, ensure_ascii=False) + "\n")
     except Exception as e:  # noqa: BLE001 - persistence must never break the server
         logger.debug(f"Failed to save session {session.session_id}: {e}")
 
@@ -109,6 +109,8 @@ const CHAT_EVENT_HANDLERS = {
             input: c.event.input,
             output: c.event.output,
             cached: c.event.cached,
+            cache_write: c.event.cache_write || 0,
+            queue_ms: c.event.queue_ms || 0,
             max_tokens: c.event.max_tokens || null,
         };
         if (c.isActive) {
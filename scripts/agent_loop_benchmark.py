@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""Benchmark janito's own cost per agent-loop round, end to end.
+
+``scripts/provider_token_benchmark.py`` measures what a prompt costs in
+tokens; this script measures what it costs in janito: the CPU time and
+memory the framework spends around every model round -- config resolution,
+tool-schema building, history compaction and request building, tool
+dispatch, usage/used-files/changes tracking writes, rendering and the
+per-prompt trace spans, plus the SDK client created for every prompt.
+
+Both agent loops are driven for real against the offline ``mock`` provider
+(:mod:`janito.providers.mock`), served in-process with a scripted scenario
+and no latency, so the measured time is janito's (and the SDK's) alone:
+
+* ``cli`` -- ``Client.send`` through ``completions_api.send_prompt``;
+* ``web`` -- ``stream_prompt`` of the web backend (``janito/web``), which
+  rehydrates the session's out-of-line tool results for the turn and
+  releases them afterwards, as a persisted session does.
+
+Every turn starts from the same seeded history and runs the scripted tool
+rounds of :data:`WORKLOAD` (listing, reading, searching, writing and editing
+files in a scratch workspace) before the final answer.
+
+**Phases.**  The functions that implement each phase are wrapped with timers
+for the duration of a run.  Phases are timed *exclusively*: the time of a
+nested phase (the stream worker under the progress-bar ``wait``, the tracking
+writes inside ``tools``) counts for the nested phase only, and ``other`` is
+the rest of the turn.  Speculative tool calls are disabled so every timed
+call runs on the loop's own path.  Memory is measured in a separate pass
+under ``tracemalloc`` (which slows Python down): the peak allocated during a
+turn and what the turn left allocated.
+
+**Regression check.**  Results can be saved as a baseline and compared
+against one; a metric regresses when it exceeds the baseline by more than
+``--tolerance`` (relative) plus ``--slack-ms`` / ``--slack-kib`` (absolute,
+so sub-millisecond phases do not flap).  A regression makes the script exit
+with status 1::
+
+    python scripts/agent_loop_benchmark.py
+    python scripts/agent_loop_benchmark.py --turns 20 --history 200 --json out.json
+    python scripts/agent_loop_benchmark.py --save-baseline scripts/agent_loop_baseline.json
+    python scripts/agent_loop_benchmark.py --check scripts/agent_loop_baseline.json
+
+Timings depend on the machine: refresh the stored baseline on the machine
+that runs the check.  No network access or API key is needed; only the
+Python standard library and janito itself are used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from inspect import isasyncgenfunction, iscoroutinefunction, isgeneratorfunction
+from pathlib import Path
+
+# Allow running from a source checkout without installing janito.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from janito import config_dir  # noqa: E402
+from janito.agent import tracing  # noqa: E402
+from janito.agent.pipeline import budget, loop  # noqa: E402
+from janito.config_store import set_config_value  # noqa: E402
+from janito.openai_client import base_client, completions_api  # noqa: E402
+from janito.providers.mock.scenario import MockScenario  # noqa: E402
+from janito.providers.mock.server import ensure_mock_server  # noqa: E402
+from janito.tooling import executor  # noqa: E402
+from janito.web.backend import blob_store  # noqa: E402
+from janito.web.backend.agent import stream_prompt as web_stream_prompt  # noqa: E402
+from janito.web.backend.config import WebServerConfig  # noqa: E402
+from janito.web.backend.events import ErrorEvent  # noqa: E402
+
+DEFAULT_TURNS = 5
+DEFAULT_HISTORY = 40
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_SLACK_MS = 2.0
+DEFAULT_SLACK_KIB = 256.0
+BASELINE_PATH = Path(__file__).with_name("agent_loop_baseline.json")
+MODES = ("cli", "web")
+
+PROMPT = "Review the modules and record what you find in notes.md."
+
+# The scripted tool rounds of every turn (MockScenario.tool_calls).
+WORKLOAD = [
+    [{"name": "ListFiles", "arguments": {"directory": "."}}],
+    [
+        {"name": "ReadFile", "arguments": {"filepath": "module_0.py"}},
+        {"name": "ReadFile", "arguments": {"filepath": "module_1.py"}},
+        {"name": "SearchText", "arguments": {"paths": ".", "query": "def "}},
+    ],
+    [
+        {
+            "name": "CreateFile",
+            "arguments": {
+                "filepath": "notes.md",
+                "content": "# Notes\n\nTODO: summary\n",
+                "overwrite": True,
+            },
+        }
+    ],
+    [
+        {
+            "name": "ReplaceTextInFile",
+            "arguments": {
+                "filepath": "notes.md",
+                "old_str": "TODO: summary",
+                "new_str": "Every module defines three functions.",
+            },
+        }
+    ],
+]
+
+# ---------------------------------------------------------------------------
+# Phase timers
+# ---------------------------------------------------------------------------
+
+# The per-prompt spans (opening, closing and finishing the trace), shared by
+# both loops.
+TRACING = [
+    (tracing.Trace, "open"),
+    (tracing.Span, "end"),
+    (tracing, "_finish"),
+]
+
+# Phase -> (owner, attribute) pairs wrapped while a mode runs.  Module-level
+# names are patched where the loop looks them up (the client modules resolve
+# their helpers through their own globals).
+PHASES = {
+    "cli": {
+        "config": [
+            (completions_api, "resolve_runtime_config"),
+            (completions_api, "_resolve_model_settings"),
+        ],
+        "client": [(completions_api.CompletionsClient, "_create_sdk_client")],
+        "schemas": [(completions_api, "_resolve_tools")],
+        "history": [
+            (base_client.Client, "_compact_context"),
+            (base_client.Client, "_preflight"),
+            (base_client, "superseded_history"),
+        ],
+        "request": [(completions_api.CompletionsClient, "_build_call_kwargs")],
+        "wait": [(completions_api, "_run_with_progress_bar")],
+        "stream": [(completions_api, "_stream_response")],
+        "tools": [(executor.ToolExecutor, "handle_tool_calls")],
+        "tracking": [
+            (base_client, "clear_changes"),
+            (base_client, "reset_used_files"),
+            (base_client, "flush_calibration"),
+            (executor, "record_tool_use"),
+            (executor, "record_used_file"),
+            (executor, "record_change"),
+        ],
+        "render": [
+            (base_client, "_display_content"),
+            (base_client, "_display_reasoning"),
+            (completions_api, "_finalize_response"),
+        ],
+        "tracing": TRACING,
+    },
+    "web": {
+        "config": [
+            (loop, "_resolve_route"),
+            (loop, "_resolve_turn_config"),
+        ],
+        "client": [(loop, "_create_agent_client")],
+        "schemas": [(loop, "resolve_tools")],
+        "history": [
+            (budget.ContextBudget, "prepare"),
+            (budget.ContextBudget, "observe"),
+            (loop, "superseded_history"),
+        ],
+        "request": [(loop, "_turn_call_kwargs")],
+        "stream": [(loop, "_stream_turn")],
+        "tools": [(loop, "run_tool_turn")],
+        "tracking": [
+            (loop, "reset_used_files"),
+            (loop, "flush_calibration"),
+            (executor, "record_tool_use"),
+            (executor, "record_used_file"),
+            (executor, "record_change"),
+        ],
+        "blobs": [
+            (blob_store, "hydrate"),
+            (blob_store, "release"),
+        ],
+        "tracing": TRACING,
+    },
+}
+
+
+class PhaseTimer:
+    """Exclusive wall-clock time per phase, accumulated across calls.
+
+    One process-wide stack of open phases is kept (not one per thread): the
+    loops run their phases one after another, and the stream worker thread
+    of the CLI must nest under the progress-bar ``wait`` of the main thread.
+    """
+
+    def __init__(self) -> None:
+        self.totals: dict[str, float] = defaultdict(float)
+        self._stack: list[float] = []
+        self._lock = threading.Lock()
+
+    def _enter(self) -> float:
+        with self._lock:
+            self._stack.append(0.0)
+        return time.perf_counter()
+
+    def _exit(self, phase: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            nested = self._stack.pop()
+            self.totals[phase] += elapsed - nested
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def take(self) -> dict[str, float]:
+        """Return the totals (seconds) and start over."""
+        totals, self.totals = dict(self.totals), defaultdict(float)
+        return totals
+
+    def wrap(self, phase: str, func):
+        """Wrap a function, coroutine function or (async) generator function."""
+        if isasyncgenfunction(func):
+            return self._wrap_async_generator(phase, func)
+        if iscoroutinefunction(func):
+            return self._wrap_coroutine(phase, func)
+        if isgeneratorfunction(func):
+            return self._wrap_generator(phase, func)
+
+        def timed(*args, **kwargs):
+            start = self._enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(phase, start)
+
+        return timed
+
+    def _wrap_coroutine(self, phase, func):
+        async def timed(*args, **kwargs):
+            start = self._enter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._exit(phase, start)
+
+        return timed
+
+    def _wrap_generator(self, phase, func):
+        def timed(*args, **kwargs):
+            start = self._enter()
+            try:
+                items = list(func(*args, **kwargs))
+            finally:
+                self._exit(phase, start)
+            yield from items
+
+        return timed
+
+    def _wrap_async_generator(self, phase, func):
+        # Only the generator's own steps are timed, not the consumer's work
+        # between two items.
+        async def timed(*args, **kwargs):
+            generator = func(*args, **kwargs)
+            while True:
+                start = self._enter()
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    self._exit(phase, start)
+                yield item
+
+        return timed
+
+
+@contextlib.contextmanager
+def timed_phases(timer: PhaseTimer, mode: str):
+    """Wrap the phase functions of ``mode`` for the duration of the block."""
+    originals = []
+    for phase, targets in PHASES[mode].items():
+        for owner, name in targets:
+            original = owner.__dict__[name]
+            originals.append((owner, name, original))
+            setattr(owner, name, timer.wrap(phase, original))
+    try:
+        yield
+    finally:
+        for owner, name, original in reversed(originals):
+            setattr(owner, name, original)
+
+
+# ---------------------------------------------------------------------------
+# Workspace, stand-in model and turns
+# ---------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def prepare_workspace(root: Path, modules: int = 8) -> None:
+    """Create the scratch project the workload's tools operate on."""
+    for index in range(modules):
+        body = "".join(
+            f"def function_{index}_{n}(value):\n    return value * {n}\n\n"
+            for n in range(3)
+        )
+        (root / f"module_{index}.py").write_text(body, encoding="utf-8")
+    (root / "README.md").write_text("# Scratch project\n", encoding="utf-8")
+
+
+def configure(root: Path) -> str:
+    """Point janito at a scratch config and start the mock server.
+
+    Returns:
+        The mock server's base URL.
+    """
+    config_dir.set_config_dir(str(root / ".janito-home"))
+    base_url = f"http://127.0.0.1:{_free_port()}/v1"
+    ensure_mock_server(
+        base_url, MockScenario(tool_calls=WORKLOAD, output_tokens=48, seed=1)
+    )
+    set_config_value("provider", "mock")
+    set_config_value("mock.endpoint", base_url)
+    set_config_value("speculative-tools", False)
+    return base_url
+
+
+def seeded_history(pairs: int) -> list[dict]:
+    """A prior conversation of ``pairs`` user/assistant exchanges."""
+    history = []
+    for n in range(pairs):
+        history.append({"role": "user", "content": f"Question {n} about the tree?"})
+        history.append(
+            {"role": "assistant", "content": f"Answer {n}: " + "details " * 40}
+        )
+    return history
+
+
+def run_cli_turn(history: list[dict]) -> list[dict]:
+    messages = [dict(message) for message in history]
+    completions_api.send_prompt(PROMPT, previous_messages=messages, use_mcp=False)
+    return messages
+
+
+def run_web_turn(history: list[dict], event_loop) -> list[dict]:
+    messages = [dict(message) for message in history]
+
+    async def drive():
+        config = WebServerConfig(provider="mock")
+        events = web_stream_prompt(PROMPT, messages, config, use_mcp=False)
+        async for event in events:
+            if isinstance(event, ErrorEvent):
+                raise RuntimeError(event.message)
+
+    event_loop.run_until_complete(drive())
+    # The session store releases the turn's payloads when it persists it.
+    blob_store.release(messages)
+    return messages
+
+
+def _check_turn(messages: list[dict], history: list[dict]) -> None:
+    tool_results = [m for m in messages[len(history) :] if m.get("role") == "tool"]
+    expected = sum(len(calls) for calls in WORKLOAD)
+    if len(tool_results) != expected:
+        raise AssertionError(f"expected {expected} tool results, got {tool_results}")
+    errors = [m for m in tool_results if '"error"' in str(m.get("content"))[:40]]
+    if errors:
+        raise AssertionError(f"tool calls failed: {errors}")
+    if messages[-1].get("role") != "assistant" or not messages[-1].get("content"):
+        raise AssertionError("the turn did not end with the final answer")
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _kib(size: int) -> float:
+    return round(size / 1024, 1)
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Drop the loops' console output (answers, tool reports, usage)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        with contextlib.redirect_stderr(io.StringIO()):
+            yield
+
+
+def measure_mode(mode: str, turns: int, history: list[dict]) -> dict:
+    """Time ``turns`` turns of one loop (after a warm-up), then measure memory."""
+    event_loop = asyncio.new_event_loop() if mode == "web" else None
+
+    def turn():
+        if mode == "web":
+            return run_web_turn(history, event_loop)
+        return run_cli_turn(history)
+
+    timer = PhaseTimer()
+    samples: dict[str, list[float]] = defaultdict(list)
+    try:
+        with _quiet():
+            _check_turn(turn(), history)  # warm-up: imports, caches
+            with timed_phases(timer, mode):
+                timer.take()
+                for _ in range(turns):
+                    start = time.perf_counter()
+                    turn()
+                    total = time.perf_counter() - start
+                    phases = timer.take()
+                    for phase in PHASES[mode]:
+                        samples[phase].append(phases.get(phase, 0.0))
+                    samples["other"].append(total - sum(phases.values()))
+                    samples["turn"].append(total)
+            peak, retained = _measure_memory(turn, turns)
+    finally:
+        if event_loop is not None:
+            event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+            event_loop.close()
+
+    rounds = len(WORKLOAD) + 1
+    return {
+        "rounds_per_turn": rounds,
+        "turn_ms": _ms(statistics.median(samples.pop("turn"))),
+        "phases_ms": {
+            phase: _ms(statistics.median(values)) for phase, values in samples.items()
+        },
+        "peak_kib": _kib(peak),
+        "retained_kib": _kib(retained),
+    }
+
+
+def _measure_memory(turn, turns: int) -> tuple[int, int]:
+    """Peak and retained allocations of a turn (medians), under tracemalloc."""
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(max(1, min(turns, 3))):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            turn()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(max(0, current - before))
+    finally:
+        tracemalloc.stop()
+    return int(statistics.median(peaks)), int(statistics.median(retained))
+
+
+def run_benchmarks(turns: int, history_pairs: int, modes=MODES) -> dict:
+    """Run the workload through each loop in a scratch workspace."""
+    cwd, home = os.getcwd(), config_dir.get_config_dir()
+    with tempfile.TemporaryDirectory(prefix="janito-bench-") as tmp:
+        root = Path(tmp)
+        prepare_workspace(root)
+        os.chdir(root)
+        try:
+            configure(root)
+            history = seeded_history(history_pairs)
+            results = {mode: measure_mode(mode, turns, history) for mode in modes}
+        finally:
+            os.chdir(cwd)
+            config_dir.set_config_dir(str(home))
+    return {
+        "workload": {
+            "turns": turns,
+            "history_messages": 2 * history_pairs,
+            "tool_calls": sum(len(calls) for calls in WORKLOAD),
+        },
+        "results": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+
+def compare(
+    report: dict,
+    baseline: dict,
+    tolerance: float = DEFAULT_TOLERANCE,
+    slack_ms: float = DEFAULT_SLACK_MS,
+    slack_kib: float = DEFAULT_SLACK_KIB,
+) -> list[str]:
+    """List the metrics of ``report`` that regressed against ``baseline``."""
+    regressions = []
+    for mode, result in report["results"].items():
+        base = baseline.get("results", {}).get(mode)
+        if not base:
+            continue
+        metrics = [("turn_ms", result["turn_ms"], base.get("turn_ms"), slack_ms)]
+        metrics += [
+            (
+                f"phases_ms.{phase}",
+                value,
+                base.get("phases_ms", {}).get(phase),
+                slack_ms,
+            )
+            for phase, value in result["phases_ms"].items()
+        ]
+        metrics += [
+            (key, result[key], base.get(key), slack_kib)
+            for key in ("peak_kib", "retained_kib")
+        ]
+        for name, value, reference, slack in metrics:
+            if reference is None:
+                continue
+            limit = reference * (1 + tolerance) + slack
+            if value > limit:
+                regressions.append(
+                    f"{mode} {name}: {value} > {limit:.3f} (baseline {reference})"
+                )
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    lines = []
+    for mode, result in report["results"].items():
+        lines.append(
+            f"{mode}: {result['turn_ms']:.2f} ms per turn "
+            f"({result['rounds_per_turn']} rounds), peak {result['peak_kib']} KiB, "
+            f"retained {result['retained_kib']} KiB"
+        )
+        for phase, value in result["phases_ms"].items():
+            lines.append(f"  {phase:<10} {value:>10.3f} ms")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, default=DEFAULT_TURNS)
+    parser.add_argument(
+        "--history",
+        type=int,
+        default=DEFAULT_HISTORY,
+        help="prior user/assistant exchanges in the history",
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--save-baseline", help="write the report as a baseline")
+    parser.add_argument(
+        "--check",
+        nargs="?",
+        const=str(BASELINE_PATH),
+        help="compare against a baseline (default: the stored one)",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--slack-ms", type=float, default=DEFAULT_SLACK_MS)
+    parser.add_argument("--slack-kib", type=float, default=DEFAULT_SLACK_KIB)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.turns, args.history, args.modes)
+    print(format_report(report))
+    for path in (args.json, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(report, indent=2) + "\n")
+            print(f"Report written to {path}")
+    if not args.check:
+        return 0
+    baseline = json.loads(Path(args.check).read_text())
+    regressions = compare(
+        report, baseline, args.tolerance, args.slack_ms, args.slack_kib
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions:
+        print(f"No regression against {args.check}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
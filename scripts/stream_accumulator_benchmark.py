@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""Microbenchmark the streaming accumulators on a synthetic stream.
+
+Every model round is folded chunk by chunk into an accumulator: the agent
+loop's ``*TurnAccumulator`` / ``CompletionsAccumulator`` classes in
+``janito/agent/`` and the CLI's ``*StreamConsumer`` classes in
+``janito/openai_client/``.  A long answer or a large tool-call argument
+(e.g. ``create_file`` with a whole file as content) easily streams tens of
+thousands of chunks, so per-chunk work that grows with the answer -- re-reading
+the chunk metadata, re-copying a growing ``arguments`` string -- turns into
+seconds of CPU at the end of the stream.
+
+This script builds one synthetic stream per wire format (Chat Completions,
+DashScope, Anthropic Messages, Responses) from the same plan: content deltas
+interleaved with the argument fragments of several tool calls.  It feeds
+each stream to the accumulators, checks that the assembled content and
+arguments are exact and prints the time per accumulator::
+
+    python scripts/stream_accumulator_benchmark.py
+    python scripts/stream_accumulator_benchmark.py --chunks 200000 --tool-calls 4
+
+No network access or API key is needed; only the Python standard library and
+janito itself are used.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Allow running from a source checkout without installing janito.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from janito.agent.anthropic import AnthropicTurnAccumulator  # noqa: E402
+from janito.agent.completions import CompletionsAccumulator  # noqa: E402
+from janito.agent.dashscope import DashScopeTurnAccumulator  # noqa: E402
+from janito.agent.responses import ResponsesTurnAccumulator  # noqa: E402
+from janito.openai_client.anthropic_stream import AnthropicStreamConsumer  # noqa: E402
+from janito.openai_client.completions_stream import (  # noqa: E402
+    CompletionsStreamConsumer,
+)
+from janito.openai_client.dashscope_stream import DashScopeStreamConsumer  # noqa: E402
+from janito.openai_client.responses_stream import ResponsesStreamConsumer  # noqa: E402
+
+DEFAULT_CHUNKS = 50_000
+DEFAULT_TOOL_CALLS = 2
+
+# ---------------------------------------------------------------------------
+# The stream plan
+# ---------------------------------------------------------------------------
+
+
+def build_plan(chunks: int, tool_calls: int) -> list[tuple]:
+    """The format-neutral sequence of deltas of a synthetic stream.
+
+    Steps are ``("content", text)`` or ``("args", call_index, fragment)``.
+    Content and argument fragments alternate; the argument fragments are
+    spread round-robin over ``tool_calls`` calls whose arguments are each a
+    valid JSON object once joined.
+    """
+    plan: list[tuple] = []
+    bodies = max(chunks - 2 * tool_calls, 0) // 2
+    for index in range(tool_calls):
+        plan.append(("args", index, '{"text": "'))
+    for n in range(bodies):
+        plan.append(("content", f"w{n} "))
+        if tool_calls:
+            plan.append(("args", n % tool_calls, "ab"))
+    for index in range(tool_calls):
+        plan.append(("args", index, '"}'))
+    return plan
+
+
+def expected_result(plan: list[tuple], tool_calls: int) -> tuple[str, list[str]]:
+    """The content and per-call arguments a correct accumulator assembles."""
+    content = "".join(step[1] for step in plan if step[0] == "content")
+    arguments = [
+        "".join(step[2] for step in plan if step[0] == "args" and step[1] == index)
+        for index in range(tool_calls)
+    ]
+    return content, arguments
+
+
+def _call_id(index: int) -> str:
+    return f"call_{index}"
+
+
+# ---------------------------------------------------------------------------
+# Wire formats
+# ---------------------------------------------------------------------------
+
+
+def completions_stream(plan: list[tuple], tool_calls: int) -> list:
+    """Chat Completions chunks (``choices[0].delta`` objects)."""
+    announced: set[int] = set()
+    chunks = []
+    for step in plan:
+        tool_delta = None
+        content = None
+        if step[0] == "content":
+            content = step[1]
+        else:
+            index, fragment = step[1], step[2]
+            first = index not in announced
+            announced.add(index)
+            tool_delta = [
+                SimpleNamespace(
+                    index=index,
+                    id=_call_id(index) if first else None,
+                    type="function" if first else None,
+                    function=SimpleNamespace(
+                        name="create_file" if first else None, arguments=fragment
+                    ),
+                )
+            ]
+        delta = SimpleNamespace(
+            content=content, reasoning_content=None, tool_calls=tool_delta
+        )
+        chunks.append(
+            SimpleNamespace(
+                id="chatcmpl-bench",
+                object="chat.completion.chunk",
+                created=0,
+                model="bench",
+                choices=[SimpleNamespace(delta=delta, finish_reason=None)],
+                usage=None,
+            )
+        )
+    finish = SimpleNamespace(content=None, reasoning_content=None, tool_calls=None)
+    chunks.append(
+        SimpleNamespace(
+            id="chatcmpl-bench",
+            object="chat.completion.chunk",
+            created=0,
+            model="bench",
+            choices=[SimpleNamespace(delta=finish, finish_reason="tool_calls")],
+            usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2),
+        )
+    )
+    return chunks
+
+
+def dashscope_stream(plan: list[tuple], tool_calls: int) -> list:
+    """DashScope incremental-output chunks (plain dicts)."""
+    announced: set[int] = set()
+    chunks = []
+    for step in plan:
+        if step[0] == "content":
+            message = {"content": step[1]}
+        else:
+            index, fragment = step[1], step[2]
+            first = index not in announced
+            announced.add(index)
+            function = {"arguments": fragment}
+            tool_call = {"index": index, "function": function}
+            if first:
+                tool_call["id"] = _call_id(index)
+                function["name"] = "create_file"
+            message = {"tool_calls": [tool_call]}
+        chunks.append(
+            {
+                "status_code": 200,
+                "request_id": "req-bench",
+                "output": {"choices": [{"message": message, "finish_reason": None}]},
+            }
+        )
+    chunks.append(
+        {
+            "status_code": 200,
+            "request_id": "req-bench",
+            "output": {"choices": [{"message": {}, "finish_reason": "stop"}]},
+            "usage": {"input_tokens": 1, "output_tokens": 1, "total_tokens": 2},
+        }
+    )
+    return chunks
+
+
+def anthropic_stream(plan: list[tuple], tool_calls: int) -> list:
+    """Anthropic Messages events (text block 0, tool_use blocks 1..n)."""
+    usage = SimpleNamespace(input_tokens=1, output_tokens=0)
+    events = [
+        SimpleNamespace(
+            type="message_start",
+            message=SimpleNamespace(id="msg_bench", model="bench", usage=usage),
+        ),
+        SimpleNamespace(
+            type="content_block_start",
+            index=0,
+            content_block=SimpleNamespace(type="text"),
+        ),
+    ]
+    for index in range(tool_calls):
+        events.append(
+            SimpleNamespace(
+                type="content_block_start",
+                index=index + 1,
+                content_block=SimpleNamespace(
+                    type="tool_use", id=_call_id(index), name="create_file"
+                ),
+            )
+        )
+    for step in plan:
+        if step[0] == "content":
+            delta = SimpleNamespace(type="text_delta", text=step[1])
+            events.append(
+                SimpleNamespace(type="content_block_delta", index=0, delta=delta)
+            )
+        else:
+            delta = SimpleNamespace(type="input_json_delta", partial_json=step[2])
+            events.append(
+                SimpleNamespace(
+                    type="content_block_delta", index=step[1] + 1, delta=delta
+                )
+            )
+    for index in range(tool_calls + 1):
+        events.append(SimpleNamespace(type="content_block_stop", index=index))
+    events.append(
+        SimpleNamespace(
+            type="message_delta",
+            delta=SimpleNamespace(stop_reason="tool_use"),
+            usage=SimpleNamespace(output_tokens=1),
+        )
+    )
+    events.append(SimpleNamespace(type="message_stop"))
+    return events
+
+
+def responses_stream(plan: list[tuple], tool_calls: int) -> list:
+    """Responses API events (function_call items ``item_<n>``)."""
+    response = SimpleNamespace(id="resp_bench", model="bench", usage=None)
+    events = [SimpleNamespace(type="response.created", response=response)]
+    for step in plan:
+        if step[0] == "content":
+            events.append(
+                SimpleNamespace(type="response.output_text.delta", delta=step[1])
+            )
+        else:
+            events.append(
+                SimpleNamespace(
+                    type="response.function_call_arguments.delta",
+                    item_id=f"item_{step[1]}",
+                    delta=step[2],
+                )
+            )
+    for index in range(tool_calls):
+        item = SimpleNamespace(
+            type="function_call",
+            id=f"item_{index}",
+            call_id=_call_id(index),
+            name="create_file",
+            arguments=None,
+        )
+        events.append(SimpleNamespace(type="response.output_item.done", item=item))
+    completed = SimpleNamespace(
+        id="resp_bench", model="bench", usage=SimpleNamespace(total_tokens=2)
+    )
+    events.append(SimpleNamespace(type="response.completed", response=completed))
+    return events
+
+
+# ---------------------------------------------------------------------------
+# Runners: feed a stream, return (content, [arguments per call])
+# ---------------------------------------------------------------------------
+
+
+def _sorted_arguments(calls: list[dict], key: str = "id") -> list[str]:
+    """Arguments of OpenAI-wire tool calls ordered by call id."""
+    calls = sorted(calls, key=lambda call: call[key])
+    return [call["function"]["arguments"] for call in calls]
+
+
+def _feed(accumulator, stream) -> None:
+    for chunk in stream:
+        accumulator.handle(chunk)
+
+
+def run_completions_accumulator(stream):
+    acc = CompletionsAccumulator()
+    _feed(acc, stream)
+    return acc.full_content(), _sorted_arguments(acc.tool_calls_list())
+
+
+def run_completions_consumer(stream):
+    content, _, tool_calls, _, _ = CompletionsStreamConsumer().consume(iter(stream))
+    return content, [tool_calls[index]["arguments"] for index in sorted(tool_calls)]
+
+
+def run_dashscope_accumulator(stream):
+    acc = DashScopeTurnAccumulator()
+    _feed(acc, stream)
+    return acc.full_content(), _sorted_arguments(acc.tool_calls_list())
+
+
+def run_dashscope_consumer(stream):
+    content, _, blocks, _, _ = DashScopeStreamConsumer().consume(iter(stream))
+    return content, [block["arguments"] for block in blocks]
+
+
+def run_anthropic_accumulator(stream):
+    acc = AnthropicTurnAccumulator()
+    _feed(acc, stream)
+    # The accumulator parses the arguments; re-serialize for comparison.
+    return acc.full_content(), _sorted_arguments(acc.tool_calls_list())
+
+
+def run_anthropic_consumer(stream):
+    content, _, blocks, _, _ = AnthropicStreamConsumer().consume(iter(stream))
+    blocks = sorted(blocks, key=lambda block: block["id"])
+    return content, [json.dumps(block["input"]) for block in blocks]
+
+
+def run_responses_accumulator(stream):
+    acc = ResponsesTurnAccumulator()
+    _feed(acc, stream)
+    calls = sorted(acc.tool_calls, key=lambda call: call["call_id"])
+    return acc.full_content(), [call["arguments"] for call in calls]
+
+
+def run_responses_consumer(stream):
+    content, _, calls, _, _, _ = ResponsesStreamConsumer().consume(iter(stream))
+    calls = sorted(calls, key=lambda call: call["call_id"])
+    return content, [call["arguments"] for call in calls]
+
+
+#: (name, stream builder, runner, arguments are re-serialized JSON)
+BENCHMARKS = [
+    (
+        "agent CompletionsAccumulator",
+        completions_stream,
+        run_completions_accumulator,
+        False,
+    ),
+    (
+        "cli CompletionsStreamConsumer",
+        completions_stream,
+        run_completions_consumer,
+        False,
+    ),
+    (
+        "agent DashScopeTurnAccumulator",
+        dashscope_stream,
+        run_dashscope_accumulator,
+        False,
+    ),
+    ("cli DashScopeStreamConsumer", dashscope_stream, run_dashscope_consumer, False),
+    (
+        "agent AnthropicTurnAccumulator",
+        anthropic_stream,
+        run_anthropic_accumulator,
+        True,
+    ),
+    ("cli AnthropicStreamConsumer", anthropic_stream, run_anthropic_consumer, True),
+    (
+        "agent ResponsesTurnAccumulator",
+        responses_stream,
+        run_responses_accumulator,
+        False,
+    ),
+    ("cli ResponsesStreamConsumer", responses_stream, run_responses_consumer, False),
+]
+
+
+def run_benchmarks(chunks: int, tool_calls: int) -> list[dict]:
+    """Time every accumulator on a ``chunks``-long synthetic stream.
+
+    Raises:
+        AssertionError: When an accumulator assembles a wrong result.
+    """
+    plan = build_plan(chunks, tool_calls)
+    content, arguments = expected_result(plan, tool_calls)
+    reserialized = [json.dumps(json.loads(args)) for args in arguments]
+    streams: dict = {}
+    results = []
+    for name, builder, runner, parsed in BENCHMARKS:
+        if builder not in streams:
+            streams[builder] = builder(plan, tool_calls)
+        stream = streams[builder]
+        start = time.perf_counter()
+        got_content, got_arguments = runner(stream)
+        seconds = time.perf_counter() - start
+        expected = reserialized if parsed else arguments
+        if got_content != content or got_arguments != expected:
+            raise AssertionError(f"{name} assembled a wrong result")
+        results.append({"name": name, "chunks": len(stream), "seconds": seconds})
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument(
+        "--chunks",
+        type=int,
+        default=DEFAULT_CHUNKS,
+        help=f"deltas per synthetic stream (default: {DEFAULT_CHUNKS})",
+    )
+    parser.add_argument(
+        "--tool-calls",
+        type=int,
+        default=DEFAULT_TOOL_CALLS,
+        help=f"interleaved tool calls (default: {DEFAULT_TOOL_CALLS})",
+    )
+    args = parser.parse_args(argv)
+    for result in run_benchmarks(args.chunks, args.tool_calls):
+        per_chunk_us = result["seconds"] / max(result["chunks"], 1) * 1e6
+        print(
+            f"{result['name']:<34} {result['chunks']:>8} chunks "
+            f"{result['seconds'] * 1000:>9.1f} ms  {per_chunk_us:>6.2f} us/chunk"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
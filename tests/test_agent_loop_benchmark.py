@@ -0,0 +1,95 @@
+"""
+Tests for the end-to-end agent-loop benchmark
+(scripts/agent_loop_benchmark.py).
+
+A one-turn run drives both loops against the in-process mock provider, so
+the workload's tool rounds must really execute; timings themselves are not
+asserted (they depend on the machine), only that every phase is reported
+and that the baseline comparison flags regressions beyond the tolerance.
+"""
+
+import asyncio
+import copy
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+import janito.config_dir as config_dir_mod
+from janito.providers.mock import server as mock_server
+
+# scripts/ is not a package, so load the script directly from its path.
+_SCRIPT = Path(__file__).parent.parent / "scripts" / "agent_loop_benchmark.py"
+_spec = importlib.util.spec_from_file_location("agent_loop_benchmark", _SCRIPT)
+alb = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(alb)
+
+
+@pytest.fixture
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+    servers = {}
+    monkeypatch.setattr(mock_server, "_servers", servers)
+    yield
+    for srv in servers.values():
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_both_loops_run_the_workload_and_report_every_phase(isolated):
+    report = alb.run_benchmarks(turns=1, history_pairs=2)
+
+    assert report["workload"]["tool_calls"] == 6
+    for mode in alb.MODES:
+        result = report["results"][mode]
+        assert set(result["phases_ms"]) == set(alb.PHASES[mode]) | {"other"}
+        assert result["turn_ms"] > 0 and result["peak_kib"] > 0
+        # The timed tool rounds ran for real.
+        assert result["phases_ms"]["tools"] > 0
+        assert result["phases_ms"]["stream"] > 0
+    # The wrapped functions are restored afterwards.
+    assert alb.completions_api.resolve_runtime_config.__name__ == (
+        "resolve_runtime_config"
+    )
+
+
+def test_phases_are_timed_exclusively():
+    timer = alb.PhaseTimer()
+    inner = timer.wrap("inner", lambda: sum(range(50_000)))
+
+    def outer():
+        return inner() + inner()
+
+    async def agen():
+        yield inner()
+
+    timer.wrap("outer", outer)()
+
+    async def drain():
+        return [item async for item in timer.wrap("stream", agen)()]
+
+    asyncio.run(drain())
+    totals = timer.take()
+    assert set(totals) == {"inner", "outer", "stream"}
+    assert totals["outer"] < totals["inner"]
+    assert timer.take() == {}
+
+
+def test_compare_flags_regressions_beyond_the_tolerance():
+    baseline = json.loads(alb.BASELINE_PATH.read_text())
+    assert set(baseline["results"]) == set(alb.MODES)
+    assert alb.compare(baseline, baseline) == []
+
+    slower = copy.deepcopy(baseline)
+    slower["results"]["cli"]["phases_ms"]["tools"] *= 3
+    slower["results"]["web"]["peak_kib"] += 10_000
+    regressions = alb.compare(slower, baseline, tolerance=0.5)
+    assert [r.split(":")[0] for r in regressions] == [
+        "cli phases_ms.tools",
+        "web peak_kib",
+    ]
+    # Within the absolute slack nothing regresses.
+    tiny = copy.deepcopy(baseline)
+    tiny["results"]["cli"]["phases_ms"]["request"] += 1.0
+    assert alb.compare(tiny, baseline, tolerance=0.0, slack_ms=2.0) == []
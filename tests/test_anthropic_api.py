@@ -135,6 +135,58 @@ if pytest is not None:
         assert usage.input_tokens == 10
         assert usage.output_tokens == 20
 
+    def test_consume_stream_reports_prompt_cache_tokens():
+        """Cache reads/writes from message_start are folded into the input
+        count and surfaced as cached / cache-write tokens."""
+        from janito.agent.usage import normalize_usage
+
+        events = [
+            _event(
+                "message_start",
+                message=SimpleNamespace(
+                    usage=SimpleNamespace(
+                        input_tokens=10,
+                        cache_read_input_tokens=3000,
+                        cache_creation_input_tokens=500,
+                    )
+                ),
+            ),
+            _event("message_delta", usage=SimpleNamespace(output_tokens=20)),
+            _event("message_stop"),
+        ]
+        usage = anthropic_api._consume_stream(events)[3]
+        assert normalize_usage(usage) == {
+            "total": 3530,
+            "input": 3510,
+            "output": 20,
+            "cached": 3000,
+            "cache_write": 500,
+        }
+
+    def test_build_call_kwargs_prompt_caching_marks_copies():
+        """With prompt caching the system prompt and the last message carry
+        cache_control; the client-side history is not modified."""
+        messages = [
+            {"role": "system", "content": "sys"},
+            {"role": "user", "content": "hi"},
+        ]
+        kwargs = anthropic_api._build_call_kwargs(
+            "claude", messages, 1000, "sys", prompt_caching=True
+        )
+        cache = {"type": "ephemeral"}
+        assert kwargs["system"] == [
+            {"type": "text", "text": "sys", "cache_control": cache}
+        ]
+        assert kwargs["messages"] == [
+            {
+                "role": "user",
+                "content": [{"type": "text", "text": "hi", "cache_control": cache}],
+            }
+        ]
+        assert messages[1] == {"role": "user", "content": "hi"}
+        plain = anthropic_api._build_call_kwargs("claude", messages, 1000, "sys")
+        assert plain["system"] == "sys"
+
     def test_consume_stream_collects_thinking_as_reasoning():
         """thinking_delta blocks are surfaced as reasoning content."""
         events = [
@@ -0,0 +1,158 @@
+"""
+Tests for the async agent pipeline driven from the CLI
+(janito/agent/pipeline/, janito/cli/async_send.py).
+
+With ``async-pipeline`` enabled the CLI send function runs the async
+loop against the in-process mock provider: tool rounds execute, the history
+is mutated in place and the usage of every round is summed.  Cancelling the
+driving task stops the prompt and closes its SDK client; Enter does too
+while the model is awaited, keeping the history.
+"""
+
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from rich.console import Console
+
+import janito.config_dir as config_dir_mod
+from janito.agent.events import (
+    ErrorEvent,
+    ToolCallEvent,
+    ToolProgressEvent,
+    WaitingEvent,
+)
+from janito.agent.pipeline import PipelineConfig, loop
+from janito.agent.usage import get_prompt_usage
+from janito.cli import async_send
+from janito.cli.chat import _make_send_prompt_func
+from janito.config_store import set_config_value
+from janito.openai_client.completions_api import RequestCancelled
+from janito.providers.mock import server as mock_server
+from janito.providers.mock.scenario import MockScenario
+
+
+@pytest.fixture
+def mock_provider(monkeypatch, tmp_path):
+    monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+    srv = mock_server.MockServer(("127.0.0.1", 0)).start()
+    set_config_value("mock.endpoint", srv.base_url)
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_cli_send_runs_tool_rounds_through_the_async_pipeline(
+    mock_provider, monkeypatch, tmp_path, capsys
+):
+    (tmp_path / "a.txt").write_text("hello\n")
+    monkeypatch.chdir(tmp_path)
+    mock_provider.scenario = MockScenario(
+        tool_calls=[[{"name": "ReadFile", "arguments": {"filepath": "a.txt"}}]],
+        content="Read it.",
+    )
+    set_config_value("async-pipeline", True)
+    send = _make_send_prompt_func("Completions", cli_provider="mock")
+    assert send.__module__ == async_send.__name__
+
+    messages = [{"role": "system", "content": "Be brief."}]
+    assert send("read a.txt", previous_messages=messages) == "Read it."
+
+    assert [m["role"] for m in messages] == [
+        "system",
+        "user",
+        "assistant",
+        "tool",
+        "assistant",
+    ]
+    assert "hello" in messages[3]["content"]
+    assert get_prompt_usage()["rounds"] == 2
+    out = capsys.readouterr().out
+    assert "Read it." in out and "Used files" in out
+
+
+def test_cancelling_the_driving_task_closes_the_sdk_client(mock_provider, monkeypatch):
+    mock_provider.scenario = MockScenario(content="late", ttft_ms=1500)
+    closed = []
+    close_client = loop._close_client
+
+    async def record_close(client):
+        closed.append(client)
+        await close_client(client)
+
+    monkeypatch.setattr(loop, "_close_client", record_close)
+    messages: list[dict] = []
+    config = PipelineConfig(provider="mock")
+
+    async def cancel_mid_stream():
+        task = asyncio.create_task(
+            async_send.drive_prompt(
+                "hi", messages, config, tools=[], console=Console(file=io.StringIO())
+            )
+        )
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    start = time.monotonic()
+    asyncio.run(cancel_mid_stream())
+    assert time.monotonic() - start < 1.2
+    assert len(closed) == 1
+    # The caller rolls the pending user message back.
+    assert messages == [{"role": "user", "content": "hi"}]
+
+
+def test_enter_cancels_the_wait_and_keeps_the_history(mock_provider, monkeypatch):
+    mock_provider.scenario = MockScenario(content="late", ttft_ms=1500)
+    polled = []
+
+    def enter_pressed():
+        polled.append(time.monotonic())
+        return len(polled) > 2
+
+    monkeypatch.setattr(async_send, "_is_enter_pressed", enter_pressed)
+    messages: list[dict] = []
+    config = PipelineConfig(provider="mock")
+
+    start = time.monotonic()
+    with pytest.raises(RequestCancelled):
+        asyncio.run(
+            async_send.drive_prompt(
+                "hi", messages, config, tools=[], console=Console(file=io.StringIO())
+            )
+        )
+    assert time.monotonic() - start < 1.2
+    # Unlike Ctrl+C, the shell keeps the pending user message.
+    assert messages == [{"role": "user", "content": "hi"}]
+
+
+def test_enter_is_not_read_while_tools_run():
+    renderer = async_send.EventRenderer(PipelineConfig(), Console(file=io.StringIO()))
+    renderer.render(WaitingEvent(phase="initial"))
+    assert renderer.awaiting_model
+    renderer.render(ToolCallEvent(tool_call_id="c", tool_name="AskUser", arguments={}))
+    assert not renderer.awaiting_model
+
+
+def test_renderer_raises_on_errors_and_keeps_report_line_endings(capsys):
+    renderer = async_send.EventRenderer(PipelineConfig(), Console(file=io.StringIO()))
+    renderer.render(
+        ToolProgressEvent(tool_call_id="c", level="start", message="a", end="")
+    )
+    renderer.render(ToolProgressEvent(tool_call_id="c", level="result", message="b"))
+    err = capsys.readouterr().err.rstrip("\n")
+    assert "a" in err and "b" in err and "\n" not in err
+    with pytest.raises(async_send.PipelineError, match="boom"):
+        renderer.render(ErrorEvent(message="boom"))
+
+
+def test_cli_reasoning_level_overrides_the_configured_one(mock_provider):
+    config = PipelineConfig(provider="mock", reasoning_level="low")
+    assert loop._resolve_turn_config(config, "mock", "mock-1")[2] == "low"
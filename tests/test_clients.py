@@ -469,6 +469,58 @@ if pytest is not None:
         Client()._print_verbose_api_response(console, "hi", None, {}, None, [])
         assert calls == ["resp_99", None]
 
+    # ---- pre-flight size check ------------------------------------------
+
+    def test_preflight_estimates_sections_per_state_shape(monkeypatch):
+        """The pre-flight hook estimates the client-side history (and a
+        separate ``system`` for Anthropic/Gemini); server-side Responses
+        conversations have nothing to estimate."""
+        from io import StringIO
+
+        from rich.console import Console
+
+        import janito.agent.tokens as tokens
+        from janito.openai_client.anthropic_api import AnthropicClient
+        from janito.openai_client.completions_api import CompletionsClient
+        from janito.openai_client.conversations_api import ResponsesClient
+
+        monkeypatch.setattr(tokens, "_calibration", tokens.TokenCalibration())
+        console = Console(file=StringIO())
+        history = [
+            {"role": "system", "content": "s" * 400},
+            {"role": "user", "content": "hi"},
+        ]
+
+        estimate = CompletionsClient()._preflight(
+            history, [], 100_000, "openai", console
+        )
+        assert estimate.system == tokens.estimate_tokens(history[:1])
+        assert tokens.last_estimate() is estimate
+
+        state = {"messages": history, "system": "short"}
+        estimate = AnthropicClient()._preflight(
+            state, [], 100_000, "anthropic", console
+        )
+        assert estimate.system == tokens.estimate_tokens("short")
+        assert estimate.family == "anthropic"
+
+        state = {"conversation_items": None}
+        assert ResponsesClient()._preflight(state, [], 10, "openai", console) is None
+
+    def test_preflight_refuses_oversized_request():
+        from io import StringIO
+
+        from rich.console import Console
+
+        from janito.agent.tokens import PromptTooLargeError
+        from janito.openai_client.completions_api import CompletionsClient
+
+        history = [{"role": "user", "content": "x" * 40_000}]
+        with pytest.raises(PromptTooLargeError):
+            CompletionsClient()._preflight(
+                history, [], 1000, "openai", Console(file=StringIO())
+            )
+
 else:  # pragma: no cover - fallback runner without pytest
 
     def _main():
@@ -1,5 +1,6 @@
 """Tests for the interactive ``--config`` provider selection (questionary)."""
 
+import sys
 from unittest.mock import patch
 
 import pytest
@@ -31,7 +32,7 @@ def _select_kwargs(fake):
 
 def test_prompt_provider_uses_questionary_select(monkeypatch, capsys):
     fake = _FakeQuestionary("deepseek")
-    monkeypatch.setattr("janito.cli.handlers.config.questionary", fake)
+    monkeypatch.setitem(sys.modules, "questionary", fake)
 
     result = _prompt_provider(existing_provider=None)
 
@@ -45,6 +46,7 @@ def test_prompt_provider_uses_questionary_select(monkeypatch, capsys):
         "deepseek",
         "google",
         "minimax",
+        "mock",
         "moonshot",
         "openai",
         "openrouter",
@@ -60,7 +62,7 @@ def test_prompt_provider_uses_questionary_select(monkeypatch, capsys):
 
 def test_prompt_provider_preselects_existing_provider(monkeypatch):
     fake = _FakeQuestionary("openai")
-    monkeypatch.setattr("janito.cli.handlers.config.questionary", fake)
+    monkeypatch.setitem(sys.modules, "questionary", fake)
 
     result = _prompt_provider(existing_provider="openai")
 
@@ -71,7 +73,7 @@ def test_prompt_provider_preselects_existing_provider(monkeypatch):
 
 def test_prompt_provider_unknown_existing_provider_has_no_default(monkeypatch):
     fake = _FakeQuestionary("openai")
-    monkeypatch.setattr("janito.cli.handlers.config.questionary", fake)
+    monkeypatch.setitem(sys.modules, "questionary", fake)
 
     _prompt_provider(existing_provider="not-a-provider")
 
@@ -81,7 +83,7 @@ def test_prompt_provider_unknown_existing_provider_has_no_default(monkeypatch):
 
 def test_prompt_provider_none_selection_returns_none(monkeypatch, capsys):
     fake = _FakeQuestionary(None)
-    monkeypatch.setattr("janito.cli.handlers.config.questionary", fake)
+    monkeypatch.setitem(sys.modules, "questionary", fake)
 
     result = _prompt_provider(existing_provider=None)
 
@@ -93,7 +95,7 @@ def test_prompt_provider_none_selection_returns_none(monkeypatch, capsys):
 def test_prompt_provider_keyboard_interrupt_exits(capsys):
     fake = _FakeQuestionary(KeyboardInterrupt())
     with (
-        patch("janito.cli.handlers.config.questionary", fake),
+        patch.dict(sys.modules, {"questionary": fake}),
         pytest.raises(SystemExit) as exc_info,
     ):
         _prompt_provider(existing_provider=None)
@@ -7,7 +7,9 @@ write-target-only semantics (global entries are never copied into local files).
 """
 
 import json
+import os
 import sys
+import time
 from pathlib import Path
 
 # Add the repo root to sys.path to allow importing the package directly.
@@ -18,6 +20,7 @@ import pytest
 import janito.config_dir as config_dir_mod
 from janito.config_keys import PROVIDER_SCOPED_KEYS
 from janito.config_store import ConfigStore
+from janito.json_store import AuthConfigStore
 
 
 @pytest.fixture(autouse=True)
@@ -135,6 +138,70 @@ if pytest is not None:
         with pytest.raises(json.JSONDecodeError):
             ConfigStore().load()
 
+    def _age(path):
+        """Backdate ``path`` past the cache's racy window."""
+        old = time.time() - 60
+        os.utime(path, (old, old))
+
+    def _count_reads(monkeypatch, store):
+        reads = []
+        read = store._read
+        monkeypatch.setattr(store, "_read", lambda: reads.append(1) or read())
+        return reads
+
+    def test_lookups_reuse_the_cached_config(monkeypatch, tmp_path):
+        base = _point_at(monkeypatch, tmp_path)
+        store = ConfigStore()
+        store.set("openai.model", "gpt-5")
+        _age(base / "config.json")
+        reads = _count_reads(monkeypatch, store)
+        for _ in range(5):
+            assert store.get("openai.model") == "gpt-5"
+        assert len(reads) == 1
+        # Callers get private copies, never the cached document.
+        store.load()["providers"]["openai"]["model"] = "mutated"
+        store.get("providers")["openai"]["model"] = "mutated"
+        assert store.get("openai.model") == "gpt-5"
+        assert len(reads) == 1
+
+    def test_external_edits_and_saves_invalidate_the_cache(monkeypatch, tmp_path):
+        base = _point_at(monkeypatch, tmp_path)
+        path = base / "config.json"
+        store = ConfigStore()
+        store.set("theme", "dark")
+        _age(path)
+        reads = _count_reads(monkeypatch, store)
+        assert store.get("theme") == "dark"
+        # Same size, different mtime: another process edited the file.
+        path.write_text(json.dumps({"theme": "lite"}))
+        assert store.get("theme") == "lite"
+        _age(path)
+        store.set("theme", "blue")
+        assert store.get("theme") == "blue"
+        assert len(reads) == 3
+
+    def test_recently_modified_files_are_not_cached(monkeypatch, tmp_path):
+        """A write within the same timestamp tick would keep the stat."""
+        _point_at(monkeypatch, tmp_path)
+        store = ConfigStore()
+        store.set("theme", "dark")
+        reads = _count_reads(monkeypatch, store)
+        store.get("theme")
+        store.get("theme")
+        assert len(reads) == 2
+
+    def test_auth_store_shares_the_cache(monkeypatch, tmp_path):
+        _point_at(monkeypatch, tmp_path)
+        store = AuthConfigStore()
+        store.set_api_key("openai", "sk-1")
+        _age(store.file_path())
+        reads = _count_reads(monkeypatch, store)
+        assert store.get_api_key("openai") == "sk-1"
+        assert store.list_providers() == ["openai"]
+        assert len(reads) == 1
+        store.set_api_key("openai", "sk-2")
+        assert store.get_api_key("openai") == "sk-2"
+
 else:  # pragma: no cover - fallback runner without pytest
 
     def _main():
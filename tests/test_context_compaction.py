@@ -0,0 +1,238 @@
+"""
+Tests for automatic context compaction (``janito.agent.context``).
+
+``ContextCompactor.compact`` trims a conversation history in place once its
+estimated size exceeds ``compact-threshold`` percent of the context window:
+first stale reasoning and large tool results of the older turns are dropped /
+elided, then (if still over budget) the older turns are replaced by a
+summary pair.  The most recent turns, and every tool call with its result,
+stay intact.  Checkpoints recorded by the shell / web session are remapped
+with ``shift_checkpoints``.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import janito.agent.context as context
+from janito.agent.context import (
+    SUMMARY_PREFIX,
+    Compaction,
+    ContextCompactor,
+    shift_checkpoints,
+)
+
+
+def _chat_turn(prompt, answer, tool_output="x" * 2000):
+    """A chat-format turn: user prompt, tool call + result, final answer."""
+    return [
+        {"role": "user", "content": prompt},
+        {
+            "role": "assistant",
+            "content": "",
+            "reasoning_content": "thinking " * 100,
+            "tool_calls": [
+                {
+                    "id": f"call_{prompt}",
+                    "type": "function",
+                    "function": {"name": "read_file", "arguments": "{}"},
+                }
+            ],
+        },
+        {"role": "tool", "tool_call_id": f"call_{prompt}", "content": tool_output},
+        {"role": "assistant", "content": answer},
+    ]
+
+
+def _history(turns=4):
+    items = [{"role": "system", "content": "You are helpful."}]
+    for n in range(turns):
+        items.extend(_chat_turn(f"question {n}", f"answer {n}"))
+    return items
+
+
+def test_under_budget_is_untouched():
+    items = _history()
+    snapshot = [dict(item) for item in items]
+    assert ContextCompactor(1_000_000, threshold=80).compact(items) is None
+    assert items == snapshot
+
+
+def test_disabled_by_zero_threshold_or_unknown_window():
+    items = _history()
+    assert ContextCompactor(100, threshold=0).compact(items) is None
+    assert ContextCompactor(None, threshold=80).compact(items) is None
+    assert len(items) == 17
+
+
+def test_threshold_read_from_config(monkeypatch):
+    monkeypatch.setattr(
+        "janito.config_store.get_config_value",
+        lambda key: "0" if key == "compact-threshold" else None,
+    )
+    assert not ContextCompactor(100).enabled
+
+
+def test_elides_old_tool_results_before_summarizing():
+    items = _history()
+    # Budget fits the history once the old tool outputs are elided.
+    compactor = ContextCompactor(3000, threshold=100)
+    compaction = compactor.compact(items)
+
+    assert compaction is not None
+    assert compaction.summarized_turns == 0
+    assert compaction.elided_results == 2
+    assert compaction.dropped_reasoning == 2
+    assert compaction.delta == 0
+    assert len(items) == 17
+    # Old turns elided, the two most recent turns kept verbatim.
+    assert "elided during context compaction" in items[3]["content"]
+    assert "reasoning_content" not in items[2]
+    assert items[-2]["content"] == "x" * 2000
+    assert "reasoning_content" in items[-3]
+    # Tool call ids stay paired with their (elided) results.
+    assert items[3]["tool_call_id"] == items[2]["tool_calls"][0]["id"]
+
+
+def test_summarizes_older_turns_and_keeps_recent_pairs():
+    items = _history()
+    compaction = ContextCompactor(500, threshold=100).compact(items)
+
+    assert compaction.summarized_turns == 2
+    assert (compaction.start, compaction.end, compaction.inserted) == (1, 9, 2)
+    assert items[0]["role"] == "system"
+    assert items[1]["role"] == "user"
+    assert items[1]["content"].startswith(SUMMARY_PREFIX)
+    assert "question 0" in items[1]["content"]
+    assert "read_file" in items[1]["content"]
+    assert "answer 1" in items[1]["content"]
+    assert items[2]["role"] == "assistant"
+    # The kept turns follow, each tool call still followed by its result.
+    assert items[3]["content"] == "question 2"
+    assert items[4]["tool_calls"][0]["id"] == items[5]["tool_call_id"]
+    assert compaction.tokens_after < compaction.tokens_before
+
+
+def test_repeated_compaction_carries_the_summary_over():
+    items = _history()
+    ContextCompactor(500, threshold=100).compact(items)
+    items.extend(_chat_turn("question 4", "answer 4"))
+    ContextCompactor(500, threshold=100).compact(items)
+
+    summary = items[1]["content"]
+    assert summary.count(SUMMARY_PREFIX) == 1
+    assert "question 0" in summary and "question 2" in summary
+
+
+def test_responses_items_get_an_items_shaped_summary():
+    items = []
+    for n in range(3):
+        items.extend(
+            [
+                {
+                    "type": "message",
+                    "role": "user",
+                    "content": [{"type": "input_text", "text": f"question {n}"}],
+                },
+                {
+                    "type": "function_call",
+                    "call_id": f"c{n}",
+                    "name": "read_file",
+                    "arguments": "{}",
+                },
+                {
+                    "type": "function_call_output",
+                    "call_id": f"c{n}",
+                    "output": "y" * 4000,
+                },
+            ]
+        )
+    compaction = ContextCompactor(500, threshold=100).compact(items)
+
+    assert compaction.summarized_turns == 1
+    assert items[0]["type"] == "message"
+    assert items[0]["content"][0]["type"] == "input_text"
+    assert items[1]["content"][0]["type"] == "output_text"
+    assert items[2]["content"][0]["text"] == "question 1"
+    assert items[3]["call_id"] == items[4]["call_id"] == "c1"
+
+
+def test_anthropic_tool_result_blocks_are_not_turn_starts():
+    items = [
+        {"role": "user", "content": "question 0"},
+        {
+            "role": "assistant",
+            "content": [
+                {"type": "thinking", "thinking": "hmm", "signature": "s"},
+                {"type": "tool_use", "id": "t0", "name": "read_file", "input": {}},
+            ],
+        },
+        {
+            "role": "user",
+            "content": [
+                {"type": "tool_result", "tool_use_id": "t0", "content": "z" * 3000}
+            ],
+        },
+        {"role": "assistant", "content": [{"type": "text", "text": "answer 0"}]},
+        {"role": "user", "content": "question 1"},
+        {"role": "user", "content": "question 2"},
+    ]
+    compaction = ContextCompactor(10_000, threshold=1).compact(items)
+
+    assert compaction.summarized_turns == 1
+    assert "question 0" in items[0]["content"]
+    assert items[2]["content"] == "question 1"
+
+
+def test_keep_turns_never_cuts_the_current_turn():
+    items = [{"role": "user", "content": "only " * 1000}]
+    assert ContextCompactor(10, threshold=100).compact(items) is None
+
+
+def test_shift_checkpoints_drops_summarized_turns():
+    compaction = Compaction(
+        start=1, end=9, inserted=2, tokens_before=100, tokens_after=50
+    )
+    checkpoints = [1, 5, 9, 13]
+    shift_checkpoints(checkpoints, compaction)
+    assert checkpoints == [1, 3, 7]
+
+
+def test_compaction_tracker_round_trip():
+    context.reset_compactions()
+    record = Compaction(start=0, end=0, inserted=0, tokens_before=1, tokens_after=1)
+    context.record_compaction(record)
+    assert context.pop_compactions() == [record]
+    assert context.pop_compactions() == []
+
+
+def test_shell_remaps_checkpoints_before_rollback():
+    """A compaction during a failed turn must not break the rollback: the
+    shell remaps its checkpoints to the compacted history first."""
+    from janito.shell import InteractiveShell
+
+    shell = InteractiveShell(model="test-model", no_history=True)
+    shell.initialize_history(system_prompt="sys")
+    shell.messages_history.extend(_history()[1:])
+    shell.history_checkpoints = [1, 5, 9, 13]
+
+    def send_prompt_func(user_input, **kwargs):
+        history = kwargs["previous_messages"]
+        history.append({"role": "user", "content": user_input})
+        compaction = ContextCompactor(500, threshold=100).compact(history)
+        context.record_compaction(compaction)
+        history.append({"role": "assistant", "content": "partial"})
+        raise KeyboardInterrupt
+
+    shell.send_prompt_func = send_prompt_func
+    shell.verbose = False
+    shell.no_tools = True
+    shell._send_prompt("question 4")
+
+    # Turns 0-2 were summarized (keep_turns=2 counts the new prompt), so only
+    # the summary pair and turn 3 remain; the failed turn is rolled back.
+    assert shell.history_checkpoints == [1, 3]
+    assert [m["content"] for m in shell.messages_history[3:4]] == ["question 3"]
+    assert shell.messages_history[-1]["content"] == "answer 3"
@@ -0,0 +1,194 @@
+"""
+Tests for the resident daemon (janito/cli/daemon.py).
+
+A real ``janito --daemon`` process serves the mock provider; the client side
+(:func:`janito.cli.daemon.forward`) runs in the test process.  Prompts run in
+the client's working directory with the client's privileges, invocations the
+daemon cannot serve fall back to an in-process run, a client that hangs up
+cancels its prompt, and an idle daemon exits and removes its socket.
+Clients only talk to a socket of their own user in a private directory.
+"""
+
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import janito.config_dir as config_dir_mod
+from janito import __version__
+from janito.cli import daemon
+from janito.cli.parser import create_parser
+from janito.providers.mock import server as mock_server
+from janito.providers.mock.scenario import MockScenario
+
+REPO_ROOT = Path(__file__).parent.parent
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="the daemon needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def mock_provider():
+    srv = mock_server.MockServer(("127.0.0.1", 0), MockScenario(content="Hi.")).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _start_daemon(tmp_path, endpoint, idle_timeout=60):
+    config_dir = tmp_path / ".janito"
+    config_dir.mkdir(exist_ok=True)
+    config = {
+        "provider": "mock",
+        "providers": {"mock": {"endpoint": endpoint}},
+        "daemon-idle-timeout": idle_timeout,
+    }
+    (config_dir / "config.json").write_text(json.dumps(config))
+    path = [str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]
+    env = dict(
+        os.environ,
+        HOME=str(tmp_path),
+        PYTHONPATH=os.pathsep.join(filter(None, path)),
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "janito", "-c", str(config_dir), "--daemon"],
+        cwd=tmp_path,
+        env=env,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    line = proc.stderr.readline()
+    assert "listening" in line, line + proc.stderr.read()
+    return proc, config_dir
+
+
+@pytest.fixture
+def running_daemon(monkeypatch, tmp_path, mock_provider):
+    proc, config_dir = _start_daemon(tmp_path, mock_provider.base_url)
+    monkeypatch.setattr(config_dir_mod, "_config_dir", config_dir)
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+    yield proc
+    proc.terminate()
+    proc.wait(timeout=10)
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def _forward(monkeypatch, argv, stdin=None):
+    """Run ``janito ARGV`` through the daemon, with piped ``stdin`` if given."""
+    monkeypatch.setattr(
+        sys, "stdin", _Terminal() if stdin is None else io.StringIO(stdin)
+    )
+    return daemon.forward(create_parser().parse_args(argv), argv)
+
+
+def test_prompt_runs_in_the_daemon_in_the_client_cwd(
+    running_daemon, mock_provider, monkeypatch, capsys
+):
+    Path("a.txt").write_text("hello\n")
+    mock_provider.scenario = MockScenario(
+        tool_calls=[[{"name": "ReadFile", "arguments": {"filepath": "a.txt"}}]],
+        content="Read it.",
+    )
+    assert _forward(monkeypatch, [], stdin="read a.txt") == 0
+    out, err = capsys.readouterr()
+    assert "Read it." in out and "Reading file" in err
+    assert "Working at" in out  # the banner shows the client's directory
+    # The daemon keeps serving.
+    assert running_daemon.poll() is None
+
+    assert _forward(monkeypatch, [], stdin="  ") == 1
+    assert "Empty prompt" in capsys.readouterr().err
+
+
+def test_privileges_apply_per_invocation(running_daemon, mock_provider, monkeypatch):
+    mock_provider.scenario = MockScenario(
+        tool_calls=[
+            [{"name": "CreateFile", "arguments": {"filepath": "new.txt"}}],
+        ],
+        content="Done.",
+    )
+    assert _forward(monkeypatch, ["-r", "create new.txt"]) == 0
+    assert not Path("new.txt").exists()
+    assert _forward(monkeypatch, ["-r", "-w", "create new.txt"]) == 0
+    assert Path("new.txt").exists()
+
+
+def test_session_flag_mismatch_runs_in_process(running_daemon, monkeypatch):
+    assert _forward(monkeypatch, ["--no-tools"], stdin="hi") is None
+    # The stdin was left for the in-process run.
+    assert sys.stdin.read() == "hi"
+
+
+def test_client_hang_up_cancels_the_prompt(running_daemon, mock_provider, monkeypatch):
+    mock_provider.scenario = MockScenario(content="Slow.", ttft_ms=30_000)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(daemon.socket_path()))
+        request = {"version": __version__, "argv": [], "cwd": os.getcwd()}
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        assert json.loads(sock.makefile("rb").readline()) == {"accept": True}
+        sock.sendall(json.dumps({"stdin": "hi"}).encode() + b"\n")
+        time.sleep(1)
+
+    mock_provider.scenario = MockScenario(content="Fast.")
+    start = time.monotonic()
+    assert _forward(monkeypatch, ["hi"]) == 0
+    assert time.monotonic() - start < 15
+    assert running_daemon.poll() is None
+
+
+def test_idle_daemon_exits_and_removes_its_socket(tmp_path, mock_provider):
+    proc, config_dir = _start_daemon(tmp_path, mock_provider.base_url, idle_timeout=1)
+    assert proc.wait(timeout=30) == 0
+    assert not (config_dir / daemon.SOCKET_NAME).exists()
+
+
+def test_no_daemon_runs_in_process(monkeypatch, tmp_path):
+    monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+    assert _forward(monkeypatch, ["hi"]) is None
+
+
+def test_long_config_paths_use_a_private_socket_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ("x" * 100))
+    runtime = tmp_path / "run"
+    runtime.mkdir(mode=0o700)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime))
+    assert daemon.socket_path().parent == runtime
+    # A runtime dir others can write to is not used.
+    runtime.chmod(0o777)
+    fallback = daemon.socket_path().parent
+    assert fallback.name == f"janito-{os.getuid()}" and fallback != runtime
+
+
+def test_client_ignores_untrusted_sockets(monkeypatch, tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    monkeypatch.setattr(config_dir_mod, "_config_dir", shared)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(shared / daemon.SOCKET_NAME))
+        listener.listen(1)
+        listener.setblocking(False)
+        # A world-writable directory: anyone could have planted the socket.
+        shared.chmod(0o777)
+        assert _forward(monkeypatch, ["hi"]) is None
+        with pytest.raises(BlockingIOError):
+            listener.accept()
+        # A listener running as another user.
+        shared.chmod(0o700)
+        monkeypatch.setattr(daemon, "_peer_uid", lambda sock: os.getuid() + 1)
+        assert _forward(monkeypatch, ["hi"]) is None
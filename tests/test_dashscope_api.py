@@ -7,6 +7,7 @@ and the package guard is pinned down: ``send_prompt`` / ``_create_client`` must
 refuse to run with an actionable install message when the package is missing.
 """
 
+import json
 import sys
 from pathlib import Path
 from types import SimpleNamespace
@@ -251,6 +252,31 @@ if pytest is not None:
             {"id": "call_1", "name": "get_weather", "arguments": '{"city": "Lisbon"}'}
         ]
 
+    def test_legacy_tool_call_map_keeps_joined_arguments():
+        """``_consume_tool_call`` hands back ``arguments`` as a JSON string."""
+        tool_calls_map = {}
+        dashscope_api._consume_tool_call(
+            {"index": 0, "id": "call_1", "function": {"name": "f", "arguments": "{"}},
+            tool_calls_map,
+        )
+        dashscope_api._consume_tool_call(
+            {"index": 0, "function": {"arguments": '"a": 1}'}}, tool_calls_map
+        )
+        assert tool_calls_map == {
+            0: {"id": "call_1", "name": "f", "arguments": '{"a": 1}'}
+        }
+        assert json.loads(tool_calls_map[0]["arguments"]) == {"a": 1}
+
+        state = {"tool_calls": {}}
+        dashscope_api._consume_message(
+            {
+                "content": "",
+                "tool_calls": [{"index": 0, "function": {"arguments": "{}"}}],
+            },
+            state,
+        )
+        assert state["tool_calls"][0]["arguments"] == "{}"
+
     def test_consume_stream_url_error_raises_endpoint_mismatch():
         """A url-error chunk (model/endpoint mismatch) raises _ModelEndpointMismatch."""
         chunks = [
@@ -696,6 +696,24 @@ if pytest is not None:
         assert cl.load_responses_in_server_from_config("openai") is None
         assert cl.load_responses_in_server_from_config() is None
 
+    def test_set_prompt_caching_per_model(monkeypatch, tmp_path):
+        from janito.provider_accessors import get_prompt_caching_from_provider
+
+        config_path = _use_temp_config(monkeypatch, tmp_path)
+        assert cl.load_prompt_caching_from_config("anthropic") is None
+        assert get_prompt_caching_from_provider("anthropic") is True
+        key, value = cc.set_config_from_cli("prompt-caching=off", "anthropic")
+        assert key == "anthropic.models.claude-sonnet-5.prompt-caching"
+        assert value is False
+        assert get_prompt_caching_from_provider("anthropic") is False
+        config = _read_config(config_path)
+        assert (
+            config["providers"]["anthropic"]["models"]["claude-sonnet-5"][
+                "prompt-caching"
+            ]
+            is False
+        )
+
     def test_unset_responses_in_server_per_provider(monkeypatch, tmp_path):
         config_path = _use_temp_config(monkeypatch, tmp_path)
         cc.set_config_from_cli("responses-in-server=true", "openai")
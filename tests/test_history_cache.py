@@ -0,0 +1,112 @@
+"""
+Tests for the incremental history conversion (janito/agent/history_cache.py).
+
+The native Anthropic and Gemini payloads are rebuilt every round from the
+OpenAI-format history.  The cache converts each message once and must give
+exactly the full conversion after appends, ``/rewind`` (truncation, also
+across merged tool results), compaction (replaced or edited messages) and
+``/restart`` (cleared history).
+"""
+
+import sys
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from janito.agent import history_cache
+from janito.agent.anthropic import _append_anthropic, _to_anthropic
+from janito.agent.history_cache import ConvertedHistory, converted_history
+from janito.gemini_helpers import _append_content, _messages_to_contents
+
+
+def _tool_call(call_id, name="ReadFile"):
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": "{}"},
+    }
+
+
+def _tool_round(prefix, answer):
+    """A user prompt, two tool calls with their results and an answer."""
+    return [
+        {"role": "user", "content": f"{prefix} prompt"},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [_tool_call(f"{prefix}1"), _tool_call(f"{prefix}2")],
+        },
+        {"role": "tool", "tool_call_id": f"{prefix}1", "content": '{"a": 1}'},
+        {"role": "tool", "tool_call_id": f"{prefix}2", "content": "two"},
+        {"role": "assistant", "content": answer},
+    ]
+
+
+FORMATS = [
+    pytest.param(_append_anthropic, lambda m: _to_anthropic(m)[0], id="anthropic"),
+    pytest.param(_append_content, _messages_to_contents, id="gemini"),
+]
+
+
+@pytest.mark.parametrize("step, full", FORMATS)
+def test_matches_the_full_conversion_through_a_session(step, full):
+    cache = ConvertedHistory(step)
+    messages = [{"role": "system", "content": "Be brief."}]
+    for prefix in "abc":
+        for message in _tool_round(prefix, f"{prefix} done"):
+            messages.append(message)
+            assert cache.convert(messages) == full(messages)
+
+    # /rewind to just after the first tool result of round "b": the merged
+    # tool-result message is rolled back to its one-result state.
+    del messages[9:]
+    assert cache.convert(messages) == full(messages)
+    messages.append({"role": "user", "content": "again"})
+    assert cache.convert(messages) == full(messages)
+
+    # Compaction: a message replaced, and one whose content was edited.
+    messages[3] = {"role": "tool", "tool_call_id": "a1", "content": "[stale]"}
+    messages[4]["content"] = "[stale]"
+    assert cache.convert(messages) == full(messages)
+
+    # /restart clears the history in place.
+    messages.clear()
+    assert cache.convert(messages) == []
+
+
+def test_only_new_messages_are_converted():
+    calls = []
+
+    def step(converted, message):
+        calls.append(message["content"])
+        converted.append(message["content"].upper())
+
+    cache = ConvertedHistory(step)
+    messages = [{"role": "user", "content": "a"}, {"role": "user", "content": "b"}]
+    first = cache.convert(messages)
+    messages.append({"role": "user", "content": "c"})
+    assert cache.convert(messages) == ["A", "B", "C"]
+    assert calls == ["a", "b", "c"]
+    # The caller gets its own list: marking it does not touch the cache.
+    first.append("X")
+    assert cache.convert(messages) == ["A", "B", "C"]
+
+
+def test_caches_are_per_conversation_and_bounded(monkeypatch):
+    history_cache.clear_converted_histories()
+    monkeypatch.setattr(history_cache, "MAX_CONVERSATIONS", 2)
+    one = [{"role": "user", "content": "one"}]
+    two = [{"role": "user", "content": "two"}]
+    converted = converted_history(one, _append_content, "gemini")
+    # Entries are reused across rounds, not rebuilt.
+    assert converted_history(one, _append_content, "gemini")[0] is converted[0]
+    assert converted_history(two, _append_content, "gemini") == [
+        {"role": "user", "parts": [{"text": "two"}]}
+    ]
+    converted_history(two, _append_anthropic, "anthropic")
+    assert len(history_cache._caches) == 2
+    assert (id(one), "gemini") not in history_cache._caches
+    history_cache.clear_converted_histories()
@@ -0,0 +1,124 @@
+"""
+Import-time budget for the common entry points (``python -X importtime``).
+
+``janito --version``, ``--get`` and ``--show-providers`` must not load the
+agent loop, the shell or any provider SDK, and must stay within
+:data:`FLAG_COMMAND_BUDGET_MS` of cumulative import time; a single prompt
+loads only its own API type's SDK, never the interactive shell.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from janito.providers.mock import server as mock_server
+from janito.providers.mock.scenario import MockScenario
+
+REPO_ROOT = Path(__file__).parent.parent
+
+#: Cumulative import time allowed for a flag-driven command (the whole
+#: ``janito`` startup measured ~60-110 ms once lazy; the agent loop alone
+#: used to add ~700 ms).  Generous, so slow CI machines do not flake.
+FLAG_COMMAND_BUDGET_MS = 400
+
+# Never needed by a flag-driven command.
+HEAVY_MODULES = {
+    "anthropic",
+    "httpx",
+    "janito.openai_client.base_client",
+    "janito.shell",
+    "openai",
+    "prompt_toolkit",
+    "questionary",
+    "requests",
+}
+
+
+def _importtime(args, tmp_path, stdin=""):
+    """Run ``python -X importtime -m janito ARGS``.
+
+    Returns:
+        ``(cumulative_ms, modules)``: the import time of everything imported
+        from the first ``janito`` import on (the interpreter's own startup is
+        not counted) and the names of every imported module.
+    """
+    path = [str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]
+    env = dict(
+        os.environ,
+        HOME=str(tmp_path),
+        PYTHONPATH=os.pathsep.join(filter(None, path)),
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "janito", *args],
+        cwd=tmp_path,
+        env=env,
+        input=stdin,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    cumulative_us, modules, started = 0, set(), False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        top_level = not name[1:].startswith(" ")
+        started = started or (top_level and name.strip().startswith("janito"))
+        if started and top_level:
+            cumulative_us += int(cumulative)
+    return cumulative_us / 1000, modules
+
+
+@pytest.mark.parametrize(
+    "args", [["--version"], ["--get", "provider"], ["--show-providers"]]
+)
+def test_flag_commands_stay_within_the_import_budget(args, tmp_path):
+    config_dir = tmp_path / ".janito"
+    config_dir.mkdir()
+    (config_dir / "config.json").write_text(json.dumps({"provider": "mock"}))
+    cumulative_ms, modules = _importtime(["-c", str(config_dir), *args], tmp_path)
+    assert not modules & HEAVY_MODULES
+    assert cumulative_ms < FLAG_COMMAND_BUDGET_MS
+
+
+def test_single_prompt_loads_only_its_api_type(tmp_path):
+    srv = mock_server.MockServer(("127.0.0.1", 0), MockScenario(content="Hi.")).start()
+    try:
+        config_dir = tmp_path / ".janito"
+        config_dir.mkdir()
+        config = {"providers": {"mock": {"endpoint": srv.base_url}}}
+        (config_dir / "config.json").write_text(json.dumps(config))
+        _, modules = _importtime(
+            ["-c", str(config_dir), "--provider", "mock", "--no-plugins"],
+            tmp_path,
+            stdin="hi",
+        )
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    assert "openai" in modules  # the mock provider speaks Completions
+    assert not modules & {"anthropic", "janito.shell", "prompt_toolkit", "requests"}
+
+
+def test_api_client_modules_do_not_import_their_sdks():
+    code = (
+        "import sys, janito.openai_client.anthropic_api, janito.gemini_api, "
+        "janito.dashscope_api, janito.openai_client.conversations_api; "
+        "print(sorted({'anthropic', 'dashscope', 'google.genai', 'openai'} "
+        "& set(sys.modules)))"
+    )
+    path = [str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, path)))
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "[]", result.stderr
@@ -2,13 +2,17 @@
 Tests for the shared JSON-file store classes (janito.json_store).
 
 Covers the :class:`JsonFileStore` base (path resolution, local-over-global
-merge, 0600 permissions, delete-missing-key semantics) and the three
+merge, 0600 permissions, delete-missing-key semantics), the three
 subclasses (:class:`AuthConfigStore`, :class:`SecretsConfigStore`,
-:class:`McpConfigStore`).
+:class:`McpConfigStore`) and the atomic, lock-protected writes shared with
+``config.json`` (no partial files, no lost updates between processes).
 """
 
 import json
+import os
+import subprocess
 import sys
+import threading
 from pathlib import Path
 
 # Add the repo root to sys.path to allow importing the package directly.
@@ -17,13 +21,32 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import pytest
 
 import janito.config_dir as config_dir_mod
+import janito.json_store as json_store_mod
 from janito.json_store import (
     AuthConfigStore,
     JsonFileStore,
     McpConfigStore,
     SecretsConfigStore,
+    locked,
 )
 
+REPO_ROOT = Path(__file__).parent.parent
+
+# Run by each writer process of the concurrency test: 25 read-modify-write
+# updates of auth.json and config.json.
+_WRITER = """
+import sys
+from pathlib import Path
+import janito.config_dir as config_dir_mod
+from janito.config_store import set_config_value
+from janito.json_store import AuthConfigStore
+config_dir_mod._config_dir = Path(sys.argv[1])
+store = AuthConfigStore()
+for i in range(25):
+    store.set_api_key(f"{sys.argv[2]}-{i}", "k")
+    set_config_value(f"{sys.argv[2]}-{i}", i)
+"""
+
 
 @pytest.fixture(autouse=True)
 def _reset_local_mode():
@@ -234,6 +257,62 @@ if pytest is not None:
         raw = json.loads(store.file_path().read_text())
         assert raw == {"services": {"s": {"command": "c"}}}
 
+    def test_save_replaces_the_file_and_keeps_its_mode(monkeypatch, tmp_path):
+        base = _point_at(monkeypatch, tmp_path)
+        store = JsonFileStore("plain.json", chmod_600=False)
+        store.save({"k": 1})
+        os.chmod(store.file_path(), 0o640)
+        inode = store.file_path().stat().st_ino
+        store.set("k", 2)
+        assert store.file_path().stat().st_ino != inode  # renamed into place
+        assert store.file_path().stat().st_mode & 0o777 == 0o640
+        assert sorted(os.listdir(base)) == ["plain.json", "plain.json.lock"]
+
+    def test_failed_save_leaves_the_old_file(monkeypatch, tmp_path):
+        base = _point_at(monkeypatch, tmp_path)
+        store = AuthConfigStore()
+        store.set_api_key("openai", "old")
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(json_store_mod.os, "replace", fail)
+        assert store.set_api_key("openai", "new") is False
+        assert json.loads(store.file_path().read_text()) == {"openai": "old"}
+        assert sorted(os.listdir(base)) == ["auth.json", "auth.json.lock"]
+
+    def test_lock_is_reentrant_and_excludes_other_threads(monkeypatch, tmp_path):
+        store = JsonFileStore("x.json")
+        _point_at(monkeypatch, tmp_path)
+        events = []
+
+        def other():
+            with locked(store.file_path()):
+                events.append("other")
+
+        with store.locked(), store.locked():
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join(0.2)
+            events.append("owner")
+        thread.join()
+        assert events == ["owner", "other"]
+
+    def test_concurrent_processes_do_not_lose_updates(monkeypatch, tmp_path):
+        base = _point_at(monkeypatch, tmp_path)
+        path = [str(REPO_ROOT), os.environ.get("PYTHONPATH", "")]
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, path)))
+        writers = [
+            subprocess.Popen(
+                [sys.executable, "-c", _WRITER, str(base), f"w{n}"], env=env
+            )
+            for n in range(4)
+        ]
+        assert [w.wait(timeout=120) for w in writers] == [0] * 4
+        expected = {f"w{n}-{i}" for n in range(4) for i in range(25)}
+        assert set(AuthConfigStore().load()) == expected
+        assert set(json.loads((base / "config.json").read_text())) == expected
+
 else:  # pragma: no cover - fallback runner without pytest
 
     def _main():
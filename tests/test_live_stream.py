@@ -0,0 +1,152 @@
+"""
+Tests for live rendering of streamed content (``janito.openai_client.live_stream``).
+
+The stream consumers push their content / reasoning deltas to the buffer the
+runner installs for the worker thread; the main thread renders the tail of
+that buffer in a transient ``Live`` region, throttled to
+``LIVE_REFRESH_SECONDS``, and keeps polling for Enter-to-cancel.
+"""
+
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from rich.console import Console
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from janito.openai_client import RequestCancelled, completions_api
+from janito.openai_client.completions_stream import CompletionsStreamConsumer
+from janito.openai_client.live_stream import (
+    LiveStreamView,
+    StreamBuffer,
+    live_render_enabled,
+    push_delta,
+    set_stream_buffer,
+)
+from janito.openai_client.responses_stream import ResponsesStreamConsumer
+
+
+def _terminal_console():
+    return Console(file=io.StringIO(), force_terminal=True, width=60, height=20)
+
+
+def _chunk(content=None, reasoning=None):
+    delta = SimpleNamespace(content=content, reasoning_content=reasoning)
+    delta.tool_calls = None
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta, finish_reason=None)], usage=None
+    )
+
+
+@pytest.fixture
+def buffer():
+    buf = StreamBuffer()
+    set_stream_buffer(buf)
+    yield buf
+    set_stream_buffer(None)
+
+
+def test_push_delta_is_a_noop_without_a_buffer():
+    set_stream_buffer(None)
+    push_delta("thinking", "text")  # must not raise
+
+
+def test_completions_consumer_streams_deltas(buffer):
+    stream = [_chunk(reasoning="hmm"), _chunk(content="Hel"), _chunk(content="lo")]
+    CompletionsStreamConsumer().consume(iter(stream))
+    assert buffer.snapshot() == ("hmm", "Hello", 3)
+
+
+def test_responses_consumer_streams_deltas(buffer):
+    consumer = ResponsesStreamConsumer()
+    consumer.handle_text_delta(
+        SimpleNamespace(type="response.reasoning_summary_text.delta", delta="plan")
+    )
+    consumer.handle_text_delta(
+        SimpleNamespace(type="response.output_text.delta", delta="done")
+    )
+    assert buffer.snapshot()[:2] == ("plan", "done")
+
+
+def test_deltas_from_other_threads_are_not_captured(buffer):
+    worker = threading.Thread(target=push_delta, kwargs={"content": "elsewhere"})
+    worker.start()
+    worker.join()
+    assert buffer.snapshot() == ("", "", 0)
+
+
+def test_view_rerenders_at_most_once_per_interval():
+    buf = StreamBuffer()
+    console = _terminal_console()
+    with LiveStreamView(
+        buf, "Waiting...", console=console, refresh_seconds=0.2
+    ) as view:
+        buf.push(content="# Title")
+        assert view.tick(now=1.0) is True
+        buf.push(content="\n\nmore")
+        # Within the throttle interval: no re-render even though text arrived.
+        assert view.tick(now=1.1) is False
+        assert view.tick(now=1.3) is True
+        # Nothing new since the last render.
+        assert view.tick(now=1.6) is False
+    assert view.renders == 2
+
+
+def test_view_shows_only_the_tail_of_long_answers():
+    console = _terminal_console()
+    view = LiveStreamView(StreamBuffer(), "Waiting...", console=console)
+    content = "\n\n".join(f"line {n}" for n in range(100))
+    console.print(view.render("", content))
+    output = console.file.getvalue()
+    assert "line 99" in output
+    assert "line 0\n" not in output
+    assert "Enter to cancel" in output
+
+
+def test_live_render_disabled_for_non_terminals_and_by_config(monkeypatch):
+    monkeypatch.setattr("janito.config_store.get_config_value", lambda key: None)
+    assert live_render_enabled(_terminal_console())
+    assert not live_render_enabled(Console(file=io.StringIO()))
+    monkeypatch.setattr(
+        "janito.config_store.get_config_value",
+        lambda key: False if key == "live-render" else None,
+    )
+    assert not live_render_enabled(_terminal_console())
+
+
+def test_enter_cancels_while_rendering_live(monkeypatch):
+    """Enter-to-cancel keeps working when the live view replaces the spinner."""
+    started = threading.Event()
+
+    def streaming_worker(cancel_event=None):
+        push_delta(content="partial answer")
+        started.set()
+        while not cancel_event.is_set():
+            time.sleep(0.01)
+        return "partial"
+
+    monkeypatch.setattr(completions_api, "live_render_enabled", lambda console: True)
+    monkeypatch.setattr(completions_api, "Console", _terminal_console)
+    monkeypatch.setattr(completions_api, "_is_enter_pressed", started.is_set)
+
+    with pytest.raises(RequestCancelled) as info:
+        completions_api._run_with_progress_bar(streaming_worker)
+    assert info.value.partial_result == "partial"
+
+
+def test_live_run_returns_the_worker_result(monkeypatch):
+    monkeypatch.setattr(completions_api, "live_render_enabled", lambda console: True)
+    monkeypatch.setattr(completions_api, "Console", _terminal_console)
+    monkeypatch.setattr(completions_api, "_is_enter_pressed", lambda: False)
+
+    def worker(cancel_event=None):
+        push_delta(reasoning="think", content="answer")
+        return "result"
+
+    assert completions_api._run_with_progress_bar(worker) == "result"
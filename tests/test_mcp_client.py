@@ -11,6 +11,12 @@ Covers the three bugs fixed around the transports:
 - the HTTP transport clears its connected flag when a request fails, so
   callers can detect the loss and reconnect.
 
+It also covers the on-disk tool catalog cache (:mod:`janito.mcp_catalog`):
+catalogs keyed by service config + server identity, restored on connect,
+revalidated in the background and invalidated by ``tools/list_changed``,
+and the service supervisor (:mod:`janito.mcp_supervisor`): crash restarts
+with backoff, idle shutdown with lazy restart, and call-latency accounting.
+
 Each test spins up a tiny fake MCP server (stdio subprocess or HTTP/SSE
 thread) and drives the real transport code end to end.
 """
@@ -27,9 +33,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import pytest
 
 import janito.config_dir as config_dir_mod
+import janito.mcp_manager as mcp_manager_mod
+from janito.mcp_catalog import catalog_fingerprint, get_cached_tools
 from janito.mcp_client import HttpTransport, StdioTransport, create_transport
-from janito.mcp_config import add_service, remove_service
+from janito.mcp_config import add_service, get_service, remove_service
 from janito.mcp_manager import MCPManager
+from janito.mcp_supervisor import MCPSupervisor, backoff_delay
 
 # ---------------------------------------------------------------------------
 # Fake stdio MCP server (written to a temp file, then spawned as a subprocess)
@@ -61,6 +70,15 @@ def main():
             }
         elif method in ("initialized", "notifications/initialized"):
             continue
+        elif method == "ping":
+            # Announce a tool list change before answering.
+            sys.stdout.write(
+                json.dumps(
+                    {"jsonrpc": "2.0", "method": "notifications/tools/list_changed"}
+                )
+                + "\\n"
+            )
+            result = {}
         elif method == "tools/list":
             result = {
                 "tools": [
@@ -277,6 +295,273 @@ def test_mcp_manager_reconnect_keeps_tools(tmp_path, _isolate):
         remove_service("loc")
 
 
+# ---------------------------------------------------------------------------
+# On-disk tool catalog cache
+# ---------------------------------------------------------------------------
+
+
+def test_catalog_fingerprint_tracks_config_and_server_identity():
+    """Changing the config or the server version changes the fingerprint."""
+    config = {"transport": "stdio", "command": "srv"}
+    info = {"name": "fake", "version": "1.0.0"}
+    base = catalog_fingerprint(config, info)
+
+    assert catalog_fingerprint(dict(config), dict(info)) == base
+    assert catalog_fingerprint(config, {**info, "version": "1.0.1"}) != base
+    assert catalog_fingerprint({**config, "command": "other"}, info) != base
+
+
+def test_mcp_manager_persists_and_restores_catalog(tmp_path, _isolate, monkeypatch):
+    """A listed catalog is persisted and advertised by the next manager."""
+    server = _write_fake_stdio_server(tmp_path)
+    add_service("loc", {"transport": "stdio", "command": f"{sys.executable} {server}"})
+
+    first = MCPManager()
+    try:
+        first.load_services(["loc"])
+        tools = first.get_all_tools()
+        assert first._clients["loc"].server_info == {
+            "name": "fake",
+            "version": "1.0.0",
+        }
+    finally:
+        first.shutdown()
+
+    fingerprint = catalog_fingerprint(
+        get_service("loc"), {"name": "fake", "version": "1.0.0"}
+    )
+    assert get_cached_tools("loc", fingerprint) == tools
+
+    # Mark the cached copy so we can tell it apart from a live listing.
+    cached = [
+        dict(t, function=dict(t["function"], description="cached")) for t in tools
+    ]
+    mcp_manager_mod.save_cached_tools("loc", fingerprint, cached)
+
+    monkeypatch.setattr(
+        MCPManager, "_revalidate_in_background", lambda self, name: None
+    )
+    second = MCPManager()
+    try:
+        second.load_services(["loc"])
+        restored = second.get_all_tools()
+        assert [t["function"]["description"] for t in restored] == ["cached", "cached"]
+        assert second.call_tool("loc_add", {"a": 1, "b": 2}) == "sum: 3"
+    finally:
+        second.shutdown()
+        remove_service("loc")
+
+
+def test_mcp_manager_revalidates_cached_catalog(tmp_path, _isolate):
+    """Background revalidation replaces a stale cached catalog."""
+    server = _write_fake_stdio_server(tmp_path)
+    add_service("loc", {"transport": "stdio", "command": f"{sys.executable} {server}"})
+    fingerprint = catalog_fingerprint(
+        get_service("loc"), {"name": "fake", "version": "1.0.0"}
+    )
+    stale = [
+        {
+            "type": "function",
+            "function": {"name": "loc_gone", "description": "", "parameters": {}},
+        }
+    ]
+    mcp_manager_mod.save_cached_tools("loc", fingerprint, stale)
+
+    manager = MCPManager()
+    try:
+        manager.load_services(["loc"])
+        manager._revalidations["loc"].join(timeout=10)
+
+        names = [t["function"]["name"] for t in manager.get_all_tools()]
+        assert names == ["loc_echo", "loc_add"]
+        assert [
+            t["function"]["name"] for t in get_cached_tools("loc", fingerprint)
+        ] == names
+    finally:
+        manager.shutdown()
+        remove_service("loc")
+
+
+def test_mcp_manager_tools_list_changed_invalidates_catalog(tmp_path, _isolate):
+    """A tools/list_changed notification drops the memory and disk catalogs."""
+    server = _write_fake_stdio_server(tmp_path)
+    add_service("loc", {"transport": "stdio", "command": f"{sys.executable} {server}"})
+    fingerprint = catalog_fingerprint(
+        get_service("loc"), {"name": "fake", "version": "1.0.0"}
+    )
+
+    manager = MCPManager()
+    try:
+        manager.load_services(["loc"])
+        manager.get_all_tools()
+        assert get_cached_tools("loc", fingerprint) is not None
+
+        # The server emits the notification before answering the ping.
+        manager._clients["loc"].send_request("ping")
+
+        assert "loc" not in manager._service_tools
+        assert get_cached_tools("loc", fingerprint) is None
+        names = [t["function"]["name"] for t in manager.get_all_tools()]
+        assert names == ["loc_echo", "loc_add"]
+    finally:
+        manager.shutdown()
+        remove_service("loc")
+
+
+# ---------------------------------------------------------------------------
+# Service supervisor
+# ---------------------------------------------------------------------------
+
+
+def test_backoff_delay_doubles_and_caps():
+    """Restart delays grow exponentially and are capped."""
+    assert backoff_delay(0) == 0
+    assert [backoff_delay(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 8]
+    assert backoff_delay(50) == 300
+
+
+def test_supervisor_restarts_crashed_service(tmp_path, _isolate):
+    """A dead stdio server is detected by the health check and restarted."""
+    server = _write_fake_stdio_server(tmp_path)
+    add_service("loc", {"transport": "stdio", "command": f"{sys.executable} {server}"})
+    manager = MCPManager()
+    try:
+        manager.load_services(["loc"])
+        manager.get_all_tools()
+        supervisor = MCPSupervisor(manager, interval=0, idle_ttl=0)
+
+        client = manager._clients["loc"]
+        client.process.terminate()
+        client.process.wait()
+
+        supervisor.check(now=100.0)
+        health = manager.get_health("loc")
+        assert health.state == "crashed"
+        assert health.next_restart_at == 101.0
+
+        # Still inside the backoff window: nothing happens.
+        supervisor.check(now=100.5)
+        assert health.state == "crashed"
+
+        supervisor.check(now=101.0)
+        assert health.state == "running"
+        assert health.restarts == 1
+        assert client.is_connected
+        assert manager.call_tool("loc_add", {"a": 1, "b": 1}) == "sum: 2"
+    finally:
+        manager.shutdown()
+        remove_service("loc")
+
+
+def test_supervisor_restarts_hung_service(tmp_path, _isolate):
+    """A live stdio server that stops answering pings is restarted for real."""
+    server = _write_fake_stdio_server(tmp_path)
+    add_service("loc", {"transport": "stdio", "command": f"{sys.executable} {server}"})
+    manager = MCPManager()
+    try:
+        manager.load_services(["loc"])
+        manager.get_all_tools()
+        supervisor = MCPSupervisor(manager, interval=0, idle_ttl=0)
+        client = manager._clients["loc"]
+        hung = client.process
+
+        def timeout(method, *args, **kwargs):
+            raise TimeoutError(f"{method} timed out")
+
+        client.send_request = timeout
+        supervisor.check(now=100.0)
+        health = manager.get_health("loc")
+        assert health.state == "crashed"
+        assert client.is_connected  # the process is still alive
+
+        del client.send_request
+        supervisor.check(now=101.0)
+        assert health.state == "running"
+        assert health.restarts == 1
+        assert client.process is not hung
+        assert hung.poll() is not None
+        assert manager.call_tool("loc_add", {"a": 1, "b": 1}) == "sum: 2"
+    finally:
+        manager.shutdown()
+        remove_service("loc")
+
+
+def test_supervisor_idle_shutdown_and_lazy_restart(tmp_path, _isolate):
+    """Idle services stop, keep their tools and restart on the next call."""
+    server = _write_fake_stdio_server(tmp_path)
+    add_service("loc", {"transport": "stdio", "command": f"{sys.executable} {server}"})
+    manager = MCPManager()
+    try:
+        manager.load_services(["loc"])
+        manager.get_all_tools()
+        health = manager.get_health("loc")
+        supervisor = MCPSupervisor(manager, interval=0, idle_ttl=60)
+
+        supervisor.check(now=health.last_used + 61)
+        client = manager._clients["loc"]
+        assert health.state == "idle"
+        assert not client.is_connected
+
+        # The catalog is still advertised without waking the service.
+        names = [t["function"]["name"] for t in manager.get_all_tools()]
+        assert names == ["loc_echo", "loc_add"]
+        assert not client.is_connected
+
+        assert manager.call_tool("loc_echo", {"message": "hi"}) == "echo: hi"
+        assert health.state == "running"
+        assert health.restarts == 1
+        assert health.calls == 1
+        assert health.last_latency is not None
+
+        status = manager.service_status()["loc"]
+        assert status["state"] == "running"
+        assert status["connected"] is True
+        assert status["calls"] == 1
+        assert status["avg_latency_ms"] is not None
+    finally:
+        manager.shutdown()
+        remove_service("loc")
+
+
+class _SlowTransport:
+    """A transport whose connect blocks until ``release`` is set."""
+
+    def __init__(self):
+        self.is_connected = False
+        self.connecting = threading.Event()
+        self.release = threading.Event()
+
+    def connect(self):
+        self.connecting.set()
+        self.release.wait(5)
+        self.is_connected = True
+        return True
+
+    def disconnect(self):
+        self.is_connected = False
+
+
+def test_slow_restart_does_not_block_other_services():
+    """A service reconnecting keeps the manager lock free for the others."""
+    manager = MCPManager()
+    slow, other = _SlowTransport(), _SlowTransport()
+    other.is_connected = True
+    manager._clients.update(slow=slow, other=other)
+    restart = threading.Thread(target=manager.restart_service, args=("slow",))
+    restart.start()
+    try:
+        assert slow.connecting.wait(2)
+        stop = threading.Thread(target=manager.idle_shutdown, args=("other",))
+        stop.start()
+        stop.join(2)
+        assert not stop.is_alive() and not other.is_connected
+        assert manager.service_status()["other"]["connected"] is False
+    finally:
+        slow.release.set()
+        restart.join(5)
+    assert slow.is_connected
+
+
 # ---------------------------------------------------------------------------
 # HTTP transport
 # ---------------------------------------------------------------------------
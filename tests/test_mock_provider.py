@@ -0,0 +1,200 @@
+"""
+Tests for the offline ``mock`` provider (``janito.providers.mock``).
+
+The mock server is driven with the real ``openai`` / ``anthropic`` SDKs and
+janito's own stream consumers, so the scripted streams must be parsed exactly
+like a real provider's: scripted tool calls in the first rounds, the
+deterministic answer afterwards, usage, latency and injected errors.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import openai
+import pytest
+
+import janito.config_dir as config_dir_mod
+import janito.provider_accessors as pa
+from janito.openai_client.anthropic_stream import AnthropicStreamConsumer
+from janito.openai_client.completions_stream import CompletionsStreamConsumer
+from janito.openai_client.responses_stream import ResponsesStreamConsumer
+from janito.providers.mock import server as mock_server
+from janito.providers.mock.scenario import MockScenario, load_scenario, request_round
+
+SCRIPT = [[{"name": "ReadFile", "arguments": {"path": "README.md"}}]]
+
+
+@pytest.fixture
+def server():
+    srv = mock_server.MockServer(("127.0.0.1", 0)).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _openai(srv):
+    return openai.OpenAI(base_url=srv.base_url, api_key="mock", max_retries=0)
+
+
+def _chat(client, messages):
+    stream = client.chat.completions.create(
+        model="mock-1",
+        messages=messages,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    return CompletionsStreamConsumer().consume(stream)
+
+
+# ---- Scenario -------------------------------------------------------------
+
+
+def test_round_counts_tool_batches_after_the_last_user_message():
+    assert request_round(["user"]) == 0
+    assert request_round(["user", "other", "tool", "tool"]) == 1
+    assert request_round(["user", "other", "tool", "other", "tool"]) == 2
+    assert request_round(["user", "other", "tool", "user"]) == 0
+
+
+def test_plans_are_deterministic_and_fail_first():
+    first = MockScenario(output_tokens=5, fail_first=1, error_kinds=["500"])
+    second = MockScenario(output_tokens=5)
+    failed = first.plan(0, 10)
+    assert failed.error == "500"
+    assert first.plan(0, 10).tokens == second.plan(0, 10).tokens
+    assert len(second.plan(0, 10).tokens) == 5
+
+
+def test_scenario_files_reject_unknown_fields(tmp_path):
+    path = tmp_path / "scenario.json"
+    path.write_text('{"ttft_ms": 5, "bogus": 1}')
+    with pytest.raises(ValueError, match="bogus"):
+        load_scenario(path)
+    path.write_text('{"error_kinds": ["418"]}')
+    with pytest.raises(ValueError, match="418"):
+        load_scenario(path)
+
+
+# ---- Streams through the real SDKs ------------------------------------------
+
+
+def test_completions_script_then_answer(server):
+    server.scenario = MockScenario(tool_calls=SCRIPT, content="All done.")
+    client = _openai(server)
+    messages = [{"role": "user", "content": "read the readme"}]
+
+    content, _, calls, usage, raw = _chat(client, messages)
+    assert content == ""
+    assert calls[0]["name"] == "ReadFile"
+    assert calls[0]["arguments"] == '{"path": "README.md"}'
+    assert raw["finish_reason"] == "tool_calls"
+    assert usage.completion_tokens > 0
+
+    messages += [
+        {"role": "assistant", "content": None, "tool_calls": []},
+        {"role": "tool", "tool_call_id": calls[0]["id"], "content": "# readme"},
+    ]
+    content, _, calls, _, raw = _chat(client, messages)
+    assert (content, calls, raw["finish_reason"]) == ("All done.", {}, "stop")
+
+
+def test_responses_stream(server):
+    server.scenario = MockScenario(tool_calls=SCRIPT)
+    stream = _openai(server).responses.create(
+        model="mock-1", input=[{"role": "user", "content": "hi"}], stream=True
+    )
+    _, _, calls, usage, response_id, _ = ResponsesStreamConsumer().consume(stream)
+    assert calls == [
+        {
+            "call_id": "call_0_0",
+            "name": "ReadFile",
+            "arguments": '{"path": "README.md"}',
+        }
+    ]
+    assert response_id.startswith("resp_mock_")
+    assert usage.output_tokens > 0
+
+
+def test_anthropic_stream(server):
+    anthropic = pytest.importorskip("anthropic")
+    server.scenario = MockScenario(content="Hello from the mock.")
+    client = anthropic.Anthropic(base_url=server.base_url[: -len("/v1")], api_key="m")
+    stream = client.messages.create(
+        model="mock-1",
+        max_tokens=64,
+        messages=[{"role": "user", "content": "hi"}],
+        stream=True,
+    )
+    content, _, blocks, usage, raw = AnthropicStreamConsumer().consume(stream)
+    assert content == "Hello from the mock."
+    assert blocks == [] and raw["stop_reason"] == "end_turn"
+    assert usage.output_tokens == 4
+
+
+# ---- Latency and errors -----------------------------------------------------
+
+
+def test_time_to_first_token(server):
+    server.scenario = MockScenario(output_tokens=2, ttft_ms=150)
+    start = time.monotonic()
+    _chat(_openai(server), [{"role": "user", "content": "hi"}])
+    assert time.monotonic() - start >= 0.15
+
+
+@pytest.mark.parametrize(
+    "kind, error", [("429", openai.RateLimitError), ("500", openai.InternalServerError)]
+)
+def test_injected_http_errors(server, kind, error):
+    server.scenario = MockScenario(fail_first=1, error_kinds=[kind])
+    client = _openai(server)
+    with pytest.raises(error):
+        _chat(client, [{"role": "user", "content": "hi"}])
+    # The next request is served.
+    assert _chat(client, [{"role": "user", "content": "hi"}])[0]
+
+
+def test_injected_disconnect_truncates_the_stream(server):
+    server.scenario = MockScenario(
+        output_tokens=20, fail_first=1, error_kinds=["disconnect"]
+    )
+    content, _, _, usage, raw = _chat(
+        _openai(server), [{"role": "user", "content": "hi"}]
+    )
+    assert 0 < len(content.split()) < 20
+    assert usage is None and "finish_reason" not in raw
+
+
+# ---- Provider wiring ------------------------------------------------------------
+
+
+def test_mock_provider_needs_no_api_key(monkeypatch, tmp_path):
+    from janito.openai_client.completions_api import resolve_runtime_config
+
+    monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+    started = []
+    monkeypatch.setattr(mock_server, "ensure_mock_server", started.append)
+
+    base_url, api_key, model = resolve_runtime_config(None, "mock")
+    assert (api_key, model) == ("mock", "mock-1")
+    assert base_url == pa.get_endpoint_for_api_type("mock", "Completions")
+    assert started == [base_url]
+    assert pa.requires_api_key("openai") and not pa.requires_api_key("mock")
+
+
+def test_ensure_mock_server_only_serves_loopback_once(monkeypatch):
+    monkeypatch.setattr(mock_server, "_servers", {})
+    probe = mock_server.MockServer(("127.0.0.1", 0))
+    port = probe.server_address[1]
+    probe.server_close()
+    url = f"http://127.0.0.1:{port}/v1"
+
+    assert not mock_server.ensure_mock_server("https://api.example.com/v1")
+    assert mock_server.ensure_mock_server(url, MockScenario(content="up"))
+    assert not mock_server.ensure_mock_server(url)
+    client = openai.OpenAI(base_url=url, api_key="mock")
+    assert _chat(client, [{"role": "user", "content": "hi"}])[0] == "up"
+    mock_server._servers[("127.0.0.1", port)].shutdown()
@@ -0,0 +1,191 @@
+"""
+Tests for the client-side rate limiter (janito/agent/ratelimit.py).
+
+The buckets serve reservations in arrival order, the provider headers
+(OpenAI, Anthropic, ``retry-after``) size and pause them, the limits come
+from the config or the provider's built-ins, and both agent loops wait for
+a slot and report the wait as ``queue_ms``.
+"""
+
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import openai
+import pytest
+from rich.console import Console
+
+import janito.config_dir as config_dir_mod
+from janito.agent import ratelimit
+from janito.agent.pipeline import PipelineConfig
+from janito.agent.pipeline.loop import stream_prompt
+from janito.agent.ratelimit import RateLimiter, get_rate_limiter, parse_duration
+from janito.agent.usage import add_queue_wait, get_prompt_usage, reset_prompt_usage
+from janito.config_store import set_config_value
+from janito.openai_client.client_support import _display_usage
+from janito.openai_client.completions_api import resolve_runtime_config
+from janito.providers.mock import server as mock_server
+from janito.providers.mock.scenario import MockScenario
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch, tmp_path):
+    monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+    ratelimit.reset_rate_limiters()
+    reset_prompt_usage()
+    yield
+    ratelimit.reset_rate_limiters()
+    reset_prompt_usage()
+
+
+def test_reservations_are_served_in_arrival_order():
+    limiter = RateLimiter(requests_per_minute=60)
+    # A full bucket: 60 requests go out at once, the next ones are spaced
+    # by the refill rate (one per second).
+    assert [limiter.reserve() for _ in range(60)] == [0.0] * 60
+    assert limiter.reserve() == pytest.approx(1.0, abs=0.05)
+    assert limiter.reserve() == pytest.approx(2.0, abs=0.05)
+
+
+def test_token_reservations_are_settled_with_the_actual_usage():
+    limiter = RateLimiter(tokens_per_minute=600)
+    assert limiter.reserve(600) == 0.0
+    assert limiter.reserve(60) == pytest.approx(6.0, abs=0.05)
+    # The first round used far fewer tokens than estimated.
+    limiter.settle(600, 100)
+    assert limiter.reserve(60) < 6.0
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [
+        ("2", 2.0),
+        ("0.5", 0.5),
+        ("1m30s", 90.0),
+        ("250ms", 0.25),
+        ("6m0.2s", 360.2),
+        ("soon", None),
+        (None, None),
+    ],
+)
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == (
+        pytest.approx(seconds) if seconds is not None else None
+    )
+
+
+def test_parse_duration_of_timestamps_is_relative_to_now():
+    assert parse_duration("2000-01-01T00:00:00Z") == 0.0
+    assert 5 < parse_duration("2999-01-01T00:00:00Z")
+
+
+def test_openai_headers_learn_the_limit_and_pause_when_exhausted():
+    limiter = RateLimiter()
+    limiter.observe_headers(
+        {
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "1.5s",
+        }
+    )
+    assert limiter.buckets["requests"].per_minute == 500
+    assert limiter.reserve() == pytest.approx(1.5, abs=0.05)
+
+
+def test_anthropic_headers_clamp_but_never_replace_a_configured_limit():
+    limiter = RateLimiter(tokens_per_minute=1000)
+    limiter.observe_headers(
+        {
+            "anthropic-ratelimit-tokens-limit": "80000",
+            "anthropic-ratelimit-tokens-remaining": "100",
+        }
+    )
+    assert limiter.buckets["tokens"].per_minute == 1000
+    assert limiter.buckets["tokens"].level == pytest.approx(100, abs=1)
+
+
+def test_retry_after_pauses_and_is_capped():
+    limiter = RateLimiter()
+    limiter.observe_headers({"retry-after-ms": "1200", "retry-after": "9"})
+    assert limiter.reserve() == pytest.approx(1.2, abs=0.05)
+    limiter.observe_headers({"retry-after": "86400"})
+    assert limiter.reserve() <= ratelimit.MAX_HEADER_PAUSE
+
+
+def test_limits_come_from_the_config_then_the_provider(monkeypatch):
+    monkeypatch.setattr(
+        "janito.provider_accessors.get_default_rate_limits_from_provider",
+        lambda provider: {"requests_per_minute": 50, "tokens_per_minute": 9000},
+    )
+    set_config_value("openai.rate-limit-rpm", 10)
+    limiter = get_rate_limiter("openai", "k1")
+    assert limiter.buckets["requests"].per_minute == 10
+    assert limiter.buckets["tokens"].per_minute == 9000
+    assert get_rate_limiter("OpenAI", "k1") is limiter
+    assert get_rate_limiter("openai", "k2") is not limiter
+
+
+def test_header_hook_feeds_the_limiter_from_sdk_responses():
+    def respond(request):
+        return httpx.Response(
+            429, headers={"retry-after": "2"}, json={"error": {"message": "slow"}}
+        )
+
+    client = openai.OpenAI(
+        api_key="k",
+        base_url="http://test/v1",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(respond)),
+    )
+    limiter = RateLimiter()
+    assert ratelimit.install_header_hook(client, limiter)
+    assert not ratelimit.install_header_hook(object(), limiter)
+    with pytest.raises(openai.RateLimitError):
+        client.models.list()
+    assert limiter.reserve() == pytest.approx(2.0, abs=0.1)
+
+
+def test_queue_wait_is_shown_in_the_usage_summary():
+    add_queue_wait(1.25)
+    assert get_prompt_usage() == {"queue_ms": 1250}
+    console = Console(file=io.StringIO(), width=200)
+    _display_usage(
+        SimpleNamespace(total_tokens=3, prompt_tokens=2, completion_tokens=1),
+        None,
+        None,
+        2,
+        console,
+    )
+    assert "Queued: 1.2s" in console.file.getvalue()
+
+
+def test_web_loop_waits_for_the_limiter_and_reports_queue_ms():
+    srv = mock_server.MockServer(("127.0.0.1", 0), MockScenario(content="ok")).start()
+    try:
+        set_config_value("mock.endpoint", srv.base_url)
+        set_config_value("mock.rate-limit-rpm", 60)
+        _, api_key, _ = resolve_runtime_config(cli_provider="mock")
+        limiter = get_rate_limiter("mock", api_key)
+        for _ in range(60):
+            limiter.reserve()
+
+        async def run():
+            config = PipelineConfig(provider="mock", api_type="Completions")
+            return [e async for e in stream_prompt("hi", [], config, tools=[])]
+
+        start = time.monotonic()
+        events = asyncio.run(run())
+        assert time.monotonic() - start >= 0.9
+        (usage,) = [e for e in events if e.type == "usage"]
+        assert 900 <= usage.queue_ms <= 1500
+        assert usage.to_dict()["queue_ms"] == usage.queue_ms
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,309 @@
+"""
+Tests for endpoint pools (janito/agent/routing.py).
+
+A pool spreads rounds over a provider and its variants by outstanding
+requests, opens a circuit breaker on repeated transient failures and keeps
+Responses chains on the endpoint that created them.  End to end, both agent
+loops fail over from a failing mock server to a healthy variant.
+"""
+
+import asyncio
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import openai
+import pytest
+from rich.console import Console
+
+import janito.config_dir as config_dir_mod
+from janito.agent import routing
+from janito.agent.pipeline import PipelineConfig
+from janito.agent.pipeline.loop import stream_prompt
+from janito.agent.routing import Endpoint, EndpointPool, Route
+from janito.cli.chat import _make_send_prompt_func
+from janito.config_cli import set_config_from_cli
+from janito.config_store import get_config_value, set_config_value
+from janito.config_variants import create_variant, load_pool
+from janito.openai_client import base_client, conversations_api
+from janito.openai_client.base_client import Client
+from janito.openai_client.live_stream import push_delta
+from janito.providers.mock import server as mock_server
+from janito.providers.mock.scenario import MockScenario
+
+
+@pytest.fixture(autouse=True)
+def config_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+    routing.reset_endpoint_pools()
+    yield
+    routing.reset_endpoint_pools()
+
+
+def _pool(*names):
+    return EndpointPool([Endpoint(name, f"http://{name}", "k") for name in names])
+
+
+def _error(status):
+    request = httpx.Request("POST", "http://x/v1/chat/completions")
+    response = httpx.Response(status, request=request)
+    error_class = {429: openai.RateLimitError, 400: openai.BadRequestError}.get(
+        status, openai.InternalServerError
+    )
+    return error_class("failed", response=response, body=None)
+
+
+# ---- Balancing and breakers ----------------------------------------------------
+
+
+def test_picks_the_least_outstanding_endpoint_then_alternates():
+    pool = _pool("a", "b")
+    first = pool.pick()
+    second = pool.pick()
+    assert second is not first  # ``first`` is still in flight
+    pool.release(first)
+    pool.release(second)
+    # Idle pool: a conversation stays where it is, a new one alternates.
+    assert pool.pick(prefer=first) is first
+    pool.release(first)
+    assert [e.provider for e in (pool.pick(), pool.pick())] == ["b", "a"]
+
+
+def test_breaker_opens_after_repeated_transient_failures():
+    pool = _pool("a", "b")
+    a, b = pool.endpoints
+    for _ in range(routing.BREAKER_THRESHOLD):
+        pool.release(pool.take(a), _error(503))
+    assert a.is_open(routing.time.monotonic())
+    assert {pool.pick().provider for _ in range(3)} == {"b"}
+    # A 400 says nothing about the endpoint's health.
+    pool.release(pool.take(b), _error(400))
+    assert b.failures == 0
+    # After the cooldown ``a`` gets a trial round; a success closes it.
+    a.open_until = 0.0
+    pool.release(pool.pick(exclude={b}))
+    assert a.failures == 0
+
+
+def test_all_open_breakers_fall_back_to_the_first_to_reopen():
+    pool = _pool("a", "b")
+    for endpoint, until in zip(pool.endpoints, (2e9, 1e9)):
+        endpoint.failures = routing.BREAKER_THRESHOLD
+        endpoint.open_until = until
+    assert pool.pick().provider == "b"
+
+
+# ---- Routes ----------------------------------------------------------------------
+
+
+def test_route_fails_over_once_per_endpoint_on_transient_errors_only():
+    route = Route(_pool("a", "b"))
+    assert route.acquire().provider == "a"
+    assert route.release(_error(429))
+    assert route.acquire().provider == "b"
+    assert not route.release(_error(500))  # every endpoint failed
+    route = Route(_pool("a", "b"))
+    route.acquire()
+    assert not route.release(_error(400))
+    assert route.pinned is None
+
+
+def test_responses_chains_stay_on_their_endpoint():
+    pool = _pool("a", "b")
+    route = Route(pool)
+    route.acquire()
+    route.release()
+    route.pin("resp_1")
+    assert route.acquire().provider == "a"
+    # A pinned route never fails over: the chain only exists there.
+    assert not route.release(_error(503))
+
+    follow_up = Route(pool, sticky_key="resp_1")
+    assert follow_up.acquire().provider == "a"
+    follow_up.release()
+    # Unknown chains go to the provider itself.
+    assert Route(pool, sticky_key="resp_unknown").acquire().provider == "a"
+
+
+# ---- Configuration ----------------------------------------------------------------
+
+
+def test_pool_members_must_be_variants_of_the_provider():
+    create_variant("mock-backup")
+    create_variant("openai-work")
+    assert set_config_from_cli("pool=mock, MOCK-backup", cli_provider="mock") == (
+        "mock.pool",
+        "mock-backup",
+    )
+    assert load_pool("mock") == ["mock", "mock-backup"]
+    with pytest.raises(ValueError, match="not a variant of 'mock'"):
+        set_config_from_cli("pool=openai-work", cli_provider="mock")
+    with pytest.raises(ValueError):
+        set_config_from_cli("pool=nope", cli_provider="mock")
+    assert get_config_value("mock.pool") == "mock-backup"
+
+
+# ---- CLI failover gate ------------------------------------------------------------
+
+
+class _Limiter:
+    def __init__(self):
+        self.settled = []
+
+    def reserve(self, tokens=0):
+        return 0.0
+
+    def settle(self, reserved, used):
+        self.settled.append((reserved, used))
+
+
+class _FlakyClient(Client):
+    """Endpoint ``a`` streams ``delta`` (if any), then fails with a 500."""
+
+    def __init__(self, delta):
+        super().__init__(use_mcp=False)
+        self.delta = delta
+        self.calls = []
+
+    def _sdk_client(self, base_url, api_key, provider=None):
+        return provider
+
+    def _run_stream_round(self, client, call_kwargs, tools_schemas, state, **kwargs):
+        self.calls.append(client)
+        if client == "a":
+            push_delta(content=self.delta)
+            raise _error(500)
+        return "from b", None, None, None, {}
+
+
+@pytest.mark.parametrize("delta, fails_over", [(None, True), ("partial", False)])
+def test_cli_round_fails_over_only_before_the_first_delta(
+    monkeypatch, delta, fails_over
+):
+    limiters = {"a": _Limiter(), "b": _Limiter()}
+    monkeypatch.setattr(
+        base_client, "get_rate_limiter", lambda provider, key: limiters[provider]
+    )
+    client = _FlakyClient(delta)
+
+    def run():
+        return client._routed_round(
+            Route(_pool("a", "b")),
+            {},
+            {},
+            [],
+            [],
+            estimate=SimpleNamespace(total=100),
+            model="m",
+            console=Console(file=io.StringIO()),
+        )
+
+    if fails_over:
+        assert run()[0][0] == "from b"
+        assert client.calls == ["a", "b"]
+    else:
+        # The partial answer was already shown: the error is final.
+        with pytest.raises(openai.InternalServerError):
+            run()
+        assert client.calls == ["a"]
+    # The failed attempt gives its reserved tokens back.
+    assert limiters["a"].settled == [(100, 0)]
+
+
+def test_cli_round_frees_the_slot_when_the_client_cannot_be_created():
+    pool = _pool("a")
+    client = _FlakyClient(None)
+
+    def broken(base_url, api_key, provider=None):
+        raise ValueError("bad base url")
+
+    client._sdk_client = broken
+    with pytest.raises(ValueError):
+        client._routed_round(
+            Route(pool),
+            {},
+            {},
+            [],
+            [],
+            estimate=None,
+            model="m",
+            console=Console(file=io.StringIO()),
+        )
+    assert [e.outstanding for e in pool.endpoints] == [0]
+
+
+# ---- End to end ----------------------------------------------------------------------
+
+
+@pytest.fixture
+def two_servers():
+    """``mock`` (failing with 500s) pooled with a healthy ``mock-backup``."""
+    failing = mock_server.MockServer(
+        ("127.0.0.1", 0),
+        MockScenario(content="from a", error_rate=1.0, error_kinds=["500"]),
+    ).start()
+    healthy = mock_server.MockServer(
+        ("127.0.0.1", 0), MockScenario(content="from b")
+    ).start()
+    set_config_value("mock.endpoint", failing.base_url)
+    create_variant("mock-backup")
+    set_config_value("mock-backup.endpoint", healthy.base_url)
+    set_config_from_cli("pool=mock-backup", cli_provider="mock")
+    yield failing, healthy
+    for srv in (failing, healthy):
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_cli_fails_over_to_a_healthy_variant(two_servers, capsys):
+    failing, healthy = two_servers
+    send = _make_send_prompt_func("Completions", cli_provider="mock")
+    assert send("hi", previous_messages=[]) == "from b"
+    # The SDK's own retries are exhausted first.
+    assert (failing.scenario.requests, healthy.scenario.requests) == (3, 1)
+    assert "failing over" in capsys.readouterr().out
+
+
+def test_web_loop_fails_over_to_a_healthy_variant(two_servers):
+    failing, healthy = two_servers
+
+    async def run():
+        config = PipelineConfig(provider="mock", api_type="Completions")
+        return [e async for e in stream_prompt("hi", [], config, tools=[])]
+
+    events = asyncio.run(run())
+    assert events[-1].type == "done" and events[-1].full_content == "from b"
+    assert healthy.scenario.requests == 1
+
+
+def test_cli_responses_follow_ups_stay_on_the_chain_endpoint():
+    servers = [
+        mock_server.MockServer(("127.0.0.1", 0), MockScenario(content=name)).start()
+        for name in ("a", "b")
+    ]
+    try:
+        set_config_value("mock.endpoint", servers[0].base_url)
+        set_config_value("mock.models.mock-1.responses-in-server", True)
+        create_variant("mock-backup")
+        set_config_value("mock-backup.endpoint", servers[1].base_url)
+        set_config_from_cli("pool=mock-backup", cli_provider="mock")
+
+        def send(**kwargs):
+            return conversations_api.send_prompt(
+                "hi", tools=[], use_mcp=False, cli_provider="mock", **kwargs
+            )
+
+        first = send()
+        assert first.content == "a" and first.response_id
+        # Left alone, the idle pool would alternate to ``b``.
+        assert send(previous_response_id=first.response_id).content == "a"
+        assert send().content == "b"
+    finally:
+        for srv in servers:
+            srv.shutdown()
+            srv.server_close()
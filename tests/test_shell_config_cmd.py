@@ -274,3 +274,32 @@ class TestStatusCmdHandlerApiType:
             assert StatusCmdHandler().handle(FakeShell(), "/status") is True
 
         assert calls["cli_api_type"] is None
+
+
+def test_status_shows_last_request_estimate(capsys, monkeypatch):
+    """/status breaks the last request down by section (pre-flight estimate)."""
+    import janito.agent.tokens as tokens
+    from janito.shell.cmds.status import _print_request_estimate
+
+    monkeypatch.setattr(tokens, "_last_estimate", None)
+    _print_request_estimate()
+    assert capsys.readouterr().out == ""
+
+    tokens.record_estimate(
+        tokens.PromptEstimate(
+            system=100,
+            tools={"read_file": 300, "run_bash": 50},
+            history=1000,
+            tool_results=400,
+            family="anthropic",
+            ratio=1.5,
+        )
+    )
+    _print_request_estimate()
+    out = capsys.readouterr().out
+    assert "Last Request" in out
+    assert "Tools (2)" in out and "~525" in out
+    assert "read_file" in out and "~450" in out
+    assert "Latest tool results" in out and "~600" in out
+    assert "~2775" in out
+    assert "x1.50 (anthropic)" in out
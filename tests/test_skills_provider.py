@@ -9,9 +9,15 @@ Skills can be discovered from two locations:
 Local skills with the same name as a home skill should take precedence.
 Each skill must track its own filesystem path so that resources are loaded
 from the correct directory.
+
+Discovery goes through the on-disk skills index, revalidated by mtimes, and
+the advertisement is capped by a token budget with ``search_skills`` for the
+skills left out.
 """
 
+import os
 import sys
+import time
 from pathlib import Path
 
 # Add the repo root to sys.path to allow importing the package directly.
@@ -20,6 +26,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import pytest
 
 import janito.config_dir as config_dir_mod
+import janito.tooling.skills_provider as skills_provider_mod
 from janito.tooling.skills_provider import SkillsProvider, get_local_skills_dir
 
 # ---------------------------------------------------------------------------
@@ -43,6 +50,13 @@ def _make_resource(skill_dir: Path, filename: str, content: str = "resource cont
     (skill_dir / filename).write_text(content, encoding="utf-8")
 
 
+def _age(*paths: Path) -> None:
+    """Backdate paths past the racy window so the index trusts their mtimes."""
+    old = time.time() - 60
+    for path in paths:
+        os.utime(path, (old, old))
+
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -247,6 +261,74 @@ if pytest is not None:
         assert len(skills) == 1
         assert skills[0]["source"] == "home"
 
+    # ------------------------------------------------------------------
+    # On-disk index
+    # ------------------------------------------------------------------
+
+    def test_index_reuses_unchanged_skills_without_reading_them(monkeypatch, tmp_path):
+        monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+        base = tmp_path / "skills"
+        skill = _make_skill(base, "pdf", "Fill PDF forms.")
+        _make_resource(skill, "forms.md")
+        _age(skill / "SKILL.md", skill / "forms.md", skill, base)
+        SkillsProvider(skill_paths=[(base, "home")])
+        assert (tmp_path / ".janito" / "skills_index.json").exists()
+
+        reads = []
+        real_open = open
+        monkeypatch.setattr(
+            "builtins.open",
+            lambda *a, **kw: reads.append(str(a[0])) or real_open(*a, **kw),
+        )
+        provider = SkillsProvider(skill_paths=[(base, "home")])
+        assert not any(path.endswith("SKILL.md") for path in reads)
+        assert provider.get_skill("pdf").description == "Fill PDF forms."
+        assert list(provider.get_skill("pdf").resources) == ["forms.md"]
+
+        # An edited SKILL.md, a new resource and a new skill are picked up.
+        (skill / "SKILL.md").write_text("Fill and sign PDF forms.", encoding="utf-8")
+        _make_resource(skill, "sign.md")
+        _make_skill(base, "docx")
+        provider = SkillsProvider(skill_paths=[(base, "home")])
+        assert provider.get_skill("pdf").description == "Fill and sign PDF forms."
+        assert sorted(provider.get_skill("pdf").resources) == ["forms.md", "sign.md"]
+        assert provider.get_skill("docx") is not None
+
+    # ------------------------------------------------------------------
+    # Budgeted advertisement and search
+    # ------------------------------------------------------------------
+
+    def test_advertisement_is_budgeted_and_search_finds_the_rest(monkeypatch, tmp_path):
+        monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+        home = tmp_path / "home"
+        local = tmp_path / "local"
+        for i in range(30):
+            _make_skill(home, f"skill-{i:02d}", f"Home skill number {i}.")
+        _make_skill(local, "deploy", "Deploy the project " + "x" * 400)
+        provider = SkillsProvider(skill_paths=[(home, "home"), (local, "local")])
+
+        assert not provider.is_truncated(budget=10_000)
+        advertisement = provider.get_advertisement(budget=100)
+        assert provider.is_truncated(budget=100)
+        # Project skills are listed first, with capped descriptions.
+        assert "**deploy**" in advertisement and "x" * 200 not in advertisement
+        assert "more skill(s): call search_skills(query)" in advertisement
+
+        matches = provider.search("number 17")
+        assert matches[0]["name"] == "skill-17"
+        assert provider.search("nothing-like-this") == []
+
+        monkeypatch.setattr(skills_provider_mod, "_global_skills_provider", provider)
+        monkeypatch.setattr(
+            skills_provider_mod, "configured_prompt_tokens", lambda: 100
+        )
+        assert "search_skills" in skills_provider_mod.get_skills_tools()
+        assert "skill-17" in skills_provider_mod.search_skills("number 17")
+        monkeypatch.setattr(
+            skills_provider_mod, "configured_prompt_tokens", lambda: 10_000
+        )
+        assert "search_skills" not in skills_provider_mod.get_skills_tools()
+
 else:  # pragma: no cover - fallback runner without pytest
 
     def _main():
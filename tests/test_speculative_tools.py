@@ -0,0 +1,205 @@
+"""
+Tests for speculative execution of read-only tool calls
+(``janito.tooling.speculative``).
+
+The stream consumers report each tool call as soon as its arguments are
+complete; read-only built-in tools then run in the background and the
+``ToolExecutor`` reuses the result (replaying the captured report lines)
+when the stream has finished, instead of running the tool a second time.
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from janito.openai_client import anthropic_stream, completions_stream, responses_stream
+from janito.tooling import executor, speculative
+from janito.tooling.executor import ToolExecutor
+from janito.tooling.reporter import report_result, report_start, set_report_handler
+from janito.tooling.speculative import JsonObjectTracker, SpeculativeToolRunner
+
+
+@pytest.fixture
+def fake_tool(monkeypatch):
+    """A read-only tool counting its invocations."""
+    calls = []
+
+    def read_thing(path):
+        calls.append(path)
+        report_start(f"Reading {path}")
+        report_result("Read 1 line")
+        return {"success": True, "content": f"contents of {path}"}
+
+    monkeypatch.setattr(executor, "get_tool_by_name", lambda name: read_thing)
+    monkeypatch.setattr(executor, "record_used_file", lambda *a: None)
+    monkeypatch.setattr(executor, "record_change", lambda *a: None)
+    monkeypatch.setattr(executor, "record_tool_use", lambda *a: None)
+    yield calls
+    speculative.reset_speculation(None)
+
+
+# ---- JsonObjectTracker ------------------------------------------------
+
+
+def test_tracker_completes_when_the_object_closes():
+    tracker = JsonObjectTracker()
+    fragments = ['{"pa', 'th": "a}{b\\"', '", "n": [1, {"x": 2}]', "}"]
+    assert [tracker.feed(f) for f in fragments] == [False, False, False, True]
+    json.loads("".join(fragments))  # sanity: the fragments form valid JSON
+    assert tracker.feed("  \n") is True
+
+
+def test_tracker_rejects_trailing_text_and_non_objects():
+    tracker = JsonObjectTracker()
+    tracker.feed("{}")
+    assert tracker.feed("{}") is False
+    assert not JsonObjectTracker().feed("[1, 2]")
+    assert not JsonObjectTracker().feed('"text"')
+
+
+# ---- Stream consumers report completed calls ---------------------------
+
+
+def _tool_chunk(index, call_id=None, name=None, arguments=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    tc = SimpleNamespace(index=index, id=call_id, function=function)
+    delta = SimpleNamespace(content=None, reasoning_content=None, tool_calls=[tc])
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta, finish_reason=None)], usage=None
+    )
+
+
+def test_completions_calls_are_reported_before_the_stream_ends(monkeypatch):
+    ready = []
+    monkeypatch.setattr(
+        completions_stream, "speculate_tool_call", lambda *call: ready.append(call)
+    )
+    consumer = completions_stream.CompletionsStreamConsumer()
+    consumer.handle(_tool_chunk(0, "c0", "read_file", '{"path": '))
+    consumer.handle(_tool_chunk(0, arguments='"a.py"}'))
+    # The first call is reported while the second is still streaming.
+    assert ready == [("c0", "read_file", '{"path": "a.py"}')]
+    consumer.handle(_tool_chunk(1, "c1", "list_files", '{"path": "."'))
+    assert len(ready) == 1
+    consumer.handle(_tool_chunk(1, arguments="}"))
+    assert ready[-1] == ("c1", "list_files", '{"path": "."}')
+
+
+def test_completions_calls_after_an_unfinished_call_are_not_reported(monkeypatch):
+    ready = []
+    monkeypatch.setattr(
+        completions_stream, "speculate_tool_call", lambda *call: ready.append(call)
+    )
+    consumer = completions_stream.CompletionsStreamConsumer()
+    consumer.handle(_tool_chunk(0, "c0", "create_file", '{"path": "a.py"'))
+    consumer.handle(_tool_chunk(1, "c1", "read_file", '{"path": "a.py"}'))
+    assert ready == []
+
+
+def test_anthropic_and_responses_report_finished_calls(monkeypatch):
+    ready = []
+    for module in (anthropic_stream, responses_stream):
+        monkeypatch.setattr(
+            module, "speculate_tool_call", lambda *call: ready.append(call)
+        )
+    consumer = anthropic_stream.AnthropicStreamConsumer()
+    consumer.blocks[0] = {
+        "type": "tool_use",
+        "id": "t0",
+        "name": "read_file",
+        "parts": ['{"path": ', '"a.py"}'],
+    }
+    consumer.handle_content_block_stop(SimpleNamespace(index=0))
+
+    item = SimpleNamespace(
+        type="function_call", id="i1", call_id="r1", name="read_file", arguments="{}"
+    )
+    responses_stream.ResponsesStreamConsumer().handle_output_item(
+        SimpleNamespace(item=item)
+    )
+    assert ready == [("t0", "read_file", {"path": "a.py"}), ("r1", "read_file", "{}")]
+
+
+# ---- Runner and executor ------------------------------------------------
+
+
+def test_only_eligible_tools_run_speculatively(fake_tool):
+    runner = SpeculativeToolRunner(allowed={"read_thing"})
+    assert not runner.dispatch("c0", "read_thing", "{not json")
+    assert runner.dispatch("c1", "read_thing", '{"path": "a"}')
+    assert not runner.dispatch("c2", "create_file", '{"path": "x"}')
+    assert runner.take("c1", "read_thing", {"path": "a"}).result["success"]
+    assert fake_tool == ["a"]
+
+
+def test_only_allowlisted_tools_run_speculatively():
+    runner = SpeculativeToolRunner()
+    assert runner.eligible("ReadFile") and runner.eligible("SearchRegex")
+    # Declared read-only, but interactive or networked.
+    assert not runner.eligible("AskUser")
+    assert not runner.eligible("GetUrl")
+
+
+def test_calls_after_an_ineligible_call_wait_for_their_turn(fake_tool):
+    runner = SpeculativeToolRunner(allowed={"read_thing"})
+    assert runner.dispatch("c0", "read_thing", {"path": "a"})
+    # ``CreateFile foo`` then ``ReadFile foo``: the read must see the write.
+    assert not runner.dispatch("c1", "create_file", {"path": "foo"})
+    assert not runner.dispatch("c2", "read_thing", {"path": "foo"})
+    assert runner.take("c2", "read_thing", {"path": "foo"}) is None
+    assert fake_tool == ["a"]
+    # The next round starts speculating again.
+    runner.begin_round()
+    assert runner.dispatch("c3", "read_thing", {"path": "foo"})
+    assert runner.take("c3", "read_thing", {"path": "foo"}).result["success"]
+
+
+def test_mismatched_final_call_is_not_reused(fake_tool):
+    runner = SpeculativeToolRunner(allowed={"read_thing"})
+    runner.dispatch("c0", "read_thing", {"path": "a"})
+    assert runner.take("c0", "read_thing", {"path": "b"}) is None
+    assert runner.take("c0", "read_thing", {"path": "a"}) is None
+
+
+def test_executor_reuses_the_speculative_result(fake_tool):
+    speculative.reset_speculation(SpeculativeToolRunner(allowed={"read_thing"}))
+    speculative.speculate_tool_call("c0", "read_thing", '{"path": "a.py"}')
+
+    replayed = []
+    set_report_handler(lambda level, message, end: replayed.append((level, message)))
+    try:
+        message = ToolExecutor().execute_tool_call(
+            {
+                "id": "c0",
+                "function": {"name": "read_thing", "arguments": '{"path": "a.py"}'},
+            }
+        )
+    finally:
+        set_report_handler(None)
+
+    assert fake_tool == ["a.py"]
+    assert json.loads(message["content"])["content"] == "contents of a.py"
+    assert replayed == [("start", "Reading a.py"), ("result", "Read 1 line")]
+
+
+def test_speculative_reports_stay_off_the_worker_console(fake_tool, capsys):
+    runner = SpeculativeToolRunner(allowed={"read_thing"})
+    runner.dispatch("c0", "read_thing", {"path": "a"})
+    outcome = runner.take("c0", "read_thing", {"path": "a"})
+    assert outcome.reports[0] == ("start", "Reading a", "\n")
+    assert "Reading a" not in capsys.readouterr().err
+
+
+def test_reset_drops_unclaimed_results(fake_tool):
+    runner = SpeculativeToolRunner(allowed={"read_thing"})
+    speculative.reset_speculation(runner)
+    speculative.speculate_tool_call("c0", "read_thing", '{"path": "a"}')
+    speculative.reset_speculation(None)
+    assert runner.take("c0", "read_thing", {"path": "a"}) is None
+    assert speculative.take_speculative_result("c0", "read_thing", {}) is None
@@ -0,0 +1,75 @@
+"""
+Tests for the stream-accumulator microbenchmark
+(scripts/stream_accumulator_benchmark.py) and the per-chunk work it guards.
+
+The benchmark's synthetic streams interleave content deltas with the
+argument fragments of several tool calls; every accumulator must assemble
+them exactly.  Timings are not asserted (they depend on the machine);
+instead the structural guarantees are: chunk metadata is read from the first
+and terminal chunks only, and argument fragments are joined once.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+from janito.openai_client import completions_stream, dashscope_stream
+
+# scripts/ is not a package, so load the script directly from its path.
+_SCRIPT = Path(__file__).parent.parent / "scripts" / "stream_accumulator_benchmark.py"
+_spec = importlib.util.spec_from_file_location("stream_accumulator_benchmark", _SCRIPT)
+sab = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sab)
+
+
+def test_plan_interleaves_content_and_valid_tool_arguments():
+    plan = sab.build_plan(20, 2)
+    kinds = [step[0] for step in plan]
+    assert kinds[2:6] == ["content", "args", "content", "args"]
+    content, arguments = sab.expected_result(plan, 2)
+    assert content.startswith("w0 w1 ")
+    assert [json.loads(args)["text"] for args in arguments] == ["abababab"] * 2
+
+
+def test_every_accumulator_assembles_the_stream_exactly():
+    # run_benchmarks raises AssertionError on any mismatch.
+    results = sab.run_benchmarks(2_000, 3)
+    assert len(results) == len(sab.BENCHMARKS)
+    assert all(result["chunks"] > 2_000 for result in results)
+
+
+@pytest.mark.parametrize(
+    "module, builder, runner",
+    [
+        (completions_stream, sab.completions_stream, sab.run_completions_consumer),
+        (dashscope_stream, sab.dashscope_stream, sab.run_dashscope_consumer),
+    ],
+)
+def test_chunk_metadata_is_read_from_the_first_and_last_chunks(
+    monkeypatch, module, builder, runner
+):
+    calls = []
+    extract = module._extract_raw_attrs
+
+    def counting_extract(obj, skip=()):
+        calls.append(obj)
+        return extract(obj, skip=skip)
+
+    monkeypatch.setattr(module, "_extract_raw_attrs", counting_extract)
+    stream = builder(sab.build_plan(1_000, 2), 2)
+    runner(stream)
+    assert calls == [stream[0], stream[-1]]
+
+
+def test_tool_call_arguments_are_joined_lazily():
+    acc = sab.CompletionsAccumulator()
+    for chunk in sab.completions_stream(sab.build_plan(100, 1), 1):
+        acc.handle(chunk)
+    # The fragments are only collected while streaming...
+    assert len(acc._argument_parts[0]) > 1
+    arguments = acc.tool_calls[0]["arguments"]
+    # ...and joined once, on first access.
+    assert acc._argument_parts[0] == [arguments]
+    assert json.loads(arguments)["text"] == "ab" * 49
@@ -291,6 +291,34 @@ if pytest is not None:
             }
         ]
 
+    def test_completions_legacy_bridges_fold_into_the_callers_map():
+        """``_consume_chunk`` / ``_consume_tool_call_delta`` join arguments in place."""
+        from janito.openai_client.completions_api import (
+            _consume_chunk,
+            _consume_tool_call_delta,
+        )
+
+        def tc(arguments, call_id=None, name=None):
+            function = SimpleNamespace(name=name, arguments=arguments)
+            return SimpleNamespace(index=0, id=call_id, function=function)
+
+        content, reasoning, tool_calls_map = [], [], {}
+        delta = SimpleNamespace(
+            content="hi",
+            reasoning_content=None,
+            tool_calls=[tc('{"city": ', "call_1", "get_weather")],
+        )
+        _consume_chunk(delta, content, reasoning, tool_calls_map)
+        _consume_tool_call_delta(tc('"Lisbon"}'), tool_calls_map)
+        assert content == ["hi"]
+        assert tool_calls_map == {
+            0: {
+                "id": "call_1",
+                "name": "get_weather",
+                "arguments": '{"city": "Lisbon"}',
+            }
+        }
+
     # ---- AnthropicStreamConsumer --------------------------------------
 
     def test_anthropic_consumer_captures_raw_attrs():
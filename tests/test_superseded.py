@@ -0,0 +1,165 @@
+"""
+Tests for the superseded tool results view (janito/agent/superseded.py).
+
+Re-reads, rewrites and repeated searches make earlier tool results obsolete;
+the history sent stubs them while the history itself keeps every result.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from janito.agent import superseded
+from janito.agent.superseded import stub_text, superseded_history
+
+BIG = "x" * 600
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(superseded, "load_supersede_enabled", lambda: True)
+
+
+def _round(call_id, name, args, result=None):
+    """An assistant tool call and its OpenAI-format tool result."""
+    return [
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(args)},
+                }
+            ],
+        },
+        {
+            "role": "tool",
+            "tool_call_id": call_id,
+            "name": name,
+            "content": result or json.dumps({"success": True, "content": BIG}),
+        },
+    ]
+
+
+def _contents(messages):
+    return [m["content"] for m in messages if m.get("role") == "tool"]
+
+
+def test_reread_supersedes_the_earlier_read():
+    history = [{"role": "user", "content": "fix foo.py"}]
+    history += _round("a", "ReadFile", {"filepath": "foo.py"})
+    history += _round("b", "ReplaceTextInFile", {"filepath": "foo.py"}, "{}")
+    history += _round("c", "ReadFile", {"filepath": "./foo.py"})
+    original = json.dumps(history)
+
+    sent = superseded_history(history)
+    assert _contents(sent)[0] == stub_text("read", 3)
+    assert _contents(sent)[2] == _contents(history)[2]
+    # The history itself keeps every result; tool calls stay untouched.
+    assert json.dumps(history) == original
+    assert sent[1] is history[1]
+
+
+def test_partial_and_failed_reads_do_not_supersede():
+    history = _round("a", "ReadFile", {"filepath": "foo.py"})
+    history += _round("b", "ReadFile", {"filepath": "foo.py", "start_line": 10})
+    history += _round(
+        "c",
+        "ReadMultipleFiles",
+        {"filepaths": ["foo.py"]},
+        json.dumps({"success": False, "error": BIG}),
+    )
+    assert superseded_history(history) is history
+
+
+def test_wider_read_and_rewrite_supersede():
+    history = _round("a", "ReadFile", {"filepath": "a.py", "max_lines": 50})
+    history += _round("b", "ReadFile", {"filepath": "b.py"})
+    history += _round("c", "ReadMultipleFiles", {"filepaths": ["a.py"]})
+    history += _round("d", "CreateFile", {"filepath": "b.py", "content": "new"})
+    assert _contents(superseded_history(history))[:2] == [
+        stub_text("read", 3),
+        stub_text("rewrite", 4),
+    ]
+
+
+def test_repeated_search_supersedes_only_identical_calls():
+    args = {"paths": ".", "query": "TODO"}
+    history = _round("a", "SearchText", args)
+    history += _round("b", "SearchText", {**args, "query": "FIXME"})
+    history += _round("c", "SearchText", args)
+    assert _contents(superseded_history(history))[:2] == [
+        stub_text("search", 3),
+        _contents(history)[1],
+    ]
+
+
+def test_small_results_are_kept():
+    history = _round("a", "ReadFile", {"filepath": "foo.py"}, '{"success": true}')
+    history += _round("b", "ReadFile", {"filepath": "foo.py"})
+    assert superseded_history(history) is history
+
+
+def test_anthropic_and_responses_shapes():
+    anthropic = []
+    items = []
+    for call_id in ("a", "b"):
+        anthropic += [
+            {
+                "role": "assistant",
+                "content": [
+                    {
+                        "type": "tool_use",
+                        "id": call_id,
+                        "name": "ReadFile",
+                        "input": {"filepath": "foo.py"},
+                    }
+                ],
+            },
+            {
+                "role": "user",
+                "content": [
+                    {"type": "tool_result", "tool_use_id": call_id, "content": BIG}
+                ],
+            },
+        ]
+        items += [
+            {
+                "type": "function_call",
+                "call_id": call_id,
+                "name": "ReadFile",
+                "arguments": '{"filepath": "foo.py"}',
+            },
+            {"type": "function_call_output", "call_id": call_id, "output": BIG},
+        ]
+    assert superseded_history(anthropic)[1]["content"][0]["content"] == (
+        stub_text("read", 2)
+    )
+    assert superseded_history(items)[1]["output"] == stub_text("read", 2)
+    assert anthropic[1]["content"][0]["content"] == BIG
+
+
+def test_view_and_stubs_are_stable_across_rounds():
+    history = _round("a", "ReadFile", {"filepath": "foo.py"})
+    history += _round("b", "ReadFile", {"filepath": "foo.py"})
+    first = superseded_history(history)
+    stub = first[1]
+    history += _round("c", "ListFiles", {"directory": "."})
+    second = superseded_history(history)
+    assert second is first
+    assert second[1] is stub
+    assert second[-1] is history[-1]
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(superseded, "load_supersede_enabled", lambda: False)
+    history = _round("a", "ReadFile", {"filepath": "foo.py"})
+    history += _round("b", "ReadFile", {"filepath": "foo.py"})
+    assert superseded_history(history) is history
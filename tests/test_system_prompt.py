@@ -4,10 +4,13 @@ Tests for the system prompt management in ``janito/system_prompt.py``.
 The system prompt is assembled from named sections via
 :class:`SysPromptManager`.  These tests cover the manager's section operations
 (add/update/delete), rendering, and the default prompt built by
-``sync_default_sections`` (base + skills + optional ``AGENTS.md``).
+``sync_default_sections`` (base + skills + optional ``AGENTS.md``), plus the
+cache-friendly prefix: stability ordering, the render cache and its digest.
 """
 
+import os
 import sys
+import time
 from pathlib import Path
 
 # Add the repo root to sys.path to allow importing the package directly.
@@ -15,12 +18,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
 
+import janito.system_prompt as system_prompt_mod
 import janito.tooling.tools_registry as tools_registry_mod
 from janito.system_prompt import (
     SECTION_START,
     SYSTEM_PROMPT,
     SysPromptManager,
+    describe_prompt,
+    prompt_digest,
     sync_default_sections,
+    trace_attributes,
 )
 
 SKILLS_SECTION = "## Available Skills\n(fake skills section)"
@@ -261,6 +268,95 @@ def test_sync_removes_sections_that_no_longer_apply(monkeypatch, tmp_path):
     ]
 
 
+def test_sections_are_kept_in_stability_order():
+    """Volatile sections go last, whatever the order they were added in."""
+    manager = SysPromptManager("base")
+    manager.add_section("agents.md", "project notes")
+    manager.add_section("extra", "extra text")
+    manager.add_section("skills", "skills list")
+    manager.add_section("plugins:b", "plugin b")
+    manager.add_section("plugins:a", "plugin a")
+
+    assert [name for name, _ in manager.get_all_sections()] == [
+        "start",
+        "plugins:b",
+        "plugins:a",
+        "skills",
+        "extra",
+        "agents.md",
+    ]
+
+
+def test_render_is_cached_until_a_section_changes():
+    manager = SysPromptManager("base")
+    manager.add_section("skills", "skills list")
+    first = manager.render()
+    digest = manager.digest()
+    assert manager.render() is first
+    assert digest == prompt_digest(first) and len(digest) == 16
+
+    # Same text: the cached prompt (and the provider's prefix) stay valid.
+    manager.update_section("skills", "skills list")
+    assert manager.render() is first
+
+    manager.update_section("skills", "other skills")
+    assert manager.render() == "base\nother skills\n"
+    assert manager.digest() != digest
+    manager.del_section("skills")
+    assert manager.render() == "base\n"
+    assert set(manager.section_hashes()) == {"start"}
+
+
+def test_agents_md_is_reread_only_when_it_changes(monkeypatch, tmp_path):
+    _patch_skills_section(monkeypatch)
+    monkeypatch.chdir(tmp_path)
+    agents_md = tmp_path / "AGENTS.md"
+    agents_md.write_text("first", encoding="utf-8")
+    os.utime(agents_md, (time.time() - 60, time.time() - 60))
+    manager = SysPromptManager(SYSTEM_PROMPT)
+    sync_default_sections(manager)
+
+    reads = []
+    real_open = open
+    monkeypatch.setattr(
+        "builtins.open",
+        lambda *a, **kw: reads.append(a[0]) or real_open(*a, **kw),
+    )
+    prompt = sync_default_sections(manager).render()
+    assert reads == [] and prompt.endswith("first\n")
+
+    agents_md.write_text("second!", encoding="utf-8")
+    assert sync_default_sections(manager).render().endswith("second!\n")
+    assert reads == [str(agents_md)]
+
+
+def test_agents_md_rewritten_within_the_racy_window_is_reread(monkeypatch, tmp_path):
+    _patch_skills_section(monkeypatch)
+    monkeypatch.chdir(tmp_path)
+    agents_md = tmp_path / "AGENTS.md"
+    agents_md.write_text("first", encoding="utf-8")
+    mtime_ns = agents_md.stat().st_mtime_ns
+    manager = SysPromptManager(SYSTEM_PROMPT)
+    assert sync_default_sections(manager).render().endswith("first\n")
+
+    # Same size, same mtime tick: only the racy-window rule catches it.
+    agents_md.write_text("fresh", encoding="utf-8")
+    os.utime(agents_md, ns=(mtime_ns, mtime_ns))
+    assert sync_default_sections(manager).render().endswith("fresh\n")
+
+
+def test_prompt_fingerprints():
+    assert describe_prompt("héllo") == f"sha256:{prompt_digest('héllo')} (6 bytes)"
+    assert trace_attributes("héllo") == {
+        "system_prompt_hash": prompt_digest("héllo"),
+        "system_prompt_bytes": 6,
+    }
+    assert trace_attributes(None) == {} and trace_attributes("") == {}
+    assert system_prompt_mod.SYSTEM_PROMPT_MANAGER.digest() == prompt_digest(
+        system_prompt_mod.SYSTEM_PROMPT_MANAGER.render()
+    )
+
+
 if __name__ == "__main__":  # pragma: no cover
     if pytest is not None:
         raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,163 @@
+"""
+Tests for the local token estimator (``janito.agent.tokens``).
+
+``estimate_request`` splits a request into system prompt, per-tool schemas,
+history and the latest tool results; ``TokenCalibration`` learns a per-family
+ratio from the input tokens providers report; ``preflight_request``
+(``janito.agent.context``) trims an oversized request to the current turn or
+refuses it with ``PromptTooLargeError``.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import janito.agent.tokens as tokens
+from janito.agent.context import SUMMARY_PREFIX, preflight_request
+from janito.agent.tokens import (
+    PromptTooLargeError,
+    TokenCalibration,
+    estimate_request,
+    estimate_tokens,
+)
+
+_TOOLS = [
+    {
+        "type": "function",
+        "function": {"name": "read_file", "parameters": {"a": "x" * 400}},
+    },
+    {"type": "function", "function": {"name": "run_bash", "parameters": {}}},
+]
+
+
+@pytest.fixture(autouse=True)
+def _memory_calibration(monkeypatch):
+    """Never read or write the user's token_calibration.json."""
+    monkeypatch.setattr(tokens, "_calibration", TokenCalibration())
+
+
+def test_estimate_tokens_scales_with_length():
+    assert estimate_tokens(None) == 0
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 100) == 101
+    assert estimate_tokens([{"role": "user", "content": "hi"}]) > 0
+
+
+def test_estimate_request_sections():
+    history = [
+        {"role": "system", "content": "s" * 400},
+        {"role": "user", "content": "u" * 400},
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "c1"}]},
+        {"role": "tool", "tool_call_id": "c1", "content": "t" * 4000},
+    ]
+    estimate = estimate_request(history, _TOOLS, family="openai")
+
+    assert estimate.system == estimate_tokens(history[:1])
+    assert set(estimate.tools) == {"read_file", "run_bash"}
+    assert estimate.tools["read_file"] > estimate.tools["run_bash"]
+    assert estimate.history == estimate_tokens(history[1:3])
+    assert estimate.tool_results == estimate_tokens(history[3:])
+    assert estimate.total == estimate.raw_total  # uncalibrated family
+    assert [label for label, _ in estimate.sections()][1] == "Tools (2)"
+
+
+def test_explicit_system_skips_history_system_messages():
+    """Anthropic/Gemini send ``system`` separately and filter the history."""
+    history = [
+        {"role": "system", "content": "s" * 400},
+        {"role": "user", "content": "hi"},
+        {
+            "role": "user",
+            "content": [{"type": "tool_result", "tool_use_id": "t", "content": "r"}],
+        },
+    ]
+    estimate = estimate_request(history, None, system="short")
+    assert estimate.system == estimate_tokens("short")
+    assert estimate.history == estimate_tokens(history[1:2])
+    assert estimate.tool_results == estimate_tokens(history[2:])
+
+
+def test_calibration_moving_average_and_clamp():
+    calibration = TokenCalibration()
+    assert calibration.ratio("anthropic") == 1.0
+    # Too small to calibrate from.
+    assert calibration.observe("anthropic", 50, 100) == 1.0
+    assert calibration.observe("anthropic", 1000, 1200) == 1.2
+    assert calibration.observe("anthropic", 1000, 2000) == pytest.approx(1.44)
+    # Outliers are clamped.
+    assert TokenCalibration().observe("x", 1000, 100_000) == tokens.MAX_RATIO
+    assert calibration.ratio("openai") == 1.0
+
+
+def test_calibration_persists_through_the_store():
+    class _Store:
+        def __init__(self):
+            self.families = {"google": {"ratio": 0.8, "samples": 3}}
+
+        def get_families(self):
+            return self.families
+
+        def update_families(self, entries):
+            self.writes += 1
+            self.families.update(entries)
+            return True
+
+    store = _Store()
+    store.writes = 0
+    assert TokenCalibration(store).ratio("google") == 0.8
+    calibration = TokenCalibration(store)
+    calibration.observe("deepseek", 1000, 900)
+    calibration.observe("google", 1000, 800)
+    # Observations are buffered until the prompt's flush (one write).
+    assert "deepseek" not in store.families
+    assert calibration.flush() and store.writes == 1
+    assert store.families["deepseek"] == {"ratio": 0.9, "samples": 1}
+    assert store.families["google"] == {"ratio": 0.8, "samples": 4}
+    assert calibration.flush() and store.writes == 1
+
+
+def test_calibrated_ratio_applies_to_the_estimate(monkeypatch):
+    tokens._calibration.observe("zai", 1000, 1500)
+    estimate = estimate_request([{"role": "user", "content": "x" * 4000}], family="zai")
+    assert estimate.ratio == 1.5
+    assert estimate.total == round(estimate.raw_total * 1.5)
+    tokens.observe_usage(estimate, estimate.raw_total)
+    assert tokens.calibration_ratio("zai") < 1.5
+
+
+def test_preflight_passes_requests_that_fit():
+    history = [{"role": "user", "content": "hello"}]
+    estimate, trimmed = preflight_request(history, _TOOLS, None, 100_000)
+    assert trimmed is None
+    assert estimate.total < 100_000
+    assert len(history) == 1
+
+
+def test_preflight_trims_to_the_current_turn():
+    history = []
+    for n in range(3):
+        history += [
+            {"role": "user", "content": f"question {n} " + "q" * 2000},
+            {"role": "assistant", "content": f"answer {n}"},
+        ]
+    history.append({"role": "user", "content": "current"})
+
+    estimate, trimmed = preflight_request(history, None, None, 800)
+
+    assert trimmed is not None and trimmed.summarized_turns == 3
+    assert history[0]["content"].startswith(SUMMARY_PREFIX)
+    assert history[-1] == {"role": "user", "content": "current"}
+    assert estimate.total <= 800
+
+
+def test_preflight_refuses_what_cannot_fit():
+    history = [{"role": "user", "content": "x" * 40_000}]
+    with pytest.raises(PromptTooLargeError) as info:
+        preflight_request(history, _TOOLS, None, 1000)
+    assert info.value.max_input_tokens == 1000
+    assert "exceeds the model's context window of 1000 tokens" in str(info.value)
+    assert isinstance(info.value, ValueError)
@@ -0,0 +1,153 @@
+"""
+Tests for the per-conversation tool selection (janito/tooling/tool_selection.py).
+
+A catalog over ``tool-schema-budget`` is cut down to the core, pinned, used
+and relevant tools plus ``discover_tools``; the selection of a conversation
+only grows and keeps its order so the tools prefix stays cacheable.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from janito.tooling import tool_selection
+from janito.tooling.executor import ToolExecutor, invoke_tool
+from janito.tooling.tool_selection import (
+    DISCOVER_TOOL,
+    ToolIndex,
+    ToolSelection,
+    schema_name,
+    select_tools,
+)
+
+
+def _schema(name, description):
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {"type": "object", "properties": {}},
+        },
+    }
+
+
+CATALOG = [
+    _schema("ReadFile", "Read the content of a file."),
+    _schema("RunBashCode", "Run a bash command."),
+    _schema("github_create_issue", "Create a new issue in a GitHub repository."),
+    _schema("github_list_pulls", "List the pull requests of a repository."),
+    _schema("jira_search", "Search Jira tickets with a JQL query."),
+    _schema("slack_post_message", "Post a message to a Slack channel."),
+]
+
+
+@pytest.fixture
+def config(monkeypatch):
+    values = {"tool-schema-budget": "1"}
+    monkeypatch.setattr(
+        "janito.config_store.get_config_value", lambda key: values.get(key)
+    )
+    monkeypatch.setattr(
+        tool_selection, "_selections", type(tool_selection._selections)()
+    )
+    return values
+
+
+def _names(selection):
+    return [schema_name(s) for s in selection.schemas()]
+
+
+def test_index_ranks_name_matches_first():
+    index = ToolIndex(CATALOG)
+    assert index.search("open a GitHub issue")[0] == "github_create_issue"
+    assert index.search("send a slack message") == ["slack_post_message"]
+    assert index.search("nothing relevant here") == []
+
+
+def test_selects_core_pinned_used_and_relevant_tools():
+    history = [
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {"id": "1", "function": {"name": "jira_search", "arguments": "{}"}}
+            ],
+        }
+    ]
+    selection = ToolSelection()
+    selection.update(
+        CATALOG, "create an issue", history, 10_000, ["slack_post_message"]
+    )
+    assert selection.names[:4] == [
+        "ReadFile",
+        "RunBashCode",
+        "slack_post_message",
+        "jira_search",
+    ]
+    assert "github_create_issue" in selection.names
+    assert _names(selection)[-1] == DISCOVER_TOOL
+
+
+def test_relevant_tools_respect_the_budget():
+    selection = ToolSelection()
+    selection.update(CATALOG, "create a github issue", None, 0, [])
+    assert selection.names == ["ReadFile", "RunBashCode"]
+
+
+def test_selection_only_grows_and_keeps_its_order():
+    selection = ToolSelection()
+    selection.update(CATALOG, "post to slack", None, 10_000, [])
+    first = list(selection.names)
+    selection.update(CATALOG, "search jira tickets", None, 10_000, [])
+    assert selection.names[: len(first)] == first
+    assert selection.names[-1] == "jira_search"
+
+
+def test_discover_tools_adds_the_found_tools(config):
+    selection = select_tools(CATALOG, "read a file", [])
+    assert "github_list_pulls" not in selection.names
+    result = invoke_tool(
+        "discover_tools", {"query": "pull requests"}, False, selection=selection
+    )[0]
+    assert "github_list_pulls" in result
+    call = {
+        "id": "1",
+        "type": "function",
+        "function": {"name": DISCOVER_TOOL, "arguments": '{"query": "pull requests"}'},
+    }
+    assert selection.observe([call]) is True
+    assert "github_list_pulls" in selection.names
+    assert selection.observe([call]) is False
+
+
+def test_discover_tools_searches_the_calling_conversation(config):
+    mine = select_tools(CATALOG, "read a file", [])
+    # Another conversation, with another catalog, selected its tools since.
+    select_tools(CATALOG[:2] + CATALOG[4:], "read a file", [])
+    executor = ToolExecutor()
+    executor.selection = mine
+    call = {
+        "id": "1",
+        "function": {"name": DISCOVER_TOOL, "arguments": '{"query": "pull requests"}'},
+    }
+    assert "github_list_pulls" in executor.execute_tool_call(call)["content"]
+    executor.selection = None
+    assert "No tools match" in executor.execute_tool_call(call)["content"]
+
+
+def test_selection_is_kept_per_conversation(config):
+    one, two = [], []
+    assert select_tools(CATALOG, "hi", one) is select_tools(CATALOG, "hi", one)
+    assert select_tools(CATALOG, "hi", one) is not select_tools(CATALOG, "hi", two)
+
+
+def test_whole_catalog_when_it_fits_the_budget(config):
+    config["tool-schema-budget"] = "100000"
+    assert select_tools(CATALOG, "hi", []) is None
+    config["tool-schema-budget"] = "0"
+    assert select_tools(CATALOG, "hi", []) is None
@@ -226,6 +226,30 @@ if pytest is not None:
     def test_module_singleton_is_a_registry():
         assert isinstance(tools_registry._registry, ToolsRegistry)
 
+    def test_privilege_scope_filters_and_restores_the_tools(monkeypatch):
+        from janito import privileges
+        from janito.privileges import Privileges
+
+        tools = {
+            "Reader": _fake_tool("Reader", "r"),
+            "Writer": _fake_tool("Writer", "w"),
+            "Plain": _fake_tool("Plain"),
+        }
+        registry = _fresh_registry(monkeypatch, tools)
+        registry.ensure_initialized()
+        monkeypatch.setattr(
+            tools_registry,
+            "discover_toolsets",
+            lambda names: {"Web": _fake_tool("Web")},
+        )
+        monkeypatch.setattr(privileges, "running_privileges", Privileges(READ=True))
+        with registry.privilege_scope():
+            assert set(registry.all_tools()) == {"Reader", "Plain"}
+            assert registry.add_toolset("web") is True
+            assert "Web" in registry.all_tools()
+        assert set(registry.all_tools()) == set(tools)
+        assert "web" not in tools_registry._loaded_toolsets
+
 else:  # pragma: no cover - fallback runner without pytest
 
     def _main():
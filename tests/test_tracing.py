@@ -0,0 +1,212 @@
+"""
+Tests for per-prompt phase spans (janito/agent/tracing.py).
+
+Spans nest through threads and ``asyncio.to_thread``, failures are recorded
+as error statuses, finished traces go to ``/status``, ``-v`` and the
+``trace-file`` in OTLP/JSON, and both agent loops time their config, MCP,
+request (with time to first token), tool and tracking phases.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import janito.config_dir as config_dir_mod
+from janito.agent import tracing
+from janito.agent.pipeline import PipelineConfig
+from janito.agent.pipeline.loop import stream_prompt
+from janito.agent.tracing import last_trace, span, start_trace, to_otlp, trace_rows
+from janito.cli.chat import _make_send_prompt_func
+from janito.config_store import set_config_value
+from janito.providers.mock import server as mock_server
+from janito.providers.mock.scenario import MockScenario
+from janito.system_prompt import prompt_digest
+from janito.tooling.executor import run_tool
+
+
+@pytest.fixture(autouse=True)
+def config_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(config_dir_mod, "_config_dir", tmp_path / ".janito")
+    monkeypatch.setattr(tracing, "_last_trace", None)
+
+
+@pytest.fixture
+def mock_provider(monkeypatch, tmp_path):
+    (tmp_path / "a.txt").write_text("hello\n")
+    monkeypatch.chdir(tmp_path)
+    srv = mock_server.MockServer(
+        ("127.0.0.1", 0),
+        MockScenario(
+            tool_calls=[[{"name": "ReadFile", "arguments": {"filepath": "a.txt"}}]],
+            content="Read it.",
+            ttft_ms=50,
+        ),
+    ).start()
+    set_config_value("mock.endpoint", srv.base_url)
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _spans(trace, name):
+    return [s for s in trace.ordered() if s.name == name]
+
+
+def test_spans_nest_and_are_no_ops_outside_a_trace():
+    with span("orphan") as orphan:
+        orphan.set(ignored=True)
+        orphan.mark("ignored_ms")
+
+    def track():
+        with span("tracking"):
+            pass
+
+    async def in_thread():
+        with span("tool"):
+            await asyncio.to_thread(track)
+
+    with start_trace(api_type="Completions") as root:
+        with span("round", round=1) as round_span:
+            asyncio.run(in_thread())
+        with pytest.raises(RuntimeError), span("request"):
+            raise RuntimeError("boom")
+
+    trace = root.trace
+    assert last_trace() is trace
+    assert [(s.name, s.depth) for s in trace.ordered()] == [
+        ("prompt", 0),
+        ("round", 1),
+        ("tool", 2),
+        ("tracking", 3),
+        ("request", 1),
+    ]
+    assert round_span.attributes == {"round": 1}
+    assert _spans(trace, "request")[0].error == "RuntimeError: boom"
+    assert tracing.current_span() is None
+
+
+def test_otlp_export_is_one_request_per_line(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    set_config_value("trace-file", str(path))
+    for _ in range(2):
+        with start_trace() as root, span("request", provider="mock") as request:
+            request.set(queue_ms=1.5, attempts=2, streamed=True)
+            with pytest.raises(ValueError), span("tool"):
+                raise ValueError("bad")
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    (resource,) = json.loads(lines[1])["resourceSpans"]
+    (scope,) = resource["scopeSpans"]
+    assert scope["scope"]["name"] == "janito"
+    prompt, request, tool = scope["spans"]
+    assert len(prompt["traceId"]) == 32 and len(prompt["spanId"]) == 16
+    assert "parentSpanId" not in prompt
+    assert request["parentSpanId"] == prompt["spanId"]
+    assert int(request["endTimeUnixNano"]) >= int(request["startTimeUnixNano"])
+    assert request["attributes"] == [
+        {"key": "provider", "value": {"stringValue": "mock"}},
+        {"key": "queue_ms", "value": {"doubleValue": 1.5}},
+        {"key": "attempts", "value": {"intValue": "2"}},
+        {"key": "streamed", "value": {"boolValue": True}},
+    ]
+    assert tool["status"] == {"code": 2, "message": "ValueError: bad"}
+    assert to_otlp(root.trace) == json.loads(lines[1])
+
+
+def test_run_tool_records_queue_execution_and_tracking(mock_provider):
+    with start_trace() as root:
+        result, error, _ = run_tool(
+            "ReadFile",
+            {"filepath": "a.txt"},
+            use_mcp=False,
+            queued_at=tracing.time.perf_counter() - 0.25,
+        )
+    assert error is None and "hello" in json.dumps(result)
+    (tool,) = _spans(root.trace, "tool")
+    assert tool.attributes["tool"] == "ReadFile"
+    assert tool.attributes["queue_ms"] >= 250
+    assert "exec_ms" in tool.attributes
+    assert [s.name for s in root.trace.ordered() if s.parent is tool] == ["tracking"]
+
+
+def test_cli_send_times_every_phase(mock_provider):
+    send = _make_send_prompt_func("Completions", cli_provider="mock")
+    assert send("read a.txt", previous_messages=[]) == "Read it."
+
+    trace = last_trace()
+    phases = [(s.name, s.depth) for s in trace.ordered()]
+    assert phases[:4] == [
+        ("prompt", 0),
+        ("tracking", 1),
+        ("config.resolve", 1),
+        ("mcp.load", 1),
+    ]
+    assert [s.attributes["round"] for s in _spans(trace, "round")] == [1, 2]
+    assert ("tool", 2) in phases and ("finalize", 2) in phases
+    # The answer was streamed in the second round (the first only called a
+    # tool, without any text).
+    first, second = _spans(trace, "request")
+    assert "time_to_first_token_ms" not in first.attributes
+    assert second.attributes["time_to_first_token_ms"] >= 40
+
+
+def test_cli_send_records_the_system_prompt_and_cached_tokens(mock_provider):
+    send = _make_send_prompt_func("Completions", cli_provider="mock")
+    messages = [{"role": "system", "content": "Be brief."}]
+    assert send("read a.txt", previous_messages=messages) == "Read it."
+
+    trace = last_trace()
+    (root,) = _spans(trace, "prompt")
+    assert root.attributes["system_prompt_hash"] == prompt_digest("Be brief.")
+    assert root.attributes["system_prompt_bytes"] == 9
+    assert all("cached_tokens" in s.attributes for s in _spans(trace, "round"))
+    assert "system_prompt_hash=" in trace_rows(trace)[0][2]
+
+
+def test_verbose_mode_prints_the_timings(mock_provider, capsys):
+    mock_provider.scenario = MockScenario(content="Hi.")
+    send = _make_send_prompt_func("Completions", cli_provider="mock")
+    assert send("hi", previous_messages=[], verbose=True) == "Hi."
+    out = capsys.readouterr().out
+    assert "Timings" in out and "time_to_first_token_ms=" in out
+
+
+def test_web_stream_prompt_times_every_phase(mock_provider):
+    async def run():
+        config = PipelineConfig(provider="mock", api_type="Completions")
+        return [e async for e in stream_prompt("read a.txt", [], config, tools=None)]
+
+    events = asyncio.run(run())
+    assert events[-1].type == "done"
+    trace = last_trace()
+    rounds = _spans(trace, "round")
+    assert len(rounds) == 2
+    (tool,) = _spans(trace, "tool")
+    # The tool ran in a worker thread, under the round that requested it.
+    assert tool.parent is rounds[0] and "queue_ms" in tool.attributes
+    assert _spans(trace, "request")[1].attributes["time_to_first_token_ms"] >= 40
+    assert len(_spans(trace, "client.create")) == 1
+    rows = trace_rows(trace)
+    assert rows[0][0] == "prompt"
+    assert any(
+        phase == "    tool" and "tool=ReadFile" in details for phase, _, details in rows
+    )
+
+
+def test_status_shows_the_last_prompt_timings(capsys):
+    from janito.shell.cmds.status import _print_last_trace
+
+    _print_last_trace()
+    assert capsys.readouterr().out == ""
+    with start_trace(), span("request", provider="mock"):
+        pass
+    _print_last_trace()
+    out = capsys.readouterr().out
+    assert "Last Prompt (timings)" in out and "request" in out
@@ -240,7 +240,7 @@ if pytest is not None:
         """The web agent loop must also reset the tracker per prompt."""
         import asyncio
 
-        import janito.web.backend.agent.loop as loop_mod
+        import janito.agent.pipeline.loop as loop_mod
         from janito.web.backend.events import ErrorEvent
 
         _register(monkeypatch, "ReadFile", "r")
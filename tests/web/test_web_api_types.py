@@ -1,15 +1,15 @@
 """Web agent API-type support tests.
 
-The web agentic loop (``janito.web.backend.agent.loop.stream_prompt``) used
+The web agentic loop (``janito.agent.pipeline.loop.stream_prompt``) used
 to be hardcoded to the Chat Completions API.  It now resolves the API type
 for the *effective provider* (``--api-type`` > the provider's configured
 ``api-type`` written by the Settings drawer > the provider's built-in
 default) and dispatches to a per-type runner:
 
-* ``Completions`` -> ``janito.web.backend.agent.call`` (the built-in path)
-* ``Responses``   -> ``janito.web.backend.agent.responses``
-* ``Anthropic``   -> ``janito.web.backend.agent.anthropic``
-* ``DashScope``   -> ``janito.web.backend.agent.dashscope``
+* ``Completions`` -> ``janito.agent.completions`` (the built-in path)
+* ``Responses``   -> ``janito.agent.pipeline.responses``
+* ``Anthropic``   -> ``janito.agent.pipeline.anthropic``
+* ``DashScope``   -> ``janito.agent.pipeline.dashscope``
 
 Each runner exposes the same interface (``create_client`` /
 ``build_call_kwargs`` / ``accumulator`` / ``stream_turn_events``) and keeps
@@ -72,7 +72,7 @@ def clean_config(request):
 
 
 def test_loop_dispatches_each_api_type_to_its_runner():
-    from janito.web.backend.agent import loop
+    from janito.agent.pipeline import loop
 
     assert loop._runner_for("Responses") is loop.responses_runner
     assert loop._runner_for("Anthropic") is loop.anthropic_runner
@@ -55,7 +55,7 @@ def _cfg(thinking=False):
 
 
 def test_anthropic_build_call_kwargs_extracts_system_and_converts_tools():
-    from janito.web.backend.agent import anthropic
+    from janito.agent.pipeline import anthropic
 
     messages = [
         {"role": "system", "content": "Be helpful."},
@@ -70,18 +70,80 @@ def test_anthropic_build_call_kwargs_extracts_system_and_converts_tools():
     kwargs = anthropic.build_call_kwargs(
         "claude", messages, tools, _cfg(thinking=False), None, None, None
     )
+    cache = {"type": "ephemeral"}
     assert kwargs["model"] == "claude"
-    assert kwargs["system"] == "Be helpful."
+    # Prompt caching is on by default: system, tools and the rolling end of
+    # the conversation carry cache_control breakpoints.
+    assert kwargs["system"] == [
+        {"type": "text", "text": "Be helpful.", "cache_control": cache}
+    ]
     assert kwargs["max_tokens"] == 100000  # the Messages API requires max_tokens
-    assert kwargs["messages"] == [{"role": "user", "content": "Hello"}]
+    assert kwargs["messages"] == [
+        {
+            "role": "user",
+            "content": [{"type": "text", "text": "Hello", "cache_control": cache}],
+        }
+    ]
     assert kwargs["tools"] == [
-        {"name": "ReadFile", "description": "read", "input_schema": {}}
+        {
+            "name": "ReadFile",
+            "description": "read",
+            "input_schema": {},
+            "cache_control": cache,
+        }
     ]
     assert kwargs["stream"] is True
 
 
+def test_anthropic_build_call_kwargs_without_prompt_caching(monkeypatch):
+    from janito import provider_accessors
+    from janito.agent.pipeline import anthropic
+
+    monkeypatch.setattr(
+        provider_accessors,
+        "get_prompt_caching_from_provider",
+        lambda provider, model=None: False,
+    )
+    messages = [
+        {"role": "system", "content": "Be helpful."},
+        {"role": "user", "content": "Hello"},
+    ]
+    kwargs = anthropic.build_call_kwargs(
+        "claude", messages, None, _cfg(thinking=False), None, None, None
+    )
+    assert kwargs["system"] == "Be helpful."
+    assert kwargs["messages"] == [{"role": "user", "content": "Hello"}]
+
+
+def test_anthropic_cache_breakpoints_mark_rolling_end_and_previous_user():
+    from janito.agent.anthropic import apply_cache_breakpoints
+
+    result_block = {"type": "tool_result", "tool_use_id": "c1", "content": "one"}
+    messages = [
+        {"role": "user", "content": "first"},
+        {"role": "assistant", "content": "ok"},
+        {"role": "user", "content": "do it"},
+        {
+            "role": "assistant",
+            "content": [{"type": "tool_use", "id": "c1", "name": "X", "input": {}}],
+        },
+        {"role": "user", "content": [result_block]},
+    ]
+    kwargs = apply_cache_breakpoints({"messages": messages})
+    marked = [
+        i
+        for i, m in enumerate(kwargs["messages"])
+        if isinstance(m["content"], list) and "cache_control" in m["content"][-1]
+    ]
+    # The last message and the user message before it; four breakpoints max.
+    assert marked == [2, 4]
+    # The caller's history is left untouched.
+    assert messages[2] == {"role": "user", "content": "do it"}
+    assert "cache_control" not in result_block
+
+
 def test_anthropic_conversion_merges_consecutive_tool_messages():
-    from janito.web.backend.agent.anthropic import _to_anthropic
+    from janito.agent.pipeline.anthropic import _to_anthropic
 
     messages = [
         {"role": "user", "content": "do it"},
@@ -128,7 +190,7 @@ def test_anthropic_conversion_merges_consecutive_tool_messages():
 
 
 def test_anthropic_accumulator_folds_stream_events():
-    from janito.web.backend.agent.anthropic import AnthropicTurnAccumulator
+    from janito.agent.pipeline.anthropic import AnthropicTurnAccumulator
 
     acc = AnthropicTurnAccumulator()
     events = [
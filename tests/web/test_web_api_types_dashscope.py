@@ -3,6 +3,7 @@
 Split from ``test_web_api_types.py`` (call-kwargs passthrough, accumulator
 and endpoint-mismatch retry for the DashScope runner).
 """
+
 import sys
 import tempfile
 from pathlib import Path
@@ -57,7 +58,7 @@ def _cfg(thinking=False):
 
 
 def test_dashscope_build_call_kwargs_passes_history_and_thinking():
-    from janito.web.backend.agent import dashscope
+    from janito.agent.pipeline import dashscope
 
     messages = [
         {"role": "system", "content": "Be helpful."},
@@ -81,7 +82,7 @@ def test_dashscope_build_call_kwargs_passes_builtin_tools():
     """The effective model's built-in tools are sent as request-body enable_*
     kwargs on the native DashScope API (e.g. enable_code_interpreter /
     enable_search)."""
-    from janito.web.backend.agent import dashscope
+    from janito.agent.pipeline import dashscope
 
     class _Cfg:
         effective_thinking = True
@@ -109,7 +110,7 @@ def test_dashscope_build_call_kwargs_passes_builtin_tools():
 
 def test_dashscope_build_call_kwargs_omits_builtin_tools_when_none():
     """Models without built-in tools send no enable_* tool kwargs."""
-    from janito.web.backend.agent import dashscope
+    from janito.agent.pipeline import dashscope
 
     kwargs = dashscope.build_call_kwargs(
         "qwen3.8-max",
@@ -125,7 +126,7 @@ def test_dashscope_build_call_kwargs_omits_builtin_tools_when_none():
 
 
 def test_dashscope_accumulator_folds_chunks():
-    from janito.web.backend.agent.dashscope import DashScopeTurnAccumulator
+    from janito.agent.pipeline.dashscope import DashScopeTurnAccumulator
 
     acc = DashScopeTurnAccumulator()
     chunks = [
@@ -206,8 +207,8 @@ def test_dashscope_stream_retries_on_endpoint_mismatch(monkeypatch):
     import dashscope as dashscope_mod
     from dashscope import Generation, MultiModalConversation
 
+    from janito.agent.pipeline import dashscope as ds
     from janito.openai_client.dashscope_stream import _ModelEndpointMismatch
-    from janito.web.backend.agent import dashscope as ds
     from janito.web.backend.events import TokenEvent
 
     calls = []
@@ -82,7 +82,7 @@ def _cfg(thinking=False):
 
 
 def test_gemini_build_call_kwargs_converts_history_and_tools():
-    from janito.web.backend.agent import gemini
+    from janito.agent.pipeline import gemini
 
     messages = [
         {"role": "system", "content": "Be helpful."},
@@ -121,7 +121,7 @@ def test_gemini_build_call_kwargs_converts_history_and_tools():
 
 
 def test_gemini_build_call_kwargs_omits_tools_when_none():
-    from janito.web.backend.agent import gemini
+    from janito.agent.pipeline import gemini
 
     kwargs = gemini.build_call_kwargs(
         "gemini-3.7-flash",
@@ -137,7 +137,7 @@ def test_gemini_build_call_kwargs_omits_tools_when_none():
 
 
 def test_gemini_accumulator_folds_chunks():
-    from janito.web.backend.agent.gemini import GeminiTurnAccumulator
+    from janito.agent.pipeline.gemini import GeminiTurnAccumulator
 
     acc = GeminiTurnAccumulator()
     chunks = [
@@ -189,7 +189,7 @@ def test_gemini_accumulator_folds_chunks():
 
 def test_gemini_accumulator_usage_event_none_without_usage():
     """No usage metadata -> no usage event."""
-    from janito.web.backend.agent.gemini import GeminiTurnAccumulator
+    from janito.agent.pipeline.gemini import GeminiTurnAccumulator
 
     acc = GeminiTurnAccumulator()
     acc.handle(_chunk([_part(text="hi")], finish_reason=None))
@@ -198,7 +198,7 @@ def test_gemini_accumulator_usage_event_none_without_usage():
 
 def test_gemini_create_client_aborts_without_google_genai(monkeypatch):
     """The web runner guards the optional `google-genai` package."""
-    from janito.web.backend.agent import gemini
+    from janito.agent.pipeline import gemini
 
     monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
     with pytest.raises(RuntimeError) as exc:
@@ -209,7 +209,7 @@ def test_gemini_create_client_aborts_without_google_genai(monkeypatch):
 @requires_genai
 def test_gemini_create_client_builds_sdk_client():
     """With google-genai installed, create_client returns a genai.Client."""
-    from janito.web.backend.agent import gemini
+    from janito.agent.pipeline import gemini
 
     client = gemini.create_client(
         "https://generativelanguage.googleapis.com", "sk-test"
@@ -224,7 +224,7 @@ def test_gemini_stream_turn_events_consumes_sync_stream(monkeypatch):
     event loop and yields reasoning/token events."""
     import asyncio
 
-    from janito.web.backend.agent import gemini
+    from janito.agent.pipeline import gemini
     from janito.web.backend.events import ReasoningEvent, TokenEvent
 
     stop = _chunk([_part(text="done")], finish_reason=SimpleNamespace(name="STOP"))
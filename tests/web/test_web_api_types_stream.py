@@ -86,7 +86,7 @@ def test_stream_prompt_responses_round_trip(monkeypatch):
     OpenAI format, and re-sends the converted history after a tool round."""
     import asyncio
 
-    from janito.web.backend.agent import loop
+    from janito.agent.pipeline import loop
     from janito.web.backend.config import WebServerConfig
     from janito.web.backend.events import DoneEvent, TokenEvent, WaitingEvent
 
@@ -137,12 +137,17 @@ def test_stream_prompt_responses_round_trip(monkeypatch):
         ]
     )
     monkeypatch.setattr(
-        "janito.web.backend.agent.responses.create_client",
+        "janito.agent.pipeline.responses.create_client",
         lambda base_url, api_key: fake_client,
     )
 
     async def _fake_run_tool_turn(
-        tool_calls_list, full_content, messages, use_mcp, thought_parts=None
+        tool_calls_list,
+        full_content,
+        messages,
+        use_mcp,
+        thought_parts=None,
+        selection=None,
     ):
         # Mirror run_tool_turn's OpenAI-format appends without executing tools.
         assistant_msg = {
@@ -262,7 +267,7 @@ def test_stream_prompt_responses_emits_image_event(monkeypatch):
     import base64
     import os
 
-    from janito.web.backend.agent import loop
+    from janito.agent.pipeline import loop
     from janito.web.backend.config import WebServerConfig
     from janito.web.backend.events import DoneEvent, ImageEvent, TokenEvent
 
@@ -302,7 +307,7 @@ def test_stream_prompt_responses_emits_image_event(monkeypatch):
         ]
     )
     monkeypatch.setattr(
-        "janito.web.backend.agent.responses.create_client",
+        "janito.agent.pipeline.responses.create_client",
         lambda base_url, api_key: fake_client,
     )
 
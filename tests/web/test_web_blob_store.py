@@ -0,0 +1,176 @@
+"""Tests for the out-of-line tool payloads of web sessions (blob_store).
+
+Large tool results are saved to ``./.janito/blobs/<sha256>.gz`` and kept as
+references in memory and in the session files; they are rehydrated for a
+turn and for rendering, and identical payloads are stored once.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add the repo root to sys.path to allow importing the package directly.
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+from janito.agent import history_cache, superseded
+from janito.web.backend import blob_store
+
+try:
+    import fastapi  # noqa: F401
+    from fastapi.testclient import TestClient
+
+    _HAS_FASTAPI = True
+except ModuleNotFoundError:
+    _HAS_FASTAPI = False
+
+requires_fastapi = pytest.mark.skipif(
+    not _HAS_FASTAPI, reason="fastapi (web extra) is not installed"
+)
+
+BIG = json.dumps({"success": True, "content": "line\n" * 500})
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Blobs land in a temp CWD; the threshold is fixed at 1000 characters."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(blob_store, "load_blob_threshold", lambda: 1000)
+    blob_store.clear_cache()
+    yield tmp_path
+    blob_store.clear_cache()
+
+
+def _history():
+    return [
+        {"role": "user", "content": "read it twice"},
+        {"role": "tool", "tool_call_id": "a", "name": "ReadFile", "content": BIG},
+        {"role": "tool", "tool_call_id": "b", "name": "ReadFile", "content": BIG},
+        {"role": "tool", "tool_call_id": "c", "name": "ReadFile", "content": "{}"},
+    ]
+
+
+def test_release_and_hydrate_round_trip(isolated_cwd):
+    messages = _history()
+    assert blob_store.release(messages) == 2
+    ref = messages[1]["content"]
+    assert blob_store.is_ref(messages[1]) and ref["size"] == len(BIG)
+    # Identical payloads share one compressed blob.
+    blobs = list((isolated_cwd / ".janito" / "blobs").iterdir())
+    assert [p.name for p in blobs] == [f"{ref['blob']}.gz"]
+    assert blobs[0].stat().st_size < len(BIG) / 10
+    assert messages[3]["content"] == "{}"
+
+    rendered = blob_store.hydrated_copy(messages)
+    assert rendered[1]["content"] == BIG and blob_store.is_ref(messages[1])
+
+    blob_store.clear_cache()
+    assert blob_store.hydrate(messages) == 2
+    assert messages == _history()
+
+
+def test_release_skips_a_history_in_use():
+    messages = _history()
+    with blob_store.in_use(messages):
+        assert blob_store.release(messages) == 0
+        stored = blob_store.stored_message(messages[1], 1000)
+        assert blob_store.is_ref(stored) and messages[1]["content"] == BIG
+    assert blob_store.release(messages) == 2
+
+
+def test_missing_blob_and_prune(isolated_cwd):
+    messages = _history()
+    blob_store.release(messages)
+    digest = messages[1]["content"]["blob"]
+    assert blob_store.prune(set(), grace_seconds=0) == 1
+    assert not blob_store.blob_path(digest).exists()
+
+    blob_store.clear_cache()
+    blob_store.hydrate(messages)
+    assert "is missing" in messages[1]["content"]
+
+
+def test_request_caches_survive_release_and_hydrate(monkeypatch):
+    monkeypatch.setattr(superseded, "load_supersede_enabled", lambda: True)
+    history_cache.clear_converted_histories()
+    steps = []
+
+    def step(converted, message):
+        steps.append(message)
+        converted.append(message["content"])
+
+    messages = _history()
+    messages[1]["content"] = BIG[:-1] + " "  # a distinct payload
+    call = {"id": "b", "function": {"name": "ReadFile", "arguments": "{}"}}
+    messages.insert(2, {"role": "assistant", "content": None, "tool_calls": [call]})
+    messages.insert(1, {**messages[2], "tool_calls": [{**call, "id": "a"}]})
+    view = superseded.superseded_history(messages)
+    stub = view[2]
+    history_cache.converted_history(view, step, "test")
+
+    # A turn ends (payloads released), the next one rehydrates new strings.
+    assert blob_store.release(messages) == 2
+    blob_store.clear_cache()
+    blob_store.hydrate(messages)
+    messages.append({"role": "user", "content": "next"})
+    view = superseded.superseded_history(messages)
+    assert view[2] is stub
+    converted = history_cache.converted_history(view, step, "test")
+    assert steps[-1] is messages[-1] and len(steps) == len(messages)
+    assert converted[4] == BIG
+    history_cache.clear_converted_histories()
+
+
+@requires_fastapi
+def test_disconnect_mid_turn_persists_and_releases(isolated_cwd, monkeypatch):
+    from fastapi import WebSocketDisconnect
+
+    from janito.web.backend.config import WebServerConfig
+    from janito.web.backend.routers import chat_helpers
+    from janito.web.backend.session import SessionManager
+
+    sessions = SessionManager(
+        WebServerConfig(web_host="127.0.0.1", web_port=0, no_web_open=True)
+    )
+    session = sessions.create()
+
+    async def dropped_turn(session, *args):
+        session.messages.extend(_history())
+        raise WebSocketDisconnect()
+
+    monkeypatch.setattr(chat_helpers, "_run_turn", dropped_turn)
+    with pytest.raises(WebSocketDisconnect):
+        asyncio.run(
+            chat_helpers._run_prompt_turn(session, None, "hi", None, [], sessions)
+        )
+    assert blob_store.is_ref(session.messages[-2])
+    path = isolated_cwd / ".janito" / "sessions" / f"{session.session_id}.jsonl"
+    assert "read it twice" in path.read_text(encoding="utf-8")
+
+
+@requires_fastapi
+def test_sessions_save_references_and_render_payloads(isolated_cwd):
+    from janito.web.backend.app import create_app
+    from janito.web.backend.config import WebServerConfig
+
+    config = WebServerConfig(web_host="127.0.0.1", web_port=0, no_web_open=True)
+    with TestClient(create_app(config)) as client:
+        session_id = client.post("/api/chat/sessions").json()["session_id"]
+        sessions = client.app.state.sessions
+        session = sessions.get(session_id)
+        session.messages.extend(_history())
+        sessions.persist(session)
+
+        assert blob_store.is_ref(session.messages[-2])
+        path = isolated_cwd / ".janito" / "sessions" / f"{session_id}.jsonl"
+        assert len(path.read_text(encoding="utf-8")) < len(BIG)
+        rendered = client.get(f"/api/chat/sessions/{session_id}").json()
+        assert rendered["messages"][-2]["content"] == BIG
+
+    # A restart restores the references and keeps their blobs.
+    with TestClient(create_app(config)) as client:
+        restored = client.app.state.sessions.get(session_id)
+        assert blob_store.is_ref(restored.messages[-2])
+        assert blob_store.get_blob(restored.messages[-2]["content"]["blob"]) == BIG
@@ -122,3 +122,49 @@ def test_await_cancel_ignores_unknown_message_types():
 
     assert result is True
     assert pending == ["hello"]
+
+
+class _RecordingWebSocket:
+    """Collects the frames sent with send_json()."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, payload):
+        self.sent.append(payload)
+
+
+@requires_fastapi
+def test_stream_to_websocket_remaps_checkpoints_on_compaction(monkeypatch):
+    """When the loop compacts the history it yields a ``compaction`` event;
+    the session's rewind checkpoints are remapped before it is forwarded,
+    so a later cancel rolls back to the right (shifted) index."""
+    import janito.web.backend.routers.chat as chat_mod
+    from janito.agent.events import CompactionEvent, DoneEvent
+    from janito.web.backend.routers.chat_helpers import _stream_to_websocket
+
+    async def fake_stream_prompt(prompt, messages, config, tools=None, use_mcp=True):
+        yield CompactionEvent(
+            start=1,
+            end=9,
+            inserted=2,
+            tokens_before=900,
+            tokens_after=300,
+            summarized_turns=2,
+        )
+        yield DoneEvent(full_content="done", message_count=len(messages))
+
+    monkeypatch.setattr(chat_mod, "stream_prompt", fake_stream_prompt)
+
+    ws = _RecordingWebSocket()
+    checkpoints = [1, 5, 9, 13]
+    asyncio.run(_stream_to_websocket(ws, "hi", [], object(), checkpoints=checkpoints))
+
+    assert checkpoints == [1, 3, 7]
+    assert ws.sent[0] == {
+        "type": "compaction",
+        "tokens_before": 900,
+        "tokens_after": 300,
+        "summarized_turns": 2,
+        "elided_results": 0,
+    }
@@ -10,6 +10,7 @@ Endpoints under test:
     GET /api/tools          -> {"tools": [{name, description, permissions}], "count"}
     GET /api/tools/skipped  -> {"skipped": {name: reason}}
     GET /api/mcp/tools      -> {"tools": [openai schema], "count"}
+    GET /api/mcp/status     -> {"services": {name: health}}
 """
 
 import sys
@@ -160,3 +161,16 @@ def test_mcp_tools_endpoint_shape(client):
     for schema in data["tools"]:
         fn = schema.get("function", schema)
         assert "name" in fn
+
+
+@requires_fastapi
+def test_mcp_status_endpoint_shape(client):
+    """GET /api/mcp/status returns the supervisor view keyed by service."""
+    resp = client.get("/api/mcp/status")
+    assert resp.status_code == 200
+
+    data = resp.json()
+    assert isinstance(data["services"], dict)
+    for entry in data["services"].values():
+        for key in ("state", "restarts", "calls", "avg_latency_ms", "connected"):
+            assert key in entry